@@ -25,6 +25,8 @@ COMMON_FUNCTIONS_DIR="${SCRIPT_DIR}/script_functions/common"
 # Keep all generated content inside the current workspace folder.
 WORKING_DIR="$(pwd)"
 LVGL_DIR="${WORKING_DIR}/ESP32/lvgl_micropython"
+# Firmware/filesystem flash split shared by the build and size checks.
+FLASH_LAYOUT_FILE="${WORKING_DIR}/flash_layout_esp32.json"
 REPO_URL="https://github.com/lvgl-micropython/lvgl_micropython"
 
 # Shared ANSI colors used by logging helpers.
@@ -38,6 +40,11 @@ NC='\033[0m'
 for module in \
     "$COMMON_FUNCTIONS_DIR/logging_io.sh" \
     "$COMMON_FUNCTIONS_DIR/lvgl_repo.sh" \
+    "$COMMON_FUNCTIONS_DIR/frozen_modules.sh" \
+    "$COMMON_FUNCTIONS_DIR/size_report.sh" \
+    "$COMMON_FUNCTIONS_DIR/build_cache.sh" \
+    "$COMMON_FUNCTIONS_DIR/artifact_cache.sh" \
+    "$COMMON_FUNCTIONS_DIR/step_stamps.sh" \
     "$FUNCTIONS_DIR/platform_config.sh" \
     "$FUNCTIONS_DIR/board_module.sh" \
     "$FUNCTIONS_DIR/prebuild_setup.sh" \
@@ -0,0 +1,107 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+# Whole-firmware artifact cache keyed by a hash of the effective configuration.
+
+# Key of the current configuration (empty when caching is off or failed).
+ARTIFACT_CACHE_KEY=""
+# 1 after restore_cached_firmware found the artifacts of this configuration.
+ARTIFACT_CACHE_HIT=0
+
+# print_config entries that do not affect the produced firmware.
+ARTIFACT_CACHE_IGNORED_VARS="MODE WORKING_DIR LVGL_DIR INSTALL_DEPS UPDATE_SUBMODULES RECLONE CLEAN_BUILD CLEAN_REPO ESTIMATE_FIRMWARE_SIZE ESPTOOL_PORT ESPTOOL_BAUD COMPILER_CACHE COMPILER_CACHE_DIR COMPILER_CACHE_MAXSIZE ARTIFACT_CACHE ARTIFACT_CACHE_DIR ARTIFACT_CACHE_MAX_MB GIT_REFERENCE_DIR GIT_FETCH_MODE GIT_SUBMODULE_JOBS GIT_MIRROR_DIR GIT_MIRROR_MAX_AGE OFFLINE PATCH_DIFF IDF_SETUP_CACHE IDF_SETUP_CACHE_DIR STEP_TIMING STEP_STAMPS FORCE_STEPS"
+
+# Board/bus values baked into the generated board module that print_config
+# does not list (every PIN_* variable is added as well).
+ARTIFACT_CACHE_BOARD_VARS="DISPLAY_WIDTH DISPLAY_HEIGHT SPI_HOST SPI_FREQ I2C_HOST I2C_FREQ TOUCH_USE_IRQ"
+
+# Effective configuration as NAME=value lines: the workflow's print_config
+# plus the board, pin and bus variables. Also the configuration input of the
+# prepare_build_context stamp (common/step_stamps.sh).
+artifact_cache_config() {
+    local line name
+    local printed=" "
+    while IFS= read -r line; do
+        [[ "$line" =~ ^([A-Z][A-Z0-9_]*)= ]] || continue
+        name="${BASH_REMATCH[1]}"
+        printed+="$name "
+        [[ " $ARTIFACT_CACHE_IGNORED_VARS " == *" $name "* ]] && continue
+        echo "$line"
+    done < <(print_config)
+    for name in $(compgen -v PIN_) $ARTIFACT_CACHE_BOARD_VARS; do
+        [[ "$printed" == *" $name "* ]] && continue
+        echo "$name=${!name-}"
+    done
+}
+
+# Look up the current configuration; on a hit restore the artifacts into
+# WORKING_DIR and set ARTIFACT_CACHE_HIT=1 so the caller can skip the build.
+# A miss is a normal outcome, not a failed step: it returns 0 as well.
+restore_cached_firmware() {
+    ARTIFACT_CACHE_KEY=""
+    ARTIFACT_CACHE_HIT=0
+    if [ "$ARTIFACT_CACHE" != "1" ]; then
+        info "Artifact cache disabled (ARTIFACT_CACHE=0)"
+        return 0
+    fi
+    print_step "STEP 5i: Artifact cache lookup"
+
+    local describe="$LVGL_DIR/build/artifact_cache_key.json"
+    local -a inputs=(
+        "$HEREDOC_TEMPLATES_DIR"
+        "$SCRIPT_DIR/script_functions"
+        "$SCRIPT_DIR/${0##*/}"
+    )
+    local item
+    for item in ${LVGL_FONT_SUBSET_FILES:-}; do
+        inputs+=("$WORKING_DIR/$item")
+    done
+
+    mkdir -p "$LVGL_DIR/build"
+    ARTIFACT_CACHE_KEY="$(artifact_cache_config | "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/artifact_cache.py" \
+        key --repo "$LVGL_DIR" --describe "$describe" "${inputs[@]}")" || {
+        warn "Could not compute artifact cache key: building without it"
+        ARTIFACT_CACHE_KEY=""
+        return 0
+    }
+
+    if [ "$CLEAN_BUILD" = "1" ]; then
+        info "CLEAN_BUILD=1 -> rebuilding (artifacts will refresh cache entry $ARTIFACT_CACHE_KEY)"
+        return 0
+    fi
+
+    if "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/artifact_cache.py" \
+        restore --store "$ARTIFACT_CACHE_DIR" --key "$ARTIFACT_CACHE_KEY" --dest "$WORKING_DIR"; then
+        ok "Artifact cache hit ($ARTIFACT_CACHE_KEY): build skipped"
+        ARTIFACT_CACHE_HIT=1
+        return 0
+    fi
+    info "Artifact cache miss ($ARTIFACT_CACHE_KEY)"
+}
+
+# Add the artifacts of a finished build to the cache (warns on failure).
+# Usage: store_cached_firmware <firmware> [optional artifacts...] (names in WORKING_DIR)
+store_cached_firmware() {
+    [ -n "$ARTIFACT_CACHE_KEY" ] || return 0
+
+    local firmware="$1"
+    shift
+    if [ ! -f "$WORKING_DIR/$firmware" ]; then
+        warn "Firmware missing (not cached): $WORKING_DIR/$firmware"
+        return 0
+    fi
+
+    local -a files=("$WORKING_DIR/$firmware")
+    local name
+    for name in "$@"; do
+        [ -f "$WORKING_DIR/$name" ] && files+=("$WORKING_DIR/$name")
+    done
+
+    "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/artifact_cache.py" \
+        store --store "$ARTIFACT_CACHE_DIR" --key "$ARTIFACT_CACHE_KEY" \
+        --port "$TARGET_PORT" \
+        --describe "$LVGL_DIR/build/artifact_cache_key.json" \
+        --max-mb "$ARTIFACT_CACHE_MAX_MB" \
+        "${files[@]}" || warn "Storing artifacts in the cache failed"
+}
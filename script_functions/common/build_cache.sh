@@ -0,0 +1,82 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+# Compiler object cache (ccache) shared by both ports.
+#
+# The cache directory lives outside LVGL_DIR so CLEAN_BUILD=1 and RECLONE=1
+# keep it. CCACHE_BASEDIR rewrites absolute paths below the workspace to
+# relative ones, so a re-cloned tree (or another workspace with the same
+# layout) hits the same entries. Toolchains are hashed by content, which
+# keeps ARM and Xtensa objects apart in one shared cache.
+
+# Stats snapshot taken before the build ("hits misses").
+COMPILER_CACHE_STATS_BEFORE=""
+
+# Print "hits misses" from ccache's machine-readable statistics.
+_compiler_cache_counters() {
+    ccache --print-stats 2>/dev/null | awk -F'\t' '
+        $1 == "direct_cache_hit" || $1 == "preprocessed_cache_hit" { hits += $2 }
+        $1 == "cache_miss" { misses += $2 }
+        END { if (NR) print hits + 0, misses + 0 }
+    '
+}
+
+# Export the ccache environment for the port build system.
+# ESP-IDF enables its own launcher via IDF_CCACHE_ENABLE; the RP2 CMake build
+# picks up CMAKE_<LANG>_COMPILER_LAUNCHER from the environment on configure.
+setup_compiler_cache() {
+    local port="$1"
+
+    COMPILER_CACHE_STATS_BEFORE=""
+    if [ "$COMPILER_CACHE" != "1" ]; then
+        info "Compiler cache disabled (COMPILER_CACHE=0)"
+        [ "$port" = "esp32" ] && export IDF_CCACHE_ENABLE=0
+        return 0
+    fi
+    if ! command -v ccache &>/dev/null; then
+        warn "ccache not found: building without compiler cache"
+        [ "$port" = "esp32" ] && export IDF_CCACHE_ENABLE=0
+        return 0
+    fi
+
+    mkdir -p "$COMPILER_CACHE_DIR" || fail "Cannot create compiler cache dir: $COMPILER_CACHE_DIR"
+    export CCACHE_DIR="$COMPILER_CACHE_DIR"
+    export CCACHE_MAXSIZE="$COMPILER_CACHE_MAXSIZE"
+    export CCACHE_BASEDIR="$WORKING_DIR"
+    export CCACHE_NOHASHDIR=1
+    export CCACHE_COMPILERCHECK=content
+    export CCACHE_SLOPPINESS="time_macros,include_file_mtime,include_file_ctime,locale"
+
+    case "$port" in
+        esp32)
+            export IDF_CCACHE_ENABLE=1
+            ;;
+        *)
+            export CMAKE_C_COMPILER_LAUNCHER=ccache
+            export CMAKE_CXX_COMPILER_LAUNCHER=ccache
+            ;;
+    esac
+
+    COMPILER_CACHE_STATS_BEFORE="$(_compiler_cache_counters)"
+    info "Compiler cache: $CCACHE_DIR (max $CCACHE_MAXSIZE, base $CCACHE_BASEDIR)"
+}
+
+# Print the cache hits/misses of the build that just finished.
+report_compiler_cache_stats() {
+    [ -n "$COMPILER_CACHE_STATS_BEFORE" ] || return 0
+
+    local after hits0 misses0 hits1 misses1
+    after="$(_compiler_cache_counters)"
+    read -r hits0 misses0 <<<"$COMPILER_CACHE_STATS_BEFORE"
+    read -r hits1 misses1 <<<"${after:-0 0}"
+
+    local hits=$((hits1 - hits0))
+    local misses=$((misses1 - misses0))
+    local total=$((hits + misses))
+    if [ "$total" -eq 0 ]; then
+        info "Compiler cache: no compilations (build was up to date)"
+        return 0
+    fi
+    info "Compiler cache: $hits hits, $misses misses ($((hits * 100 / total))% hit rate)"
+}
@@ -0,0 +1,54 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+# Copy shared runtime modules (FROZEN_RUNTIME_MODULES) next to the board module.
+# Both ports freeze them from the destination folder together with the board helper.
+stage_frozen_runtime_modules() {
+    local dest_dir="$1"
+    [ -n "$dest_dir" ] || fail "No destination provided for frozen runtime modules"
+
+    local module src
+    for module in ${FROZEN_RUNTIME_MODULES:-}; do
+        if [[ ! "$module" =~ ^[A-Za-z_][A-Za-z0-9_]*$ ]]; then
+            fail "Invalid frozen runtime module name: '$module'"
+        fi
+        src="$HEREDOC_TEMPLATES_DIR/common/frozen/${module}.py"
+        [ -f "$src" ] || fail "Missing frozen runtime module: $src"
+        write_file "$dest_dir/${module}.py" < "$src"
+    done
+}
+
+# Remove previously staged runtime modules when freezing is disabled.
+remove_frozen_runtime_modules() {
+    local dest_dir="$1"
+    local module
+    for module in ${FROZEN_RUNTIME_MODULES:-}; do
+        rm -f "$dest_dir/${module}.py"
+    done
+}
+
+# Resolve HOT_PATH_EMITTER for @_hot_path functions in the board module.
+# Native code is only baked in when the port freezes with the mpy-cross
+# architecture the platform expects; other ports keep the bytecode fallback.
+resolve_hot_path_emitter() {
+    local port_dir="$1"
+    local arch="$2"
+
+    case "$NATIVE_EMITTER" in
+        bytecode)
+            HOT_PATH_EMITTER="bytecode"
+            return 0
+            ;;
+        native|viper) ;;
+        *) fail "Invalid NATIVE_EMITTER='$NATIVE_EMITTER' (expected native, viper or bytecode)" ;;
+    esac
+
+    if grep -qs -- "-march=$arch" "$port_dir/CMakeLists.txt" "$port_dir"/*.cmake; then
+        HOT_PATH_EMITTER="$NATIVE_EMITTER"
+        info "Hot paths: @micropython.$NATIVE_EMITTER ($arch)"
+    else
+        HOT_PATH_EMITTER="bytecode"
+        warn "Port $(basename "$port_dir") does not freeze for $arch; hot paths stay bytecode"
+    fi
+}
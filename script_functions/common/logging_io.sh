@@ -34,3 +34,83 @@ write_file() {
         rm -f "$tmp"
     fi
 }
+
+# Step timing (STEP_TIMING=1): `timed_step fn args...` records the start/end
+# time and exit status of a workflow step. Steps nest, so a flow and the
+# steps it runs are both recorded. Events are appended to a TSV file; the
+# EXIT trap closes steps left open by `fail`/`set -e` with the exit status
+# and writes build_timing_<port>.json, a Chrome trace and a summary table.
+STEP_TIMING_EVENTS=""
+STEP_TIMING_PORT=""
+STEP_TIMING_NAMES=()
+STEP_TIMING_STARTS=()
+
+# Print the current time in microseconds since the epoch.
+_step_timing_now() {
+    if [ -n "${EPOCHREALTIME:-}" ]; then
+        echo "${EPOCHREALTIME/[.,]/}"
+    else
+        date +%s%6N
+    fi
+}
+
+# Start collecting step timings for `port`.
+step_timing_init() {
+    STEP_TIMING_PORT="$1"
+    STEP_TIMING_NAMES=()
+    STEP_TIMING_STARTS=()
+    if [ "${STEP_TIMING:-1}" != "1" ]; then
+        STEP_TIMING_EVENTS=""
+        return 0
+    fi
+    STEP_TIMING_EVENTS="$(mktemp)"
+    trap _step_timing_finish EXIT
+}
+
+# Record the end of the innermost open step with exit status `status`.
+_step_timing_end() {
+    local status="$1"
+    local depth=$(( ${#STEP_TIMING_NAMES[@]} - 1 ))
+    printf '%s\t%s\t%s\t%s\t%s\n' \
+        "$depth" "${STEP_TIMING_NAMES[$depth]}" "${STEP_TIMING_STARTS[$depth]}" "$(_step_timing_now)" "$status" \
+        >> "$STEP_TIMING_EVENTS"
+    unset "STEP_TIMING_NAMES[$depth]" "STEP_TIMING_STARTS[$depth]"
+}
+
+# Run one workflow step (a function name plus arguments) under the timer.
+# Errors still abort through `set -e`/`fail`; the EXIT trap records them.
+timed_step() {
+    if [ -z "$STEP_TIMING_EVENTS" ]; then
+        "$@"
+        return
+    fi
+
+    STEP_TIMING_NAMES+=("$1")
+    STEP_TIMING_STARTS+=("$(_step_timing_now)")
+    "$@"
+    local status=$?
+    _step_timing_end "$status"
+    return "$status"
+}
+
+# EXIT trap: close open steps, then write the JSON/trace files and the summary.
+_step_timing_finish() {
+    local status=$?
+    [ -n "$STEP_TIMING_EVENTS" ] || return "$status"
+
+    while [ "${#STEP_TIMING_NAMES[@]}" -gt 0 ]; do
+        _step_timing_end "$status"
+    done
+    if [ -s "$STEP_TIMING_EVENTS" ]; then
+        "${PYTHON_BIN:-python3}" "$HEREDOC_TEMPLATES_DIR/common/step_timing.py" \
+            --events "$STEP_TIMING_EVENTS" \
+            --port "$STEP_TIMING_PORT" \
+            --mode "${MODE:-}" \
+            --status "$status" \
+            --json "$WORKING_DIR/build_timing_${STEP_TIMING_PORT}.json" \
+            --trace "$WORKING_DIR/build_timing_${STEP_TIMING_PORT}.trace.json" \
+            || echo "[WARN] Step timing report failed"
+    fi
+    rm -f "$STEP_TIMING_EVENTS"
+    return "$status"
+}
@@ -22,6 +22,55 @@ configure_lvgl_fonts() {
     ok "LVGL font configuration applied"
 }
 
+# Apply LV_CONF_PROFILE and LV_CONF_SET overrides to lib/lv_conf.h. Macros a
+# previous profile changed and the current one does not set are restored.
+configure_lv_conf() {
+    print_step "${LV_CONF_STEP_LABEL:-STEP: Configure lv_conf.h profile}"
+
+    local lv_conf_file="$LVGL_DIR/lib/lv_conf.h"
+    [ -f "$lv_conf_file" ] || fail "Missing lv_conf.h: $lv_conf_file"
+
+    local -a args=("$lv_conf_file" --profile "${LV_CONF_PROFILE:-}" --port "$TARGET_PORT")
+    if [ -n "${LV_CONF_SET:-}" ]; then
+        args+=(--set "$LV_CONF_SET")
+    fi
+
+    "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/configure_lv_conf.py" "${args[@]}" || fail "Failed configuring lv_conf.h"
+    ok "lv_conf.h profile applied"
+}
+
+# Cut the enabled Montserrat sources down to the configured character set.
+# With no LVGL_FONT_SUBSET_* source set, full fonts are restored instead.
+subset_lvgl_fonts() {
+    print_step "${LVGL_FONT_SUBSET_STEP_LABEL:-STEP: Subset LVGL fonts}"
+
+    local font_dir="$LVGL_DIR/lib/lvgl/src/font"
+    [ -d "$font_dir" ] || fail "Missing LVGL font sources: $font_dir"
+
+    local -a args=(
+        "$font_dir" "$LVGL_MONTSERRAT_FONTS $LVGL_FONT_DEFAULT_SIZE"
+        --charset "${LVGL_FONT_SUBSET_CHARSET:-}"
+        --ranges "${LVGL_FONT_SUBSET_RANGES:-}"
+    )
+    if _is_truthy "${LVGL_FONT_SUBSET_SYMBOLS:-1}"; then
+        args+=(--keep-symbols)
+    fi
+
+    # Character source files are relative to the directory the build started in.
+    local source
+    local -a files=()
+    for source in ${LVGL_FONT_SUBSET_FILES:-}; do
+        [[ "$source" = /* ]] || source="$WORKING_DIR/$source"
+        files+=("$source")
+    done
+    if [ "${#files[@]}" -gt 0 ]; then
+        args+=(--files "${files[@]}")
+    fi
+
+    "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/subset_lvgl_fonts.py" "${args[@]}" || fail "Failed subsetting LVGL fonts"
+    ok "LVGL font subset step completed"
+}
+
 # Treat common truthy values as "enabled".
 _is_truthy() {
     case "${1:-}" in
@@ -30,6 +79,54 @@ _is_truthy() {
     esac
 }
 
+# Route git fetches of mirrored URLs to the local mirrors.
+# Reads `<url>\t<mirror url>` lines from stdin. GIT_CONFIG_* is inherited by
+# the git processes that clone nested submodules.
+_use_git_mirrors() {
+    local url mirror idx=0
+    while IFS=$'\t' read -r url mirror; do
+        [ -n "$url" ] || continue
+        export "GIT_CONFIG_KEY_${idx}=url.${mirror}.insteadOf"
+        export "GIT_CONFIG_VALUE_${idx}=$url"
+        idx=$((idx + 1))
+    done
+    # Submodule clones over file:// are blocked by default since git 2.38.1.
+    export "GIT_CONFIG_KEY_${idx}=protocol.file.allow"
+    export "GIT_CONFIG_VALUE_${idx}=always"
+    export GIT_CONFIG_COUNT=$((idx + 1))
+}
+
+# Create/refresh local bare mirrors (GIT_MIRROR_DIR) and clone from them.
+# Extra args are passed to git_mirror.py (e.g. --rev/--submodules).
+sync_git_mirrors() {
+    if [ -z "${GIT_MIRROR_DIR:-}" ]; then
+        _is_truthy "${OFFLINE:-0}" && fail "OFFLINE=1 requires GIT_MIRROR_DIR"
+        return 0
+    fi
+
+    local -a args=(--root "$GIT_MIRROR_DIR" --url "$REPO_URL" --max-age "${GIT_MIRROR_MAX_AGE:-600}")
+    if _is_truthy "${OFFLINE:-0}"; then
+        args+=(--offline)
+        # Anything not served by a mirror must fail instead of going online.
+        export GIT_ALLOW_PROTOCOL=file
+    fi
+
+    local mapping
+    mapping="$("$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/git_mirror.py" "${args[@]}" "$@")" || fail "Git mirror sync failed"
+    _use_git_mirrors <<<"$mapping"
+    info "Using git mirrors in $GIT_MIRROR_DIR"
+}
+
+# Clone/fetch size options for GIT_FETCH_MODE (full|shallow|blobless).
+_git_fetch_args() {
+    case "${GIT_FETCH_MODE:-full}" in
+        full) ;;
+        shallow) echo "--depth 1" ;;
+        blobless) echo "--filter=blob:none" ;;
+        *) fail "Invalid GIT_FETCH_MODE='${GIT_FETCH_MODE}'. Use full|shallow|blobless" ;;
+    esac
+}
+
 # Clone or reuse lvgl_micropython according to RECLONE policy.
 ensure_repo_common() {
     local step_label="${1:-STEP 1: Prepare repository}"
@@ -72,8 +169,18 @@ ensure_repo_common() {
 
     # Clone only when needed; otherwise keep the local checkout.
     if [ ! -d "$LVGL_DIR/.git" ]; then
-        info "Cloning from $REPO_URL ..."
-        git clone "$REPO_URL" "$LVGL_DIR" || fail "Clone failed"
+        sync_git_mirrors
+        local fetch_args
+        fetch_args="$(_git_fetch_args)"
+        # shellcheck disable=SC2206
+        local -a clone_args=($fetch_args)
+        # Borrow objects from a shared reference checkout (see tools/build_matrix.py).
+        if [ -n "${GIT_REFERENCE_DIR:-}" ]; then
+            info "Using reference repository: $GIT_REFERENCE_DIR"
+            clone_args+=(--reference-if-able "$GIT_REFERENCE_DIR")
+        fi
+        info "Cloning from $REPO_URL (${GIT_FETCH_MODE:-full}) ..."
+        git clone ${clone_args[@]+"${clone_args[@]}"} "$REPO_URL" "$LVGL_DIR" || fail "Clone failed"
         ok "Repository cloned"
     else
         ok "Using existing repository: $LVGL_DIR"
@@ -82,33 +189,74 @@ ensure_repo_common() {
     cd "$LVGL_DIR"
 }
 
-# Run platform-specific builder patch scripts with shared validation/error handling.
-patch_builder_space_paths_common() {
-    local patch_script="$1"
+# Run a declarative patch manifest (see common/patch_engine.py) against LVGL_DIR.
+# PATCH_DIFF=1 prints a unified diff of every edit applied.
+run_patch_manifest() {
+    local manifest="$1"
     shift
 
-    [ -f "$patch_script" ] || fail "Missing patch script: $patch_script"
-    [ "$#" -gt 0 ] || fail "No files provided for builder patching"
+    [ -f "$manifest" ] || fail "Missing patch manifest: $manifest"
 
-    print_step "${PATCH_BUILDER_STEP_LABEL:-STEP 3: Patch builder for paths with spaces}"
+    local -a args=(--root "$LVGL_DIR")
+    if _is_truthy "${PATCH_DIFF:-0}"; then
+        args+=(--diff)
+    fi
+    "$PYTHON_BIN" "$manifest" "${args[@]}" "$@"
+}
 
-    local file
-    for file in "$@"; do
-        [ -f "$file" ] || fail "Missing builder file: $file"
-    done
+# Stamp description of the builder patch step (see common/step_stamps.sh).
+patch_builder_space_paths_stamp_inputs() {
+    stamp_digest "$HEREDOC_TEMPLATES_DIR/common/patch_engine.py" \
+        "$HEREDOC_TEMPLATES_DIR/common/patch_builder_space_paths.py"
+}
 
-    "$PYTHON_BIN" "$patch_script" "$@" || fail "Failed patching builder path handling"
+patch_builder_space_paths_stamp_outputs() {
+    stamp_stat "$LVGL_DIR/builder" \
+        "$LVGL_DIR/lib/micropython/ports/rp2/Makefile" \
+        "$LVGL_DIR/lib/micropython/ports/esp32/Makefile"
+}
+
+# Apply the builder space-path patches for one port (rp2|esp32).
+patch_builder_space_paths_common() {
+    local port="$1"
+
+    print_step "${PATCH_BUILDER_STEP_LABEL:-STEP 3: Patch builder for paths with spaces}"
+
+    run_patch_manifest "$HEREDOC_TEMPLATES_DIR/common/patch_builder_space_paths.py" --enable "$port" \
+        || fail "Failed patching builder path handling"
     ok "Builder path patch check completed"
 }
 
-# Initialize a selected list of submodules.
+# Initialize a selected list of submodules (fetched in parallel).
 init_submodules_common() {
     [ "$#" -gt 0 ] || fail "No submodules provided"
 
-    local submodule
-    for submodule in "$@"; do
-        git submodule update --init --recursive "$submodule" || fail "$submodule initialization failed"
-    done
+    sync_git_mirrors --rev "$(git rev-parse HEAD)" --submodules "$@"
+
+    # With a reference checkout, submodules borrow objects from its .git/modules.
+    local -a git_config=()
+    if [ -n "${GIT_REFERENCE_DIR:-}" ]; then
+        git_config+=(-c submodule.alternateLocation=superproject -c submodule.alternateErrorStrategy=info)
+    fi
+
+    local fetch_args
+    fetch_args="$(_git_fetch_args)"
+    # shellcheck disable=SC2206
+    local -a update_args=(--init --recursive --jobs "${GIT_SUBMODULE_JOBS:-4}" $fetch_args)
+
+    git ${git_config[@]+"${git_config[@]}"} submodule update "${update_args[@]}" -- "$@" || fail "Submodule initialization failed ($*)"
 
     ok "Submodules initialized"
 }
+
+# Stamp inputs of a submodule step: superproject commit and recorded SHAs.
+submodules_stamp_inputs() {
+    echo "update=$UPDATE_SUBMODULES fetch=$GIT_FETCH_MODE"
+    git -C "$LVGL_DIR" rev-parse HEAD
+    git -C "$LVGL_DIR" ls-tree HEAD -- "$@" 2>/dev/null
+}
+
+# Stamp outputs of a submodule step: checked-out SHAs ('-'/'+' when not in sync).
+submodules_stamp_outputs() {
+    git -C "$LVGL_DIR" submodule status -- "$@" 2>/dev/null
+}
@@ -0,0 +1,54 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+# Write the per-component size report of a build and diff it with the previous one.
+# The report is diagnostic only: failures warn instead of stopping the build.
+write_firmware_size_report() {
+    local port="$1"
+    local elf_file="$2"
+    local map_file="$3"
+    local report_file="$4"
+
+    if [ ! -f "$elf_file" ]; then
+        warn "ELF not found (skipping size report): $elf_file"
+        return 0
+    fi
+
+    "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/analyze_firmware_size.py" \
+        --port "$port" \
+        --elf "$elf_file" \
+        --map "$map_file" \
+        --report "$report_file" || warn "Size report failed for $elf_file"
+}
+
+# Predict the firmware size of the current font/frozen-module selection and
+# stop before the build when it would not fit `budget_bytes` (0 = unknown).
+run_firmware_size_estimate() {
+    local history_file="$1"
+    local budget_bytes="$2"
+    shift 2
+
+    local font_dir="$LVGL_DIR/lib/lvgl/src/font"
+    [ -d "$font_dir" ] || fail "Missing LVGL font sources: $font_dir"
+
+    "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/estimate_firmware_size.py" \
+        "$font_dir" "$LVGL_MONTSERRAT_FONTS" "$LVGL_FONT_DEFAULT_SIZE" \
+        --toggle "LV_FONT_MONTSERRAT_28_COMPRESSED=$LVGL_FONT_MONTSERRAT_28_COMPRESSED" \
+        --toggle "LV_FONT_DEJAVU_16_PERSIAN_HEBREW=$LVGL_FONT_DEJAVU_16_PERSIAN_HEBREW" \
+        --toggle "LV_FONT_SIMSUN_14_CJK=$LVGL_FONT_SIMSUN_14_CJK" \
+        --toggle "LV_FONT_SIMSUN_16_CJK=$LVGL_FONT_SIMSUN_16_CJK" \
+        --toggle "LV_FONT_UNSCII_8=$LVGL_FONT_UNSCII_8" \
+        --toggle "LV_FONT_UNSCII_16=$LVGL_FONT_UNSCII_16" \
+        --history "$history_file" \
+        --budget "$budget_bytes" \
+        --frozen "$@" || fail "Firmware size estimate failed"
+}
+
+# Run a common/flash_layout.py command on the layout file of this port.
+# Usage: flash_layout <plan|from-csv|get|header|verify> [args...]
+flash_layout() {
+    local command="$1"
+    shift
+    "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/common/flash_layout.py" "$command" --layout "$FLASH_LAYOUT_FILE" "$@"
+}
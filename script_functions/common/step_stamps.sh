@@ -0,0 +1,103 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+# Skip setup steps whose inputs and outputs are unchanged since their last run.
+#
+# A stamped step `fn` is described by `fn_stamp_inputs` (printed before the
+# step runs: configuration, script hashes, recorded submodule SHAs, ...) and
+# optionally `fn_stamp_outputs` (printed after it ran: state of the files it
+# produced). Their hashes are stored in $LVGL_DIR/.step_stamps/<fn>. In `build`
+# mode a step is skipped when both hashes still match, so files changed behind
+# the stamp (submodule reset, manual edit) re-run it. Other modes always run
+# the steps and refresh the stamps. `fn_stamp_skipped`, when defined, restores
+# shell state the skipped step would have set.
+#
+# FORCE_STEPS="init_submodules prepare_build_context" (or "all") re-runs the
+# named steps; STEP_STAMPS=0 disables stamps.
+
+# Print "path size mtime" for files (recursively for directories).
+stamp_stat() {
+    local path
+    for path in "$@"; do
+        if [ -d "$path" ]; then
+            find "$path" -type f ! -path '*/__pycache__/*' -printf '%p %s %T@\n' | sort
+        elif [ -f "$path" ]; then
+            stat -c '%n %s %.9Y' "$path"
+        else
+            echo "missing $path"
+        fi
+    done
+}
+
+# Print content hashes of files (recursively for directories).
+stamp_digest() {
+    local path
+    for path in "$@"; do
+        if [ -e "$path" ]; then
+            find "$path" -type f ! -path '*/__pycache__/*' -print0 | sort -z | xargs -0 -r sha256sum
+        else
+            echo "missing $path"
+        fi
+    done
+}
+
+# Inputs of prepare_build_context shared by both ports: the configuration the
+# artifact cache key hashes (print_config plus board, pin and bus values),
+# build scripts/templates and the font subset source files.
+build_context_stamp_inputs() {
+    artifact_cache_config
+    stamp_digest "$HEREDOC_TEMPLATES_DIR" "$SCRIPT_DIR/script_functions"
+    local item
+    for item in ${LVGL_FONT_SUBSET_FILES:-}; do
+        stamp_digest "$WORKING_DIR/$item"
+    done
+}
+
+# Hash the output of a stamp description function (empty when undefined).
+_step_stamp_hash() {
+    local describe="$1"
+    if declare -F "$describe" >/dev/null; then
+        { declare -f "${describe%_stamp_*}"; "$describe"; } | sha256sum | cut -d' ' -f1
+    fi
+}
+
+# True when FORCE_STEPS names `step` (or "all").
+_step_forced() {
+    case " ${FORCE_STEPS//,/ } " in
+        *" all "*|*" $1 "*) return 0 ;;
+    esac
+    return 1
+}
+
+# Run `step args...` unless its stamp shows nothing changed (build mode only).
+stamped_step() {
+    local step="$1"
+    local stamp="$LVGL_DIR/.step_stamps/$step"
+
+    if [ "$STEP_STAMPS" != "1" ] || ! declare -F "${step}_stamp_inputs" >/dev/null; then
+        timed_step "$@"
+        return
+    fi
+
+    local inputs
+    inputs="$(_step_stamp_hash "${step}_stamp_inputs")"
+
+    if [ "$MODE" = "build" ] && [ -f "$stamp" ]; then
+        if _step_forced "$step"; then
+            info "FORCE_STEPS -> re-running $step"
+        elif [ "$(cat "$stamp")" = "$inputs $(_step_stamp_hash "${step}_stamp_outputs")" ]; then
+            ok "$step: inputs unchanged since last run (stamp), skipping"
+            if declare -F "${step}_stamp_skipped" >/dev/null; then
+                "${step}_stamp_skipped"
+            fi
+            return 0
+        fi
+    fi
+
+    # A failed or interrupted step must not leave a stamp behind.
+    rm -f "$stamp"
+    timed_step "$@"
+    mkdir -p "${stamp%/*}"
+    echo "$inputs $(_step_stamp_hash "${step}_stamp_outputs")" > "$stamp"
+}
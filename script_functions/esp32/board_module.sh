@@ -33,13 +33,9 @@ apply_board_profile_defaults() {
     esac
 }
 
-# Generate and export a frozen Python board helper module for firmware build.
-create_frozen_board_module() {
-    print_step "STEP 5g: Generate frozen board module ($BOARD_MODULE_NAME)"
-
-    [ "$FREEZE_BOARD_MODULE" = "1" ] || fail "create_frozen_board_module called with FREEZE_BOARD_MODULE=$FREEZE_BOARD_MODULE"
-    [ -n "$BOARD_MODULE_NAME" ] || fail "BOARD_MODULE_NAME cannot be empty"
-
+# Export the settings the frozen board helper generator and the build read.
+# Also used when a stamped prepare_build_context is skipped.
+export_frozen_board_module_env() {
     # Fill missing values before generating the Python helper source.
     apply_board_profile_defaults
 
@@ -48,9 +44,27 @@ create_frozen_board_module() {
     export FROZEN_BOARD_PY
     export FROZEN_BOARD_MANIFEST
     export BOARD_MODULE_NAME
+    export FROZEN_RUNTIME_MODULES
     export PIN_LCD_BL PIN_TP_INT PIN_TP_SDA PIN_TP_SCL
     export PIN_LCD_DC PIN_LCD_CS PIN_LCD_CLK PIN_LCD_MOSI PIN_LCD_MISO PIN_TP_RST PIN_LCD_RST
     export DISPLAY_WIDTH DISPLAY_HEIGHT SPI_HOST SPI_FREQ I2C_HOST I2C_FREQ
+    export TOUCH_USE_IRQ
+
+    resolve_hot_path_emitter "$LVGL_DIR/lib/micropython/ports/esp32" "$NATIVE_EMITTER_ARCH"
+    export HOT_PATH_EMITTER
+}
+
+# Generate and export a frozen Python board helper module for firmware build.
+create_frozen_board_module() {
+    print_step "STEP 5g: Generate frozen board module ($BOARD_MODULE_NAME)"
+
+    [ "$FREEZE_BOARD_MODULE" = "1" ] || fail "create_frozen_board_module called with FREEZE_BOARD_MODULE=$FREEZE_BOARD_MODULE"
+    [ -n "$BOARD_MODULE_NAME" ] || fail "BOARD_MODULE_NAME cannot be empty"
+
+    export_frozen_board_module_env
+
+    # Runtime modules are frozen from the same folder as the generated helper.
+    stage_frozen_runtime_modules "$(dirname "$FROZEN_BOARD_PY")"
 
     # The Python generator reads settings directly from exported environment vars.
     "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/esp32/generate_frozen_board_module.py" || fail "Failed generating frozen board module"
@@ -2,6 +2,24 @@
 # Created: 2026-02-20
 # License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
 # See: ./LICENSE.md
+# Print the MicroPython build folder (follows the MicroPython ESP32 convention).
+esp32_build_dir() {
+    local build_dir="$LVGL_DIR/lib/micropython/ports/esp32/build-$BOARD"
+    if [ -n "$BOARD_VARIANT" ] && [ "$BOARD_VARIANT" != "-" ]; then
+        build_dir="${build_dir}-${BOARD_VARIANT}"
+    fi
+    echo "$build_dir"
+}
+
+# Print the partition table the builder produced for the last build.
+builder_partition_csv() {
+    local partition_csv="$LVGL_DIR/build/partitions.csv"
+    if [ ! -f "$partition_csv" ]; then
+        partition_csv="$(esp32_build_dir)/partition_table/partition-table.csv"
+    fi
+    echo "$partition_csv"
+}
+
 # Build ESP32 firmware using make.py with selected board/display options.
 build_firmware() {
     print_step "STEP 6: Build"
@@ -19,8 +37,8 @@ build_firmware() {
     info "Fonts (Mont.): $LVGL_MONTSERRAT_FONTS"
     info "Font default:  montserrat_$LVGL_FONT_DEFAULT_SIZE"
 
-    # Build folder name follows MicroPython ESP32 convention.
-    local build_dir="$LVGL_DIR/lib/micropython/ports/esp32/build-$BOARD"
+    local build_dir
+    build_dir="$(esp32_build_dir)"
     local -a build_args=(
         "$TARGET_PORT"
         "BOARD=$BOARD"
@@ -34,7 +52,6 @@ build_firmware() {
     fi
 
     if [ -n "$BOARD_VARIANT" ] && [ "$BOARD_VARIANT" != "-" ]; then
-        build_dir="${build_dir}-${BOARD_VARIANT}"
         build_args+=("BOARD_VARIANT=$BOARD_VARIANT")
     fi
 
@@ -47,45 +64,137 @@ build_firmware() {
         export LV_CFLAGS="$LV_CFLAGS_EXTRA"
     fi
 
+    # FLASH_LAYOUT=auto: the builder writes a partition table with this app
+    # size and gives the remaining flash to the filesystem.
+    if [ "$FLASH_LAYOUT" = "auto" ]; then
+        local layout_mode app_size
+        read -r layout_mode app_size <<<"$(flash_layout get mode firmware_max_bytes)"
+        if [ "$layout_mode" = "auto" ] && [ "$app_size" -gt 0 ]; then
+            info "App partition: $((app_size / 1024)) KB (flash layout)"
+            build_args+=("--flash-size=$((FLASH_SIZE_KB / 1024))" "--partition-size=$app_size")
+        else
+            info "App partition: builder default until the first image is measured"
+        fi
+    fi
+
+    setup_compiler_cache esp32
+
     # Unset host DISPLAY vars to avoid leaking desktop-specific env into build logic.
     env -u DISPLAY -u DISPLAY_DRIVER "$PYTHON_BIN" make.py "${build_args[@]}" || fail "Build failed"
+    report_compiler_cache_stats
     ok "Build completed"
 }
 
-# Validate that firmware binary fits the application partition.
-check_firmware_size() {
-    print_step "STEP 7: Check firmware size"
-
-    local build_dir="$LVGL_DIR/lib/micropython/ports/esp32/build-$BOARD"
-    local app_bin partition_csv part_values app_max fs_size fw_size
+# FLASH_LAYOUT=auto: plan the partition table from the last measured image.
+# Fixed layouts are recorded from the builder's table after the build.
+plan_flash_layout() {
+    if [ "$FLASH_LAYOUT" != "auto" ]; then
+        info "FLASH_LAYOUT=fixed -> builder partition table"
+        return
+    fi
+    print_step "STEP 5j: Plan flash layout"
 
-    if [ -n "$BOARD_VARIANT" ] && [ "$BOARD_VARIANT" != "-" ]; then
-        build_dir="${build_dir}-${BOARD_VARIANT}"
+    local measured
+    measured="$(flash_layout get measured_firmware_bytes)"
+    if [ "$measured" -le 0 ]; then
+        info "No measured firmware yet: the layout is planned after the first build"
+        return
     fi
+    flash_layout plan --port esp32 --mode auto \
+        --flash-kb "$FLASH_SIZE_KB" --min-fs-kb "$FLASH_FS_MIN_KB" \
+        --margin-kb "$FLASH_LAYOUT_MARGIN_KB" \
+        --partitions "$WORKING_DIR/flash_layout_esp32.csv" || fail "Flash layout planning failed"
+}
 
-    app_bin="$build_dir/micropython.bin"
-    partition_csv="$LVGL_DIR/build/partitions.csv"
-    if [ ! -f "$partition_csv" ]; then
-        partition_csv="$build_dir/partition_table/partition-table.csv"
+# Record the layout of the image just built. Auto mode re-plans the app
+# partition from its size and rebuilds once when the partition table changed.
+settle_flash_layout() {
+    local app_bin partition_csv fw_size
+    app_bin="$(esp32_build_dir)/micropython.bin"
+    partition_csv="$(builder_partition_csv)"
+    fw_size="$(stat -c %s "$app_bin" 2>/dev/null || echo 0)"
+
+    if [ "$FLASH_LAYOUT" != "auto" ]; then
+        if [ -f "$partition_csv" ]; then
+            flash_layout from-csv --csv "$partition_csv" --flash-kb "$FLASH_SIZE_KB" --measured "$fw_size" \
+                || fail "Failed parsing partition CSV: $partition_csv"
+        else
+            warn "Partition CSV not found (flash layout not recorded): $partition_csv"
+        fi
+        return
     fi
+    print_step "STEP 6b: Settle flash layout"
 
-    if [ ! -f "$app_bin" ]; then
-        warn "App binary not found: $app_bin"
+    if [ "$fw_size" -le 0 ]; then
+        warn "App binary not found (flash layout unchanged): $app_bin"
         return
     fi
 
-    if [ ! -f "$partition_csv" ]; then
-        warn "Partition CSV not found (skipping size check): $partition_csv"
+    local status=0
+    flash_layout plan --port esp32 --mode auto \
+        --flash-kb "$FLASH_SIZE_KB" --min-fs-kb "$FLASH_FS_MIN_KB" \
+        --margin-kb "$FLASH_LAYOUT_MARGIN_KB" --measured "$fw_size" \
+        --partitions "$WORKING_DIR/flash_layout_esp32.csv" --exit-changed || status=$?
+    case "$status" in
+        0) ;;
+        3)
+            info "App partition size changed -> rebuilding with the new partition table"
+            timed_step build_firmware
+            partition_csv="$(builder_partition_csv)"
+            ;;
+        *) fail "Flash layout planning failed" ;;
+    esac
+
+    if ! flash_layout verify --csv "$partition_csv"; then
+        fail "Builder partition table differs from the flash layout (FLASH_LAYOUT=fixed keeps the builder's table)"
+    fi
+    ok "Flash layout settled"
+}
+
+# Predict the image size from fonts/frozen modules before spending a build on it.
+# The budget comes from the flash layout (app partition of the previous build).
+estimate_firmware_size() {
+    if [ "$ESTIMATE_FIRMWARE_SIZE" != "1" ]; then
+        info "Firmware size estimate disabled (ESTIMATE_FIRMWARE_SIZE=0)"
         return
     fi
+    print_step "STEP 5h: Estimate firmware size"
+
+    local budget
+    budget="$(flash_layout get firmware_budget_bytes)"
+
+    local -a frozen=()
+    local module
+    if [ "$FREEZE_BOARD_MODULE" = "1" ]; then
+        frozen+=("$LVGL_DIR/build/${BOARD_MODULE_NAME}.py")
+        for module in ${FROZEN_RUNTIME_MODULES:-}; do
+            frozen+=("$LVGL_DIR/build/${module}.py")
+        done
+    fi
+
+    run_firmware_size_estimate "$WORKING_DIR/firmware_esp32.size.json" "$budget" "${frozen[@]}"
+    ok "Firmware size estimate within budget"
+}
+
+# Validate that firmware binary fits the app partition of the flash layout.
+check_firmware_size() {
+    print_step "STEP 7: Check firmware size"
 
-    # Parse max app/fs partition sizes from the active partition table.
-    part_values="$("$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/esp32/parse_partition_sizes.py" "$partition_csv")" || fail "Failed parsing partition CSV: $partition_csv"
+    local build_dir app_bin app_max fs_size fw_size
+    build_dir="$(esp32_build_dir)"
+    app_bin="$build_dir/micropython.bin"
+
+    if [ ! -f "$app_bin" ]; then
+        warn "App binary not found: $app_bin"
+        return
+    fi
 
-    read -r app_max fs_size <<<"$part_values"
+    # Breakdown first, so an oversized build still shows what grew.
+    write_firmware_size_report esp32 "$build_dir/micropython.elf" "$build_dir/micropython.map" "$WORKING_DIR/firmware_esp32.size.json"
 
+    read -r app_max fs_size <<<"$(flash_layout get firmware_max_bytes fs_bytes)"
     if [ -z "${app_max:-}" ] || [ "$app_max" -le 0 ]; then
-        warn "Could not determine app partition size from: $partition_csv"
+        warn "No flash layout (skipping size check): $FLASH_LAYOUT_FILE"
         return
     fi
 
@@ -36,6 +36,12 @@ init_esp32_defaults() {
     BOARD_PROFILE="${BOARD_PROFILE:-waveshare_esp32s3_lcd128}"
     FREEZE_BOARD_MODULE="${FREEZE_BOARD_MODULE:-1}"
     BOARD_MODULE_NAME="${BOARD_MODULE_NAME:-$BOARD_PROFILE}"
+    # - FROZEN_RUNTIME_MODULES: shared runtime modules frozen with the board module
+    FROZEN_RUNTIME_MODULES="${FROZEN_RUNTIME_MODULES-lvgl_runloop lvgl_profiler lcd_spi_calibration lvgl_app}"
+    # - NATIVE_EMITTER: emitter for @_hot_path functions (native|viper|bytecode)
+    # - NATIVE_EMITTER_ARCH: mpy-cross architecture required to use it
+    NATIVE_EMITTER="${NATIVE_EMITTER:-native}"
+    NATIVE_EMITTER_ARCH="${NATIVE_EMITTER_ARCH:-xtensawin}"
 
     # Optional overrides (especially useful with BOARD_PROFILE=custom)
     PIN_LCD_BL="${PIN_LCD_BL:-}"
@@ -55,6 +61,8 @@ init_esp32_defaults() {
     SPI_FREQ="${SPI_FREQ:-}"
     I2C_HOST="${I2C_HOST:-}"
     I2C_FREQ="${I2C_FREQ:-}"
+    # Touch read strategy baked into the board module: 1 = TP_INT IRQ, 0 = polling.
+    TOUCH_USE_IRQ="${TOUCH_USE_IRQ:-1}"
 
     # LVGL font config:
     #   LVGL_MONTSERRAT_FONTS="12 14 16 28"
@@ -68,15 +76,71 @@ init_esp32_defaults() {
     LVGL_FONT_SIMSUN_16_CJK="${LVGL_FONT_SIMSUN_16_CJK:-0}"
     LVGL_FONT_UNSCII_8="${LVGL_FONT_UNSCII_8:-0}"
     LVGL_FONT_UNSCII_16="${LVGL_FONT_UNSCII_16:-0}"
+    # Montserrat glyph subsetting (all empty = full fonts):
+    #   LVGL_FONT_SUBSET_CHARSET="Temp°C 0123456789"
+    #   LVGL_FONT_SUBSET_RANGES="0x20-0x7E,0xB0"
+    #   LVGL_FONT_SUBSET_FILES="app/ strings.txt" (scanned for characters)
+    #   LVGL_FONT_SUBSET_SYMBOLS=1 keeps the LV_SYMBOL_* glyphs
+    LVGL_FONT_SUBSET_CHARSET="${LVGL_FONT_SUBSET_CHARSET:-}"
+    LVGL_FONT_SUBSET_RANGES="${LVGL_FONT_SUBSET_RANGES:-}"
+    LVGL_FONT_SUBSET_FILES="${LVGL_FONT_SUBSET_FILES:-}"
+    LVGL_FONT_SUBSET_SYMBOLS="${LVGL_FONT_SUBSET_SYMBOLS:-1}"
+    # lv_conf.h performance profile (common/configure_lv_conf.py): empty (default),
+    # low-latency, low-memory or max-fps; LV_CONF_SET="LV_DEF_REFR_PERIOD=16;..."
+    # overrides single macros on top of it.
+    LV_CONF_PROFILE="${LV_CONF_PROFILE:-}"
+    LV_CONF_SET="${LV_CONF_SET:-}"
+    # Predict the firmware size before building and stop early when it won't fit.
+    ESTIMATE_FIRMWARE_SIZE="${ESTIMATE_FIRMWARE_SIZE:-1}"
+    # Flash split (common/flash_layout.py): fixed keeps the builder's partition
+    # table; auto sizes the app partition to the measured firmware plus
+    # FLASH_LAYOUT_MARGIN_KB (64 KB aligned) and gives the rest of FLASH_SIZE_KB
+    # to the filesystem partition.
+    FLASH_LAYOUT="${FLASH_LAYOUT:-fixed}" # fixed|auto
+    FLASH_SIZE_KB="${FLASH_SIZE_KB:-16384}"
+    FLASH_FS_MIN_KB="${FLASH_FS_MIN_KB:-1024}"
+    FLASH_LAYOUT_MARGIN_KB="${FLASH_LAYOUT_MARGIN_KB:-128}"
 
     LVGL_FONTS_STEP_LABEL="${LVGL_FONTS_STEP_LABEL:-STEP 5f: Configure LVGL fonts}"
+    LV_CONF_STEP_LABEL="${LV_CONF_STEP_LABEL:-STEP 5f1: Configure lv_conf.h profile}"
+    LVGL_FONT_SUBSET_STEP_LABEL="${LVGL_FONT_SUBSET_STEP_LABEL:-STEP 5f2: Subset LVGL fonts}"
     PATCH_BUILDER_STEP_LABEL="${PATCH_BUILDER_STEP_LABEL:-STEP 3: Patch builder for paths with spaces}"
 
     # Generic workflow toggles shared with other platforms.
     INSTALL_DEPS="${INSTALL_DEPS:-1}"
     UPDATE_SUBMODULES="${UPDATE_SUBMODULES:-1}"
     RECLONE="${RECLONE:-ask}" # ask|1|0
+    # Git transfer: clone/submodule depth (full|shallow|blobless), parallel
+    # submodule fetches, optional bare-mirror cache and mirror-only offline mode.
+    GIT_FETCH_MODE="${GIT_FETCH_MODE:-full}"
+    GIT_SUBMODULE_JOBS="${GIT_SUBMODULE_JOBS:-4}"
+    GIT_MIRROR_DIR="${GIT_MIRROR_DIR:-}"
+    GIT_MIRROR_MAX_AGE="${GIT_MIRROR_MAX_AGE:-600}"
+    OFFLINE="${OFFLINE:-0}"
+    if [ "$OFFLINE" = "1" ]; then
+        INSTALL_DEPS=0
+    fi
     CLEAN_BUILD="${CLEAN_BUILD:-0}"
+    # In build mode, skip setup steps whose stamped inputs/outputs are unchanged;
+    # FORCE_STEPS="init_submodules prepare_build_context" (or "all") re-runs them.
+    STEP_STAMPS="${STEP_STAMPS:-1}"
+    FORCE_STEPS="${FORCE_STEPS:-}"
+    # Record per-step timings (build_timing_<port>.json + Chrome trace) in WORKING_DIR.
+    STEP_TIMING="${STEP_TIMING:-1}"
+    # Print a unified diff of every source patch applied (common/patch_engine.py).
+    PATCH_DIFF="${PATCH_DIFF:-0}"
+    # ccache shared by both ports; kept outside LVGL_DIR so clean builds reuse it.
+    COMPILER_CACHE="${COMPILER_CACHE:-1}"
+    COMPILER_CACHE_DIR="${COMPILER_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/micropython_lvgl/ccache}"
+    COMPILER_CACHE_MAXSIZE="${COMPILER_CACHE_MAXSIZE:-5G}"
+    # Finished firmware per configuration hash; a hit skips the build (LRU by size).
+    ARTIFACT_CACHE="${ARTIFACT_CACHE:-1}"
+    ARTIFACT_CACHE_DIR="${ARTIFACT_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/micropython_lvgl/artifacts}"
+    ARTIFACT_CACHE_MAX_MB="${ARTIFACT_CACHE_MAX_MB:-512}"
+    # Skip pip/install.sh and replay the cached export.sh environment when the
+    # ESP-IDF commit, chip and Python version match a previous setup.
+    IDF_SETUP_CACHE="${IDF_SETUP_CACHE:-1}"
+    IDF_SETUP_CACHE_DIR="${IDF_SETUP_CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/micropython_lvgl/idf}"
     CLEAN_REPO="${CLEAN_REPO:-0}"
     PYTHON_BIN="${PYTHON_BIN:-python3}"
     LV_CFLAGS_EXTRA="${LV_CFLAGS_EXTRA:-}"
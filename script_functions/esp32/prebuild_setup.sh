@@ -4,14 +4,7 @@
 # See: ./LICENSE.md
 # Patch upstream builder files so paths containing spaces keep working.
 patch_builder_space_paths() {
-    local init_file="$LVGL_DIR/builder/__init__.py"
-    local esp32_file="$LVGL_DIR/builder/esp32.py"
-    local mp_makefile="$LVGL_DIR/lib/micropython/ports/esp32/Makefile"
-    patch_builder_space_paths_common \
-        "$HEREDOC_TEMPLATES_DIR/esp32/patch_builder_space_paths.py" \
-        "$init_file" \
-        "$esp32_file" \
-        "$mp_makefile"
+    patch_builder_space_paths_common esp32
 }
 
 # Ensure user-local python tools are discoverable (pip --user installs).
@@ -85,13 +78,64 @@ init_submodules() {
     init_submodules_common ext_mod/ lib/lvgl lib/micropython lib/esp-idf
 }
 
+# Stamp description of init_submodules (see common/step_stamps.sh).
+init_submodules_stamp_inputs() {
+    submodules_stamp_inputs ext_mod lib/lvgl lib/micropython lib/esp-idf
+}
+
+init_submodules_stamp_outputs() {
+    submodules_stamp_outputs ext_mod lib/lvgl lib/micropython lib/esp-idf
+}
+
+# ESP-IDF setup stamps (IDF_SETUP_CACHE=1): pip and install.sh are skipped when
+# their stamp matches, and the environment exported by export.sh is replayed
+# from a cached script. Stamps live in IDF_SETUP_CACHE_DIR so RECLONE=1 keeps
+# them; the key covers everything that changes what those steps produce.
+
+# Print the Python version the toolchain steps run with.
+_idf_python_version() {
+    "$PYTHON_BIN" -c 'import platform; print(platform.python_version())'
+}
+
+# Print the cache key for the ESP-IDF tools/environment of this checkout.
+_idf_setup_key() {
+    local idf_dir="$1"
+    local idf_commit
+
+    idf_commit="$(git -C "$idf_dir" rev-parse HEAD 2>/dev/null)" || return 1
+    printf '%s\n' \
+        "idf $idf_commit" \
+        "chip $ESP_CHIP" \
+        "python $(_idf_python_version)" \
+        "idf_path $idf_dir" \
+        "tools_path ${IDF_TOOLS_PATH:-$HOME/.espressif}" \
+        | sha256sum | cut -c1-32
+}
+
 # Install MicroPython/port Python requirements when available.
 install_python_requirements() {
     print_step "STEP 4a: Install Python requirements"
 
+    if [ "$OFFLINE" = "1" ]; then
+        info "OFFLINE=1 -> skipping pip install (requirements must already be installed)"
+        return
+    fi
+
     local req_file="$LVGL_DIR/lib/micropython/ports/esp32/requirements.txt"
     if [ -f "$req_file" ]; then
+        local stamp=""
+        if [ "$IDF_SETUP_CACHE" = "1" ]; then
+            stamp="$IDF_SETUP_CACHE_DIR/pip-$({ cat "$req_file"; _idf_python_version; } | sha256sum | cut -c1-32)"
+            if [ -f "$stamp" ]; then
+                ok "Python requirements unchanged since last install (stamp)"
+                return
+            fi
+        fi
+
         "$PYTHON_BIN" -m pip install --user -r "$req_file" || fail "Python requirements installation failed"
+        if [ -n "$stamp" ]; then
+            mkdir -p "$IDF_SETUP_CACHE_DIR" && touch "$stamp"
+        fi
         ok "Python requirements installed from $req_file"
     else
         warn "No port requirements file found at $req_file"
@@ -99,6 +143,51 @@ install_python_requirements() {
     fi
 }
 
+# Source export.sh and save every variable it set or changed as a script.
+_idf_export_and_cache() {
+    local idf_export="$1"
+    local env_cache="$2"
+    local name
+    declare -A env_before=()
+
+    for name in $(compgen -e); do
+        env_before[$name]="${!name}"
+    done
+
+    # shellcheck disable=SC1090
+    source "$idf_export" >/dev/null || return 1
+    [ -n "$env_cache" ] || return 0
+
+    mkdir -p "$(dirname "$env_cache")"
+    {
+        echo "# ESP-IDF environment captured from $idf_export"
+        for name in $(compgen -e); do
+            case "$name" in
+                PWD|OLDPWD|SHLVL|_) continue ;;
+            esac
+            if [ -z "${env_before[$name]+set}" ] || [ "${env_before[$name]}" != "${!name}" ]; then
+                printf 'export %s=%q\n' "$name" "${!name}"
+            fi
+        done
+    } > "$env_cache.tmp" && mv "$env_cache.tmp" "$env_cache"
+}
+
+# Load a cached ESP-IDF environment; fail (status 1) when its tools are gone.
+# The cache is validated in a subshell so a stale one leaves no variables behind.
+_idf_load_cached_env() {
+    local env_cache="$1"
+
+    [ -f "$env_cache" ] || return 1
+    # shellcheck disable=SC1090
+    (
+        source "$env_cache" || exit 1
+        [ -x "${IDF_PYTHON_ENV_PATH:-}/bin/python" ] || exit 1
+        command -v idf.py &>/dev/null
+    ) || return 1
+    # shellcheck disable=SC1090
+    source "$env_cache"
+}
+
 # Install and export ESP-IDF environment for the selected chip.
 setup_esp_idf() {
     print_step "STEP 4b: Setup ESP-IDF"
@@ -110,27 +199,71 @@ setup_esp_idf() {
     [ -f "$idf_install" ] || fail "Missing ESP-IDF install script: $idf_install"
     [ -f "$idf_export" ] || fail "Missing ESP-IDF export script: $idf_export"
 
-    info "Installing ESP-IDF tools for target: $ESP_CHIP"
-    bash "$idf_install" "$ESP_CHIP" || fail "ESP-IDF tools installation failed"
+    local key="" stamp_dir="" env_cache=""
+    if [ "$IDF_SETUP_CACHE" = "1" ] && key="$(_idf_setup_key "$idf_dir")"; then
+        stamp_dir="$IDF_SETUP_CACHE_DIR/$key"
+        env_cache="$stamp_dir/env.sh"
+        if _idf_load_cached_env "$env_cache"; then
+            ok "ESP-IDF environment loaded from stamp $key"
+            return
+        fi
+        rm -rf "$stamp_dir"
+    fi
+
+    if [ "$OFFLINE" = "1" ]; then
+        info "OFFLINE=1 -> skipping ESP-IDF tools installation (using installed tools)"
+    else
+        info "Installing ESP-IDF tools for target: $ESP_CHIP"
+        bash "$idf_install" "$ESP_CHIP" || fail "ESP-IDF tools installation failed"
+    fi
 
     info "Loading ESP-IDF environment"
-    # shellcheck disable=SC1090
-    source "$idf_export" >/dev/null || fail "Unable to source ESP-IDF environment"
+    _idf_export_and_cache "$idf_export" "$env_cache" || fail "Unable to source ESP-IDF environment"
+    if [ -n "$env_cache" ]; then
+        info "ESP-IDF environment cached as stamp $key"
+    fi
     ok "ESP-IDF environment is active"
 }
 
 # Prepare toolchain/environment prerequisites for the port.
 prepare_port_toolchain() {
-    install_python_requirements
-    setup_esp_idf
+    timed_step install_python_requirements
+    timed_step setup_esp_idf
 }
 
-# Apply shared build-context changes (fonts + optional frozen board helper).
+# Apply shared build-context changes (fonts, lv_conf.h profile, optional frozen board helper).
 prepare_build_context() {
-    configure_lvgl_fonts
+    timed_step configure_lvgl_fonts
+    timed_step configure_lv_conf
+    timed_step subset_lvgl_fonts
     if [ "$FREEZE_BOARD_MODULE" = "1" ]; then
-        create_frozen_board_module
+        timed_step create_frozen_board_module
     else
         info "Frozen board module disabled (FREEZE_BOARD_MODULE=0)"
     fi
 }
+
+# Stamp description of prepare_build_context (see common/step_stamps.sh).
+prepare_build_context_stamp_inputs() {
+    build_context_stamp_inputs
+}
+
+prepare_build_context_stamp_outputs() {
+    local -a outputs=("$LVGL_DIR/lib/lv_conf.h" "$LVGL_DIR/lib/lvgl/src/font")
+    if [ "$FREEZE_BOARD_MODULE" = "1" ]; then
+        outputs+=("$LVGL_DIR/build/${BOARD_MODULE_NAME}.py" "$LVGL_DIR/build/manifest_${BOARD_MODULE_NAME}.py")
+        local module
+        for module in ${FROZEN_RUNTIME_MODULES:-}; do
+            outputs+=("$LVGL_DIR/build/${module}.py")
+        done
+    fi
+    stamp_stat "${outputs[@]}"
+}
+
+# The build reads FROZEN_BOARD_MANIFEST and the board settings exported by
+# create_frozen_board_module.
+prepare_build_context_stamp_skipped() {
+    if [ "$FREEZE_BOARD_MODULE" = "1" ]; then
+        export_frozen_board_module_env
+    fi
+}
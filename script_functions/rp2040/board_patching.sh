@@ -2,6 +2,14 @@
 # Created: 2026-02-20
 # License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
 # See: ./LICENSE.md
+# Write mpconfigboard.h with the filesystem size of the flash layout.
+write_board_header() {
+    local header
+    header="$(flash_layout header < "$HEREDOC_TEMPLATES_DIR/rp2040/board/mpconfigboard.h")" \
+        || fail "Failed rendering mpconfigboard.h from $FLASH_LAYOUT_FILE"
+    printf '%s\n' "$header" | write_file "$1/mpconfigboard.h"
+}
+
 # Create/update a custom RP2040 board folder used by MicroPython build.
 create_custom_board() {
     print_step "STEP 5a: Create board definition $BOARD"
@@ -13,28 +21,38 @@ create_custom_board() {
     mkdir -p "$board_dir/modules"
 
     write_file "$board_dir/mpconfigboard.cmake" < "$HEREDOC_TEMPLATES_DIR/rp2040/board/mpconfigboard.cmake"
-    write_file "$board_dir/mpconfigboard.h" < "$HEREDOC_TEMPLATES_DIR/rp2040/board/mpconfigboard.h"
+    write_board_header "$board_dir"
     write_file "$board_dir/pins.csv" < "$HEREDOC_TEMPLATES_DIR/rp2040/board/pins.csv"
     write_file "$board_dir/board.json" < "$HEREDOC_TEMPLATES_DIR/rp2040/board/board.json"
     # When enabled, freeze the helper module into firmware via board manifest.
     if [ "$FREEZE_BOARD_MODULE" = "1" ]; then
         write_file "$board_dir/manifest.py" < "$HEREDOC_TEMPLATES_DIR/rp2040/board/manifest.py"
-        write_file "$board_dir/modules/${BOARD_MODULE_NAME}.py" < "$HEREDOC_TEMPLATES_DIR/rp2040/board/board_module.py"
+        # Bake pin aliases from pins.csv so the frozen module does no pin lookup at boot.
+        resolve_hot_path_emitter "$LVGL_DIR/lib/micropython/ports/rp2" "$NATIVE_EMITTER_ARCH"
+        "$PYTHON_BIN" "$HEREDOC_TEMPLATES_DIR/rp2040/generate_board_module.py" \
+            "$HEREDOC_TEMPLATES_DIR/rp2040/board/board_module.py" \
+            "$HEREDOC_TEMPLATES_DIR/rp2040/board/pins.csv" \
+            "$board_dir/modules/${BOARD_MODULE_NAME}.py" \
+            "$HOT_PATH_EMITTER" || fail "Failed generating RP2040 board module"
+        stage_frozen_runtime_modules "$board_dir/modules"
     else
         write_file "$board_dir/manifest.py" <<'EOF'
 include("$(PORT_DIR)/boards/manifest.py")
 EOF
         rm -f "$board_dir/modules/${BOARD_MODULE_NAME}.py"
+        remove_frozen_runtime_modules "$board_dir/modules"
         info "Frozen board module disabled (FREEZE_BOARD_MODULE=0)"
     fi
 
     ok "Custom board ready in $board_dir"
 }
 
-# Materialize the SPI API patch helper into the cloned repo.
+# Materialize the SPI API patch helper (and the patch engine it imports) into the cloned repo.
+# The CMake configure hook runs it from gen/ after submodule resets.
 create_patch_spi_api_script() {
     print_step "STEP 5b: Create gen/patch_spi_api.py"
 
+    write_file "$LVGL_DIR/gen/patch_engine.py" < "$HEREDOC_TEMPLATES_DIR/common/patch_engine.py"
     write_file "$LVGL_DIR/gen/patch_spi_api.py" < "$HEREDOC_TEMPLATES_DIR/rp2040/patch_spi_api.py"
 
     chmod +x "$LVGL_DIR/gen/patch_spi_api.py"
@@ -55,13 +73,17 @@ create_tree_patch_script() {
 apply_tree_patches() {
     print_step "STEP 5d: Apply tree patches"
 
-    local -a args=("--root" "$LVGL_DIR")
+    local -a args=()
     if [ "$DEBUG_PATCHES" = "1" ]; then
-        args+=("--enable-debug")
+        args+=(--enable debug)
         warn "DEBUG_PATCHES=1 -> debug prints will be injected"
     fi
+    if [ "$LCD_SPI_DMA" = "1" ]; then
+        args+=(--enable spi_dma)
+        info "LCD_SPI_DMA=1 -> lcd_bus color transfers use DMA"
+    fi
 
-    "$PYTHON_BIN" "$LVGL_DIR/gen/patch_rp2040_tree.py" "${args[@]}" || fail "Failed applying tree patches"
+    run_patch_manifest "$LVGL_DIR/gen/patch_rp2040_tree.py" ${args[@]+"${args[@]}"} || fail "Failed applying tree patches"
     ok "Tree patching completed"
 }
 
@@ -75,32 +97,45 @@ patch_machine_spi() {
     [ -f "$src" ] || fail "Missing source patch file: $src"
     [ -f "$dst" ] || fail "Missing destination file: $dst"
 
-    "$PYTHON_BIN" "$LVGL_DIR/gen/patch_spi_api.py" "$src" || fail "Failed patching source machine_spi.c"
+    # Residual old-API patterns are reported by the patch engine; the CMake
+    # hook patches the destination again after submodule resets.
+    run_patch_manifest "$LVGL_DIR/gen/patch_spi_api.py" "$src" || fail "Failed patching source machine_spi.c"
 
     if ! cmp -s "$src" "$dst"; then
         cp "$src" "$dst"
         info "Copied patched machine_spi.c into lib/micropython"
     fi
+    ok "machine_spi.c patched"
+}
 
-    "$PYTHON_BIN" "$LVGL_DIR/gen/patch_spi_api.py" "$dst" || fail "Failed patching destination machine_spi.c"
-
-    local residuals
-    residuals="$(grep -nE 'machine_hw_spi_obj_t|\.mosi|\.miso|\.active_devices|self->baudrate' "$dst" 2>/dev/null || true)"
+# Prepare board assets, apply source patches, then configure LVGL fonts and lv_conf.h.
+prepare_build_context() {
+    timed_step create_custom_board
+    timed_step create_patch_spi_api_script
+    timed_step create_tree_patch_script
+    timed_step apply_tree_patches
+    timed_step patch_machine_spi
+    timed_step configure_lvgl_fonts
+    timed_step configure_lv_conf
+    timed_step subset_lvgl_fonts
+}
 
-    if [ -n "$residuals" ]; then
-        warn "Residual patterns found in machine_spi.c (will be re-patched by cmake):"
-        echo "$residuals"
-    else
-        ok "No residual patterns in machine_spi.c"
-    fi
+# Stamp description of prepare_build_context (see common/step_stamps.sh).
+prepare_build_context_stamp_inputs() {
+    build_context_stamp_inputs
 }
 
-# Prepare board assets, apply source patches, then configure LVGL fonts.
-prepare_build_context() {
-    create_custom_board
-    create_patch_spi_api_script
-    create_tree_patch_script
-    apply_tree_patches
-    patch_machine_spi
-    configure_lvgl_fonts
+prepare_build_context_stamp_outputs() {
+    stamp_stat \
+        "$LVGL_DIR/lib/lv_conf.h" \
+        "$LVGL_DIR/lib/lvgl/src/font" \
+        "$LVGL_DIR/lib/micropython/ports/rp2/boards/$BOARD" \
+        "$LVGL_DIR/gen/patch_engine.py" \
+        "$LVGL_DIR/gen/patch_spi_api.py" \
+        "$LVGL_DIR/gen/patch_rp2040_tree.py" \
+        "$LVGL_DIR/gen/lvgl_api_gen_mpy.py" \
+        "$LVGL_DIR/ext_mod/lvgl/micropython.cmake" \
+        "$LVGL_DIR/ext_mod/lcd_bus" \
+        "$LVGL_DIR/micropy_updates/rp2/machine_spi.c" \
+        "$LVGL_DIR/lib/micropython/ports/rp2/machine_spi.c"
 }
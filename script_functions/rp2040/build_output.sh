@@ -47,26 +47,82 @@ build_firmware() {
         build_args+=("FROZEN_MANIFEST=$manifest")
     fi
 
+    setup_compiler_cache rp2
+
     # Unset host DISPLAY vars to avoid leaking desktop-specific env into build logic.
     env -u DISPLAY -u DISPLAY_DRIVER "$PYTHON_BIN" make.py "${build_args[@]}" || fail "Build failed"
+    report_compiler_cache_stats
 
     ok "Build completed"
 }
 
-# Validate that firmware payload fits reserved flash area.
-check_firmware_size() {
-    print_step "STEP 7: Check firmware size"
+# Plan the firmware/filesystem split (FLASH_LAYOUT) and render the storage size
+# into the board header. Auto mode reuses the last measured image size.
+plan_flash_layout() {
+    print_step "STEP 5j: Plan flash layout"
 
-    local flash_total=$((2048 * 1024))
-    local flash_fs=$((1024 * 1024))
-    local flash_fw_max=$((flash_total - flash_fs))
-    local elf_file="$LVGL_DIR/lib/micropython/ports/rp2/build-$BOARD/firmware.elf"
+    flash_layout plan --port rp2 --mode "$FLASH_LAYOUT" \
+        --flash-kb "$FLASH_SIZE_KB" --fs-kb "$FLASH_FS_KB" --min-fs-kb "$FLASH_FS_MIN_KB" \
+        --margin-kb "$FLASH_LAYOUT_MARGIN_KB" || fail "Flash layout planning failed"
+    write_board_header "$LVGL_DIR/lib/micropython/ports/rp2/boards/$BOARD"
+}
 
-    if [ ! -f "$elf_file" ]; then
-        warn "ELF not found: $elf_file"
+# FLASH_LAYOUT=auto: re-plan from the image just built and rebuild once when the
+# filesystem size changed, so the firmware area is the image plus the margin.
+settle_flash_layout() {
+    [ "$FLASH_LAYOUT" = "auto" ] || return 0
+    print_step "STEP 6b: Settle flash layout"
+
+    local fw_size
+    fw_size="$(measure_firmware_size "$LVGL_DIR/lib/micropython/ports/rp2/build-$BOARD/firmware.elf")"
+    if [ "$fw_size" -le 0 ]; then
+        warn "Could not determine firmware size (flash layout unchanged)"
+        return 0
+    fi
+
+    local status=0
+    flash_layout plan --port rp2 --mode auto \
+        --flash-kb "$FLASH_SIZE_KB" --fs-kb "$FLASH_FS_KB" --min-fs-kb "$FLASH_FS_MIN_KB" \
+        --margin-kb "$FLASH_LAYOUT_MARGIN_KB" --measured "$fw_size" --exit-changed || status=$?
+    case "$status" in
+        0) ok "Flash layout settled" ;;
+        3)
+            write_board_header "$LVGL_DIR/lib/micropython/ports/rp2/boards/$BOARD"
+            info "Filesystem size changed -> rebuilding with the new layout"
+            timed_step build_firmware
+            ;;
+        *) fail "Flash layout planning failed" ;;
+    esac
+}
+
+# Flash bytes the pre-build estimate may use (from the flash layout).
+firmware_flash_budget() {
+    flash_layout get firmware_budget_bytes
+}
+
+# Predict the image size from fonts/frozen modules before spending a build on it.
+estimate_firmware_size() {
+    if [ "$ESTIMATE_FIRMWARE_SIZE" != "1" ]; then
+        info "Firmware size estimate disabled (ESTIMATE_FIRMWARE_SIZE=0)"
         return
     fi
+    print_step "STEP 5h: Estimate firmware size"
+
+    local -a frozen=()
+    local module
+    if [ "$FREEZE_BOARD_MODULE" = "1" ]; then
+        for module in "$LVGL_DIR/lib/micropython/ports/rp2/boards/$BOARD/modules/"*.py; do
+            [ -f "$module" ] && frozen+=("$module")
+        done
+    fi
 
+    run_firmware_size_estimate "$WORKING_DIR/firmware_rp2040.size.json" "$(firmware_flash_budget)" "${frozen[@]}"
+    ok "Firmware size estimate within budget"
+}
+
+# Print the flash bytes of the firmware image (0 when unknown).
+measure_firmware_size() {
+    local elf_file="$1"
     local fw_size
     fw_size="$(arm-none-eabi-size -A "$elf_file" 2>/dev/null | awk '/^\.boot2|^\.text|^\.rodata|^\.binary_info|^\.data/ {sum += $2} END {print sum+0}')"
 
@@ -81,11 +137,35 @@ check_firmware_size() {
             fi
         fi
     fi
+    echo "${fw_size:-0}"
+}
 
-    if [ -z "$fw_size" ] || [ "$fw_size" -le 0 ]; then
+# Validate that firmware payload fits the firmware area of the flash layout.
+check_firmware_size() {
+    print_step "STEP 7: Check firmware size"
+
+    local flash_fw_max flash_fs
+    read -r flash_fw_max flash_fs <<<"$(flash_layout get firmware_max_bytes fs_bytes)"
+    local elf_file="$LVGL_DIR/lib/micropython/ports/rp2/build-$BOARD/firmware.elf"
+
+    if [ ! -f "$elf_file" ]; then
+        warn "ELF not found: $elf_file"
+        return
+    fi
+
+    # Breakdown first, so an oversized build still shows what grew.
+    write_firmware_size_report rp2 "$elf_file" "${elf_file}.map" "$WORKING_DIR/firmware_rp2040.size.json"
+
+    local fw_size
+    fw_size="$(measure_firmware_size "$elf_file")"
+    if [ "$fw_size" -le 0 ]; then
         warn "Could not determine firmware size"
         return
     fi
+    if [ "${flash_fw_max:-0}" -le 0 ]; then
+        warn "No flash layout (skipping size check): $FLASH_LAYOUT_FILE"
+        return
+    fi
 
     local fw_kb=$((fw_size / 1024))
     local max_kb=$((flash_fw_max / 1024))
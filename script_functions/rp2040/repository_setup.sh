@@ -4,12 +4,7 @@
 # See: ./LICENSE.md
 # Patch upstream builder files so paths containing spaces keep working.
 patch_builder_space_paths() {
-    local init_file="$LVGL_DIR/builder/__init__.py"
-    local rp2_makefile="$LVGL_DIR/lib/micropython/ports/rp2/Makefile"
-    patch_builder_space_paths_common \
-        "$HEREDOC_TEMPLATES_DIR/rp2040/patch_builder_space_paths.py" \
-        "$init_file" \
-        "$rp2_makefile"
+    patch_builder_space_paths_common rp2
 }
 
 # Verify/install toolchain dependencies required by RP2040 builds.
@@ -22,6 +17,7 @@ install_dependencies() {
     dep_map["make"]="make"
     dep_map["cmake"]="cmake"
     dep_map["ninja"]="ninja-build"
+    dep_map["ccache"]="ccache"
     dep_map["arm-none-eabi-gcc"]="arm-none-eabi-gcc arm-none-eabi-newlib arm-none-eabi-binutils"
 
     local -a missing_pkgs=()
@@ -75,6 +71,15 @@ init_submodules() {
     init_submodules_common ext_mod/ lib/lvgl lib/micropython
 }
 
+# Stamp description of init_submodules (see common/step_stamps.sh).
+init_submodules_stamp_inputs() {
+    submodules_stamp_inputs ext_mod lib/lvgl lib/micropython
+}
+
+init_submodules_stamp_outputs() {
+    submodules_stamp_outputs ext_mod lib/lvgl lib/micropython
+}
+
 # RP2040 currently needs no extra per-port setup beyond dependencies.
 prepare_port_toolchain() {
     print_step "STEP 4: Prepare RP2040 toolchain"
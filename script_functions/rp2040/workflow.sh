@@ -12,15 +12,35 @@ print_config() {
     echo "BOARD=$BOARD"
     echo "CUSTOM_BOARD=$CUSTOM_BOARD"
     echo "BOARD_MODULE_NAME=$BOARD_MODULE_NAME"
+    echo "FROZEN_RUNTIME_MODULES=$FROZEN_RUNTIME_MODULES"
+    echo "NATIVE_EMITTER=$NATIVE_EMITTER"
+    echo "NATIVE_EMITTER_ARCH=$NATIVE_EMITTER_ARCH"
     echo "FREEZE_BOARD_MODULE=$FREEZE_BOARD_MODULE"
     echo "DISPLAY_DRIVER=$DISPLAY_DRIVER"
     echo "INDEV=$INDEV"
     echo "INSTALL_DEPS=$INSTALL_DEPS"
     echo "UPDATE_SUBMODULES=$UPDATE_SUBMODULES"
     echo "RECLONE=$RECLONE"
+    echo "GIT_REFERENCE_DIR=${GIT_REFERENCE_DIR:-}"
+    echo "GIT_FETCH_MODE=$GIT_FETCH_MODE"
+    echo "GIT_SUBMODULE_JOBS=$GIT_SUBMODULE_JOBS"
+    echo "GIT_MIRROR_DIR=$GIT_MIRROR_DIR"
+    echo "GIT_MIRROR_MAX_AGE=$GIT_MIRROR_MAX_AGE"
+    echo "OFFLINE=$OFFLINE"
     echo "CLEAN_BUILD=$CLEAN_BUILD"
+    echo "PATCH_DIFF=$PATCH_DIFF"
+    echo "STEP_TIMING=$STEP_TIMING"
+    echo "STEP_STAMPS=$STEP_STAMPS"
+    echo "FORCE_STEPS=$FORCE_STEPS"
+    echo "ARTIFACT_CACHE=$ARTIFACT_CACHE"
+    echo "ARTIFACT_CACHE_DIR=$ARTIFACT_CACHE_DIR"
+    echo "ARTIFACT_CACHE_MAX_MB=$ARTIFACT_CACHE_MAX_MB"
+    echo "COMPILER_CACHE=$COMPILER_CACHE"
+    echo "COMPILER_CACHE_DIR=$COMPILER_CACHE_DIR"
+    echo "COMPILER_CACHE_MAXSIZE=$COMPILER_CACHE_MAXSIZE"
     echo "CLEAN_REPO=$CLEAN_REPO"
     echo "DEBUG_PATCHES=$DEBUG_PATCHES"
+    echo "LCD_SPI_DMA=$LCD_SPI_DMA"
     echo "PYTHON_BIN=$PYTHON_BIN"
     echo "LV_CFLAGS_EXTRA=$LV_CFLAGS_EXTRA"
     echo "LVGL_MONTSERRAT_FONTS=$LVGL_MONTSERRAT_FONTS"
@@ -31,49 +51,74 @@ print_config() {
     echo "LVGL_FONT_SIMSUN_16_CJK=$LVGL_FONT_SIMSUN_16_CJK"
     echo "LVGL_FONT_UNSCII_8=$LVGL_FONT_UNSCII_8"
     echo "LVGL_FONT_UNSCII_16=$LVGL_FONT_UNSCII_16"
+    echo "LVGL_FONT_SUBSET_CHARSET=$LVGL_FONT_SUBSET_CHARSET"
+    echo "LVGL_FONT_SUBSET_RANGES=$LVGL_FONT_SUBSET_RANGES"
+    echo "LVGL_FONT_SUBSET_FILES=$LVGL_FONT_SUBSET_FILES"
+    echo "LVGL_FONT_SUBSET_SYMBOLS=$LVGL_FONT_SUBSET_SYMBOLS"
+    echo "LV_CONF_PROFILE=$LV_CONF_PROFILE"
+    echo "LV_CONF_SET=$LV_CONF_SET"
+    echo "ESTIMATE_FIRMWARE_SIZE=$ESTIMATE_FIRMWARE_SIZE"
+    echo "FLASH_LAYOUT=$FLASH_LAYOUT"
+    echo "FLASH_SIZE_KB=$FLASH_SIZE_KB"
+    echo "FLASH_FS_KB=$FLASH_FS_KB"
+    echo "FLASH_FS_MIN_KB=$FLASH_FS_MIN_KB"
+    echo "FLASH_LAYOUT_MARGIN_KB=$FLASH_LAYOUT_MARGIN_KB"
 }
 
 # Bootstrap sequence: dependencies + repository + patching + context preparation.
 bootstrap_flow() {
-    install_dependencies
-    ensure_repo
-    init_submodules
-    patch_builder_space_paths
-    prepare_port_toolchain
-    prepare_build_context
+    timed_step install_dependencies
+    timed_step ensure_repo
+    stamped_step init_submodules
+    stamped_step patch_builder_space_paths
+    timed_step prepare_port_toolchain
+    stamped_step prepare_build_context
+}
+
+# Build, check and locate the firmware unless the artifact cache already
+# holds the output of an identical configuration.
+firmware_flow() {
+    timed_step restore_cached_firmware
+    if [ "$ARTIFACT_CACHE_HIT" = "1" ]; then
+        return
+    fi
+    timed_step plan_flash_layout
+    timed_step estimate_firmware_size
+    timed_step build_firmware
+    timed_step settle_flash_layout
+    timed_step check_firmware_size
+    timed_step locate_firmware
+    timed_step store_cached_firmware firmware_rp2040.uf2 firmware_rp2040.size.json flash_layout_rp2040.json
 }
 
 # Build sequence for an already prepared checkout.
 build_flow() {
-    ensure_repo
-    init_submodules
-    patch_builder_space_paths
-    prepare_port_toolchain
-    prepare_build_context
-    build_firmware
-    check_firmware_size
-    locate_firmware
-    cleanup_repo
+    timed_step ensure_repo
+    stamped_step init_submodules
+    stamped_step patch_builder_space_paths
+    timed_step prepare_port_toolchain
+    stamped_step prepare_build_context
+    timed_step firmware_flow
+    timed_step cleanup_repo
 }
 
 # Main command dispatcher for all/bootstap/build modes.
 main() {
+    step_timing_init rp2040
     case "$MODE" in
         all)
             print_config
-            bootstrap_flow
-            build_firmware
-            check_firmware_size
-            locate_firmware
-            cleanup_repo
+            timed_step bootstrap_flow
+            timed_step firmware_flow
+            timed_step cleanup_repo
             ;;
         bootstrap)
             print_config
-            bootstrap_flow
+            timed_step bootstrap_flow
             ;;
         build)
             print_config
-            build_flow
+            timed_step build_flow
             ;;
         *)
             echo "Usage: $0 [all|bootstrap|build]"
@@ -82,18 +127,47 @@ main() {
             echo "  INSTALL_DEPS=0|1      (default: 1)"
             echo "  UPDATE_SUBMODULES=0|1 (default: 1)"
             echo "  RECLONE=ask|0|1       (default: ask)"
+            echo "  GIT_REFERENCE_DIR=/path/to/reference/lvgl_micropython"
+            echo "  GIT_FETCH_MODE=full|shallow|blobless (default: full)"
+            echo "  GIT_SUBMODULE_JOBS=4"
+            echo "  GIT_MIRROR_DIR=~/.cache/micropython_lvgl/git (default: unset, no mirrors)"
+            echo "  GIT_MIRROR_MAX_AGE=600 (seconds between mirror refreshes)"
+            echo "  OFFLINE=0|1           (default: 0, needs GIT_MIRROR_DIR)"
             echo "  CLEAN_BUILD=0|1       (default: 0)"
+            echo "  PATCH_DIFF=0|1        (default: 0)"
+            echo "  STEP_TIMING=0|1       (default: 1)"
+            echo "  STEP_STAMPS=0|1       (default: 1, build mode skips unchanged steps)"
+            echo "  FORCE_STEPS=\"init_submodules patch_builder_space_paths prepare_build_context\"|all"
+            echo "  COMPILER_CACHE=0|1    (default: 1)"
+            echo "  COMPILER_CACHE_DIR=~/.cache/micropython_lvgl/ccache"
+            echo "  COMPILER_CACHE_MAXSIZE=5G"
+            echo "  ARTIFACT_CACHE=0|1    (default: 1)"
+            echo "  ARTIFACT_CACHE_DIR=~/.cache/micropython_lvgl/artifacts"
+            echo "  ARTIFACT_CACHE_MAX_MB=512"
             echo "  CLEAN_REPO=0|1        (default: 0)"
             echo "  DEBUG_PATCHES=0|1     (default: 0)"
+            echo "  LCD_SPI_DMA=0|1       (default: 1)"
             echo "  TARGET_PORT=rp2"
             echo "  BOARD=WAVESHARE_RP2040_LCD128"
             echo "  FREEZE_BOARD_MODULE=0|1"
             echo "  BOARD_MODULE_NAME=waveshare_rp2040_lcd128"
+            echo "  FROZEN_RUNTIME_MODULES=\"lvgl_runloop lvgl_profiler lcd_spi_calibration lvgl_app\""
+            echo "  NATIVE_EMITTER=native|viper|bytecode (default: native)"
+            echo "  NATIVE_EMITTER_ARCH=armv6m"
             echo "  LV_CFLAGS_EXTRA='...'"
             echo "  DISPLAY_DRIVER=gc9a01"
             echo "  INDEV=cst816s"
             echo "  LVGL_MONTSERRAT_FONTS=\"12 14 16 28\""
             echo "  LVGL_FONT_DEFAULT_SIZE=28"
+            echo "  LVGL_FONT_SUBSET_CHARSET='...' LVGL_FONT_SUBSET_RANGES=0x20-0x7E"
+            echo "  LVGL_FONT_SUBSET_FILES='app/ strings.txt'"
+            echo "  LVGL_FONT_SUBSET_SYMBOLS=0|1 (default: 1)"
+            echo "  LV_CONF_PROFILE=low-latency|low-memory|max-fps (default: none)"
+            echo "  LV_CONF_SET=\"LV_DEF_REFR_PERIOD=16;LV_USE_LOG=0\""
+            echo "  ESTIMATE_FIRMWARE_SIZE=0|1 (default: 1)"
+            echo "  FLASH_LAYOUT=fixed|auto (default: fixed)"
+            echo "  FLASH_SIZE_KB=2048 FLASH_FS_KB=1024 (fixed filesystem size)"
+            echo "  FLASH_FS_MIN_KB=256 FLASH_LAYOUT_MARGIN_KB=64 (auto)"
             echo ""
             exit 1
             ;;
@@ -0,0 +1,273 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Break firmware flash/RAM usage down by section, object and component.
+
+Reads ELF section headers (no toolchain needed) and the GNU ld map file of a
+build, writes a JSON report and diffs it against the report of the previous
+build, which is kept next to it as `<report>.prev.json`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import struct
+from pathlib import Path
+
+REPORT_VERSION = 1
+TOP_OBJECTS = 10
+
+# ELF section header flags/types used to classify sections.
+SHF_WRITE = 0x1
+SHF_ALLOC = 0x2
+SHT_NOBITS = 8
+
+# Sections executed or read from internal RAM on ESP32 (besides .data/.bss).
+ESP32_RAM_PREFIXES = (".iram", ".dram", ".rtc", ".noinit", ".ext_ram")
+
+# (category, pattern) checked in order against the object path from the map.
+CATEGORIES = (
+    ("frozen modules", re.compile(r"frozen_content|frozen_mpy")),
+    ("lvgl fonts", re.compile(r"/lvgl/src/font/|lv_font_")),
+    ("lvgl widgets", re.compile(r"/lvgl/src/widgets/")),
+    ("lvgl binding", re.compile(r"lv_mpy|/ext_mod/lvgl")),
+    ("lvgl core", re.compile(r"/lvgl/")),
+    ("lvgl_micropython drivers", re.compile(r"/ext_mod/|/micropy_updates/")),
+    ("micropython core", re.compile(r"/py/")),
+    ("micropython extmod", re.compile(r"/extmod/|/shared/|/lib/(?:oofatfs|littlefs|tinyusb)")),
+    ("micropython port", re.compile(r"/ports/")),
+    ("pico-sdk", re.compile(r"pico-sdk|pico_|hardware_|boot_stage2")),
+    ("esp-idf", re.compile(r"esp-idf|/esp_|libesp|libfreertos|liblwip|libmbed|libnewlib|libsoc|libhal|libspi_flash|libbt|libwpa")),
+    ("toolchain libs", re.compile(r"lib(?:c|m|g|gcc|nosys|stdc\+\+|supc\+\+)(?:_nano)?\.a")),
+)
+
+_MAP_ENTRY = re.compile(r"^ (\.\S+|COMMON)\s+0x([0-9a-fA-F]+)\s+0x([0-9a-fA-F]+)\s+(\S.*)$")
+_MAP_NAME_ONLY = re.compile(r"^ (\.\S+|COMMON)$")
+_MAP_CONT = re.compile(r"^\s+0x([0-9a-fA-F]+)\s+0x([0-9a-fA-F]+)\s+(\S.*)$")
+_MAP_OUTPUT = re.compile(r"^(\.\S+)(?:\s+0x([0-9a-fA-F]+)\s+0x([0-9a-fA-F]+))?")
+
+
+def read_elf_sections(path: Path) -> dict[str, dict]:
+    """Return allocated sections of a 32-bit little-endian ELF."""
+    data = path.read_bytes()
+    if data[:4] != b"\x7fELF" or data[4] != 1 or data[5] != 1:
+        raise SystemExit(f"Unsupported ELF (expected 32-bit little endian): {path}")
+
+    shoff, = struct.unpack_from("<I", data, 0x20)
+    shentsize, shnum, shstrndx = struct.unpack_from("<HHH", data, 0x2E)
+    headers = [struct.unpack_from("<IIIIII", data, shoff + idx * shentsize) for idx in range(shnum)]
+    strtab_offset = headers[shstrndx][4]
+
+    sections = {}
+    for name_off, sh_type, flags, addr, _offset, size in headers:
+        if not flags & SHF_ALLOC or size == 0:
+            continue
+        end = data.index(b"\x00", strtab_offset + name_off)
+        name = data[strtab_offset + name_off:end].decode("ascii", "replace")
+        sections[name] = {
+            "addr": addr,
+            "size": size,
+            "write": bool(flags & SHF_WRITE),
+            "nobits": sh_type == SHT_NOBITS,
+        }
+    return sections
+
+
+def classify_section(name: str, info: dict, port: str) -> tuple[bool, bool]:
+    """Return `(in_flash, in_ram)` for an allocated section."""
+    in_flash = not info["nobits"]
+    in_ram = info["write"] or info["nobits"]
+    if port == "esp32" and name.startswith(ESP32_RAM_PREFIXES):
+        in_ram = True
+    return in_flash, in_ram
+
+
+def categorize(obj: str) -> str:
+    """Map an object/archive member path to a component category."""
+    normalized = obj.replace("\\", "/")
+    for name, pattern in CATEGORIES:
+        if pattern.search(normalized):
+            return name
+    return "other"
+
+
+def short_object_name(obj: str) -> str:
+    """Shorten build paths while keeping archive members distinguishable."""
+    obj = obj.replace("\\", "/")
+    member = re.match(r"^(.*?)([^/]+\.a)\((.+)\)$", obj)
+    if member:
+        return f"{member.group(2)}({member.group(3)})"
+    parts = [part for part in obj.split("/") if part]
+    return "/".join(parts[-3:])
+
+
+def parse_map(path: Path, sections: dict[str, dict]) -> list[tuple[str, str, int]]:
+    """Return `(output_section, object, size)` for every allocated input section."""
+    entries = []
+    output = None
+    # Long input section names put address/size/object on the next line.
+    pending = False
+    in_memory_map = False
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        if not in_memory_map:
+            in_memory_map = line.startswith("Linker script and memory map")
+            continue
+
+        if line and not line[0].isspace():
+            match = _MAP_OUTPUT.match(line)
+            output = match.group(1) if match else None
+            pending = False
+            continue
+        if output not in sections:
+            continue
+
+        if pending:
+            pending = False
+            cont = _MAP_CONT.match(line)
+            if cont:
+                addr, size, obj = int(cont.group(1), 16), int(cont.group(2), 16), cont.group(3).strip()
+                if addr and size:
+                    entries.append((output, obj, size))
+                continue
+
+        if _MAP_NAME_ONLY.match(line):
+            pending = True
+            continue
+        match = _MAP_ENTRY.match(line)
+        if match:
+            addr, size, obj = int(match.group(2), 16), int(match.group(3), 16), match.group(4).strip()
+            if addr and size:
+                entries.append((output, obj, size))
+    return entries
+
+
+def build_report(elf: Path, map_file: Path | None, port: str) -> dict:
+    """Collect section, object and category usage into a report dict."""
+    sections = read_elf_sections(elf)
+    report = {
+        "version": REPORT_VERSION,
+        "port": port,
+        "elf": str(elf),
+        "totals": {"flash": 0, "ram": 0},
+        "sections": {},
+        "categories": {},
+        "objects": {},
+    }
+
+    kinds = {}
+    for name, info in sorted(sections.items(), key=lambda item: item[1]["addr"]):
+        in_flash, in_ram = classify_section(name, info, port)
+        kinds[name] = (in_flash, in_ram)
+        report["sections"][name] = {"size": info["size"], "flash": in_flash, "ram": in_ram}
+        if in_flash:
+            report["totals"]["flash"] += info["size"]
+        if in_ram:
+            report["totals"]["ram"] += info["size"]
+
+    if map_file is None or not map_file.exists():
+        return report
+
+    for output, obj, size in parse_map(map_file, sections):
+        in_flash, in_ram = kinds[output]
+        name = short_object_name(obj)
+        category = categorize(obj)
+        entry = report["objects"].setdefault(name, {"category": category, "flash": 0, "ram": 0})
+        bucket = report["categories"].setdefault(category, {"flash": 0, "ram": 0})
+        for key, used in (("flash", in_flash), ("ram", in_ram)):
+            if used:
+                entry[key] += size
+                bucket[key] += size
+    return report
+
+
+def _fmt_delta(value: int) -> str:
+    return f"{value:+d}" if value else "0"
+
+
+def print_report(report: dict) -> None:
+    """Print totals, categories and the largest objects."""
+    totals = report["totals"]
+    print(f"Flash: {totals['flash']} bytes  RAM: {totals['ram']} bytes")
+    if report["categories"]:
+        print(f"  {'component':<28} {'flash':>10} {'ram':>10}")
+        for name, usage in sorted(report["categories"].items(), key=lambda item: -item[1]["flash"]):
+            print(f"  {name:<28} {usage['flash']:>10} {usage['ram']:>10}")
+        print("  Largest objects (flash):")
+        largest = sorted(report["objects"].items(), key=lambda item: -item[1]["flash"])[:TOP_OBJECTS]
+        for name, usage in largest:
+            print(f"    {usage['flash']:>9}  {name}")
+
+
+def diff_reports(old: dict, new: dict) -> None:
+    """Print total/category deltas and the top growing objects."""
+    for key in ("flash", "ram"):
+        delta = new["totals"][key] - old["totals"].get(key, 0)
+        print(f"{key.upper() if key == 'ram' else key.capitalize()} vs previous build: {_fmt_delta(delta)} bytes")
+
+    names = set(old.get("categories", {})) | set(new.get("categories", {}))
+    changed = []
+    for name in names:
+        before = old.get("categories", {}).get(name, {}).get("flash", 0)
+        after = new.get("categories", {}).get(name, {}).get("flash", 0)
+        if before != after:
+            changed.append((after - before, name))
+    for delta, name in sorted(changed, reverse=True):
+        print(f"  {name:<28} {_fmt_delta(delta):>10}")
+
+    growers = []
+    for name in set(old.get("objects", {})) | set(new.get("objects", {})):
+        before = old.get("objects", {}).get(name, {}).get("flash", 0)
+        after = new.get("objects", {}).get(name, {}).get("flash", 0)
+        if after > before:
+            growers.append((after - before, name))
+    if growers:
+        print("  Top growers (flash):")
+        for delta, name in sorted(growers, reverse=True)[:TOP_OBJECTS]:
+            print(f"    {_fmt_delta(delta):>9}  {name}")
+
+
+def main() -> int:
+    """CLI entrypoint: analyze a build or diff two existing reports."""
+    parser = argparse.ArgumentParser(description="Firmware size breakdown and build-to-build diff.")
+    parser.add_argument("--port", choices=("rp2", "esp32"), help="port the ELF was built for")
+    parser.add_argument("--elf", type=Path, help="firmware ELF")
+    parser.add_argument("--map", type=Path, help="GNU ld map file of the same link")
+    parser.add_argument("--report", type=Path, help="JSON report to write (previous one is diffed)")
+    parser.add_argument("--diff", nargs=2, type=Path, metavar=("OLD", "NEW"), help="diff two reports")
+    args = parser.parse_args()
+
+    if args.diff:
+        old, new = (json.loads(path.read_text(encoding="utf-8")) for path in args.diff)
+        diff_reports(old, new)
+        return 0
+
+    if not (args.port and args.elf and args.report):
+        parser.error("--port, --elf and --report are required unless --diff is used")
+    if not args.elf.exists():
+        raise SystemExit(f"ELF not found: {args.elf}")
+
+    report = build_report(args.elf, args.map, args.port)
+    if args.map is None or not args.map.exists():
+        print(f"Map file not found ({args.map}); reporting ELF sections only")
+    print_report(report)
+
+    previous = None
+    if args.report.exists():
+        previous = json.loads(args.report.read_text(encoding="utf-8"))
+        args.report.with_name(args.report.stem + ".prev.json").write_text(
+            json.dumps(previous, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"Size report: {args.report}")
+
+    if previous is not None and previous.get("version") == REPORT_VERSION:
+        diff_reports(previous, report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,232 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Local store of finished firmware artifacts keyed by a configuration hash.
+
+`key` hashes everything that shapes the firmware: the upstream commit, the
+submodule SHAs, the build scripts/templates and the effective configuration
+(read from stdin as `NAME=value` lines). `restore` copies the artifacts of a
+matching entry back into the workspace (exit status 1 on a miss), `store`
+adds the artifacts of a finished build and evicts least recently used
+entries until the store fits its size limit. Every entry directory holds the
+artifacts plus an `entry.json` describing them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+KEY_VERSION = 1
+ENTRY_FILE = "entry.json"
+# Skipped while hashing script/template trees.
+IGNORED_PARTS = {"__pycache__", ".git"}
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-C", str(repo), *args], capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"git {' '.join(args)} failed in {repo}: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _input_files(paths: list[Path]) -> list[Path]:
+    """Expand files/directories into a sorted list of files."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                item for item in path.rglob("*")
+                if item.is_file() and not IGNORED_PARTS.intersection(item.parts)
+            )
+        elif path.is_file():
+            files.append(path)
+    return sorted(set(files))
+
+
+def config_key(repo: Path, paths: list[Path], config: list[str]) -> tuple[str, dict]:
+    """Return `(key, description)` for a checkout, input files and config lines."""
+    upstream = _git(repo, "rev-parse", "HEAD")
+    submodules = [
+        " ".join(line.split()[:2])
+        for line in _git(repo, "submodule", "status", "--recursive").splitlines()
+        if line.strip()
+    ]
+
+    digest = hashlib.sha256()
+    digest.update(f"version {KEY_VERSION}\nupstream {upstream}\n".encode())
+    for line in submodules:
+        digest.update(f"submodule {line}\n".encode())
+    files = _input_files(paths)
+    for path in files:
+        # Names relative to their root so another workspace yields the same key.
+        root = next(root for root in paths if path == root or root in path.parents)
+        rel = path.name if path == root else f"{root.name}/{path.relative_to(root).as_posix()}"
+        digest.update(f"file {rel} {_file_digest(path)}\n".encode())
+    for line in sorted(config):
+        digest.update(f"config {line}\n".encode())
+
+    return digest.hexdigest()[:32], {
+        "upstream": upstream,
+        "submodules": len(submodules),
+        "input_files": len(files),
+        "config": sorted(config),
+    }
+
+
+def _read_entry(entry_dir: Path) -> dict | None:
+    try:
+        return json.loads((entry_dir / ENTRY_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_entry(entry_dir: Path, entry: dict) -> None:
+    (entry_dir / ENTRY_FILE).write_text(json.dumps(entry, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def restore(store: Path, key: str, dest: Path) -> bool:
+    """Copy the artifacts of entry `key` into `dest`; drop corrupt entries."""
+    entry_dir = store / key
+    entry = _read_entry(entry_dir)
+    if entry is None:
+        return False
+
+    for name, meta in entry["files"].items():
+        path = entry_dir / name
+        if not path.is_file() or _file_digest(path) != meta["sha256"]:
+            print(f"Artifact cache entry {key} is damaged ({name}); discarding it")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return False
+
+    dest.mkdir(parents=True, exist_ok=True)
+    for name in entry["files"]:
+        shutil.copy2(entry_dir / name, dest / name)
+        print(f"Restored {dest / name}")
+    entry["last_used"] = time.time()
+    entry["hits"] = entry.get("hits", 0) + 1
+    _write_entry(entry_dir, entry)
+    return True
+
+
+def evict(store: Path, max_bytes: int, keep: str = "") -> None:
+    """Remove least recently used entries until the store fits `max_bytes`."""
+    entries = []
+    for entry_dir in store.iterdir() if store.is_dir() else ():
+        if entry_dir.name.startswith("."):
+            # Staging directory of a store in progress.
+            continue
+        entry = _read_entry(entry_dir) if entry_dir.is_dir() else None
+        if entry is None:
+            if entry_dir.is_dir():
+                # Interrupted store or foreign directory.
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            continue
+        entries.append((entry.get("last_used", 0), entry_dir, entry.get("bytes", 0)))
+
+    total = sum(size for _, _, size in entries)
+    for _, entry_dir, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if entry_dir.name == keep:
+            continue
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+        print(f"Evicted artifact cache entry {entry_dir.name} ({size // 1024} KB)")
+
+
+def store_artifacts(store: Path, key: str, files: list[Path], info: dict, max_bytes: int) -> None:
+    """Add an entry for `key` with copies of `files`, then enforce the size limit."""
+    missing = [str(path) for path in files if not path.is_file()]
+    if missing:
+        raise SystemExit(f"Cannot cache missing artifacts: {', '.join(missing)}")
+
+    store.mkdir(parents=True, exist_ok=True)
+    staging = store / f".{key}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+
+    now = time.time()
+    entry = {
+        "key": key,
+        "created": now,
+        "last_used": now,
+        "hits": 0,
+        "files": {},
+        "bytes": 0,
+        **info,
+    }
+    for path in files:
+        shutil.copy2(path, staging / path.name)
+        size = path.stat().st_size
+        entry["files"][path.name] = {"size": size, "sha256": _file_digest(path)}
+        entry["bytes"] += size
+    _write_entry(staging, entry)
+
+    shutil.rmtree(store / key, ignore_errors=True)
+    staging.rename(store / key)
+    print(f"Cached {len(files)} artifact(s) as {key} ({entry['bytes'] // 1024} KB)")
+    evict(store, max_bytes, keep=key)
+
+
+def main() -> int:
+    """CLI entrypoint for the key/restore/store subcommands."""
+    parser = argparse.ArgumentParser(description="Firmware artifact cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    key_cmd = sub.add_parser("key", help="print the configuration hash (config lines on stdin)")
+    key_cmd.add_argument("--repo", type=Path, required=True, help="lvgl_micropython checkout")
+    key_cmd.add_argument("--describe", type=Path, help="also write the hashed inputs as JSON here")
+    key_cmd.add_argument("inputs", nargs="*", type=Path, help="scripts/templates/data that shape the build")
+
+    restore_cmd = sub.add_parser("restore", help="restore artifacts of a cached configuration")
+    restore_cmd.add_argument("--store", type=Path, required=True)
+    restore_cmd.add_argument("--key", required=True)
+    restore_cmd.add_argument("--dest", type=Path, required=True)
+
+    store_cmd = sub.add_parser("store", help="cache the artifacts of a finished build")
+    store_cmd.add_argument("--store", type=Path, required=True)
+    store_cmd.add_argument("--key", required=True)
+    store_cmd.add_argument("--port", required=True)
+    store_cmd.add_argument("--describe", type=Path, help="JSON written by `key --describe`")
+    store_cmd.add_argument("--max-mb", type=int, default=512, help="store size limit")
+    store_cmd.add_argument("files", nargs="+", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "key":
+        config = [line.strip() for line in sys.stdin if line.strip()]
+        key, info = config_key(args.repo, args.inputs, config)
+        if args.describe:
+            args.describe.write_text(json.dumps(info, indent=2) + "\n", encoding="utf-8")
+        print(key)
+        return 0
+
+    if args.command == "restore":
+        return 0 if restore(args.store, args.key, args.dest) else 1
+
+    info = {"port": args.port}
+    if args.describe and args.describe.is_file():
+        info.update(json.loads(args.describe.read_text(encoding="utf-8")))
+    store_artifacts(args.store, args.key, args.files, info, args.max_mb * 1024 * 1024)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,247 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Apply a named performance profile and explicit overrides to lv_conf.h.
+
+A profile maps lv_conf.h macros to values: memory pool, draw buffer
+alignment, refresh and input read periods, software renderer features,
+asserts and logging, layer and cache sizes, and the OS layer. Port entries
+(`rp2`, `esp32`) override the shared ones. Macros listed in `OPTIONAL`
+differ between LVGL releases: when the checked-out lv_conf.h lacks them they
+are reported and skipped. Any other missing macro fails the run before
+anything is written.
+
+The value a macro had before it was first changed is kept in
+`lv_conf.h.profile.json`, so switching or dropping a profile restores the
+macros it no longer sets. Font macros are left to configure_lvgl_fonts.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+_SINGLE_THREAD = {
+    # MicroPython drives LVGL from one thread (lvgl_runloop); an OS layer
+    # would only add locking around every LVGL call.
+    "LV_USE_OS": "LV_OS_NONE",
+}
+_NO_ASSERTS = {
+    "LV_USE_ASSERT_NULL": "0",
+    "LV_USE_ASSERT_MALLOC": "0",
+    "LV_USE_ASSERT_STYLE": "0",
+    "LV_USE_ASSERT_MEM_INTEGRITY": "0",
+    "LV_USE_ASSERT_OBJ": "0",
+}
+
+PROFILES = {
+    "low-latency": {
+        "description": "short refresh and input periods, cheap checks kept",
+        "defines": {
+            **_SINGLE_THREAD,
+            "LV_MEM_SIZE": "(48 * 1024U)",
+            "LV_DEF_REFR_PERIOD": "10",
+            "LV_INDEV_DEF_READ_PERIOD": "10",
+            "LV_DRAW_BUF_ALIGN": "4",
+            "LV_DRAW_SW_COMPLEX": "1",
+            "LV_DRAW_SW_SHADOW_CACHE_SIZE": "0",
+            "LV_DRAW_SW_CIRCLE_CACHE_SIZE": "4",
+            **_NO_ASSERTS,
+            "LV_USE_ASSERT_NULL": "1",
+            "LV_USE_LOG": "0",
+            "LV_DRAW_LAYER_SIMPLE_BUF_SIZE": "(24 * 1024)",
+            "LV_CACHE_DEF_SIZE": "0",
+            "LV_USE_PERF_MONITOR": "0",
+            "LV_USE_SYSMON": "0",
+        },
+    },
+    "low-memory": {
+        "description": "small pool, layers and caches; no complex drawing",
+        "defines": {
+            **_SINGLE_THREAD,
+            "LV_MEM_SIZE": "(32 * 1024U)",
+            "LV_DEF_REFR_PERIOD": "33",
+            "LV_INDEV_DEF_READ_PERIOD": "30",
+            "LV_DRAW_BUF_ALIGN": "4",
+            "LV_DRAW_SW_COMPLEX": "0",
+            "LV_DRAW_SW_SHADOW_CACHE_SIZE": "0",
+            "LV_DRAW_SW_CIRCLE_CACHE_SIZE": "0",
+            **_NO_ASSERTS,
+            "LV_USE_LOG": "0",
+            "LV_DRAW_LAYER_SIMPLE_BUF_SIZE": "(8 * 1024)",
+            "LV_CACHE_DEF_SIZE": "0",
+            "LV_IMAGE_HEADER_CACHE_DEF_CNT": "0",
+            "LV_GRADIENT_MAX_STOPS": "2",
+            "LV_USE_PERF_MONITOR": "0",
+            "LV_USE_SYSMON": "0",
+        },
+    },
+    "max-fps": {
+        "description": "no asserts or logging, larger layer and image caches",
+        "defines": {
+            **_SINGLE_THREAD,
+            "LV_MEM_SIZE": "(64 * 1024U)",
+            "LV_DEF_REFR_PERIOD": "10",
+            "LV_INDEV_DEF_READ_PERIOD": "20",
+            "LV_DRAW_BUF_ALIGN": "4",
+            "LV_DRAW_SW_COMPLEX": "1",
+            "LV_DRAW_SW_SHADOW_CACHE_SIZE": "8",
+            "LV_DRAW_SW_CIRCLE_CACHE_SIZE": "8",
+            **_NO_ASSERTS,
+            "LV_USE_LOG": "0",
+            "LV_DRAW_LAYER_SIMPLE_BUF_SIZE": "(32 * 1024)",
+            "LV_CACHE_DEF_SIZE": "(64 * 1024)",
+            "LV_IMAGE_HEADER_CACHE_DEF_CNT": "8",
+            "LV_USE_PERF_MONITOR": "0",
+            "LV_USE_SYSMON": "0",
+        },
+        # 264 KB of RAM: keep the image cache small on RP2040.
+        "rp2": {"LV_CACHE_DEF_SIZE": "(16 * 1024)"},
+    },
+}
+
+# Macros not present in every LVGL release's lv_conf.h.
+OPTIONAL = {
+    "LV_INDEV_DEF_READ_PERIOD",  # LVGL 8; LVGL 9 reads input every refresh period
+    "LV_DRAW_SW_SHADOW_CACHE_SIZE",
+    "LV_DRAW_SW_CIRCLE_CACHE_SIZE",
+    "LV_DRAW_LAYER_SIMPLE_BUF_SIZE",
+    "LV_CACHE_DEF_SIZE",
+    "LV_IMAGE_HEADER_CACHE_DEF_CNT",
+    "LV_GRADIENT_MAX_STOPS",
+    "LV_USE_PERF_MONITOR",
+    "LV_USE_SYSMON",
+    "LV_DRAW_BUF_ALIGN",
+}
+
+STATE_SUFFIX = ".profile.json"
+
+
+def _define_pattern(name: str, expected_pattern: str = r".*?") -> re.Pattern:
+    return re.compile(
+        rf"(^[ \t]*#define[ \t]+{re.escape(name)}[ \t]+)({expected_pattern})([ \t]*(?:/\*.*|//.*)?$)",
+        re.MULTILINE,
+    )
+
+
+def read_define(text: str, name: str) -> str | None:
+    """Value of the first `#define name value` (None when not defined)."""
+    match = _define_pattern(name).search(text)
+    return match.group(2).strip() if match else None
+
+
+# Replace one #define value while preserving trailing comments and formatting.
+def replace_define(text: str, name: str, value: str, expected_pattern: str = r"[01]") -> str:
+    def _repl(match):
+        return f"{match.group(1)}{value}{match.group(3)}"
+
+    new_text, count = _define_pattern(name, expected_pattern).subn(_repl, text)
+    if count == 0:
+        raise SystemExit(f"Define not found in lv_conf.h: {name}")
+    return new_text
+
+
+def profile_defines(name: str, port: str) -> dict[str, str]:
+    """Macro values of a profile for `port` ("" = no profile)."""
+    if not name:
+        return {}
+    if name not in PROFILES:
+        raise SystemExit(f"Unknown LV_CONF_PROFILE={name!r} (available: {', '.join(sorted(PROFILES))})")
+    profile = PROFILES[name]
+    return {**profile["defines"], **profile.get(port, {})}
+
+
+def parse_overrides(items: list[str]) -> dict[str, str]:
+    """NAME=VALUE pairs (also `;`-separated within one item)."""
+    overrides = {}
+    for item in items:
+        for pair in filter(None, (part.strip() for part in item.split(";"))):
+            name, sep, value = pair.partition("=")
+            name = name.strip()
+            if not sep or not re.fullmatch(r"[A-Z][A-Z0-9_]*", name) or not value.strip():
+                raise SystemExit(f"Invalid lv_conf.h override {pair!r} (expected NAME=VALUE)")
+            if name.startswith("LV_FONT_"):
+                raise SystemExit(f"{name}: fonts are set by LVGL_MONTSERRAT_FONTS/LVGL_FONT_*, not overrides")
+            overrides[name] = value.strip()
+    return overrides
+
+
+def validate(text: str, wanted: dict[str, str], explicit: set[str]) -> list[str]:
+    """Names to skip; fail on required macros missing from lv_conf.h."""
+    missing = [name for name in wanted if read_define(text, name) is None]
+    required = [name for name in missing if name in explicit or name not in OPTIONAL]
+    if required:
+        raise SystemExit("Not defined in this lv_conf.h: " + ", ".join(required))
+    return missing
+
+
+def configure(text: str, originals: dict[str, str], wanted: dict[str, str]) -> tuple[str, list[str]]:
+    """Set `wanted`, restore recorded originals of everything else."""
+    target = {name: value for name, value in originals.items() if name not in wanted}
+    target.update(wanted)
+    changes = []
+    for name, value in target.items():
+        current = read_define(text, name)
+        if current is None or current == value:
+            continue
+        originals.setdefault(name, current)
+        text = replace_define(text, name, value, expected_pattern=r".*?")
+        changes.append(f"{name}: {current} -> {value}")
+    for name in [name for name in originals if name not in wanted]:
+        del originals[name]
+    return text, changes
+
+
+def main() -> int:
+    """CLI entrypoint used by configure_lv_conf in the build scripts."""
+    parser = argparse.ArgumentParser(description="Apply a performance profile to lv_conf.h.")
+    parser.add_argument("lv_conf", type=Path, nargs="?", help="lv_conf.h to update")
+    parser.add_argument("--profile", default="", help="profile name (empty = none)")
+    parser.add_argument("--port", choices=("rp2", "esp32"), default="")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="explicit macro value")
+    parser.add_argument("--check", action="store_true", help="validate and report without writing")
+    parser.add_argument("--list", action="store_true", help="print the profiles and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, profile in PROFILES.items():
+            print(f"{name}: {profile['description']}")
+            for macro, value in profile_defines(name, args.port).items():
+                print(f"  {macro} = {value}")
+        return 0
+    if args.lv_conf is None:
+        parser.error("lv_conf.h path required")
+
+    overrides = parse_overrides(args.set)
+    wanted = {**profile_defines(args.profile, args.port), **overrides}
+    text = args.lv_conf.read_text(encoding="utf-8")
+    for name in validate(text, wanted, set(overrides)):
+        print(f"{name}: not in this lv_conf.h, skipped")
+        del wanted[name]
+
+    state_path = args.lv_conf.with_name(args.lv_conf.name + STATE_SUFFIX)
+    try:
+        originals = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        originals = {}
+
+    new_text, changes = configure(text, originals, wanted)
+    label = args.profile or "none"
+    for change in changes:
+        print(("would set " if args.check else "") + change)
+    if args.check:
+        print(f"CHECK: profile {label}, {len(wanted)} macro(s) valid, {len(changes)} change(s)")
+        return 0
+
+    if new_text != text:
+        args.lv_conf.write_text(new_text, encoding="utf-8")
+    state_path.write_text(json.dumps(originals, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"lv_conf.h profile: {label} ({len(wanted)} macro(s), {len(changes)} changed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
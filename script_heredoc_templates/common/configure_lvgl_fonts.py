@@ -8,6 +8,9 @@ import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from configure_lv_conf import replace_define  # noqa: E402
+
 # Target lv_conf.h file and requested Montserrat size list.
 path = Path(sys.argv[1])
 enabled_raw = sys.argv[2]
@@ -63,20 +66,6 @@ if default_size not in enabled_sizes:
 
 content = path.read_text(encoding="utf-8")
 
-# Replace one #define value while preserving trailing comments and formatting.
-def replace_define(text: str, name: str, value: str, expected_pattern: str = r"[01]") -> str:
-    pattern = re.compile(
-        rf"(^\s*#define\s+{re.escape(name)}\s+){expected_pattern}(\s*(?:/\*.*)?$)",
-        re.MULTILINE,
-    )
-    def _repl(match):
-        return f"{match.group(1)}{value}{match.group(2)}"
-
-    new_text, count = pattern.subn(_repl, text)
-    if count == 0:
-        raise SystemExit(f"Define not found in lv_conf.h: {name}")
-    return new_text
-
 # Enable/disable all Montserrat sizes based on requested set.
 for size in allowed_sizes:
     macro = f"LV_FONT_MONTSERRAT_{size}"
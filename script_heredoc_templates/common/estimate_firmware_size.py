@@ -0,0 +1,142 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Predict firmware flash usage for a font/frozen-module selection before building.
+
+Font cost is read from the glyph bitmap, descriptor, cmap and kerning arrays
+of the LVGL font sources (after subsetting, if enabled). Frozen module cost
+is estimated from their source size. The rest of the image comes from the
+last size report written by analyze_firmware_size.py: its measured font and
+frozen-module bytes are swapped for the new estimates. When the prediction
+exceeds the budget, a reduced font selection that fits is suggested.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from subset_lvgl_fonts import FontData  # noqa: E402
+
+# Frozen .mpy (bytecode + qstrs) relative to the .py source size (rough).
+FROZEN_SOURCE_RATIO = 0.5
+# Data font objects as named in size reports (source or archive member).
+_FONT_OBJECT = re.compile(r"lv_font_((?:montserrat|dejavu|simsun|unscii)\w*)\.c\.o(?:bj)?\b")
+
+
+def font_bytes(path: Path) -> int:
+    """Const data bytes of one font source (bytes of hex literals as fallback)."""
+    content = path.read_text(encoding="utf-8", errors="replace")
+    try:
+        return FontData(content, path.name).data_bytes()
+    except (SystemExit, KeyError, ValueError):
+        return len(re.findall(r"0x[0-9a-fA-F]+", content))
+
+
+def history_baseline(report: dict) -> tuple[int, int, int]:
+    """Return `(total_flash, font_flash, frozen_flash)` measured in a report."""
+    fonts = sum(
+        usage.get("flash", 0)
+        for name, usage in report.get("objects", {}).items()
+        if _FONT_OBJECT.search(name)
+    )
+    frozen = report.get("categories", {}).get("frozen modules", {}).get("flash", 0)
+    return report["totals"]["flash"], fonts, frozen
+
+
+def suggest(fonts: dict[str, int], keep: str, excess: int) -> list[str]:
+    """Drop the largest optional fonts until `excess` bytes are recovered."""
+    dropped = []
+    for name, size in sorted(fonts.items(), key=lambda item: -item[1]):
+        if excess <= 0:
+            break
+        if name == keep:
+            continue
+        dropped.append(name)
+        excess -= size
+    return dropped if excess <= 0 else []
+
+
+def main() -> int:
+    """CLI entrypoint: print the estimate and fail when it exceeds the budget."""
+    parser = argparse.ArgumentParser(description="Pre-build firmware flash estimate.")
+    parser.add_argument("font_dir", type=Path, help="LVGL src/font directory")
+    parser.add_argument("sizes", help="enabled Montserrat sizes, e.g. '12 14 16'")
+    parser.add_argument("default_size", type=int, help="LVGL_FONT_DEFAULT_SIZE")
+    parser.add_argument("--toggle", action="append", default=[], metavar="LV_FONT_X=0|1",
+                        help="optional font toggle as set in lv_conf.h")
+    parser.add_argument("--frozen", nargs="*", default=[], type=Path, help="frozen .py sources")
+    parser.add_argument("--history", type=Path, help="size report of a previous build")
+    parser.add_argument("--budget", type=int, default=0, help="flash budget in bytes (0 = none)")
+    args = parser.parse_args()
+
+    sizes = {int(tok) for tok in re.split(r"[,\s]+", args.sizes.strip()) if tok}
+    sizes.add(args.default_size)
+    selected = {f"montserrat_{size}": args.font_dir / f"lv_font_montserrat_{size}.c" for size in sorted(sizes)}
+    for toggle in args.toggle:
+        macro, _, value = toggle.partition("=")
+        if value.strip() == "1":
+            name = macro.strip().lower().removeprefix("lv_font_")
+            selected[name] = args.font_dir / f"lv_font_{name}.c"
+
+    fonts = {}
+    for name, path in selected.items():
+        if not path.exists():
+            raise SystemExit(f"Missing font source: {path}")
+        fonts[name] = font_bytes(path)
+
+    frozen_src = 0
+    for path in args.frozen:
+        if not path.exists():
+            raise SystemExit(f"Missing frozen module source: {path}")
+        frozen_src += path.stat().st_size
+    frozen = int(frozen_src * FROZEN_SOURCE_RATIO)
+
+    print(f"  {'item':<28} {'flash':>10}")
+    for name, size in fonts.items():
+        print(f"  {'font ' + name:<28} {size:>10}")
+    print(f"  {'frozen modules':<28} {frozen:>10}  ({frozen_src} bytes of source)")
+
+    if args.history is None or not args.history.exists():
+        print(f"Fonts + frozen modules: {sum(fonts.values()) + frozen} bytes")
+        print("No size report from a previous build: whole-image prediction skipped")
+        return 0
+
+    report = json.loads(args.history.read_text(encoding="utf-8"))
+    total, hist_fonts, hist_frozen = history_baseline(report)
+    predicted = total - hist_fonts - hist_frozen + sum(fonts.values()) + frozen
+    print(f"Last build: {total} bytes (fonts {hist_fonts}, frozen {hist_frozen})")
+    print(f"Predicted:  {predicted} bytes ({predicted // 1024} KB)")
+
+    if not args.budget:
+        print("No flash budget known: limit check skipped")
+        return 0
+
+    print(f"Budget:     {args.budget} bytes ({args.budget // 1024} KB)")
+    if predicted <= args.budget:
+        print(f"Estimated margin: {(args.budget - predicted) // 1024} KB")
+        return 0
+
+    excess = predicted - args.budget
+    print(f"Predicted image exceeds the budget by {excess // 1024 + 1} KB")
+    dropped = suggest(fonts, f"montserrat_{args.default_size}", excess)
+    if dropped:
+        kept_sizes = [str(size) for size in sorted(sizes) if f"montserrat_{size}" not in dropped]
+        print("Suggested reduced selection:")
+        print(f"  LVGL_MONTSERRAT_FONTS=\"{' '.join(kept_sizes)}\"")
+        montserrat = {f"montserrat_{size}" for size in sizes}
+        for name in dropped:
+            if name not in montserrat:
+                print(f"  LVGL_FONT_{name.upper()}=0")
+    else:
+        print("Dropping optional fonts is not enough; subset fonts (LVGL_FONT_SUBSET_*) or trim frozen modules")
+    raise SystemExit("Predicted firmware size exceeds the flash budget (set ESTIMATE_FIRMWARE_SIZE=0 to skip)")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
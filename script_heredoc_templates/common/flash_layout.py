@@ -0,0 +1,266 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Plan the firmware/filesystem flash split and keep it in one layout file.
+
+The layout JSON (`flash_layout_<port>.json` in the working directory) is the
+single source of the split: the RP2040 board header gets its
+`MICROPY_HW_FLASH_STORAGE_BYTES` from it, the ESP32 build gets its app
+partition size from it, and the size checks and the pre-build estimate read
+their budget from it.
+
+Modes:
+
+- `fixed`: RP2040 keeps `--fs-kb` for the filesystem. ESP32 keeps the
+  partition table of the builder, recorded after the build (`from-csv`).
+- `auto`: the firmware area is the measured image plus `--margin-kb`,
+  rounded up to 64 KB, and all remaining flash goes to the filesystem.
+  Without a measurement yet (first build), the fixed split (RP2040) or the
+  builder's table (ESP32) is used and the layout is settled after the build.
+
+Subcommands: `plan`, `from-csv`, `get`, `header`, `verify`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import re
+import sys
+from pathlib import Path
+
+# Firmware areas end on a 64 KB boundary (ESP32 app partitions require it).
+ALIGN = 64 * 1024
+# ESP32: partition table at 0x8000, then nvs/phy_init, app from 0x10000.
+ESP32_APP_OFFSET = 0x10000
+ESP32_DATA_PARTITIONS = (
+    ("nvs", "data", "nvs", 0x9000, 0x6000),
+    ("phy_init", "data", "phy", 0xF000, 0x1000),
+)
+_STORAGE_DEFINE = re.compile(r"^(#define\s+MICROPY_HW_FLASH_STORAGE_BYTES\s+).*$", re.M)
+_FS_SUBTYPES = {"fat", "spiffs", "littlefs"}
+
+
+def align_up(value: int, align: int = ALIGN) -> int:
+    return (value + align - 1) // align * align
+
+
+def load(path: Path) -> dict:
+    """Read a layout file ({} when missing or unreadable)."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save(path: Path, layout: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(layout, indent=2) + "\n", encoding="utf-8")
+
+
+def firmware_area(space: int, measured: int, margin: int, fixed_fs: int, min_fs: int, mode: str) -> int:
+    """Bytes reserved for the firmware image out of `space` shared with the filesystem."""
+    if mode == "auto" and measured > 0:
+        area = align_up(measured + margin)
+        if space - area < min_fs:
+            raise SystemExit(f"Firmware ({measured // 1024} KB + {margin // 1024} KB margin) leaves less than "
+                             f"{min_fs // 1024} KB for the filesystem in {space // 1024} KB")
+    else:
+        area = space - fixed_fs
+    if area >= space:
+        raise SystemExit(f"Firmware area ({area // 1024} KB) leaves no filesystem in {space // 1024} KB")
+    return area
+
+
+def plan(port: str, flash: int, measured: int, margin: int, fixed_fs: int, min_fs: int, mode: str) -> dict:
+    """Build the layout of `port` for the given flash size and firmware size.
+
+    `firmware_budget_bytes` is what the pre-build estimate may use: the
+    firmware area in fixed mode, everything but the minimum filesystem in
+    auto mode (the layout is re-planned after the build).
+    """
+    layout = {
+        "port": port,
+        "mode": mode,
+        "flash_bytes": flash,
+        "margin_bytes": margin,
+        "measured_firmware_bytes": measured,
+    }
+    if port == "rp2":
+        # Firmware from the start of flash, filesystem at the end.
+        area = firmware_area(flash, measured, margin, fixed_fs, min_fs, mode)
+        budget = flash - min_fs if mode == "auto" else area
+        layout.update(firmware_max_bytes=area, firmware_budget_bytes=budget, fs_offset=area, fs_bytes=flash - area)
+        return layout
+
+    if measured <= 0:
+        raise SystemExit("ESP32 layouts are planned from a measured firmware size (build once first)")
+    app = firmware_area(flash - ESP32_APP_OFFSET, measured, margin, fixed_fs, min_fs, mode)
+    fs_offset = ESP32_APP_OFFSET + app
+    partitions = [
+        {"name": name, "type": kind, "subtype": subtype, "offset": offset, "size": size}
+        for name, kind, subtype, offset, size in ESP32_DATA_PARTITIONS
+    ]
+    partitions.append({"name": "factory", "type": "app", "subtype": "factory", "offset": ESP32_APP_OFFSET, "size": app})
+    partitions.append({"name": "vfs", "type": "data", "subtype": "fat", "offset": fs_offset, "size": flash - fs_offset})
+    budget = flash - ESP32_APP_OFFSET - min_fs if mode == "auto" else app
+    layout.update(firmware_max_bytes=app, firmware_budget_bytes=budget, fs_offset=fs_offset,
+                  fs_bytes=flash - fs_offset, partitions=partitions)
+    return layout
+
+
+def partitions_csv(layout: dict) -> str:
+    """Render the ESP32 partition table of a layout."""
+    lines = ["# Generated by flash_layout.py", "# Name, Type, SubType, Offset, Size, Flags"]
+    for part in layout["partitions"]:
+        lines.append(f"{part['name']}, {part['type']}, {part['subtype']}, 0x{part['offset']:X}, 0x{part['size']:X},")
+    return "\n".join(lines) + "\n"
+
+
+def read_partitions(path: Path) -> list[dict]:
+    """Parse an ESP32 partition CSV (rows with non-numeric offsets/sizes are skipped)."""
+    partitions = []
+    for row in csv.reader(path.read_text(encoding="utf-8").splitlines()):
+        if len(row) < 5 or row[0].strip().startswith("#"):
+            continue
+        try:
+            offset = int(row[3].strip(), 0) if row[3].strip() else 0
+            size = int(row[4].strip(), 0)
+        except ValueError:
+            continue
+        partitions.append({
+            "name": row[0].strip(),
+            "type": row[1].strip(),
+            "subtype": row[2].strip().lower(),
+            "offset": offset,
+            "size": size,
+        })
+    return partitions
+
+
+def layout_from_partitions(partitions: list[dict], flash: int, measured: int = 0) -> dict:
+    """Layout of an existing ESP32 partition table (largest app and filesystem)."""
+    apps = [part for part in partitions if part["type"] == "app"]
+    filesystems = [part for part in partitions if part["type"] == "data" and part["subtype"] in _FS_SUBTYPES]
+    fs = max(filesystems, key=lambda part: part["size"], default=None)
+    app = max((part["size"] for part in apps), default=0)
+    return {
+        "port": "esp32",
+        "mode": "fixed",
+        "flash_bytes": flash,
+        "margin_bytes": 0,
+        "measured_firmware_bytes": measured,
+        "firmware_max_bytes": app,
+        "firmware_budget_bytes": app,
+        "fs_offset": fs["offset"] if fs else 0,
+        "fs_bytes": fs["size"] if fs else 0,
+        "partitions": partitions,
+    }
+
+
+def _describe(layout: dict) -> str:
+    return (f"firmware {layout['firmware_max_bytes'] // 1024} KB, "
+            f"filesystem {layout['fs_bytes'] // 1024} KB at 0x{layout['fs_offset']:X} "
+            f"({layout['flash_bytes'] // 1024} KB flash, {layout['mode']})")
+
+
+def cmd_plan(args) -> int:
+    previous = load(args.layout)
+    measured = args.measured if args.measured is not None else previous.get("measured_firmware_bytes", 0)
+    layout = plan(args.port, args.flash_kb * 1024, measured, args.margin_kb * 1024, args.fs_kb * 1024,
+                  args.min_fs_kb * 1024, args.mode)
+    changed = {key: previous.get(key) for key in ("firmware_max_bytes", "fs_bytes")} != \
+              {key: layout[key] for key in ("firmware_max_bytes", "fs_bytes")}
+    save(args.layout, layout)
+    if args.partitions and "partitions" in layout:
+        args.partitions.write_text(partitions_csv(layout), encoding="utf-8")
+    print(("Flash layout changed: " if changed else "Flash layout: ") + _describe(layout))
+    return 3 if changed and args.exit_changed else 0
+
+
+def cmd_from_csv(args) -> int:
+    layout = layout_from_partitions(read_partitions(args.csv), args.flash_kb * 1024, args.measured)
+    if not layout["firmware_max_bytes"]:
+        raise SystemExit(f"No app partition in {args.csv}")
+    save(args.layout, layout)
+    print("Flash layout (partition table): " + _describe(layout))
+    return 0
+
+
+def cmd_get(args) -> int:
+    layout = load(args.layout)
+    print(" ".join(str(layout.get(field, 0)) for field in args.fields))
+    return 0
+
+
+def cmd_header(args) -> int:
+    """Copy a board header from stdin, setting the storage size from the layout."""
+    layout = load(args.layout)
+    content = sys.stdin.read()
+    if layout.get("fs_bytes"):
+        fs_kb = layout["fs_bytes"] // 1024
+        content = _STORAGE_DEFINE.sub(lambda m: f"{m.group(1)}({fs_kb} * 1024)", content)
+    sys.stdout.write(content)
+    return 0
+
+
+def cmd_verify(args) -> int:
+    """Fail when the partition table the builder produced differs from the layout."""
+    layout = load(args.layout)
+    actual = layout_from_partitions(read_partitions(args.csv), layout.get("flash_bytes", 0))
+    for key in ("firmware_max_bytes", "fs_offset", "fs_bytes"):
+        if actual[key] != layout.get(key):
+            print(f"Partition table {args.csv} does not match the flash layout: "
+                  f"{key} {actual[key]} != {layout.get(key)}")
+            return 1
+    print(f"Partition table matches the flash layout: {args.csv}")
+    return 0
+
+
+def main() -> int:
+    """CLI entrypoint used by the build scripts."""
+    parser = argparse.ArgumentParser(description="Firmware/filesystem flash layout.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("plan", help="compute the layout and write it")
+    p.add_argument("--layout", type=Path, required=True, help="layout JSON (its measurement is reused)")
+    p.add_argument("--port", choices=("rp2", "esp32"), required=True)
+    p.add_argument("--mode", choices=("fixed", "auto"), default="fixed")
+    p.add_argument("--flash-kb", type=int, required=True)
+    p.add_argument("--fs-kb", type=int, default=0, help="filesystem size in fixed mode")
+    p.add_argument("--margin-kb", type=int, default=64, help="headroom above the measured firmware (auto)")
+    p.add_argument("--min-fs-kb", type=int, default=0, help="smallest filesystem accepted (auto)")
+    p.add_argument("--measured", type=int, help="firmware image bytes (default: from the layout file)")
+    p.add_argument("--partitions", type=Path, help="also write the ESP32 partition CSV")
+    p.add_argument("--exit-changed", action="store_true", help="exit 3 when the split changed")
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser("from-csv", help="record the layout of an existing ESP32 partition table")
+    p.add_argument("--layout", type=Path, required=True)
+    p.add_argument("--csv", type=Path, required=True)
+    p.add_argument("--flash-kb", type=int, default=0)
+    p.add_argument("--measured", type=int, default=0, help="firmware image bytes")
+    p.set_defaults(func=cmd_from_csv)
+
+    p = sub.add_parser("get", help="print layout fields (0 when missing)")
+    p.add_argument("--layout", type=Path, required=True)
+    p.add_argument("fields", nargs="+")
+    p.set_defaults(func=cmd_get)
+
+    p = sub.add_parser("header", help="stdin -> stdout with MICROPY_HW_FLASH_STORAGE_BYTES from the layout")
+    p.add_argument("--layout", type=Path, required=True)
+    p.set_defaults(func=cmd_header)
+
+    p = sub.add_parser("verify", help="compare an ESP32 partition CSV with the layout")
+    p.add_argument("--layout", type=Path, required=True)
+    p.add_argument("--csv", type=Path, required=True)
+    p.set_defaults(func=cmd_verify)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""GC9A01 SPI clock calibration with a per-unit result stored on flash.
+
+Each candidate clock writes MADCTL/COLMOD patterns at that clock and reads
+them back at a slow, known-good clock. The highest clock where every
+pattern survives, minus a safety margin, is saved to CAL_FILE and picked
+up by the board modules' init_display() on later boots.
+"""
+
+import time
+
+CAL_FILE = "/lcd_spi_freq.txt"
+# Clock used for readback so only the write path is being stressed.
+READ_FREQ = 4_000_000
+MARGIN_PCT = 15
+
+_CMD_SWRESET = 0x01
+_CMD_SLPOUT = 0x11
+_CMD_MADCTL = 0x36
+_CMD_RDDMADCTL = 0x0B
+_CMD_COLMOD = 0x3A
+_CMD_RDDCOLMOD = 0x0C
+
+# (write command, read command, value) register round trips.
+_PATTERNS = (
+    (_CMD_MADCTL, _CMD_RDDMADCTL, 0x08),
+    (_CMD_MADCTL, _CMD_RDDMADCTL, 0x48),
+    (_CMD_MADCTL, _CMD_RDDMADCTL, 0xC8),
+    (_CMD_MADCTL, _CMD_RDDMADCTL, 0x28),
+    (_CMD_COLMOD, _CMD_RDDCOLMOD, 0x55),
+    (_CMD_COLMOD, _CMD_RDDCOLMOD, 0x66),
+)
+
+
+def load(default):
+    """Return the calibrated clock, or `default` when none is stored."""
+    try:
+        with open(CAL_FILE, "r") as fh:
+            freq = int(fh.read().strip())
+    except (OSError, ValueError):
+        return default
+    return freq if freq > 0 else default
+
+
+def save(freq):
+    """Persist a calibrated clock for later boots."""
+    with open(CAL_FILE, "w") as fh:
+        fh.write("%d\n" % freq)
+
+
+def clear():
+    """Forget the stored calibration so boards fall back to their default."""
+    try:
+        import os
+        os.remove(CAL_FILE)
+    except OSError:
+        pass
+
+
+def _command(spi, dc, cs, cmd, data=None, read_buf=None):
+    """Send one command with optional parameter write or response read."""
+    cs.value(0)
+    dc.value(0)
+    spi.write(bytes((cmd,)))
+    if data is not None:
+        dc.value(1)
+        spi.write(data)
+    if read_buf is not None:
+        dc.value(1)
+        spi.readinto(read_buf)
+    cs.value(1)
+
+
+def _decode(buf, shifted):
+    """Decode a register read; some panels clock a dummy bit first."""
+    if shifted:
+        return ((buf[0] << 1) | (buf[1] >> 7)) & 0xFF
+    return buf[0]
+
+
+def _passes(open_spi, dc, cs, freq, rounds, shifted):
+    """Return True when every pattern written at `freq` reads back intact."""
+    buf = bytearray(2)
+    for _ in range(rounds):
+        for write_cmd, read_cmd, value in _PATTERNS:
+            _command(open_spi(freq), dc, cs, write_cmd, bytes((value,)))
+            _command(open_spi(READ_FREQ), dc, cs, read_cmd, read_buf=buf)
+            if _decode(buf, shifted) != value:
+                return False
+    return True
+
+
+def calibrate(open_spi, dc, cs, freqs, rounds=8, margin_pct=MARGIN_PCT, store=True):
+    """Step through `freqs` (ascending) and return the safe clock in Hz.
+
+    `open_spi(freq)` must return an SPI object running at `freq` with
+    write()/readinto(); `dc`/`cs` are output Pins and the panel must be out
+    of hardware reset. Returns None when even the slowest clock fails.
+    """
+    cs.value(1)
+    _command(open_spi(READ_FREQ), dc, cs, _CMD_SWRESET)
+    time.sleep_ms(120)
+    _command(open_spi(READ_FREQ), dc, cs, _CMD_SLPOUT)
+    time.sleep_ms(120)
+
+    # Pick the readback encoding that works at the slowest candidate.
+    shifted = None
+    for mode in (False, True):
+        if _passes(open_spi, dc, cs, freqs[0], 1, mode):
+            shifted = mode
+            break
+    if shifted is None:
+        print("[CAL] Readback failed at %d Hz (check LCD MISO wiring)" % freqs[0])
+        return None
+
+    best = None
+    for freq in freqs:
+        ok = _passes(open_spi, dc, cs, freq, rounds, shifted)
+        print("[CAL] %9d Hz: %s" % (freq, "ok" if ok else "FAIL"))
+        if not ok:
+            break
+        best = freq
+
+    if best is None:
+        return None
+
+    safe = best * (100 - margin_pct) // 100
+    print("[CAL] Highest stable clock %d Hz -> using %d Hz" % (best, safe))
+    if store:
+        save(safe)
+    return safe
@@ -0,0 +1,204 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Application scaffold: screens, declarative widgets and C-driven motion.
+
+Widgets are described as `(type, props, children)` tuples and built in one
+pass. Each prop maps onto the setter LVGL already has (`"size": (w, h)` ->
+`set_size(w, h)`), plus a few keys for calls that are not setters (`id`,
+`align`, `flags`, `styles`, `events`).
+
+Motion helpers configure `lv.anim_t` / `lv.anim_timeline` instead of
+Python timers: LVGL's animation timer computes the values, paths, playback
+and repeats. A binding setter (`lv.arc.set_value`, `lv.obj.set_x`, ...) is
+handed to `set_exec_cb()` as its C function, so a step runs no Python at
+all. Only when the binding refuses it (a Python callable, or a binding
+that cannot unwrap the function) is the setter called from a Python
+`set_custom_exec_cb()` lambda on every changed value.
+"""
+
+import lvgl as lv
+
+# LVGL 9 names first; the LVGL 8 bindings spell the durations *_time.
+_SET_DURATION = ("set_duration", "set_time")
+_SET_PLAYBACK = ("set_playback_duration", "set_reverse_duration", "set_playback_time")
+REPEAT_INFINITE = getattr(lv, "ANIM_REPEAT_INFINITE", 0xFFFF)
+
+
+def _call(target, names, *args):
+    """Call the first method of `names` that `target` provides."""
+    for name in names:
+        fn = getattr(target, name, None)
+        if fn is not None:
+            return fn(*args)
+    raise AttributeError(names[0])
+
+
+def _apply(widget, key, value, ids):
+    if key == "id":
+        ids[value] = widget
+    elif key == "align":
+        widget.align(*value)
+    elif key == "flags":
+        for flag in value:
+            widget.add_flag(flag)
+    elif key == "styles":
+        # {"bg_color": (value, selector)} -> set_style_bg_color(value, selector)
+        for name, args in value.items():
+            getattr(widget, "set_style_" + name)(*args)
+    elif key == "events":
+        # ((callback, event code), ...)
+        for cb, code in value:
+            widget.add_event_cb(cb, code, None)
+    elif isinstance(value, tuple):
+        getattr(widget, "set_" + key)(*value)
+    else:
+        getattr(widget, "set_" + key)(value)
+
+
+def build(parent, spec, ids=None):
+    """Create the widget tree `spec` under `parent`; return the ids dict.
+
+    `spec` is `(type, props, children)`: `type` an LVGL widget class or its
+    name (`"arc"`), `props` a dict applied in order, `children` a tuple of
+    specs (props and children may be omitted). Widgets with an `id` prop are
+    returned by that id.
+    """
+    if ids is None:
+        ids = {}
+    kind = spec[0]
+    props = spec[1] if len(spec) > 1 else {}
+    children = spec[2] if len(spec) > 2 else ()
+    if isinstance(kind, str):
+        kind = getattr(lv, kind)
+    widget = kind(parent)
+    for key, value in props.items():
+        _apply(widget, key, value, ids)
+    for child in children:
+        build(widget, child, ids)
+    return ids
+
+
+class Screens:
+    """Named screens built on first use, loaded with optional transitions."""
+
+    def __init__(self):
+        self._builders = {}
+        self._screens = {}
+        self._ids = {}
+        self.current = None
+
+    def add(self, name, builder, screen=None):
+        """Register `builder(screen) -> ids` for `name`.
+
+        Pass `screen` (e.g. `lv.screen_active()`) to build onto an existing
+        screen immediately instead of a new one on first show().
+        """
+        self._builders[name] = builder
+        if screen is not None:
+            self._screens[name] = screen
+            self._ids[name] = builder(screen) or {}
+            self.current = name
+
+    def get(self, name):
+        """Return the screen object of `name`, building it if needed."""
+        screen = self._screens.get(name)
+        if screen is None:
+            screen = lv.obj()
+            self._screens[name] = screen
+            self._ids[name] = self._builders[name](screen) or {}
+        return screen
+
+    def ids(self, name):
+        """Widgets by id of the screen `name` (after it was built)."""
+        return self._ids[name]
+
+    def show(self, name, anim=None, duration=300, delay=0):
+        """Load screen `name`, with an `lv.SCR_LOAD_ANIM` transition if given."""
+        screen = self.get(name)
+        if anim is None:
+            lv.screen_load(screen)
+        else:
+            lv.screen_load_anim(screen, anim, duration, delay, False)
+        self.current = name
+        return screen
+
+
+def _set_exec(anim, target, setter):
+    """Bind `setter` as C exec callback, or through a Python lambda if refused."""
+    try:
+        anim.set_exec_cb(setter)
+    except Exception:
+        # Binding versions report a callback they cannot store with
+        # different exceptions (TypeError, SyntaxError, RuntimeError).
+        anim.set_custom_exec_cb(lambda _anim, value: setter(target, value))
+
+
+def animate(target, setter, start, end, duration, delay=0, playback=0, repeat=0, repeat_delay=0,
+            path=None, run=True):
+    """Animate `setter(target, value)` from `start` to `end` over `duration` ms.
+
+    `setter` (e.g. `lv.arc.set_value`, `lv.obj.set_x`) is called each time
+    the animated value changes. `playback` runs back to `start` in that many
+    ms, `repeat` is a count or REPEAT_INFINITE and `path` an
+    `lv.anim_t.path_*` function (linear by default). With `run=False` the
+    configured `lv.anim_t` is returned for a timeline instead of being
+    started.
+    """
+    anim = lv.anim_t()
+    anim.init()
+    anim.set_var(target)
+    anim.set_values(start, end)
+    _call(anim, _SET_DURATION, duration)
+    if delay:
+        anim.set_delay(delay)
+    if playback:
+        _call(anim, _SET_PLAYBACK, playback)
+    if repeat:
+        anim.set_repeat_count(repeat)
+    if repeat_delay:
+        anim.set_repeat_delay(repeat_delay)
+    anim.set_path_cb(path or lv.anim_t.path_linear)
+    _set_exec(anim, target, setter)
+    if not run:
+        return anim
+    return anim.start()
+
+
+def ping_pong(target, setter, low, high, duration, path=None):
+    """Run `setter` from `low` to `high` and back forever, `duration` ms each way."""
+    return animate(target, setter, low, high, duration, playback=duration, repeat=REPEAT_INFINITE,
+                   path=path)
+
+
+def move_x(widget, start, end, duration, **kwargs):
+    """Slide `widget` horizontally (see animate() for the options)."""
+    return animate(widget, lv.obj.set_x, start, end, duration, **kwargs)
+
+
+def move_y(widget, start, end, duration, **kwargs):
+    """Slide `widget` vertically (see animate() for the options)."""
+    return animate(widget, lv.obj.set_y, start, end, duration, **kwargs)
+
+
+def fade_in(widget, duration=300, delay=0):
+    """Fade `widget` in with LVGL's built-in opacity animation."""
+    widget.fade_in(duration, delay)
+
+
+def fade_out(widget, duration=300, delay=0):
+    """Fade `widget` out with LVGL's built-in opacity animation."""
+    widget.fade_out(duration, delay)
+
+
+def timeline(*steps):
+    """Build an `lv.anim_timeline` from `(start_ms, anim)` pairs.
+
+    Create the animations with `animate(..., run=False)`; start the
+    timeline with `lv.anim_timeline_start(tl)`.
+    """
+    tl = lv.anim_timeline_create()
+    for start_ms, anim in steps:
+        lv.anim_timeline_add(tl, start_ms, anim)
+    return tl
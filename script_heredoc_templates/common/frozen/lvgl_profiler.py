@@ -0,0 +1,135 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""On-device timing profiler with fixed-size ring buffers.
+
+Samples are microsecond durations stored in preallocated `array` buffers,
+one per channel, so recording does not allocate. Instrumentation is only
+installed while ENABLED is True when the board is initialized; otherwise
+wrap() returns the original callable and costs nothing.
+"""
+
+import time
+from array import array
+
+# Channel ids and their names in dump() output.
+FLUSH = 0
+TASK = 1
+TOUCH = 2
+FRAME = 3
+CHANNELS = ("flush", "task", "touch", "frame")
+
+# Samples kept per channel (oldest samples are overwritten).
+CAPACITY = 256
+
+ENABLED = False
+
+_samples = [array("I", bytes(4 * CAPACITY)) for _ in CHANNELS]
+_counts = array("I", bytes(4 * len(CHANNELS)))
+_last_frame_us = None
+
+
+def enable():
+    """Turn instrumentation on; call before the board module is initialized."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """Stop wrapping new callbacks (already wrapped ones keep recording)."""
+    global ENABLED
+    ENABLED = False
+
+
+def record(channel, duration_us):
+    """Store one duration sample in the channel ring buffer."""
+    count = _counts[channel]
+    _samples[channel][count % CAPACITY] = duration_us
+    _counts[channel] = count + 1
+
+
+def mark_frame():
+    """Record the interval since the previous completed frame."""
+    global _last_frame_us
+    now = time.ticks_us()
+    if _last_frame_us is not None:
+        record(FRAME, time.ticks_diff(now, _last_frame_us))
+    _last_frame_us = now
+
+
+def wrap(channel, fn, nargs):
+    """Return `fn` timed into `channel`, or `fn` itself when disabled.
+
+    `nargs` selects a fixed-arity wrapper so calls do not build argument
+    tuples (0 for task handlers, 2 for indev read callbacks, 3 for flush).
+    """
+    if not ENABLED:
+        return fn
+
+    ticks_us = time.ticks_us
+    ticks_diff = time.ticks_diff
+
+    if nargs == 0:
+        def _timed0():
+            start = ticks_us()
+            result = fn()
+            record(channel, ticks_diff(ticks_us(), start))
+            return result
+        return _timed0
+
+    if nargs == 2:
+        def _timed2(a, b):
+            start = ticks_us()
+            result = fn(a, b)
+            record(channel, ticks_diff(ticks_us(), start))
+            return result
+        return _timed2
+
+    if nargs == 3:
+        def _timed3(a, b, c):
+            start = ticks_us()
+            result = fn(a, b, c)
+            record(channel, ticks_diff(ticks_us(), start))
+            return result
+        return _timed3
+
+    raise ValueError("unsupported callback arity: %d" % nargs)
+
+
+def wrap_flush(fn):
+    """Time a display flush callback and mark frames on the last flush."""
+    if not ENABLED:
+        return fn
+
+    timed = wrap(FLUSH, fn, 3)
+
+    def _flush(disp, area, color_p):
+        timed(disp, area, color_p)
+        if disp.flush_is_last():
+            mark_frame()
+
+    return _flush
+
+
+def reset():
+    """Drop every recorded sample."""
+    global _last_frame_us
+    for idx in range(len(CHANNELS)):
+        _counts[idx] = 0
+    _last_frame_us = None
+
+
+def dump():
+    """Print all channels in the text format parsed by tools/profile_report.py."""
+    print("# lvgl_profiler v1 capacity=%d" % CAPACITY)
+    for idx, name in enumerate(CHANNELS):
+        count = _counts[idx]
+        kept = count if count < CAPACITY else CAPACITY
+        first = count - kept
+        buf = _samples[idx]
+        print("%s %d" % (name, count), end="")
+        for pos in range(first, count):
+            print(" %d" % buf[pos % CAPACITY], end="")
+        print()
+    print("# end")
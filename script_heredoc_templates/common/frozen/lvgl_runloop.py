@@ -0,0 +1,111 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Deadline-driven LVGL main loop shared by the frozen board firmware images."""
+
+import time
+import lvgl as lv
+
+# lv_timer_handler() returns this value when no timer is scheduled.
+NO_TIMER_READY = 0xFFFFFFFF
+# Upper bound for a single idle period so the loop never stalls indefinitely.
+MAX_SLEEP_MS = 500
+# Sleep slice used while idle: a wake() request waits at most this long.
+WAKE_POLL_MS = 5
+
+# Prefer the LVGL 9 name; older bindings only expose task_handler().
+_timer_handler = getattr(lv, "timer_handler", None) or lv.task_handler
+
+_wake_pending = False
+_last_tick = None
+_wakeups = 0
+_slept_ms = 0
+
+
+def wake(*_args):
+    """Request an early loop iteration.
+
+    It only sets a flag, so it is safe to pass directly as a `Pin.irq`
+    handler or to call from touch/driver callbacks. An idle loop notices
+    the flag at the end of its current sleep slice, so the worst-case
+    latency is WAKE_POLL_MS (5 ms) before the next timer handler pass.
+    """
+    global _wake_pending
+    _wake_pending = True
+
+
+def wrap_timer_handler(wrapper):
+    """Replace the LVGL timer handler with `wrapper(handler)` (e.g. profiling)."""
+    global _timer_handler
+    _timer_handler = wrapper(_timer_handler)
+
+
+def _advance_tick():
+    """Feed LVGL with the real elapsed time since the previous iteration."""
+    global _last_tick
+    now = time.ticks_ms()
+    if _last_tick is None:
+        _last_tick = now
+        return
+
+    elapsed = time.ticks_diff(now, _last_tick)
+    if elapsed > 0:
+        lv.tick_inc(elapsed)
+        _last_tick = now
+
+
+def run_once(max_sleep_ms=MAX_SLEEP_MS):
+    """Run due LVGL timers once and return the idle budget in milliseconds.
+
+    The budget is the delay reported by LVGL until its next timer deadline,
+    capped to `max_sleep_ms`.
+    """
+    global _wake_pending, _wakeups
+    _advance_tick()
+    _wake_pending = False
+    next_ms = _timer_handler()
+    _wakeups += 1
+
+    if next_ms is None or next_ms < 0 or next_ms > max_sleep_ms:
+        return max_sleep_ms
+    return next_ms
+
+
+def _sleep(budget_ms, poll_ms):
+    """Sleep for `budget_ms` unless wake() is requested in the meantime.
+
+    `time.sleep_ms()` cannot be interrupted, so the budget is slept in
+    `poll_ms` slices and a wake() is served within one slice.
+    """
+    global _slept_ms
+    start = time.ticks_ms()
+    while not _wake_pending:
+        remaining = budget_ms - time.ticks_diff(time.ticks_ms(), start)
+        if remaining <= 0:
+            break
+        time.sleep_ms(remaining if remaining < poll_ms else poll_ms)
+    _slept_ms += time.ticks_diff(time.ticks_ms(), start)
+
+
+def run(max_sleep_ms=MAX_SLEEP_MS, poll_ms=WAKE_POLL_MS, iterations=None):
+    """Drive LVGL until `iterations` loop passes are done (forever by default)."""
+    done = 0
+    while iterations is None or done < iterations:
+        budget = run_once(max_sleep_ms)
+        if budget > 0:
+            _sleep(budget, poll_ms)
+        done += 1
+
+
+def stats():
+    """Return `(wakeups, slept_ms)` accumulated since the last reset_stats()."""
+    return _wakeups, _slept_ms
+
+
+def reset_stats():
+    """Clear loop counters and restart tick accounting from the next pass."""
+    global _last_tick, _wakeups, _slept_ms
+    _last_tick = None
+    _wakeups = 0
+    _slept_ms = 0
@@ -0,0 +1,172 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Maintain local bare mirrors of lvgl_micropython and its submodules.
+
+Mirrors live under `<root>/<host>/<path>.git`. The superproject is always
+mirrored. With `--submodules`, the submodules under the given paths (and
+all nested submodules) are mirrored as well, at the commits recorded in
+`--rev`. A mirror is fetched again only when it is older than
+`--max-age` seconds. With `--offline`, nothing is fetched and a missing
+mirror is an error.
+
+Each line of output is `<url>\\t<file:// mirror url>`, ready to be used as
+`url.<mirror>.insteadOf <url>` git configuration.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+STAMP_FILE = "mirror-fetched"
+
+
+def _git(*args: str, check: bool = True) -> subprocess.CompletedProcess:
+    result = subprocess.run(["git", *args], capture_output=True, text=True, check=False)
+    if check and result.returncode != 0:
+        raise SystemExit(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result
+
+
+def mirror_path(root: Path, url: str) -> Path:
+    """Map a remote URL to its mirror directory."""
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        host, path = "local", parsed.path
+    elif parsed.scheme and parsed.netloc:
+        host, path = parsed.hostname or parsed.netloc, parsed.path
+    elif ":" in url and not url.startswith("/"):
+        # scp-like syntax: git@host:owner/repo
+        host, path = url.split("@")[-1].split(":", 1)
+    else:
+        host, path = "local", parsed.path or url
+    path = path.strip("/")
+    if not path.endswith(".git"):
+        path += ".git"
+    return root / host / path
+
+
+def resolve_url(base: str, url: str) -> str:
+    """Resolve a relative .gitmodules URL against the parent repository URL."""
+    if not url.startswith(("./", "../")):
+        return url
+    base = base.rstrip("/")
+    while url.startswith(("./", "../")):
+        if url.startswith("./"):
+            url = url[2:]
+        else:
+            url = url[3:]
+            base = base.rsplit("/", 1)[0]
+    return f"{base}/{url}"
+
+
+def ensure_mirror(root: Path, url: str, offline: bool, max_age: int, force: bool = False) -> Path:
+    """Create or refresh the bare mirror of `url` and return its path."""
+    path = mirror_path(root, url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Concurrent builds (tools/build_matrix.py) share the mirrors.
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        stamp = path / STAMP_FILE
+        if (path / "HEAD").is_file():
+            if offline:
+                return path
+            age = time.time() - stamp.stat().st_mtime if stamp.exists() else max_age + 1
+            if force or age > max_age:
+                print(f"Refreshing mirror {path}", file=sys.stderr)
+                _git("-C", str(path), "remote", "update", "--prune")
+                stamp.touch()
+            return path
+
+        if offline:
+            raise SystemExit(f"OFFLINE=1 but no mirror of {url} at {path}")
+        print(f"Creating mirror {path}", file=sys.stderr)
+        _git("clone", "--quiet", "--mirror", url, str(path))
+        # Allow shallow/filtered clones of pinned (non-tip) submodule commits.
+        _git("-C", str(path), "config", "uploadpack.allowAnySHA1InWant", "true")
+        _git("-C", str(path), "config", "uploadpack.allowFilter", "true")
+        stamp.touch()
+    return path
+
+
+def _has_commit(mirror: Path, rev: str) -> bool:
+    return _git("-C", str(mirror), "cat-file", "-e", f"{rev}^{{commit}}", check=False).returncode == 0
+
+
+def submodules_at(mirror: Path, rev: str) -> list[tuple[str, str, str]]:
+    """Return `(path, url, commit)` for every submodule recorded at `rev`."""
+    result = _git(
+        "-C", str(mirror), "config", "--blob", f"{rev}:.gitmodules",
+        "--get-regexp", r"^submodule\..*\.(path|url)$", check=False,
+    )
+    if result.returncode != 0:
+        return []
+
+    entries: dict[str, dict[str, str]] = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(" ")
+        name, _, field = key[len("submodule."):].rpartition(".")
+        entries.setdefault(name, {})[field] = value
+
+    found = []
+    for entry in entries.values():
+        if "path" not in entry or "url" not in entry:
+            continue
+        tree = _git("-C", str(mirror), "ls-tree", rev, "--", entry["path"], check=False).stdout.split()
+        if len(tree) >= 3 and tree[1] == "commit":
+            found.append((entry["path"], entry["url"], tree[2]))
+    return found
+
+
+def sync(root: Path, url: str, rev: str, selected: list[str] | None, offline: bool, max_age: int,
+         mapping: dict[str, Path]) -> None:
+    """Mirror `url` and, recursively, the selected submodules at `rev`."""
+    mirror = ensure_mirror(root, url, offline, max_age)
+    mapping[url] = mirror
+    if selected is not None and not selected:
+        return
+
+    if not _has_commit(mirror, rev):
+        if not offline:
+            ensure_mirror(root, url, offline, max_age, force=True)
+        if not _has_commit(mirror, rev):
+            print(f"warning: {rev} not in mirror of {url}; skipping its submodules", file=sys.stderr)
+            return
+
+    for path, sub_url, commit in submodules_at(mirror, rev):
+        if selected is not None and not any(path == sel or path.startswith(sel + "/") for sel in selected):
+            continue
+        absolute = resolve_url(url, sub_url)
+        if absolute in mapping:
+            continue
+        sync(root, absolute, commit, None, offline, max_age, mapping)
+
+
+def main() -> int:
+    """CLI entrypoint: sync mirrors and print the insteadOf mapping."""
+    parser = argparse.ArgumentParser(description="Local bare mirrors for lvgl_micropython builds.")
+    parser.add_argument("--root", type=Path, required=True, help="mirror cache directory")
+    parser.add_argument("--url", required=True, help="superproject URL")
+    parser.add_argument("--rev", default="HEAD", help="superproject commit whose submodules are mirrored")
+    parser.add_argument("--submodules", nargs="*", help="submodule paths/prefixes to mirror (recursive)")
+    parser.add_argument("--max-age", type=int, default=600, help="refresh mirrors older than this (seconds)")
+    parser.add_argument("--offline", action="store_true", help="never fetch; fail on missing mirrors")
+    args = parser.parse_args()
+
+    selected = [path.rstrip("/") for path in args.submodules] if args.submodules else []
+    mapping: dict[str, Path] = {}
+    sync(args.root.resolve(), args.url, args.rev, selected, args.offline, args.max_age, mapping)
+    for url, mirror in mapping.items():
+        print(f"{url}\t{mirror.as_uri()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Bake MicroPython code emitters into `@_hot_path` functions of board modules.
+
+Board modules mark per-frame/per-sample functions with `@_hot_path`, a no-op
+decorator defined in the module itself, so the source still runs as plain
+bytecode anywhere. When freezing for a port whose mpy-cross architecture
+supports it, the marker is rewritten to `@micropython.native` (or viper).
+"""
+
+import re
+
+EMITTERS = ("bytecode", "native", "viper")
+
+_MARKER = re.compile(r"^([ \t]*)@_hot_path[ \t]*$", re.MULTILINE)
+_FIRST_IMPORT = re.compile(r"^(?:import|from) ", re.MULTILINE)
+
+
+def apply_emitter(source, emitter):
+    """Return `(source, count)` with hot path markers bound to `emitter`.
+
+    "bytecode" leaves the markers (and the module's no-op decorator) alone.
+    """
+    if emitter not in EMITTERS:
+        raise SystemExit(f"Invalid hot path emitter: {emitter!r} (expected one of {', '.join(EMITTERS)})")
+    if emitter == "bytecode":
+        return source, len(_MARKER.findall(source))
+
+    rendered, count = _MARKER.subn(rf"\1@micropython.{emitter}", source)
+    if count and not re.search(r"^import micropython$", rendered, re.MULTILINE):
+        first = _FIRST_IMPORT.search(rendered)
+        if first is None:
+            raise SystemExit("Cannot place 'import micropython': module has no import statements")
+        rendered = rendered[:first.start()] + "import micropython\n" + rendered[first.start():]
+    return rendered, count
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Patch manifest: keep builder/port files working when paths contain spaces.
+
+Run with `--enable rp2` or `--enable esp32` to select the port files.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from patch_engine import build_parser, run  # noqa: E402
+
+# Replace fragile join logic with token-aware command formatting.
+OLD_SPAWN = "    cmd_ = list(' '.join(c) for c in cmd_)\n"
+NEW_SPAWN = """    shell_operators = {\n        '|', '||', '&&', ';',\n        '>', '>>', '<', '<<',\n        '1>', '1>>', '2>', '2>>',\n        '&>', '2>&1', '1>&2'\n    }\n\n    def format_cmd(cmd):\n        if isinstance(cmd, str):\n            return cmd\n\n        if len(cmd) == 1:\n            return cmd[0]\n\n        parts = []\n        for token in cmd:\n            if token in shell_operators:\n                parts.append(token)\n                continue\n\n            if '\"' in token or \"'\" in token:\n                parts.append(token)\n                continue\n\n            if token.startswith('$') and token[1:].replace('_', '').isalnum():\n                parts.append(token)\n                continue\n\n            if (\n                any(char.isspace() for char in token) and\n                ('/' in token or '\\\\' in token)\n            ):\n                parts.append(shlex.quote(token))\n                continue\n\n            parts.append(token)\n\n        return ' '.join(parts)\n\n    cmd_ = [format_cmd(c) for c in cmd_]\n"""
+
+MANIFEST = (
+    {
+        "files": ("builder/__init__.py",),
+        "edits": (
+            # Ensure shlex is available for safe quoting logic.
+            {"replace": "import queue\n", "with": "import queue\nimport shlex\n", "count": 1, "done": "import shlex"},
+            {"replace": OLD_SPAWN, "with": NEW_SPAWN, "count": 1, "done": "def format_cmd(cmd):"},
+        ),
+    },
+    {
+        # Quote frozen manifest when forwarded to CMake, otherwise paths containing
+        # spaces are split by the shell and CMake sees broken -D arguments.
+        "files": ("lib/micropython/ports/rp2/Makefile",),
+        "when": "rp2",
+        "edits": (
+            {
+                "replace": "CMAKE_ARGS += -DMICROPY_FROZEN_MANIFEST=${FROZEN_MANIFEST}",
+                "with": 'CMAKE_ARGS += -DMICROPY_FROZEN_MANIFEST="${FROZEN_MANIFEST}"',
+                "done": 'CMAKE_ARGS += -DMICROPY_FROZEN_MANIFEST="${FROZEN_MANIFEST}"',
+            },
+        ),
+    },
+    {
+        # Normalize cd commands so directory paths remain single argv elements.
+        "files": ("builder/esp32.py",),
+        "when": "esp32",
+        "edits": (
+            {"replace": "[f'cd {idf_path}']", "with": "['cd', idf_path]", "done": "['cd', idf_path]"},
+            {"replace": "[f'cd {SCRIPT_DIR}']", "with": "['cd', SCRIPT_DIR]", "done": "['cd', SCRIPT_DIR]"},
+        ),
+    },
+    {
+        # Same quoting for the frozen manifest forwarded to idf.py.
+        "files": ("lib/micropython/ports/esp32/Makefile",),
+        "when": "esp32",
+        "edits": (
+            {
+                "replace": "IDFPY_FLAGS += -D MICROPY_FROZEN_MANIFEST=$(FROZEN_MANIFEST)",
+                "with": 'IDFPY_FLAGS += -D MICROPY_FROZEN_MANIFEST="$(FROZEN_MANIFEST)"',
+                "done": 'IDFPY_FLAGS += -D MICROPY_FROZEN_MANIFEST="$(FROZEN_MANIFEST)"',
+            },
+        ),
+    },
+)
+
+
+if __name__ == "__main__":
+    raise SystemExit(run(MANIFEST, "builder_space_paths", build_parser(__doc__.splitlines()[0]).parse_args()))
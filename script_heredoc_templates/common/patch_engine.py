@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Apply declarative patch manifests to the lvgl_micropython tree.
+
+A manifest is a Python module defining `MANIFEST`, a sequence of entries:
+
+    {
+        "files": ("ext_mod/lcd_bus/common_src/spi_bus.c",),
+        "optional_file": False,       # missing file is not an error
+        "when": "spi_dma",            # only with --enable spi_dma
+        "edits": (...),
+        "residual": (r"regex", ...),  # warn if still present after patching
+    }
+
+Each edit has exactly one operation key:
+
+- `replace`: literal text, replaced by `with` (`count` occurrences, 0 = all)
+- `regex`: pattern, substituted by `with` literally (`flags`: "S", "M", "SM")
+- `insert_before` / `insert_after`: literal anchor, `text` inserted next to
+  its first occurrence
+- `insert_after_line`: `text` inserted after the line holding the anchor
+- `transform`: `fn(content, context) -> content` for edits that need code
+
+and optionally `done` (marker meaning "already applied": skip the edit),
+`optional` (a missing anchor is not an error) and `when` (flag). An edit
+whose anchor is missing, without its `done` marker and not optional, means
+upstream drifted: the run fails before writing anything.
+
+A transform is fingerprinted by its source plus the module constants and
+helper functions it refers to (e.g. the block of code it inserts). Its
+`done` marker is versioned with that fingerprint: the transform receives
+`context["done"]` (`<done>@<hash>`) and must write it into the file, so a
+changed transform is not mistaken for an applied one.
+
+All edits of a file run in memory and the file is written once. A stamp
+(`<root>/.patch_stamps/<manifest>.json`) records the pre/post-patch hashes
+per file; a file whose size, mtime and edit set match its stamp is skipped
+without being read, one whose hash matches is skipped without being parsed.
+The pre-patch content is kept next to the stamp (`<manifest>.orig/`): when
+the edit set changes, a file still holding the previous output is patched
+again from that copy (or from its git HEAD version) instead of on top.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+STAMP_DIR = ".patch_stamps"
+STAMP_VERSION = 1
+_OPS = ("replace", "regex", "insert_before", "insert_after", "insert_after_line", "transform")
+_FLAGS = {"S": re.DOTALL, "M": re.MULTILINE, "I": re.IGNORECASE}
+
+
+class DriftError(RuntimeError):
+    """An anchor expected by the manifest is no longer in the upstream file."""
+
+
+def load_manifest(path: Path):
+    """Import a manifest module from its path."""
+    spec = importlib.util.spec_from_file_location(f"patch_manifest_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"Cannot load patch manifest: {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "MANIFEST"):
+        raise SystemExit(f"Patch manifest defines no MANIFEST: {path}")
+    validate(module.MANIFEST, path.name)
+    return module
+
+
+def validate(manifest, name: str) -> None:
+    """Reject edits that could not be re-applied safely."""
+    for entry in manifest:
+        for idx, edit in enumerate(entry["edits"]):
+            ops = [op for op in _OPS if op in edit]
+            where = f"{name}: {entry['files'][0]} edit {idx}"
+            if len(ops) != 1:
+                raise SystemExit(f"{where}: expected exactly one of {', '.join(_OPS)}")
+            # Without a done marker a required edit fails on its second run.
+            if ops[0] != "transform" and not edit.get("optional") and "done" not in edit:
+                raise SystemExit(f"{where}: required edits need a `done` marker")
+
+
+def _active(item: dict, flags: set[str]) -> bool:
+    return item.get("when") is None or item["when"] in flags
+
+
+def _describe(edit: dict) -> str:
+    op = next(op for op in _OPS if op in edit)
+    target = edit[op]
+    if callable(target):
+        return f"{op} {target.__name__}"
+    first = str(target).strip().splitlines()[0] if str(target).strip() else repr(target)
+    return f"{op} {first[:60]!r}"
+
+
+def _versioned_done(edit: dict) -> str | None:
+    """Done marker of a transform, tied to its fingerprint (None otherwise)."""
+    if "transform" not in edit or edit.get("done") is None:
+        return None
+    return f"{edit['done']}@{_sha256(_edit_fingerprint(edit).encode())[:12]}"
+
+
+def _stale_transforms(content: str, edits) -> list[str]:
+    """Transforms applied to `content` by an older version of their code."""
+    stale = []
+    for edit in edits:
+        marker = _versioned_done(edit)
+        if marker is not None and marker not in content and edit["done"] in content:
+            stale.append(_describe(edit))
+    return stale
+
+
+def apply_edits(content: str, edits, context: dict) -> tuple[str, list[str]]:
+    """Apply `edits` in order; return the new content and applied edit names."""
+    applied = []
+    for edit in edits:
+        done = _versioned_done(edit) or edit.get("done")
+        if done is not None and done in content:
+            continue
+
+        before = content
+        if "transform" in edit:
+            if done is not None:
+                if edit["done"] in content:
+                    raise DriftError(f"{context['rel']}: {_describe(edit)} was applied by an older version of "
+                                     f"the patch; restore the file (e.g. git checkout) and run again")
+                content = edit["transform"](content, dict(context, done=done))
+                if done not in content:
+                    raise DriftError(f"{context['rel']}: {_describe(edit)} did not write its done marker {done!r}")
+            else:
+                content = edit["transform"](content, context)
+        elif "replace" in edit:
+            if edit["replace"] in content:
+                count = edit.get("count", 0) or -1
+                content = content.replace(edit["replace"], edit["with"], count)
+        elif "regex" in edit:
+            flags = 0
+            for letter in edit.get("flags", ""):
+                flags |= _FLAGS[letter]
+            content = re.sub(edit["regex"], lambda _m, text=edit["with"]: text, content,
+                             count=edit.get("count", 0), flags=flags)
+        else:
+            op = next(op for op in ("insert_before", "insert_after", "insert_after_line") if op in edit)
+            pos = content.find(edit[op])
+            if pos >= 0:
+                if op == "insert_after":
+                    pos += len(edit[op])
+                elif op == "insert_after_line":
+                    eol = content.find("\n", pos)
+                    pos = len(content) if eol < 0 else eol + 1
+                content = content[:pos] + edit["text"] + content[pos:]
+
+        if content != before:
+            applied.append(_describe(edit))
+        elif not edit.get("optional") and "transform" not in edit:
+            raise DriftError(f"{context['rel']}: anchor not found for {_describe(edit)}")
+    return content, applied
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return path.resolve().relative_to(root).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _code_names(code) -> set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _code_names(const)
+    return names
+
+
+def _callable_fingerprint(fn, seen: set | None = None) -> str:
+    """Source of `fn` plus the module constants and functions it refers to."""
+    seen = set() if seen is None else seen
+    seen.add(fn)
+    try:
+        parts = [inspect.getsource(fn)]
+    except (OSError, TypeError):
+        parts = [fn.__code__.co_code.hex()]
+    for name in sorted(_code_names(fn.__code__)):
+        value = fn.__globals__.get(name)
+        if isinstance(value, (str, bytes, int, float, tuple)):
+            parts.append(f"{name}={value!r}")
+        elif inspect.isfunction(value) and value.__module__ == fn.__module__ and value not in seen:
+            parts.append(_callable_fingerprint(value, seen))
+    return "\n".join(parts)
+
+
+def _edit_fingerprint(edit: dict) -> str:
+    parts = []
+    for key in sorted(edit):
+        value = edit[key]
+        parts.append(f"{key}={_callable_fingerprint(value) if callable(value) else repr(value)}")
+    return "\n".join(parts)
+
+
+def _edit_set_hash(entry: dict, flags: set[str]) -> str:
+    """Fingerprint of the edits that apply to a file under `flags`."""
+    parts = [_edit_fingerprint(edit) for edit in entry["edits"] if _active(edit, flags)]
+    return _sha256("\n".join(parts).encode())[:16]
+
+
+def _git_head_text(path: Path) -> str | None:
+    """Content of `path` at HEAD of the git checkout holding it, if any."""
+    try:
+        result = subprocess.run(["git", "-C", str(path.parent), "show", f"HEAD:./{path.name}"],
+                                capture_output=True, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return result.stdout.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+class Stamps:
+    """Per-manifest record of pre/post-patch hashes of every target file."""
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.orig_dir = None if path is None else path.with_suffix(".orig")
+        self.data = {}
+        if path is not None and path.is_file():
+            try:
+                loaded = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                loaded = {}
+            if loaded.get("version") == STAMP_VERSION:
+                self.data = loaded.get("files", {})
+        self.dirty = False
+
+    def unchanged(self, rel: str, path: Path, edits_hash: str) -> bool:
+        """True when `path` is the recorded post-patch state (by stat)."""
+        stamp = self.data.get(rel)
+        if not stamp or stamp.get("edits") != edits_hash:
+            return False
+        st = path.stat()
+        return stamp.get("size") == st.st_size and stamp.get("mtime_ns") == st.st_mtime_ns
+
+    def post_hash(self, rel: str, edits_hash: str) -> str | None:
+        stamp = self.data.get(rel)
+        return stamp.get("post") if stamp and stamp.get("edits") == edits_hash else None
+
+    def original(self, rel: str, current: str) -> str | None:
+        """Pre-patch content of `rel` while the file still holds a recorded output."""
+        stamp = self.data.get(rel)
+        if self.orig_dir is None or not stamp or stamp.get("post") != current or stamp.get("pre") == current:
+            return None
+        copy = self.orig_dir / rel
+        if not copy.is_file():
+            return None
+        raw = copy.read_bytes()
+        return raw.decode("utf-8") if _sha256(raw) == stamp.get("pre") else None
+
+    def record(self, rel: str, path: Path, pre: str, post: str, edits_hash: str,
+               original: str | None = None) -> None:
+        if original is not None and pre != post and self.orig_dir is not None:
+            copy = self.orig_dir / rel
+            copy.parent.mkdir(parents=True, exist_ok=True)
+            copy.write_text(original, encoding="utf-8")
+        st = path.stat()
+        self.data[rel] = {
+            "pre": pre,
+            "post": post,
+            "edits": edits_hash,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        self.dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": STAMP_VERSION, "files": self.data}, indent=2, sort_keys=True) + "\n",
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def apply_manifest(manifest, root: Path, flags: set[str], *, dry_run: bool = False, diff: bool = False,
+                   stamp_path: Path | None = None, paths: dict[str, Path] | None = None) -> bool:
+    """Patch every active manifest file under `root`; return True if any changed.
+
+    `paths` maps manifest-relative names to explicit paths (used by wrappers
+    that patch one given file). Nothing is written if any file drifted.
+    """
+    stamps = Stamps(None if dry_run else stamp_path)
+    pending = []
+    skipped = 0
+
+    for entry in manifest:
+        if not _active(entry, flags):
+            continue
+        edits = [edit for edit in entry["edits"] if _active(edit, flags)]
+        if not edits:
+            continue
+        edits_hash = _edit_set_hash(entry, flags)
+
+        for name in entry["files"]:
+            if paths is not None and name not in paths:
+                continue
+            path = paths[name] if paths is not None else root / name
+            # Explicit paths are reported (and stamped) relative to the root.
+            rel = _relative(path, root) if paths is not None else name
+            if not path.is_file():
+                if entry.get("optional_file"):
+                    continue
+                raise DriftError(f"{rel}: file not found under {root}")
+
+            if stamps.unchanged(rel, path, edits_hash):
+                skipped += 1
+                continue
+            raw = path.read_bytes()
+            pre = _sha256(raw)
+            if pre == stamps.post_hash(rel, edits_hash):
+                stamps.record(rel, path, stamps.data[rel]["pre"], pre, edits_hash)
+                skipped += 1
+                continue
+
+            content = raw.decode("utf-8")
+            # Our output of an older edit set: patch the pre-patch content again.
+            source, origin = content, None
+            original = stamps.original(rel, pre)
+            if original is not None:
+                source, origin = original, "the pre-patch copy"
+            elif _stale_transforms(content, edits):
+                original = _git_head_text(path)
+                if original is not None:
+                    source, origin = original, "git HEAD"
+            if origin is not None:
+                pre = _sha256(source.encode("utf-8"))
+            context = {"root": root, "path": path, "rel": rel, "flags": flags}
+            patched, applied = apply_edits(source, edits, context)
+            residual = [pattern for pattern in entry.get("residual", ()) if re.search(pattern, patched)]
+            pending.append((rel, path, content, patched, applied, residual, pre, edits_hash, origin, source))
+
+    changed = False
+    for rel, path, content, patched, applied, residual, pre, edits_hash, origin, original in pending:
+        if origin is not None:
+            print(f"{rel}: edit set changed, patching again from {origin}")
+        for pattern in residual:
+            print(f"WARNING: {rel}: residual pattern {pattern!r} after patching")
+        if patched == content:
+            print(f"{rel}: already patched")
+        else:
+            changed = True
+            verb = "would apply" if dry_run else "applied"
+            print(f"{rel}: {verb} {len(applied)} edit(s)")
+            for name in applied:
+                print(f"  - {name}")
+            if diff:
+                sys.stdout.writelines(difflib.unified_diff(
+                    content.splitlines(keepends=True), patched.splitlines(keepends=True),
+                    fromfile=f"a/{rel}", tofile=f"b/{rel}",
+                ))
+            if not dry_run:
+                path.write_text(patched, encoding="utf-8")
+        if not dry_run:
+            stamps.record(rel, path, pre, _sha256(patched.encode("utf-8")), edits_hash, original)
+
+    if skipped:
+        print(f"{skipped} file(s) unchanged since last patch (stamp)")
+    stamps.save()
+    return changed
+
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    """Arguments shared by the engine CLI and manifest wrappers."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--root", type=Path, default=Path("."), help="lvgl_micropython root")
+    parser.add_argument("--enable", action="append", default=[], metavar="FLAG", help="enable conditional edits")
+    parser.add_argument("--dry-run", action="store_true", help="report edits without writing")
+    parser.add_argument("--diff", action="store_true", help="print a unified diff of every change")
+    parser.add_argument("--no-stamp", action="store_true", help="ignore and do not write stamps")
+    return parser
+
+
+def run(manifest, name: str, args, paths: dict[str, Path] | None = None) -> int:
+    """Apply a manifest with parsed CLI args; print errors instead of tracebacks."""
+    # Wrappers pass their MANIFEST directly, without load_manifest().
+    validate(manifest, name)
+    root = args.root.resolve()
+    stamp = None if args.no_stamp else root / STAMP_DIR / f"{name}.json"
+    try:
+        changed = apply_manifest(manifest, root, set(args.enable), dry_run=args.dry_run, diff=args.diff,
+                                 stamp_path=stamp, paths=paths)
+    except (DriftError, UnicodeDecodeError) as exc:
+        print(f"ERROR: {exc}")
+        return 1
+    if args.dry_run:
+        print("DRY RUN: " + ("changes pending" if changed else "nothing to change"))
+    else:
+        print("OK: patches applied" if changed else "OK: already patched")
+    return 0
+
+
+def main() -> int:
+    """CLI entrypoint: apply the manifest given on the command line."""
+    parser = build_parser("Apply a declarative patch manifest.")
+    parser.add_argument("manifest", type=Path, help="manifest module defining MANIFEST")
+    args = parser.parse_args()
+    module = load_manifest(args.manifest)
+    return run(module.MANIFEST, args.manifest.stem, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
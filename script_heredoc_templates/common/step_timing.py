@@ -0,0 +1,127 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Turn the step timing events of a build run into JSON, a Chrome trace and a summary.
+
+Events come from `timed_step` in script_functions/common/logging_io.sh, one
+TSV line per finished step: `depth name start_us end_us status`. Steps are
+written when they end, so nested steps precede their parent. The JSON report
+lists the steps in start order with their parent path; the trace file uses
+Chrome's trace event format (chrome://tracing, Perfetto). The summary table
+compares each step with the previous report of the same port.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+
+def read_events(path: Path) -> list[dict]:
+    """Parse the TSV events and rebuild each step's parent path."""
+    steps = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        fields = line.split("\t")
+        if len(fields) != 5:
+            continue
+        depth, name, start, end, status = fields
+        steps.append({
+            "name": name,
+            "depth": int(depth),
+            "start_us": int(start),
+            "end_us": int(end),
+            "status": int(status),
+        })
+
+    steps.sort(key=lambda step: (step["start_us"], step["depth"]))
+    stack: list[dict] = []
+    for step in steps:
+        del stack[step["depth"]:]
+        step["path"] = "/".join([parent["name"] for parent in stack] + [step["name"]])
+        step["seconds"] = round((step["end_us"] - step["start_us"]) / 1e6, 3)
+        stack.append(step)
+    return steps
+
+
+def write_trace(path: Path, steps: list[dict], port: str) -> None:
+    """Write complete ("X") events; nesting on one thread renders as a flame graph."""
+    origin = min(step["start_us"] for step in steps)
+    events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"compile_{port}.sh"}}]
+    for step in steps:
+        events.append({
+            "name": step["name"],
+            "cat": "step",
+            "ph": "X",
+            "pid": 1,
+            "tid": 1,
+            "ts": step["start_us"] - origin,
+            "dur": step["end_us"] - step["start_us"],
+            "args": {"status": step["status"], "path": step["path"]},
+        })
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n", encoding="utf-8")
+
+
+def _previous_seconds(path: Path) -> dict[str, float]:
+    try:
+        report = json.loads(path.read_text(encoding="utf-8"))
+        return {step["path"]: step["seconds"] for step in report["steps"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def print_summary(steps: list[dict], previous: dict[str, float], total: float) -> None:
+    """Print one row per step, indented by depth, with the change from the last run."""
+    print()
+    print(f"{'step':<44} {'time s':>9} {'prev s':>9} {'delta':>8}  status")
+    for step in steps:
+        label = "  " * step["depth"] + step["name"]
+        prev = previous.get(step["path"])
+        prev_text = f"{prev:.1f}" if prev is not None else "-"
+        delta_text = f"{step['seconds'] - prev:+.1f}" if prev is not None else "-"
+        status = "ok" if step["status"] == 0 else f"rc {step['status']}"
+        print(f"{label:<44} {step['seconds']:>9.1f} {prev_text:>9} {delta_text:>8}  {status}")
+    print(f"{'total':<44} {total:>9.1f}")
+
+
+def main() -> int:
+    """CLI entrypoint used by the EXIT trap of the build scripts."""
+    parser = argparse.ArgumentParser(description="Build step timing report.")
+    parser.add_argument("--events", type=Path, required=True, help="TSV events written by timed_step")
+    parser.add_argument("--port", required=True)
+    parser.add_argument("--mode", default="")
+    parser.add_argument("--status", type=int, default=0, help="exit status of the build script")
+    parser.add_argument("--json", type=Path, required=True, help="timing report (the previous one is compared)")
+    parser.add_argument("--trace", type=Path, help="Chrome trace output")
+    args = parser.parse_args()
+
+    steps = read_events(args.events)
+    if not steps:
+        return 0
+    total = round((max(s["end_us"] for s in steps) - min(s["start_us"] for s in steps)) / 1e6, 3)
+
+    previous = _previous_seconds(args.json)
+    print_summary(steps, previous, total)
+
+    report = {
+        "port": args.port,
+        "mode": args.mode,
+        "status": args.status,
+        "finished": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "total_seconds": total,
+        "steps": [
+            {key: step[key] for key in ("path", "name", "depth", "start_us", "end_us", "seconds", "status")}
+            for step in steps
+        ],
+    }
+    args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.trace:
+        write_trace(args.trace, steps, args.port)
+    print(f"Step timings: {args.json}" + (f" (trace: {args.trace})" if args.trace else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,488 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Subset built-in LVGL Montserrat fonts to the glyphs an application uses.
+
+Rewrites lv_font_montserrat_<size>.c in the LVGL checkout so it only keeps
+the requested code points: glyph bitmaps, glyph descriptors, character maps
+and kerning (classes or pairs) are rebuilt for the kept glyphs. The pristine
+source is kept next to it as `.orig` and is always the input, so changing the
+character set or disabling subsetting restores the full font. Every result
+is re-parsed and checked glyph by glyph before it is written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import re
+from pathlib import Path
+
+# LV_SYMBOL_* glyphs (FontAwesome) live in the private use area.
+SYMBOL_FIRST = 0xF000
+SYMBOL_LAST = 0xF8FF
+# Runs of at least this many consecutive code points get an O(1) FORMAT0_TINY
+# cmap; other code points are looked up in SPARSE_TINY lists.
+MIN_FORMAT0_RUN = 8
+# Sizes of lv_font_fmt_txt_glyph_dsc_t / lv_font_fmt_txt_cmap_t on 32-bit targets.
+GLYPH_DSC_BYTES = 8
+CMAP_BYTES = 20
+# Sources scanned for characters when a directory is given.
+SCAN_SUFFIXES = {".py", ".txt", ".json"}
+CTYPE_BYTES = {"uint8_t": 1, "int8_t": 1, "uint16_t": 2, "int16_t": 2, "uint32_t": 4}
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_FIELD = re.compile(r"\.(\w+)\s*=\s*([-\w]+)")
+_ENTRY = re.compile(r"\{([^{}]*)\}")
+
+
+class FontData:
+    """Parsed glyph tables of one lv_font_conv generated font source."""
+
+    def __init__(self, content: str, name: str):
+        self.content = content
+        self.name = name
+        self.bitmap = array_values(content, "glyph_bitmap")
+        self.glyphs = [dict(_FIELD.findall(entry)) for entry in _ENTRY.findall(array_body(content, "glyph_dsc"))]
+        if not self.glyphs:
+            raise SystemExit(f"{name}: empty glyph_dsc table")
+        self.cmap_fields = [dict(_FIELD.findall(entry)) for entry in _ENTRY.findall(array_body(content, "cmaps"))]
+        self.codepoints = self._map_codepoints()
+        self.kern = self._parse_kern()
+        self._starts = sorted({int(glyph["bitmap_index"], 0) for glyph in self.glyphs})
+
+    def _map_codepoints(self) -> dict[int, int]:
+        mapping = {}
+        for cmap in self.cmap_fields:
+            start = int(cmap["range_start"], 0)
+            first_id = int(cmap["glyph_id_start"], 0)
+            kind = cmap["type"]
+            unicode_list = self._optional_list(cmap["unicode_list"])
+            ofs_list = self._optional_list(cmap["glyph_id_ofs_list"])
+            if kind.endswith("FORMAT0_TINY"):
+                for idx in range(int(cmap["range_length"], 0)):
+                    mapping[start + idx] = first_id + idx
+            elif kind.endswith("FORMAT0_FULL"):
+                for idx, ofs in enumerate(ofs_list):
+                    mapping[start + idx] = first_id + ofs
+            elif kind.endswith("SPARSE_TINY"):
+                for idx, rel in enumerate(unicode_list):
+                    mapping[start + rel] = first_id + idx
+            elif kind.endswith("SPARSE_FULL"):
+                for rel, ofs in zip(unicode_list, ofs_list):
+                    mapping[start + rel] = first_id + ofs
+            else:
+                raise SystemExit(f"{self.name}: unsupported cmap type {kind}")
+        return mapping
+
+    def _optional_list(self, name: str) -> list[int]:
+        return [] if name == "NULL" else array_values(self.content, name)
+
+    def _parse_kern(self) -> dict | None:
+        if re.search(r"\bkern_classes\s*=\s*\{", self.content) or "kern_left_class_mapping" in self.content:
+            fields = dict(_FIELD.findall(struct_body(self.content, "kern_classes")))
+            return {
+                "kind": "classes",
+                "left": array_values(self.content, "kern_left_class_mapping"),
+                "right": array_values(self.content, "kern_right_class_mapping"),
+                "values": array_values(self.content, "kern_class_values"),
+                "right_cnt": int(fields["right_class_cnt"], 0),
+            }
+        if "kern_pair_glyph_ids" in self.content:
+            ids = array_values(self.content, "kern_pair_glyph_ids")
+            return {
+                "kind": "pairs",
+                "pairs": list(zip(ids[0::2], ids[1::2])),
+                "values": array_values(self.content, "kern_pair_values"),
+            }
+        return None
+
+    def glyph_bitmap(self, glyph_id: int) -> list[int]:
+        """Return the bitmap bytes of one glyph."""
+        glyph = self.glyphs[glyph_id]
+        if int(glyph["box_w"], 0) == 0 or int(glyph["box_h"], 0) == 0:
+            return []
+        start = int(glyph["bitmap_index"], 0)
+        pos = bisect.bisect_right(self._starts, start)
+        end = self._starts[pos] if pos < len(self._starts) else len(self.bitmap)
+        return self.bitmap[start:end]
+
+    def kern_value(self, left_id: int, right_id: int) -> int:
+        """Kerning between two glyph ids, evaluated like lv_font_fmt_txt."""
+        kern = self.kern
+        if kern is None:
+            return 0
+        if kern["kind"] == "pairs":
+            for idx, pair in enumerate(kern["pairs"]):
+                if pair == (left_id, right_id):
+                    return kern["values"][idx]
+            return 0
+        left_class = kern["left"][left_id]
+        right_class = kern["right"][right_id]
+        if left_class and right_class:
+            return kern["values"][(left_class - 1) * kern["right_cnt"] + right_class - 1]
+        return 0
+
+    def data_bytes(self) -> int:
+        """Approximate const data size of the glyph tables in bytes."""
+        total = len(self.bitmap) + len(self.glyphs) * GLYPH_DSC_BYTES + len(self.cmap_fields) * CMAP_BYTES
+        for cmap in self.cmap_fields:
+            total += 2 * (len(self._optional_list(cmap["unicode_list"])) + len(self._optional_list(cmap["glyph_id_ofs_list"])))
+        for name in ("kern_left_class_mapping", "kern_right_class_mapping", "kern_class_values",
+                     "kern_pair_glyph_ids", "kern_pair_values"):
+            if re.search(rf"\b{name}\[\]", self.content):
+                total += len(array_values(self.content, name)) * CTYPE_BYTES.get(array_ctype(self.content, name), 1)
+        return total
+
+
+def _array_match(content: str, name: str) -> re.Match:
+    pattern = re.compile(
+        rf"^(static\s+(?:[A-Z_]+\s+)*const\s+(\w+)\s+{re.escape(name)}\[\]\s*=\s*\{{)(.*?)^(\}};)",
+        re.MULTILINE | re.DOTALL,
+    )
+    match = pattern.search(content)
+    if match is None:
+        raise SystemExit(f"Array not found in font source: {name}")
+    return match
+
+
+def array_body(content: str, name: str) -> str:
+    """Return the initializer text of a static const array."""
+    return _array_match(content, name).group(3)
+
+
+def array_ctype(content: str, name: str) -> str:
+    """Return the element type of a static const array."""
+    return _array_match(content, name).group(2)
+
+
+def array_values(content: str, name: str) -> list[int]:
+    """Return the integer elements of a static const array."""
+    body = _COMMENT.sub("", array_body(content, name))
+    return [int(tok, 0) for tok in (part.strip() for part in body.split(",")) if tok]
+
+
+def replace_array(content: str, name: str, body: str) -> str:
+    """Replace the initializer of a static const array."""
+    match = _array_match(content, name)
+    return content[:match.start(3)] + body + content[match.start(4):]
+
+
+def struct_body(content: str, name: str) -> str:
+    """Return the initializer text of a static const struct."""
+    match = re.search(rf"\b{re.escape(name)}\s*=\s*\{{(.*?)^\}};", content, re.MULTILINE | re.DOTALL)
+    if match is None:
+        raise SystemExit(f"Struct not found in font source: {name}")
+    return match.group(1)
+
+
+def replace_field(content: str, struct: str, field: str, value: int | str) -> str:
+    """Set one designated initializer field inside a named struct."""
+    body = struct_body(content, struct)
+    new_body, count = re.subn(rf"(\.{field}\s*=\s*)[-\w&]+", rf"\g<1>{value}", body)
+    if count != 1:
+        raise SystemExit(f"Field .{field} not found in {struct}")
+    return content.replace(body, new_body, 1)
+
+
+def format_values(values: list[int], fmt: str = "{}", per_line: int = 16) -> str:
+    """Format array elements the way lv_font_conv lays them out."""
+    lines = []
+    for idx in range(0, len(values), per_line):
+        chunk = ", ".join(fmt.format(value) for value in values[idx:idx + per_line])
+        lines.append(f"    {chunk}")
+    return "\n" + ",\n".join(lines) + "\n"
+
+
+def _char_label(codepoint: int) -> str:
+    char = chr(codepoint)
+    if 0x20 < codepoint < 0x7F and char not in "\"\\":
+        return f'U+{codepoint:04X} "{char}"'
+    return f"U+{codepoint:04X}"
+
+
+def plan_cmaps(codepoints: list[int]) -> list[tuple[str, list[int]]]:
+    """Split sorted code points into non-overlapping FORMAT0/SPARSE cmaps.
+
+    lv_font_fmt_txt stops at the first cmap whose range covers a letter, so
+    a sparse range never spans a FORMAT0 run.
+    """
+    runs: list[list[int]] = []
+    for cp in codepoints:
+        if runs and cp == runs[-1][-1] + 1:
+            runs[-1].append(cp)
+        else:
+            runs.append([cp])
+
+    cmaps: list[tuple[str, list[int]]] = []
+    sparse: list[int] = []
+    for run in runs:
+        if len(run) >= MIN_FORMAT0_RUN:
+            if sparse:
+                cmaps.append(("sparse", sparse))
+                sparse = []
+            cmaps.append(("format0", run))
+            continue
+        for cp in run:
+            if sparse and cp - sparse[0] > 0xFFFF:
+                cmaps.append(("sparse", sparse))
+                sparse = []
+            sparse.append(cp)
+    if sparse:
+        cmaps.append(("sparse", sparse))
+    return cmaps
+
+
+def _render_cmaps(cmaps: list[tuple[str, list[int]]]) -> str:
+    lists = []
+    entries = []
+    glyph_id = 1
+    for idx, (kind, cps) in enumerate(cmaps):
+        start = cps[0]
+        if kind == "format0":
+            unicode_list = "NULL"
+            list_length = 0
+            cmap_type = "LV_FONT_FMT_TXT_CMAP_FORMAT0_TINY"
+        else:
+            unicode_list = f"unicode_list_{idx}"
+            list_length = len(cps)
+            cmap_type = "LV_FONT_FMT_TXT_CMAP_SPARSE_TINY"
+            lists.append(
+                f"static const uint16_t {unicode_list}[] = {{"
+                + format_values([cp - start for cp in cps], "0x{:x}", 8)
+                + "};\n\n"
+            )
+        entries.append(
+            "    {\n"
+            f"        .range_start = {start}, .range_length = {cps[-1] - start + 1}, .glyph_id_start = {glyph_id},\n"
+            f"        .unicode_list = {unicode_list}, .glyph_id_ofs_list = NULL, .list_length = {list_length}, .type = {cmap_type}\n"
+            "    }"
+        )
+        glyph_id += len(cps)
+
+    return (
+        "".join(lists)
+        + "/*Collect the unicode lists and glyph_id offsets*/\n"
+        + "static const lv_font_fmt_txt_cmap_t cmaps[] =\n{\n"
+        + ",\n".join(entries)
+        + "\n};"
+    )
+
+
+def _replace_cmaps(content: str, rendered: str) -> str:
+    starts = [_array_match(content, "cmaps").start()]
+    for match in re.finditer(r"^static\s+const\s+\w+\s+(unicode_list_\d+|glyph_id_ofs_list_\d+)\[\]", content, re.MULTILINE):
+        starts.append(match.start())
+    comment = content.find("/*Collect the unicode lists and glyph_id offsets*/")
+    if comment >= 0:
+        starts.append(comment)
+    return content[:min(starts)] + rendered + content[_array_match(content, "cmaps").end():]
+
+
+def _subset_kern(content: str, font: FontData, old_ids: list[int]) -> str:
+    kern = font.kern
+    if kern is None:
+        return content
+
+    if kern["kind"] == "pairs":
+        new_id = {old: new for new, old in enumerate(old_ids)}
+        ids = []
+        values = []
+        for (left, right), value in zip(kern["pairs"], kern["values"]):
+            if left in new_id and right in new_id:
+                ids.extend((new_id[left], new_id[right]))
+                values.append(value)
+        pair_cnt = len(values)
+        if not values:
+            # C forbids empty arrays; pair_cnt = 0 keeps the dummy unused.
+            ids, values = [0, 0], [0]
+        content = replace_array(content, "kern_pair_glyph_ids", format_values(ids))
+        content = replace_array(content, "kern_pair_values", format_values(values))
+        return replace_field(content, "kern_pairs", "pair_cnt", pair_cnt)
+
+    # Compact the class tables to the classes still referenced by kept glyphs.
+    left_used = sorted({kern["left"][old] for old in old_ids[1:]} - {0})
+    right_used = sorted({kern["right"][old] for old in old_ids[1:]} - {0})
+    left_new = {old: new for new, old in enumerate(left_used, start=1)}
+    right_new = {old: new for new, old in enumerate(right_used, start=1)}
+    left_map = [0] + [left_new.get(kern["left"][old], 0) for old in old_ids[1:]]
+    right_map = [0] + [right_new.get(kern["right"][old], 0) for old in old_ids[1:]]
+    values = [
+        kern["values"][(left - 1) * kern["right_cnt"] + right - 1]
+        for left in left_used
+        for right in right_used
+    ] or [0]
+
+    content = replace_array(content, "kern_left_class_mapping", format_values(left_map))
+    content = replace_array(content, "kern_right_class_mapping", format_values(right_map))
+    content = replace_array(content, "kern_class_values", format_values(values))
+    content = replace_field(content, "kern_classes", "left_class_cnt", len(left_used))
+    return replace_field(content, "kern_classes", "right_class_cnt", len(right_used))
+
+
+def subset_font(content: str, wanted: set[int], name: str) -> tuple[str, FontData, FontData, list[int]]:
+    """Return `(new_source, original, subset, missing_codepoints)`."""
+    font = FontData(content, name)
+    kept = sorted(cp for cp in wanted if cp in font.codepoints)
+    missing = sorted(cp for cp in wanted if cp not in font.codepoints)
+    if not kept:
+        raise SystemExit(f"{name}: none of the requested characters exist in this font")
+
+    cmaps = plan_cmaps(kept)
+    order = [cp for _, cps in cmaps for cp in cps]
+    old_ids = [0] + [font.codepoints[cp] for cp in order]
+
+    bitmap_lines = []
+    glyph_lines = [
+        "    {" + ", ".join(f".{k} = {v}" for k, v in font.glyphs[0].items()) + "} /* id = 0 reserved */"
+    ]
+    index = 0
+    for cp, old in zip(order, old_ids[1:]):
+        data = font.glyph_bitmap(old)
+        bitmap_lines.extend(("", f"    /* {_char_label(cp)} */"))
+        for pos in range(0, len(data), 16):
+            bitmap_lines.append("    " + ", ".join(f"0x{value:x}" for value in data[pos:pos + 16]) + ",")
+        fields = dict(font.glyphs[old], bitmap_index=str(index))
+        glyph_lines.append("    {" + ", ".join(f".{k} = {v}" for k, v in fields.items()) + "}")
+        index += len(data)
+
+    new = replace_array(content, "glyph_bitmap", "\n".join(bitmap_lines) + "\n")
+    new = replace_array(new, "glyph_dsc", "\n" + ",\n".join(glyph_lines) + "\n")
+    new = _replace_cmaps(new, _render_cmaps(cmaps))
+    new = _subset_kern(new, font, old_ids)
+    new = replace_field(new, "font_dsc", "cmap_num", len(cmaps))
+    new = re.sub(
+        r"^( \*+/)$",
+        rf" * Subset: {len(kept)} of {len(font.codepoints)} glyphs (subset_lvgl_fonts.py)\n\1",
+        new,
+        count=1,
+        flags=re.MULTILINE,
+    )
+
+    subset = FontData(new, name)
+    verify_subset(font, subset, kept)
+    return new, font, subset, missing
+
+
+def verify_subset(font: FontData, subset: FontData, kept: list[int]) -> None:
+    """Fail unless every kept glyph, metric and kerning pair survived intact."""
+    if sorted(subset.codepoints) != kept:
+        raise SystemExit(f"{subset.name}: subset code points do not match the request")
+    for cp in kept:
+        old, new = font.codepoints[cp], subset.codepoints[cp]
+        if font.glyph_bitmap(old) != subset.glyph_bitmap(new):
+            raise SystemExit(f"{subset.name}: bitmap mismatch for U+{cp:04X}")
+        for key in ("adv_w", "box_w", "box_h", "ofs_x", "ofs_y"):
+            if font.glyphs[old].get(key) != subset.glyphs[new].get(key):
+                raise SystemExit(f"{subset.name}: {key} mismatch for U+{cp:04X}")
+    for left in kept:
+        for right in kept:
+            before = font.kern_value(font.codepoints[left], font.codepoints[right])
+            after = subset.kern_value(subset.codepoints[left], subset.codepoints[right])
+            if before != after:
+                raise SystemExit(f"{subset.name}: kerning mismatch for U+{left:04X} U+{right:04X}")
+
+
+def parse_ranges(raw: str) -> set[int]:
+    """Parse "0x20-0x7E,0xB0,8226" style code point ranges."""
+    codepoints: set[int] = set()
+    for token in (tok.strip() for tok in re.split(r"[,\s]+", raw) if tok.strip()):
+        try:
+            if "-" in token:
+                low, high = (int(part, 0) for part in token.split("-", 1))
+            else:
+                low = high = int(token, 0)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid code point range: {token!r}") from exc
+        if low > high:
+            raise SystemExit(f"Invalid code point range: {token!r}")
+        codepoints.update(range(low, high + 1))
+    return codepoints
+
+
+def scan_files(paths: list[str]) -> set[int]:
+    """Collect printable characters from files (directories are walked)."""
+    codepoints: set[int] = set()
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files = [p for p in sorted(path.rglob("*")) if p.is_file() and p.suffix in SCAN_SUFFIXES]
+        elif path.is_file():
+            files = [path]
+        else:
+            raise SystemExit(f"Character source not found: {path}")
+        for file in files:
+            text = file.read_text(encoding="utf-8", errors="replace")
+            codepoints.update(ord(char) for char in text if ord(char) >= 0x20 and char != "�")
+    return codepoints
+
+
+def main() -> int:
+    """CLI entrypoint: subset (or restore) the selected Montserrat sizes."""
+    parser = argparse.ArgumentParser(description="Subset LVGL Montserrat fonts to a character set.")
+    parser.add_argument("font_dir", type=Path, help="LVGL src/font directory")
+    parser.add_argument("sizes", help="Montserrat sizes, e.g. '12 14 16'")
+    parser.add_argument("--charset", default="", help="literal characters to keep")
+    parser.add_argument("--ranges", default="", help="code point ranges, e.g. 0x20-0x7E,0xB0")
+    parser.add_argument("--files", nargs="*", default=[], help="files/directories scanned for characters")
+    parser.add_argument("--keep-symbols", action="store_true", help="keep LV_SYMBOL_* glyphs")
+    parser.add_argument("--dry-run", action="store_true", help="report savings without writing")
+    args = parser.parse_args()
+
+    sizes = sorted({int(tok) for tok in re.split(r"[,\s]+", args.sizes.strip()) if tok})
+    wanted = {ord(char) for char in args.charset} | parse_ranges(args.ranges) | scan_files(args.files)
+    restore = not wanted
+
+    total_saved = 0
+    for size in sizes:
+        path = args.font_dir / f"lv_font_montserrat_{size}.c"
+        orig = path.with_name(path.name + ".orig")
+
+        if restore:
+            if orig.exists() and not args.dry_run:
+                if path.read_text(encoding="utf-8") != orig.read_text(encoding="utf-8"):
+                    path.write_text(orig.read_text(encoding="utf-8"), encoding="utf-8")
+                    print(f"Restored: {path}")
+                orig.unlink()
+            continue
+
+        if not path.exists():
+            raise SystemExit(f"Missing font source: {path}")
+        if not orig.exists():
+            content = path.read_text(encoding="utf-8")
+            if "(subset_lvgl_fonts.py)" in content:
+                raise SystemExit(f"{path} is already subset but {orig.name} is missing; restore the LVGL checkout")
+            if not args.dry_run:
+                orig.write_text(content, encoding="utf-8")
+        else:
+            content = orig.read_text(encoding="utf-8")
+
+        font_wanted = wanted | {0x20}
+        if args.keep_symbols:
+            font_wanted |= {cp for cp in FontData(content, path.name).codepoints if SYMBOL_FIRST <= cp <= SYMBOL_LAST}
+
+        new, font, subset, missing = subset_font(content, font_wanted, path.name)
+        before, after = font.data_bytes(), subset.data_bytes()
+        total_saved += before - after
+        print(
+            f"montserrat_{size}: {len(subset.codepoints)}/{len(font.codepoints)} glyphs, "
+            f"{before} -> {after} bytes (saved {before - after})"
+        )
+        if missing:
+            shown = " ".join(f"U+{cp:04X}" for cp in missing[:10])
+            print(f"  not in font ({len(missing)}): {shown}{' ...' if len(missing) > 10 else ''}")
+
+        if not args.dry_run and path.read_text(encoding="utf-8") != new:
+            path.write_text(new, encoding="utf-8")
+            print(f"Updated: {path}")
+
+    if restore:
+        print("Font subsetting disabled: full Montserrat sources in place")
+    else:
+        print(f"Font subsetting saved {total_saved} bytes{' (dry run)' if args.dry_run else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
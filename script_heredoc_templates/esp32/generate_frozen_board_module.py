@@ -6,8 +6,12 @@
 
 import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from hot_paths import apply_emitter  # noqa: E402
+
 # Validate module import name used inside frozen firmware.
 module_name = os.environ["BOARD_MODULE_NAME"]
 if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", module_name):
@@ -36,6 +40,14 @@ for key in required:
     except ValueError as exc:
         raise SystemExit(f"Invalid integer for {key}: {raw!r}") from exc
 
+# Touch read strategy: 1 = TP_INT driven, 0 = poll on every LVGL read.
+touch_use_irq = os.environ.get("TOUCH_USE_IRQ", "1").strip()
+if touch_use_irq not in {"0", "1"}:
+    raise SystemExit(f"Invalid value for TOUCH_USE_IRQ: {touch_use_irq!r} (expected 0 or 1)")
+
+# Emitter baked into @_hot_path functions (resolved per port by the workflow).
+hot_path_emitter = os.environ.get("HOT_PATH_EMITTER", "bytecode").strip()
+
 out_py = Path(os.environ["FROZEN_BOARD_PY"])
 out_manifest = Path(os.environ["FROZEN_BOARD_MANIFEST"])
 out_py.parent.mkdir(parents=True, exist_ok=True)
@@ -49,6 +61,21 @@ import gc9a01
 import cst816s
 import i2c
 
+try:
+    from lvgl_runloop import wake as _wake_runloop
+except ImportError:
+    _wake_runloop = None
+
+try:
+    import lvgl_profiler as _profiler
+except ImportError:
+    _profiler = None
+
+try:
+    import lcd_spi_calibration as _spi_cal
+except ImportError:
+    _spi_cal = None
+
 PIN_LCD_BL = {values["PIN_LCD_BL"]}
 PIN_TP_INT = {values["PIN_TP_INT"]}
 PIN_TP_SDA = {values["PIN_TP_SDA"]}
@@ -66,7 +93,89 @@ DISPLAY_HEIGHT = {values["DISPLAY_HEIGHT"]}
 SPI_HOST = {values["SPI_HOST"]}
 SPI_FREQ = {values["SPI_FREQ"]}
 I2C_HOST = {values["I2C_HOST"]}
+SPI_CAL_MAX_FREQ = 80_000_000
+SPI_CAL_STEP = 5_000_000
 I2C_FREQ = {values["I2C_FREQ"]}
+TOUCH_USE_IRQ = {touch_use_irq == "1"}
+FAST_BOOT = True
+PANEL_RESET_SETTLE_MS = 120
+
+# (phase, ticks_ms) pairs recorded during init; ticks_ms counts from boot.
+BOOT_PHASES = []
+
+
+def _hot_path(fn):
+    # Marker rewritten to a native emitter at build time; no-op as bytecode.
+    return fn
+
+
+def boot_mark(phase):
+    BOOT_PHASES.append((phase, time.ticks_ms()))
+
+
+def boot_report():
+    prev = None
+    for phase, stamp in BOOT_PHASES:
+        delta = 0 if prev is None else time.ticks_diff(stamp, prev)
+        print("[BOOT] %-14s %6d ms (+%d)" % (phase, stamp, delta))
+        prev = stamp
+    return prev
+
+
+def _panel_reset():
+    # Single hardware reset; returns the ticks_ms deadline when the panel is ready.
+    rst = Pin(PIN_LCD_RST, Pin.OUT)
+    rst.value(0)
+    time.sleep_ms(1)
+    rst.value(1)
+    return time.ticks_add(time.ticks_ms(), PANEL_RESET_SETTLE_MS)
+
+
+def _wait_until(deadline):
+    remaining = time.ticks_diff(deadline, time.ticks_ms())
+    if remaining > 0:
+        time.sleep_ms(remaining)
+
+
+def _spi_freq():
+    # Per-unit clock stored by calibrate_spi(), SPI_FREQ otherwise.
+    if _spi_cal is None:
+        return SPI_FREQ
+    return _spi_cal.load(SPI_FREQ)
+
+
+def calibrate_spi(start=SPI_FREQ // 2, stop=SPI_CAL_MAX_FREQ, step=SPI_CAL_STEP, rounds=8):
+    # Run from the REPL instead of init(), then reset to apply the stored clock.
+    if _spi_cal is None:
+        raise RuntimeError("lcd_spi_calibration is not frozen in this firmware")
+
+    _wait_until(_panel_reset())
+    dc = Pin(PIN_LCD_DC, Pin.OUT)
+    cs = Pin(PIN_LCD_CS, Pin.OUT, value=1)
+
+    if not hasattr(SPI, "Bus"):
+        spi = SPI(SPI_HOST, baudrate=start, sck=Pin(PIN_LCD_CLK), mosi=Pin(PIN_LCD_MOSI), miso=Pin(PIN_LCD_MISO))
+
+        def _open(freq):
+            spi.init(baudrate=freq)
+            return spi
+    else:
+        # ESP-IDF allows few devices per bus: keep the readback device and
+        # a single device for the clock under test.
+        bus = _create_spi_bus()
+        devices = {{}}
+
+        def _open(freq):
+            dev = devices.get(freq)
+            if dev is None:
+                for other in list(devices):
+                    if other != _spi_cal.READ_FREQ:
+                        devices.pop(other).deinit()
+                dev = SPI.Device(spi_bus=bus, freq=freq, cs=-1, polarity=0, phase=0)
+                devices[freq] = dev
+            return dev
+
+    return _spi_cal.calibrate(_open, dc, cs, list(range(start, stop + 1, step)), rounds)
 
 
 def _create_spi_bus():
@@ -80,26 +189,23 @@ def _create_spi_bus():
 
     return SPI(
         SPI_HOST,
-        baudrate=SPI_FREQ,
+        baudrate=_spi_freq(),
         sck=Pin(PIN_LCD_CLK),
         mosi=Pin(PIN_LCD_MOSI),
         miso=Pin(PIN_LCD_MISO),
     )
 
 
-def init_display():
-    rst = Pin(PIN_LCD_RST, Pin.OUT)
-    rst.value(1)
-    time.sleep_ms(10)
-    rst.value(0)
-    time.sleep_ms(20)
-    rst.value(1)
-    time.sleep_ms(120)
+def init_display(ready_at=None):
+    if ready_at is None:
+        ready_at = _panel_reset()
+    _wait_until(ready_at)
+    boot_mark("panel_ready")
 
     spi_bus = _create_spi_bus()
     bus = lcd_bus.SPIBus(
         spi_bus=spi_bus,
-        freq=SPI_FREQ,
+        freq=_spi_freq(),
         dc=PIN_LCD_DC,
         cs=PIN_LCD_CS,
         spi_mode=0,
@@ -115,7 +221,7 @@ def init_display():
         data_bus=bus,
         display_width=DISPLAY_WIDTH,
         display_height=DISPLAY_HEIGHT,
-        reset_pin=PIN_LCD_RST,
+        reset_pin=None,
         reset_state=gc9a01.STATE_LOW,
         backlight_pin=PIN_LCD_BL,
         backlight_on_state=gc9a01.STATE_HIGH,
@@ -124,13 +230,44 @@ def init_display():
         rgb565_byte_swap=False,
     )
 
+    if _profiler is not None and _profiler.ENABLED:
+        display._disp_drv.set_flush_cb(_profiler.wrap_flush(display._flush_cb))
+
     display.set_power(True)
     display.init()
     display.set_backlight(100)
+    boot_mark("display_ready")
     return display
 
 
-def init_touch():
+class _IrqCST816S(cst816s.CST816S):
+    # Skip the I2C transaction unless TP_INT fired or a press is in progress.
+
+    def __init__(self, *args, **kwargs):
+        self._irq_pending = True
+        self._irq_pressed = False
+        self._int_pin = Pin(PIN_TP_INT, Pin.IN, Pin.PULL_UP)
+        super().__init__(*args, **kwargs)
+        self._int_pin.irq(trigger=Pin.IRQ_FALLING, handler=self._on_int)
+
+    def _on_int(self, _pin):
+        self._irq_pending = True
+        if _wake_runloop is not None:
+            _wake_runloop()
+
+    @_hot_path
+    def _get_coords(self):
+        if not self._irq_pending and not self._irq_pressed:
+            return None
+        self._irq_pending = False
+        # Explicit base call keeps this method valid under every emitter.
+        coords = cst816s.CST816S._get_coords(self)
+        self._irq_pressed = coords is not None
+        return coords
+
+
+def _touch_setup():
+    # Bus/device creation and controller reset, safe before the display exists.
     i2c_bus = i2c.I2C.Bus(
         host=I2C_HOST,
         scl=PIN_TP_SCL,
@@ -144,25 +281,73 @@ def init_touch():
         reg_bits=getattr(cst816s, "BITS", 8),
     )
 
-    return cst816s.CST816S(
+    rst = Pin(PIN_TP_RST, Pin.OUT)
+    rst.value(0)
+    time.sleep_ms(5)
+    rst.value(1)
+    boot_mark("touch_bus_ready")
+    return touch_dev
+
+
+def init_touch(use_irq=TOUCH_USE_IRQ, touch_dev=None):
+    # A touch_dev from _touch_setup() was already reset while the panel settled.
+    reset_pin = None
+    if touch_dev is None:
+        touch_dev = _touch_setup()
+        time.sleep_ms(50)
+
+    touch_cls = _IrqCST816S if use_irq else cst816s.CST816S
+    touch = touch_cls(
         touch_dev,
-        reset_pin=PIN_TP_RST,
+        reset_pin=reset_pin,
     )
+    if _profiler is not None:
+        touch._get_coords = _profiler.wrap(_profiler.TOUCH, touch._get_coords, 0)
+    boot_mark("touch_ready")
+    return touch
+
 
+def init(touch=True, touch_irq=TOUCH_USE_IRQ, profile=False, fast_boot=FAST_BOOT):
+    # fast_boot brings up the touch bus while the panel is in its reset delay.
+    boot_mark("init")
+    if profile and _profiler is not None:
+        _profiler.enable()
 
-def init(touch=True):
-    display = init_display()
-    indev = init_touch() if touch else None
+    touch_dev = None
+    if fast_boot:
+        ready_at = _panel_reset()
+        if touch:
+            touch_dev = _touch_setup()
+        display = init_display(ready_at)
+    else:
+        display = init_display()
+
+    indev = init_touch(use_irq=touch_irq, touch_dev=touch_dev) if touch else None
+    boot_mark("init_done")
     return display, indev
 """
 
+# Shared runtime modules are staged by the shell workflow in the same folder.
+frozen_names = [out_py.name]
+for runtime_module in os.environ.get("FROZEN_RUNTIME_MODULES", "").split():
+    if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", runtime_module):
+        raise SystemExit(f"Invalid frozen runtime module name: {runtime_module!r}")
+    runtime_py = out_py.parent / f"{runtime_module}.py"
+    if not runtime_py.is_file():
+        raise SystemExit(f"Missing staged runtime module: {runtime_py}")
+    frozen_names.append(runtime_py.name)
+
+helper_src, hot_paths = apply_emitter(helper_src, hot_path_emitter)
 out_py.write_text(helper_src, encoding="utf-8")
-# Freeze exactly the generated helper file from its directory.
+# Freeze exactly the generated helper and staged runtime files from their directory.
 out_manifest.write_text(
-    "freeze(%r, %r)\n" % (str(out_py.parent), out_py.name),
+    "freeze(%r, %r)\n" % (str(out_py.parent), tuple(frozen_names)),
     encoding="utf-8",
 )
 
 print(f"OK: board module generated -> {out_py}")
 print(f"OK: board manifest generated -> {out_manifest}")
 print(f"OK: import name in firmware -> {module_name}")
+print(f"OK: {hot_paths} hot paths compiled as {hot_path_emitter}")
+if len(frozen_names) > 1:
+    print(f"OK: runtime modules frozen -> {', '.join(frozen_names[1:])}")
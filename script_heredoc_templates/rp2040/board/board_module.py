@@ -9,140 +9,527 @@ import lvgl as lv
 from machine import Pin, SPI, I2C
 import lcd_bus
 import gc9a01
-import cst816s
+
+try:
+    from lvgl_runloop import wake as _wake_runloop
+except ImportError:
+    _wake_runloop = None
+
+try:
+    import lvgl_profiler as _profiler
+except ImportError:
+    _profiler = None
+
+try:
+    import lcd_spi_calibration as _spi_cal
+except ImportError:
+    _spi_cal = None
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+# Board pins, replaced with literal GPIO numbers from board/pins.csv by
+# generate_board_module.py when the module is frozen.
+# --- BEGIN BOARD PINS ---
+PIN_LCD_CLK = "LCD_CLK"
+PIN_LCD_MOSI = "LCD_MOSI"
+PIN_LCD_MISO = "LCD_MISO"
+PIN_LCD_DC = "LCD_DC"
+PIN_LCD_CS = "LCD_CS"
+PIN_LCD_RST = "LCD_RST"
+PIN_LCD_BL = "LCD_BL"
+PIN_TP_SDA = "TP_SDA"
+PIN_TP_SCL = "TP_SCL"
+PIN_TP_RST = "TP_RST"
+PIN_TP_INT = "TP_INT"
+# --- END BOARD PINS ---
 
 DISPLAY_WIDTH = 240
 DISPLAY_HEIGHT = 240
+# Default LCD SPI clock; calibrate_spi() stores a per-unit value on flash.
 SPI_FREQ = 10_000_000
+# RP2040 SPI tops out at clk_peri / 2 (62.5 MHz at the default 125 MHz).
+SPI_CAL_MAX_FREQ = 62_500_000
+SPI_CAL_STEP = 5_000_000
 I2C_FREQ = 400_000
-TOUCH_I2C_ADDR = getattr(cst816s, "I2C_ADDR", 0x15)
+# Two partial framebuffers (1/10 of the screen each): LVGL renders into one
+# while the lcd_bus DMA transfer streams the other to the panel.
+FRAME_BUFFER_SIZE = DISPLAY_WIDTH * (DISPLAY_HEIGHT // 10) * 2
+TOUCH_I2C_ADDR = 0x15
+# First CST816S report register (finger count, then X/Y high/low bytes).
+_TOUCH_REG_REPORT = 0x02
+_TOUCH_REG_CHIP_ID = 0xA7
+_TOUCH_CHIP_IDS = (0xB4, 0xB5, 0xB6)
+# IrqCtl: pulse TP_INT on touch and on every change while a finger is down.
+_TOUCH_REG_IRQ_CTL = 0xFA
+_TOUCH_IRQ_TOUCH_CHANGE = 0x60
+# CST816S boot time after a TP_RST pulse before it answers on I2C.
+TOUCH_RESET_SETTLE_MS = 50
+# Read the controller only after a TP_INT falling edge (False = poll every read).
+TOUCH_USE_IRQ = True
+# Overlap touch bring-up with the panel power-on delay in init().
+FAST_BOOT = True
+# GC9A01 needs 120 ms after a hardware reset before it accepts sleep-out.
+PANEL_RESET_SETTLE_MS = 120
+
+# Run flush submission and touch sampling on core 1 (opt-in, needs _thread).
+CORE1_MODE = False
+# Touch sampling period of the core 1 worker.
+CORE1_TOUCH_MS = 10
+# Core 1 idle sleep between mailbox polls.
+CORE1_IDLE_MS = 1
+# Longest core 0 wait for core 1 to take a flush request before it stops
+# using the worker and flushes inline (one band takes ~10 ms at 10 MHz).
+CORE1_FLUSH_TIMEOUT_MS = 100
+# Core 0 pause between checks while it waits on core 1.
+CORE1_WAIT_US = 20
+# Core 0 attempts at a consistent touch sample before it reuses the last one.
+CORE1_READ_RETRIES = 4
+
+# (phase, ticks_ms) pairs recorded during init; ticks_ms counts from boot.
+BOOT_PHASES = []
+
+# Keep the TP_INT pin alive while LVGL reads through it.
+_touch_int_pin = None
+
+# Core 1 worker state: [stop requested, running, flush claimed]. Bytes are
+# written by a single core each, so no lock is needed.
+_core1_state = bytearray(3)
+_core1_flush = None
+_core1_touch = None
+_core1_display = None
+
+
+def _hot_path(fn):
+    """Mark a per-frame/per-sample function for the native code emitter.
+
+    The build rewrites the marker to `@micropython.native` when freezing for
+    a port that supports it; run as a plain module it is a no-op.
+    """
+    return fn
 
 
 class _CompatI2CDevice:
-    """Adapter that exposes the minimal I2C Device API expected by cst816s driver."""
+    """Register access to the CST816S over a machine.I2C controller.
+
+    Register and read buffers are allocated once and reused through cached
+    memoryviews, so steady-state transactions do not allocate once every
+    read size has been seen (tools/test_touch_alloc.py). Returned views are
+    overwritten by the next read.
+    """
 
-    def __init__(self, bus, addr):
+    def __init__(self, bus, addr, max_read=8):
         self._bus = bus
         self._addr = addr
+        self._reg = bytearray(1)
+        self._rbuf = bytearray(max_read)
+        self._views = {}
+
+    def _view(self, nbytes):
+        view = self._views.get(nbytes)
+        if view is None:
+            if nbytes > len(self._rbuf):
+                self._rbuf = bytearray(nbytes)
+                self._views = {}
+            view = memoryview(self._rbuf)[:nbytes]
+            self._views[nbytes] = view
+        return view
 
     def write(self, buf):
         self._bus.writeto(self._addr, buf)
 
+    @_hot_path
     def read(self, nbytes, write=0x00):
-        wr = bytes([write & 0xFF]) if isinstance(write, int) else write
-        self._bus.writeto(self._addr, wr, False)
-        return self._bus.readfrom(self._addr, nbytes)
+        if isinstance(write, int):
+            self._reg[0] = write & 0xFF
+            write = self._reg
+        view = self._view(nbytes)
+        self._bus.writeto(self._addr, write, False)
+        self._bus.readfrom_into(self._addr, view)
+        return view
 
     def write_readinto(self, wr_buf, rd_buf):
         self._bus.writeto(self._addr, wr_buf, False)
         self._bus.readfrom_into(self._addr, rd_buf)
 
 
-def _pin(name):
-    """Return a board pin alias and fail with a clear error when missing."""
-    if not hasattr(Pin.board, name):
-        raise RuntimeError("Missing board pin alias in firmware: %s" % name)
-    return getattr(Pin.board, name)
-
+@_hot_path
+def _touch_into(dev, data):
+    """Read one CST816S report and store clamped coordinates into `data`.
 
-def _gpio_num(pin_obj):
-    """Normalize Pin/int/string-like identifiers to a numeric GPIO index."""
-    if isinstance(pin_obj, int):
-        return pin_obj
+    Returns True while a finger is down. Reads registers 0x02..0x06
+    (finger count, X high/low, Y high/low) through the reusable adapter
+    buffers, so no intermediate tuple or parsing objects are created.
+    """
+    buf = dev.read(5, _TOUCH_REG_REPORT)
+    if not buf[0] & 0x0F:
+        return False
 
-    try:
-        return int(pin_obj)
-    except Exception:
-        pass
-
-    pin_id = getattr(pin_obj, "id", None)
-    if callable(pin_id):
-        try:
-            pin_id = pin_id()
-        except Exception:
-            pin_id = None
-
-    if isinstance(pin_id, int):
-        return pin_id
-
-    if isinstance(pin_id, str):
-        if pin_id.startswith("GPIO"):
-            return int(pin_id[4:])
-        if pin_id.startswith("GP"):
-            return int(pin_id[2:])
-        if pin_id.isdigit():
-            return int(pin_id)
-
-    pin_str = str(pin_obj)
-    for prefix in ("GPIO", "GP"):
-        idx = pin_str.find(prefix)
-        if idx >= 0:
-            idx += len(prefix)
-            digits = ""
-            while idx < len(pin_str) and pin_str[idx].isdigit():
-                digits += pin_str[idx]
-                idx += 1
-            if digits:
-                return int(digits)
-
-    raise RuntimeError("Cannot resolve pin alias to GPIO number: %s" % pin_obj)
-
-
-def _pin_num(name):
-    """Resolve a board alias directly to GPIO number."""
-    return _gpio_num(_pin(name))
-
-
-def _touch_xy(sample):
-    """Convert touch sample to clamped (x, y) tuple or None when invalid."""
-    if not sample:
-        return None
-
-    try:
-        x, y = int(sample[0]), int(sample[1])
-    except Exception:
-        try:
-            x, y = int(sample.x), int(sample.y)
-        except Exception:
-            return None
-
-    if x < 0:
-        x = 0
-    elif x >= DISPLAY_WIDTH:
+    x = ((buf[1] & 0x0F) << 8) | buf[2]
+    y = ((buf[3] & 0x0F) << 8) | buf[4]
+    if x >= DISPLAY_WIDTH:
         x = DISPLAY_WIDTH - 1
-
-    if y < 0:
-        y = 0
-    elif y >= DISPLAY_HEIGHT:
+    if y >= DISPLAY_HEIGHT:
         y = DISPLAY_HEIGHT - 1
 
-    return (x, y)
+    point = data.point
+    point.x = x
+    point.y = y
+    return True
 
 
-def init_display():
-    """Initialize LVGL + GC9A01 display and return display object."""
-    lcd_rst = _pin_num("LCD_RST")
-    rst = Pin(lcd_rst, Pin.OUT)
-    rst.value(1)
-    time.sleep_ms(10)
+@_hot_path
+def _read_touch(dev, pending, state, data):
+    """LVGL pointer read on core 0: sample the controller when needed.
+
+    `pending` is the TP_INT flag (None to poll on every read) and `state[0]`
+    remembers whether a finger was down at the previous read.
+    """
+    if pending is not None:
+        # Releases are only observable through the bus, so keep reading
+        # while pressed even without a new edge.
+        if not pending[0] and not state[0]:
+            data.state = lv.INDEV_STATE.RELEASED
+            return
+        pending[0] = 0
+
+    try:
+        pressed = _touch_into(dev, data)
+    except OSError:
+        pressed = False
+
+    state[0] = pressed
+    data.state = lv.INDEV_STATE.PRESSED if pressed else lv.INDEV_STATE.RELEASED
+
+
+class _TouchMailbox:
+    """Touch sample published by core 1 and consumed by core 0.
+
+    `seq` is odd while core 1 is updating the sample; core 0 retries up to
+    CORE1_READ_RETRIES times to see the same even value before and after
+    copying. `point` refers back to the mailbox so _touch_into() can write
+    into it directly. The `last_*` fields hold the last consistent copy and
+    are only written by core 0.
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self.pressed = False
+        self.x = 0
+        self.y = 0
+        self.point = self
+        self.last_pressed = False
+        self.last_x = 0
+        self.last_y = 0
+
+
+class _FlushMailbox:
+    """Single flush request handed from core 0 to core 1.
+
+    Core 0 fills the slot and sets `pending`; core 1 clears it once the
+    request was submitted to the bus. The area is copied into a preallocated
+    struct because LVGL may reuse its own area after the callback returns.
+    """
+
+    def __init__(self, flush_cb):
+        self.flush_cb = flush_cb
+        self.pending = False
+        self.disp = None
+        self.color_p = None
+        self.area = lv.area_t()
+
+
+@_hot_path
+def _core1_sample_touch(dev, pending, box):
+    """Sample the controller on core 1 and publish it into `box`."""
+    if pending is not None:
+        if not pending[0] and not box.pressed:
+            return
+        pending[0] = 0
+
+    box.seq += 1
+    try:
+        box.pressed = _touch_into(dev, box)
+    except OSError:
+        box.pressed = False
+    box.seq += 1
+
+
+def _core1_main():
+    """Core 1 worker loop: serve flush requests and sample touch.
+
+    Core 1 only runs the display driver flush (window commands and the
+    lcd_bus transfer start) and CST816S register reads. No other LVGL call
+    is made here: with the rp2 lcd_bus DMA stage the flush-ready callback
+    is queued with mp_sched_schedule and runs on core 0, and LVGL timers,
+    indev reads and app callbacks stay on core 0 as well. Without that
+    stage the blocking transfer would call flush-ready from core 1, so do
+    not enable core1 mode with LCD_SPI_DMA=0.
+    """
+    state = _core1_state
+    flush = _core1_flush
+    touch = _core1_touch
+    next_touch = time.ticks_ms()
+    state[1] = 1
+    try:
+        while not state[0]:
+            if flush is not None and flush.pending:
+                # Claim first, then re-check the stop flag: core 0 sets the
+                # flag before checking the claim when it gives up waiting.
+                state[2] = 1
+                if state[0]:
+                    break
+                flush.flush_cb(flush.disp, flush.area, flush.color_p)
+                flush.pending = False
+                state[2] = 0
+                continue
+
+            if touch is not None and time.ticks_diff(time.ticks_ms(), next_touch) >= 0:
+                next_touch = time.ticks_add(time.ticks_ms(), CORE1_TOUCH_MS)
+                _core1_sample_touch(touch[0], touch[1], touch[2])
+                continue
+
+            time.sleep_ms(CORE1_IDLE_MS)
+    finally:
+        state[1] = 0
+
+
+def _core1_abandon(slot):
+    """Stop using a core 1 worker that did not take a flush request in time.
+
+    The pending request is flushed inline unless core 1 already claimed
+    it; a claimed one is stuck in the driver, so LVGL is only told the
+    buffer is free (that band is repainted on its next invalidation).
+    Later flushes go straight to the driver on core 0.
+    """
+    state = _core1_state
+    state[0] = 1
+    if state[2]:
+        slot.disp.flush_ready()
+    else:
+        slot.flush_cb(slot.disp, slot.area, slot.color_p)
+    slot.pending = False
+    if _core1_display is not None:
+        _core1_display._disp_drv.set_flush_cb(slot.flush_cb)
+    print("[WARN] core 1 flush timed out, flushing on core 0")
+
+
+@_hot_path
+def _core1_flush_cb(disp, area, color_p):
+    """Post a flush request to core 1 (runs on core 0 from LVGL refresh)."""
+    slot = _core1_flush
+    # Double buffering means at most one request is normally in flight;
+    # wait for core 1 to pick it up, or flush inline if it has stopped or
+    # does not answer within CORE1_FLUSH_TIMEOUT_MS.
+    if slot.pending:
+        start = time.ticks_ms()
+        while slot.pending:
+            if not _core1_state[1]:
+                slot.flush_cb(slot.disp, slot.area, slot.color_p)
+                slot.pending = False
+            elif time.ticks_diff(time.ticks_ms(), start) >= CORE1_FLUSH_TIMEOUT_MS:
+                _core1_abandon(slot)
+            else:
+                time.sleep_us(CORE1_WAIT_US)
+
+    if not _core1_state[1] or _core1_state[0]:
+        slot.flush_cb(disp, area, color_p)
+        return
+
+    dst = slot.area
+    dst.x1 = area.x1
+    dst.y1 = area.y1
+    dst.x2 = area.x2
+    dst.y2 = area.y2
+    slot.disp = disp
+    slot.color_p = color_p
+    slot.pending = True
+
+
+@_hot_path
+def _core1_read_cb(_, data):
+    """LVGL pointer read on core 0 from the core 1 touch mailbox.
+
+    Bounded: when core 1 keeps the sample busy for CORE1_READ_RETRIES
+    attempts the last consistent sample is reported again, and a stopped
+    (or stopping) worker reads as released.
+    """
+    if _core1_touch is None or not _core1_state[1] or _core1_state[0]:
+        data.state = lv.INDEV_STATE.RELEASED
+        return
+
+    box = _core1_touch[2]
+    tries = CORE1_READ_RETRIES
+    while tries:
+        tries -= 1
+        seq = box.seq
+        if seq & 1:
+            continue
+        pressed = box.pressed
+        x = box.x
+        y = box.y
+        if box.seq == seq:
+            box.last_pressed = pressed
+            box.last_x = x
+            box.last_y = y
+            break
+
+    if box.last_pressed:
+        point = data.point
+        point.x = box.last_x
+        point.y = box.last_y
+        data.state = lv.INDEV_STATE.PRESSED
+    else:
+        data.state = lv.INDEV_STATE.RELEASED
+
+
+def _start_core1(display):
+    """Move flush submission (and touch sampling when set up) to core 1."""
+    global _core1_flush, _core1_display
+    if _thread is None:
+        raise RuntimeError("_thread is not available in this firmware")
+
+    flush_cb = display._flush_cb
+    if _profiler is not None and _profiler.ENABLED:
+        flush_cb = _profiler.wrap_flush(flush_cb)
+
+    _core1_flush = _FlushMailbox(flush_cb)
+    _core1_display = display
+    _core1_state[0] = 0
+    _core1_state[1] = 1
+    _core1_state[2] = 0
+    try:
+        _thread.start_new_thread(_core1_main, ())
+    except OSError:
+        # Core 1 is already taken (e.g. by a thread from user code).
+        _core1_state[1] = 0
+        raise
+    display._disp_drv.set_flush_cb(_core1_flush_cb)
+    boot_mark("core1_started")
+
+
+def shutdown(timeout_ms=500):
+    """Stop the core 1 worker and restore core 0 flushing.
+
+    Call it before a soft reset (e.g. from a try/finally around the main
+    loop) so core 1 is not left running Python code from the old heap.
+    Returns True when the worker stopped, or was not running.
+    """
+    global _core1_flush, _core1_touch, _core1_display
+    if _core1_flush is None:
+        return True
+
+    _core1_state[0] = 1
+    start = time.ticks_ms()
+    while _core1_state[1] and time.ticks_diff(time.ticks_ms(), start) < timeout_ms:
+        time.sleep_ms(1)
+    stopped = not _core1_state[1]
+
+    slot = _core1_flush
+    if stopped and slot.pending:
+        # Complete the last request so LVGL is not left waiting on it.
+        slot.flush_cb(slot.disp, slot.area, slot.color_p)
+        slot.pending = False
+    if _core1_display is not None:
+        _core1_display._disp_drv.set_flush_cb(slot.flush_cb)
+    _core1_flush = None
+    _core1_touch = None
+    _core1_display = None
+    return stopped
+
+
+def boot_mark(phase):
+    """Record the current ticks_ms timestamp for a named init phase."""
+    BOOT_PHASES.append((phase, time.ticks_ms()))
+
+
+def boot_report():
+    """Print every recorded init phase and return the last timestamp (ms)."""
+    prev = None
+    for phase, stamp in BOOT_PHASES:
+        delta = 0 if prev is None else time.ticks_diff(stamp, prev)
+        print("[BOOT] %-14s %6d ms (+%d)" % (phase, stamp, delta))
+        prev = stamp
+    return prev
+
+
+def _panel_reset():
+    """Pulse the panel reset line and return the ticks_ms when it is ready."""
+    rst = Pin(PIN_LCD_RST, Pin.OUT)
     rst.value(0)
-    time.sleep_ms(20)
+    time.sleep_ms(1)
     rst.value(1)
-    time.sleep_ms(120)
+    return time.ticks_add(time.ticks_ms(), PANEL_RESET_SETTLE_MS)
+
+
+def _wait_until(deadline):
+    """Sleep until a ticks_ms deadline (no-op when it already passed)."""
+    remaining = time.ticks_diff(deadline, time.ticks_ms())
+    if remaining > 0:
+        time.sleep_ms(remaining)
+
+
+def _spi_freq():
+    """Return the calibrated LCD SPI clock, or SPI_FREQ when none is stored."""
+    if _spi_cal is None:
+        return SPI_FREQ
+    return _spi_cal.load(SPI_FREQ)
+
+
+def calibrate_spi(start=SPI_FREQ, stop=SPI_CAL_MAX_FREQ, step=SPI_CAL_STEP, rounds=8):
+    """Find, store and return the highest stable LCD SPI clock for this unit.
 
+    Run it from the REPL instead of init(), then reset the board so
+    init_display() picks up the stored clock.
+    """
+    if _spi_cal is None:
+        raise RuntimeError("lcd_spi_calibration is not frozen in this firmware")
+
+    _wait_until(_panel_reset())
+    dc = Pin(PIN_LCD_DC, Pin.OUT)
+    cs = Pin(PIN_LCD_CS, Pin.OUT, value=1)
+
+    def _open(freq):
+        return SPI(
+            1,
+            baudrate=freq,
+            polarity=1,
+            phase=1,
+            sck=PIN_LCD_CLK,
+            mosi=PIN_LCD_MOSI,
+            miso=PIN_LCD_MISO,
+        )
+
+    return _spi_cal.calibrate(_open, dc, cs, list(range(start, stop + 1, step)), rounds)
+
+
+def init_display(ready_at=None):
+    """Initialize LVGL + GC9A01 display and return display object.
+
+    The panel is reset exactly once: here, or by the caller that passes the
+    `ready_at` deadline returned by _panel_reset().
+    """
+    if ready_at is None:
+        ready_at = _panel_reset()
+    _wait_until(ready_at)
+    boot_mark("panel_ready")
+
+    spi_freq = _spi_freq()
     spi = SPI(
         1,
-        baudrate=SPI_FREQ,
-        sck=_pin_num("LCD_CLK"),
-        mosi=_pin_num("LCD_MOSI"),
-        miso=_pin_num("LCD_MISO"),
+        baudrate=spi_freq,
+        sck=PIN_LCD_CLK,
+        mosi=PIN_LCD_MOSI,
+        miso=PIN_LCD_MISO,
     )
 
     bus = lcd_bus.SPIBus(
         spi_bus=spi,
-        dc=_pin_num("LCD_DC"),
-        cs=_pin_num("LCD_CS"),
-        freq=SPI_FREQ,
+        dc=PIN_LCD_DC,
+        cs=PIN_LCD_CS,
+        freq=spi_freq,
         spi_mode=3,
         lsb_first=False,
         dc_low_on_data=False,
@@ -156,9 +543,11 @@ def init_display():
         data_bus=bus,
         display_width=DISPLAY_WIDTH,
         display_height=DISPLAY_HEIGHT,
-        reset_pin=lcd_rst,
+        frame_buffer1=bytearray(FRAME_BUFFER_SIZE),
+        frame_buffer2=bytearray(FRAME_BUFFER_SIZE),
+        reset_pin=None,
         reset_state=gc9a01.STATE_LOW,
-        backlight_pin=_pin_num("LCD_BL"),
+        backlight_pin=PIN_LCD_BL,
         backlight_on_state=gc9a01.STATE_HIGH,
         color_space=lv.COLOR_FORMAT.RGB565,
         color_byte_order=gc9a01.BYTE_ORDER_RGB,
@@ -166,44 +555,138 @@ def init_display():
         _init_bus=True,
     )
 
+    if _profiler is not None and _profiler.ENABLED:
+        display._disp_drv.set_flush_cb(_profiler.wrap_flush(display._flush_cb))
+
     display._disp_drv.set_default()
     display.init()
     display.set_backlight(100)
+    boot_mark("display_ready")
     return display
 
 
-def init_touch():
-    """Initialize touch driver and bind it to an LVGL pointer input device."""
+def _attach_touch_irq():
+    """Arm TP_INT and return a one-slot flag set by each falling edge."""
+    global _touch_int_pin
+    pending = bytearray(b"\x01")
+
+    def _on_touch_irq(_pin):
+        pending[0] = 1
+        if _wake_runloop is not None:
+            _wake_runloop()
+
+    _touch_int_pin = Pin(PIN_TP_INT, Pin.IN, Pin.PULL_UP)
+    _touch_int_pin.irq(trigger=Pin.IRQ_FALLING, handler=_on_touch_irq)
+    return pending
+
+
+def _touch_identify(touch_dev):
+    """Check the CST816S chip id and enable its touch/change interrupts.
+
+    The lvgl_micropython cst816s driver is not used: it registers a polling
+    LVGL input device of its own next to the one created by init_touch().
+    """
+    chip_id = touch_dev.read(1, _TOUCH_REG_CHIP_ID)[0]
+    if chip_id not in _TOUCH_CHIP_IDS:
+        raise RuntimeError("CST816S not found (chip id 0x%02X)" % chip_id)
+    touch_dev.write(bytes((_TOUCH_REG_IRQ_CTL, _TOUCH_IRQ_TOUCH_CHANGE)))
+
+
+def _touch_setup():
+    """Create the touch I2C bus and pulse TP_RST; return (device, ready_at).
+
+    Only the bus and the reset line are touched, so it can run before LVGL
+    and the display exist. `ready_at` is the ticks_ms deadline after which
+    the controller answers on I2C.
+    """
     i2c = I2C(
         1,
-        scl=Pin(_pin_num("TP_SCL")),
-        sda=Pin(_pin_num("TP_SDA")),
+        scl=Pin(PIN_TP_SCL),
+        sda=Pin(PIN_TP_SDA),
         freq=I2C_FREQ,
     )
-    touch = cst816s.CST816S(_CompatI2CDevice(i2c, TOUCH_I2C_ADDR), _pin_num("TP_RST"))
+    touch_dev = _CompatI2CDevice(i2c, TOUCH_I2C_ADDR)
+    rst = Pin(PIN_TP_RST, Pin.OUT)
+    rst.value(0)
+    time.sleep_ms(5)
+    rst.value(1)
+    boot_mark("touch_bus_ready")
+    return touch_dev, time.ticks_add(time.ticks_ms(), TOUCH_RESET_SETTLE_MS)
+
+
+def init_touch(use_irq=TOUCH_USE_IRQ, touch_dev=None, core1=False, ready_at=None):
+    """Bring up the touch controller and bind it to an LVGL pointer input device.
+
+    With `use_irq` the I2C bus is only accessed after a TP_INT edge or while
+    a press is in progress; otherwise the controller is polled on each read.
+    `touch_dev` and `ready_at` reuse a device already reset by _touch_setup().
+    With `core1` the bus is sampled by the core 1 worker started from init()
+    and the read callback only copies the latest sample. Call it after
+    init_display(): the input device needs LVGL and a default display.
+    """
+    global _core1_touch
+    if touch_dev is None:
+        touch_dev, ready_at = _touch_setup()
+    if ready_at is not None:
+        _wait_until(ready_at)
+    _touch_identify(touch_dev)
+    boot_mark("touch_ready")
+
+    pending = _attach_touch_irq() if use_irq else None
 
     indev = lv.indev_create()
     indev.set_type(lv.INDEV_TYPE.POINTER)
 
+    if core1:
+        _core1_touch = (touch_dev, pending, _TouchMailbox())
+        read_cb = _core1_read_cb
+        if _profiler is not None:
+            read_cb = _profiler.wrap(_profiler.TOUCH, read_cb, 2)
+        indev.set_read_cb(read_cb)
+        return indev
+
+    state = bytearray(1)
+
+    # Closures stay bytecode (the native emitter handles them poorly); the
+    # per-read work is in the _read_touch() hot path.
     def _read_cb(_, data):
-        """Poll touch controller and feed LVGL pointer state."""
-        try:
-            xy = _touch_xy(touch.read())
-        except OSError:
-            xy = None
-
-        if xy:
-            data.point.x, data.point.y = xy
-            data.state = lv.INDEV_STATE.PRESSED
-        else:
-            data.state = lv.INDEV_STATE.RELEASED
+        _read_touch(touch_dev, pending, state, data)
 
+    if _profiler is not None:
+        _read_cb = _profiler.wrap(_profiler.TOUCH, _read_cb, 2)
     indev.set_read_cb(_read_cb)
     return indev
 
 
-def init(touch=True):
-    """Initialize display and optional touch, returning (display, indev)."""
-    display = init_display()
-    indev = init_touch() if touch else None
+def init(touch=True, touch_irq=TOUCH_USE_IRQ, profile=False, fast_boot=FAST_BOOT, core1=CORE1_MODE):
+    """Initialize display and optional touch, returning (display, indev).
+
+    `profile` enables lvgl_profiler instrumentation of flush and touch reads.
+    With `fast_boot` the touch I2C bus is created and TP_RST pulsed while
+    the panel is still in its post-reset delay; the controller is identified
+    and its input device created after the display, so the reset delays
+    overlap. Phase timestamps land in BOOT_PHASES.
+    With `core1` flush submission and touch sampling run on the second core;
+    call shutdown() before a soft reset.
+    """
+    shutdown()
+    boot_mark("init")
+    if profile and _profiler is not None:
+        _profiler.enable()
+
+    touch_dev = touch_ready_at = None
+    if fast_boot:
+        ready_at = _panel_reset()
+        if touch:
+            touch_dev, touch_ready_at = _touch_setup()
+        display = init_display(ready_at)
+    else:
+        display = init_display()
+
+    indev = None
+    if touch:
+        indev = init_touch(use_irq=touch_irq, touch_dev=touch_dev, core1=core1, ready_at=touch_ready_at)
+    if core1:
+        _start_core1(display)
+    boot_mark("init_done")
     return display, indev
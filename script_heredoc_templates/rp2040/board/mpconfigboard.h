@@ -4,7 +4,8 @@
 // See: ./LICENSE.md
 // Board config for Waveshare RP2040-Touch-LCD-1.28
 // Total flash: 2048 KB
-// Reserve 1024 KB for firmware and 1024 KB for filesystem.
 // MICROPY_HW_FLASH_STORAGE_BYTES is the filesystem slice visible to MicroPython.
+// The build rewrites it from the flash layout (FLASH_LAYOUT, common/flash_layout.py);
+// the value below is the fixed 1024 KB firmware / 1024 KB filesystem split.
 #define MICROPY_HW_BOARD_NAME                   "Waveshare RP2040-Touch-LCD-1.28"
 #define MICROPY_HW_FLASH_STORAGE_BYTES          (1024 * 1024)
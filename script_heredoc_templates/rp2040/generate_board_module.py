@@ -0,0 +1,72 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Render the RP2040 frozen board module with pin aliases baked as GPIO numbers."""
+
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "common"))
+from hot_paths import apply_emitter  # noqa: E402
+
+# Template board module, board pins.csv, rendered output path and the
+# emitter baked into @_hot_path functions (bytecode|native|viper).
+template_path = Path(sys.argv[1])
+pins_path = Path(sys.argv[2])
+out_path = Path(sys.argv[3])
+emitter = sys.argv[4] if len(sys.argv) > 4 else "bytecode"
+
+BEGIN_MARKER = "# --- BEGIN BOARD PINS ---"
+END_MARKER = "# --- END BOARD PINS ---"
+
+# Parse alias -> GPIO number from the same pins.csv frozen into the board.
+gpio_by_alias = {}
+for lineno, line in enumerate(pins_path.read_text(encoding="utf-8").splitlines(), start=1):
+    line = line.strip()
+    if not line or line.startswith("#"):
+        continue
+    parts = [part.strip() for part in line.split(",")]
+    if len(parts) < 2:
+        raise SystemExit(f"{pins_path}:{lineno}: expected 'ALIAS,GPIOn', got {line!r}")
+    match = re.fullmatch(r"GPIO(\d+)", parts[1])
+    if not match:
+        raise SystemExit(f"{pins_path}:{lineno}: unsupported pin {parts[1]!r} for alias {parts[0]!r}")
+    gpio_by_alias[parts[0]] = int(match.group(1))
+
+template = template_path.read_text(encoding="utf-8")
+start = template.find(BEGIN_MARKER)
+end = template.find(END_MARKER)
+if start < 0 or end < start:
+    raise SystemExit(f"Board pin markers not found in template: {template_path}")
+
+# Each template line looks like: PIN_<NAME> = "<alias>"
+block = template[start:end]
+pin_line = re.compile(r'^(PIN_[A-Z0-9_]+) = "([A-Za-z0-9_]+)"$', re.MULTILINE)
+missing = []
+
+
+def _resolve(match):
+    alias = match.group(2)
+    if alias not in gpio_by_alias:
+        missing.append(alias)
+        return match.group(0)
+    return f"{match.group(1)} = {gpio_by_alias[alias]}"
+
+
+rendered_block, count = pin_line.subn(_resolve, block)
+if count == 0:
+    raise SystemExit(f"No board pin assignments found between markers in {template_path}")
+if missing:
+    raise SystemExit(f"Missing board pin alias in {pins_path}: {', '.join(missing)}")
+
+out_path.parent.mkdir(parents=True, exist_ok=True)
+rendered = template[:start] + rendered_block + template[end:]
+rendered, hot_paths = apply_emitter(rendered, emitter)
+if not out_path.exists() or out_path.read_text(encoding="utf-8") != rendered:
+    out_path.write_text(rendered, encoding="utf-8")
+    print(f"Updated: {out_path}")
+
+print(f"OK: {count} board pins resolved from {pins_path.name}")
+print(f"OK: {hot_paths} hot paths compiled as {emitter}")
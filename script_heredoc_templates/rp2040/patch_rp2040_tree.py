@@ -3,327 +3,408 @@
 # Created: 2026-02-20
 # License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
 # See: ./LICENSE.md
-"""Apply rp2040 build patches required by lvgl_micropython."""
+"""Apply rp2040 build patches required by lvgl_micropython.
+
+Patch manifest for common/patch_engine.py. Optional edits are enabled with
+`--enable debug` (debug prints) and `--enable spi_dma` (DMA color transfers).
+"""
 
 from __future__ import annotations
 
-import argparse
-import os
 import re
 import sys
-
-
-def read_text(path: str) -> str:
-    """Read UTF-8 text file."""
-    with open(path, "r", encoding="utf-8") as fh:
-        return fh.read()
-
-
-def write_text(path: str, content: str) -> None:
-    """Write UTF-8 text file."""
-    with open(path, "w", encoding="utf-8") as fh:
-        fh.write(content)
-
-
-def patch_micropython_cmake(path: str) -> bool:
-    """Patch ext_mod/lvgl/micropython.cmake for RP2040 build compatibility."""
-    content = read_text(path)
-    changed = False
-
-    # Inject robust GEN_SCRIPT/LV_PORT resolution once.
-    if "_GEN_SCRIPT_VAL" not in content:
-        block = (
-            "# --- Robust GEN_SCRIPT (cmake > env > default python) ---\n"
-            "if(DEFINED GEN_SCRIPT AND NOT \"${GEN_SCRIPT}\" STREQUAL \"\")\n"
-            "    set(_GEN_SCRIPT_VAL \"${GEN_SCRIPT}\")\n"
-            "elseif(NOT \"$ENV{GEN_SCRIPT}\" STREQUAL \"\")\n"
-            "    set(_GEN_SCRIPT_VAL \"$ENV{GEN_SCRIPT}\")\n"
-            "else()\n"
-            "    set(_GEN_SCRIPT_VAL \"python\")\n"
-            "endif()\n"
-            "# --- Robust LV_PORT (cmake > env > default rp2) ---\n"
-            "if(DEFINED LV_PORT AND NOT \"${LV_PORT}\" STREQUAL \"\")\n"
-            "    set(_LV_PORT_VAL \"${LV_PORT}\")\n"
-            "elseif(NOT \"$ENV{LV_PORT}\" STREQUAL \"\")\n"
-            "    set(_LV_PORT_VAL \"$ENV{LV_PORT}\")\n"
-            "else()\n"
-            "    set(_LV_PORT_VAL \"rp2\")\n"
-            "endif()\n"
-            "\n"
-        )
-
-        anchor = "set(LVGL_DIR "
-        if anchor not in content:
-            raise RuntimeError("set(LVGL_DIR anchor not found")
-
-        content = content.replace(anchor, block + anchor, 1)
-        content = content.replace(
-            "$ENV{GEN_SCRIPT}_api_gen_mpy.py",
-            "${_GEN_SCRIPT_VAL}_api_gen_mpy.py",
-        )
-        content = content.replace("--board=$ENV{LV_PORT}", "--board=${_LV_PORT_VAL}")
-        changed = True
-
-    # Replace fragile LV_CFLAGS/SECOND_BUILD env handling with explicit fallback logic.
-    if "_SECOND_BUILD_VAL" not in content:
-        pat = re.compile(
-            r"separate_arguments\s*\(\s*LV_CFLAGS_ENV\s+UNIX_COMMAND\s+\$ENV\{LV_CFLAGS\}\s*\)"
-            r".*?"
-            r"separate_arguments\s*\(\s*SECOND_BUILD_ENV\s+UNIX_COMMAND\s+\$ENV\{SECOND_BUILD\}\s*\)",
-            re.DOTALL,
-        )
-
-        new_block = (
-            "# --- Robust SECOND_BUILD (cmake > env > default 0) ---\n"
-            "if(DEFINED SECOND_BUILD AND NOT \"${SECOND_BUILD}\" STREQUAL \"\")\n"
-            "    set(_SECOND_BUILD_VAL \"${SECOND_BUILD}\")\n"
-            "elseif(NOT \"$ENV{SECOND_BUILD}\" STREQUAL \"\")\n"
-            "    set(_SECOND_BUILD_VAL \"$ENV{SECOND_BUILD}\")\n"
-            "else()\n"
-            "    set(_SECOND_BUILD_VAL \"0\")\n"
-            "endif()\n"
-            "separate_arguments(SECOND_BUILD_ENV UNIX_COMMAND ${_SECOND_BUILD_VAL})\n"
-            "# --- Robust LV_CFLAGS (cmake > env > default empty) ---\n"
-            "if(DEFINED LV_CFLAGS_EXTRA AND NOT \"${LV_CFLAGS_EXTRA}\" STREQUAL \"\")\n"
-            "    separate_arguments(LV_CFLAGS_ENV UNIX_COMMAND ${LV_CFLAGS_EXTRA})\n"
-            "elseif(NOT \"$ENV{LV_CFLAGS}\" STREQUAL \"\")\n"
-            "    separate_arguments(LV_CFLAGS_ENV UNIX_COMMAND $ENV{LV_CFLAGS})\n"
-            "else()\n"
-            "    set(LV_CFLAGS_ENV \"\")\n"
-            "endif()\n"
-            "list(APPEND LV_CFLAGS\n"
-            "    ${LV_CFLAGS_ENV}\n"
-            "    -Wno-unused-function\n"
-            "    -DMICROPY_FLOAT=1\n"
-            ")\n"
-        )
-
-        m = pat.search(content)
-        if not m:
-            raise RuntimeError("LV_CFLAGS/SECOND_BUILD block not found")
-
-        content = content[: m.start()] + new_block + content[m.end() :]
-        changed = True
-
-    # Ensure machine_spi patch script is executed from CMake configure step.
-    if "patch_spi_api.py" not in content:
-        cmake_patch = (
-            "\n"
-            "# --- Patch machine_spi.c after git submodule reset ---\n"
-            "execute_process(\n"
-            "    COMMAND\n"
-            "        ${Python3_EXECUTABLE}\n"
-            "        ${BINDING_DIR}/gen/patch_spi_api.py\n"
-            "        ${BINDING_DIR}/lib/micropython/ports/rp2/machine_spi.c\n"
-            "    RESULT_VARIABLE _spi_result\n"
-            "    OUTPUT_VARIABLE _spi_output\n"
-            "    OUTPUT_STRIP_TRAILING_WHITESPACE\n"
-            ")\n"
-            "if(NOT \"${_spi_output}\" STREQUAL \"\")\n"
-            "    message(STATUS \"SPI patch: ${_spi_output}\")\n"
-            "endif()\n"
-            "\n"
-        )
-
-        anchor = "set(LVGL_DIR "
-        if anchor not in content:
-            raise RuntimeError("set(LVGL_DIR anchor not found")
-
-        pos = content.find("\n", content.find(anchor)) + 1
-        content = content[:pos] + cmake_patch + content[pos:]
-        changed = True
-
-    if changed:
-        write_text(path, content)
-
-    return changed
-
-
-def patch_lvgl_api_gen(path: str) -> bool:
-    """Patch LVGL API generator call signature expected by current codebase."""
-    content = read_text(path)
-    old = "stub_gen.run(args.metadata)"
-    new = "stub_gen.run(args.metadata, args.metadata)"
-
-    if new in content:
-        return False
-
-    if old not in content:
-        raise RuntimeError("stub_gen.run pattern not found")
-
-    write_text(path, content.replace(old, new))
-    return True
-
-
-def patch_lcd_bus(base: str, enable_debug: bool) -> bool:
-    """Apply lcd_bus C/C header compatibility patches for RP2040 integration."""
-    changed = False
-
-    # Paths touched inside ext_mod/lcd_bus.
-    spi_h = os.path.join(base, "common_include", "spi_bus.h")
-    spi_c = os.path.join(base, "common_src", "spi_bus.c")
-    i80_h = os.path.join(base, "common_include", "i80_bus.h")
-    lcd_types_c = os.path.join(base, "lcd_types.c")
-
-    h = read_text(spi_h)
-    old_h = h
-    h = h.replace("mp_mp_machine_hw_spi_device_obj_t", "mp_machine_hw_spi_device_obj_t")
-    h = re.sub(r"(?<!mp_)machine_hw_spi_device_obj_t", "mp_machine_hw_spi_device_obj_t", h)
-
-    modmachine_inc = '#include "extmod/modmachine.h"'
-    if modmachine_inc not in h:
-        first_inc = h.find("#include")
-        if first_inc == -1:
-            raise RuntimeError("No #include found in spi_bus.h")
-        eol = h.find("\n", first_inc) + 1
-        h = h[:eol] + modmachine_inc + "\n" + h[eol:]
-
-    old_layout = "void *buf2;\n\n            bool trans_done;"
-    new_layout = "void *buf2;\n            uint32_t buffer_flags;\n\n            bool trans_done;"
-    h = h.replace(old_layout, new_layout)
-
-    if h != old_h:
-        write_text(spi_h, h)
-        changed = True
-
-    # Keep i80 header layout aligned when present.
-    if os.path.exists(i80_h):
-        i80 = read_text(i80_h)
-        i80_new = i80.replace(old_layout, new_layout)
-        if i80_new != i80:
-            write_text(i80_h, i80_new)
-            changed = True
-
-    c = read_text(spi_c)
-    old_c = c
-
-    c = c.replace("mp_mp_machine_hw_spi_device_obj_t", "mp_machine_hw_spi_device_obj_t")
-    c = re.sub(r"(?<!mp_)machine_hw_spi_device_obj_t", "mp_machine_hw_spi_device_obj_t", c)
-    c = c.replace("->spi_bus->mosi", "->spi_bus->data1")
-    c = c.replace("->spi_bus->miso", "->spi_bus->data0")
-
-    if modmachine_inc not in c:
-        first_inc = c.find("#include")
-        if first_inc == -1:
-            raise RuntimeError("No #include found in spi_bus.c")
-        eol = c.find("\n", first_inc) + 1
-        c = c[:eol] + modmachine_inc + "\n" + c[eol:]
-
-    init_marker = "self->panel_io_handle.del = s_spi_del;"
-    extra_init = (
-        "self->buf1 = NULL;\n"
-        "        self->buf2 = NULL;\n"
-        "        self->buffer_flags = 0;\n"
-        "        self->trans_done = false;\n"
-        "        self->rgb565_byte_swap = false;\n"
-        "        self->panel_io_handle.allocate_framebuffer = NULL;\n"
-        "        self->panel_io_handle.free_framebuffer = NULL;\n\n"
-        "        "
-    )
-
-    if "self->buf1 = NULL;" not in c:
-        if init_marker not in c:
-            raise RuntimeError("spi_bus.c init marker not found")
-        c = c.replace(init_marker, extra_init + init_marker)
-
-    old_firstbit = (
-        "if (args[ARG_lsb_first].u_bool) {\n"
-        "            self->firstbit = 1;\n"
-        "        } else {\n"
-        "            self->firstbit = 0;\n"
-        "        }"
-    )
-    new_firstbit = (
-        "if (args[ARG_lsb_first].u_bool) {\n"
-        "            self->firstbit = 0;  // SPI_LSB_FIRST\n"
-        "        } else {\n"
-        "            self->firstbit = 1;  // SPI_MSB_FIRST\n"
-        "        }"
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+sys.path[:0] = [str(_HERE), str(_HERE.parent / "common")]
+from patch_engine import DriftError, build_parser, run  # noqa: E402
+
+# --- ext_mod/lvgl/micropython.cmake ---------------------------------------
+
+# Robust GEN_SCRIPT/LV_PORT resolution, injected before set(LVGL_DIR ...).
+GEN_SCRIPT_BLOCK = (
+    "# --- Robust GEN_SCRIPT (cmake > env > default python) ---\n"
+    "if(DEFINED GEN_SCRIPT AND NOT \"${GEN_SCRIPT}\" STREQUAL \"\")\n"
+    "    set(_GEN_SCRIPT_VAL \"${GEN_SCRIPT}\")\n"
+    "elseif(NOT \"$ENV{GEN_SCRIPT}\" STREQUAL \"\")\n"
+    "    set(_GEN_SCRIPT_VAL \"$ENV{GEN_SCRIPT}\")\n"
+    "else()\n"
+    "    set(_GEN_SCRIPT_VAL \"python\")\n"
+    "endif()\n"
+    "# --- Robust LV_PORT (cmake > env > default rp2) ---\n"
+    "if(DEFINED LV_PORT AND NOT \"${LV_PORT}\" STREQUAL \"\")\n"
+    "    set(_LV_PORT_VAL \"${LV_PORT}\")\n"
+    "elseif(NOT \"$ENV{LV_PORT}\" STREQUAL \"\")\n"
+    "    set(_LV_PORT_VAL \"$ENV{LV_PORT}\")\n"
+    "else()\n"
+    "    set(_LV_PORT_VAL \"rp2\")\n"
+    "endif()\n"
+    "\n"
+)
+
+# Replaces the fragile LV_CFLAGS/SECOND_BUILD env handling with explicit fallbacks.
+CFLAGS_BLOCK = (
+    "# --- Robust SECOND_BUILD (cmake > env > default 0) ---\n"
+    "if(DEFINED SECOND_BUILD AND NOT \"${SECOND_BUILD}\" STREQUAL \"\")\n"
+    "    set(_SECOND_BUILD_VAL \"${SECOND_BUILD}\")\n"
+    "elseif(NOT \"$ENV{SECOND_BUILD}\" STREQUAL \"\")\n"
+    "    set(_SECOND_BUILD_VAL \"$ENV{SECOND_BUILD}\")\n"
+    "else()\n"
+    "    set(_SECOND_BUILD_VAL \"0\")\n"
+    "endif()\n"
+    "separate_arguments(SECOND_BUILD_ENV UNIX_COMMAND ${_SECOND_BUILD_VAL})\n"
+    "# --- Robust LV_CFLAGS (cmake > env > default empty) ---\n"
+    "if(DEFINED LV_CFLAGS_EXTRA AND NOT \"${LV_CFLAGS_EXTRA}\" STREQUAL \"\")\n"
+    "    separate_arguments(LV_CFLAGS_ENV UNIX_COMMAND ${LV_CFLAGS_EXTRA})\n"
+    "elseif(NOT \"$ENV{LV_CFLAGS}\" STREQUAL \"\")\n"
+    "    separate_arguments(LV_CFLAGS_ENV UNIX_COMMAND $ENV{LV_CFLAGS})\n"
+    "else()\n"
+    "    set(LV_CFLAGS_ENV \"\")\n"
+    "endif()\n"
+    "list(APPEND LV_CFLAGS\n"
+    "    ${LV_CFLAGS_ENV}\n"
+    "    -Wno-unused-function\n"
+    "    -DMICROPY_FLOAT=1\n"
+    ")\n"
+)
+
+# Re-patch machine_spi.c from the CMake configure step (after submodule resets).
+SPI_HOOK_BLOCK = (
+    "\n"
+    "# --- Patch machine_spi.c after git submodule reset ---\n"
+    "execute_process(\n"
+    "    COMMAND\n"
+    "        ${Python3_EXECUTABLE}\n"
+    "        ${BINDING_DIR}/gen/patch_spi_api.py\n"
+    "        ${BINDING_DIR}/lib/micropython/ports/rp2/machine_spi.c\n"
+    "    RESULT_VARIABLE _spi_result\n"
+    "    OUTPUT_VARIABLE _spi_output\n"
+    "    OUTPUT_STRIP_TRAILING_WHITESPACE\n"
+    ")\n"
+    "if(NOT \"${_spi_output}\" STREQUAL \"\")\n"
+    "    message(STATUS \"SPI patch: ${_spi_output}\")\n"
+    "endif()\n"
+    "\n"
+)
+
+# --- ext_mod/lcd_bus ----------------------------------------------------
+
+MODMACHINE_INCLUDE = '#include "extmod/modmachine.h"'
+OLD_LAYOUT = "void *buf2;\n\n            bool trans_done;"
+NEW_LAYOUT = "void *buf2;\n            uint32_t buffer_flags;\n\n            bool trans_done;"
+SPI_INIT_MARKER = "self->panel_io_handle.del = s_spi_del;"
+SPI_EXTRA_INIT = (
+    "self->buf1 = NULL;\n"
+    "        self->buf2 = NULL;\n"
+    "        self->buffer_flags = 0;\n"
+    "        self->trans_done = false;\n"
+    "        self->rgb565_byte_swap = false;\n"
+    "        self->panel_io_handle.allocate_framebuffer = NULL;\n"
+    "        self->panel_io_handle.free_framebuffer = NULL;\n\n"
+    "        "
+)
+OLD_FIRSTBIT = (
+    "if (args[ARG_lsb_first].u_bool) {\n"
+    "            self->firstbit = 1;\n"
+    "        } else {\n"
+    "            self->firstbit = 0;\n"
+    "        }"
+)
+NEW_FIRSTBIT = (
+    "if (args[ARG_lsb_first].u_bool) {\n"
+    "            self->firstbit = 0;  // SPI_LSB_FIRST\n"
+    "        } else {\n"
+    "            self->firstbit = 1;  // SPI_MSB_FIRST\n"
+    "        }"
+)
+
+# Debug print injection for patch troubleshooting (--enable debug).
+DEBUG_INIT_MARKER = (
+    "mp_lcd_err_t s_spi_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
+    "    {"
+)
+DEBUG_INIT_BODY = (
+    "mp_lcd_err_t s_spi_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
+    "    {\n"
+    "        mp_printf(&mp_plat_print, \"  [DBG] s_spi_init ENTER\\n\");"
+)
+OLD_PANEL_IO_INIT = (
+    "mp_lcd_err_t lcd_panel_io_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
+    "{\n"
+    "    mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)obj;\n\n"
+    "    return self->panel_io_handle.init"
+)
+NEW_PANEL_IO_INIT = (
+    "mp_lcd_err_t lcd_panel_io_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
+    "{\n"
+    "    mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)obj;\n"
+    "    mp_printf(&mp_plat_print, \"  [DBG] lcd_panel_io_init: init_fn=%p\\n\", self->panel_io_handle.init);\n\n"
+    "    return self->panel_io_handle.init"
+)
+
+MAKE_NEW_LINE = "spi = MP_OBJ_TO_PTR(MP_OBJ_TYPE_GET_SLOT(&machine_spi_type, make_new)"
+
+
+def debug_make_new(c: str, context: dict) -> str:
+    """Print before/after the machine SPI make_new call in s_spi_init."""
+    if "DBG] before make_new" in c or MAKE_NEW_LINE not in c:
+        return c
+    idx = c.find(MAKE_NEW_LINE)
+    c = c[:idx] + 'mp_printf(&mp_plat_print, "  [DBG] before make_new\\n");\n        ' + c[idx:]
+    idx2 = c.find(";", c.find(MAKE_NEW_LINE)) + 1
+    return c[:idx2] + '\n        mp_printf(&mp_plat_print, "  [DBG] after make_new\\n");' + c[idx2:]
+
+
+LCD_DMA_MARKER = "LCD_BUS_RP2_DMA"
+
+# Self-contained rp2 DMA engine injected into spi_bus.c. Color transfers are
+# pushed to the SPI TX FIFO by one DMA channel; the completion IRQ schedules the
+# flush-ready callback so LVGL renders the next partial buffer meanwhile.
+# CS is left asserted until the next transaction, which first waits for the
+# DMA channel and the SPI shifter to drain.
+LCD_DMA_BLOCK = """
+// --- LCD_BUS_RP2_DMA: non-blocking color transfers (begin) ---
+#if defined(PICO_RP2040) && PICO_RP2040
+#include "py/runtime.h"
+#include "hardware/dma.h"
+#include "hardware/irq.h"
+#include "hardware/spi.h"
+
+typedef struct _lcd_bus_rp2_dma_t {
+    int channel;
+    volatile bool active;
+    spi_inst_t *spi;
+    mp_lcd_spi_bus_obj_t *owner;
+} lcd_bus_rp2_dma_t;
+
+static lcd_bus_rp2_dma_t lcd_bus_rp2_dma = { -1, false, NULL, NULL };
+
+static void lcd_bus_rp2_dma_irq_handler(void)
+{
+    int ch = lcd_bus_rp2_dma.channel;
+    if (ch < 0 || !dma_channel_get_irq1_status(ch)) {
+        return;
+    }
+    dma_channel_acknowledge_irq1(ch);
+
+    // The whole buffer is in the SPI FIFO: LVGL may render into it again.
+    mp_lcd_spi_bus_obj_t *self = lcd_bus_rp2_dma.owner;
+    if (self != NULL && self->callback != mp_const_none) {
+        mp_sched_schedule(self->callback, MP_OBJ_FROM_PTR(self));
+    }
+}
+
+static void lcd_bus_rp2_dma_wait(void)
+{
+    if (!lcd_bus_rp2_dma.active) {
+        return;
+    }
+
+    spi_inst_t *spi = lcd_bus_rp2_dma.spi;
+    while (dma_channel_is_busy(lcd_bus_rp2_dma.channel)) {
+        tight_loop_contents();
+    }
+    while (spi_is_busy(spi)) {
+        tight_loop_contents();
+    }
+    // TX-only DMA leaves stale bytes and an overrun flag on the RX side.
+    while (spi_is_readable(spi)) {
+        (void)spi_get_hw(spi)->dr;
+    }
+    spi_get_hw(spi)->icr = SPI_SSPICR_RORIC_BITS;
+    lcd_bus_rp2_dma.active = false;
+}
+
+static bool lcd_bus_rp2_dma_start(mp_lcd_spi_bus_obj_t *self, uint8_t host, const void *buf, size_t len)
+{
+    if (len == 0 || host > 1) {
+        return false;
+    }
+
+    if (lcd_bus_rp2_dma.channel < 0) {
+        int ch = dma_claim_unused_channel(false);
+        if (ch < 0) {
+            return false;
+        }
+        lcd_bus_rp2_dma.channel = ch;
+        dma_channel_set_irq1_enabled(ch, true);
+        irq_add_shared_handler(DMA_IRQ_1, lcd_bus_rp2_dma_irq_handler, PICO_SHARED_IRQ_HANDLER_DEFAULT_ORDER_PRIORITY);
+        irq_set_enabled(DMA_IRQ_1, true);
+    }
+
+    spi_inst_t *spi = host == 0 ? spi0 : spi1;
+    dma_channel_config cfg = dma_channel_get_default_config(lcd_bus_rp2_dma.channel);
+    channel_config_set_transfer_data_size(&cfg, DMA_SIZE_8);
+    channel_config_set_read_increment(&cfg, true);
+    channel_config_set_write_increment(&cfg, false);
+    channel_config_set_dreq(&cfg, spi_get_dreq(spi, true));
+
+    lcd_bus_rp2_dma.spi = spi;
+    lcd_bus_rp2_dma.owner = self;
+    lcd_bus_rp2_dma.active = true;
+    dma_channel_configure(lcd_bus_rp2_dma.channel, &cfg, &spi_get_hw(spi)->dr, buf, len, true);
+    return true;
+}
+#else
+#define lcd_bus_rp2_dma_wait() ((void)0)
+#define lcd_bus_rp2_dma_start(self, host, buf, len) (false)
+#endif
+// --- LCD_BUS_RP2_DMA: non-blocking color transfers (end) ---
+
+"""
+
+
+def _function_body(content: str, signature: str) -> tuple[int, int]:
+    """Return (open_brace, close_brace) indexes of a C function definition."""
+    pat = re.compile(re.escape(signature) + r"\([^;{]*\)\s*\{", re.DOTALL)
+    m = pat.search(content)
+    if not m:
+        raise DriftError(f"{signature} definition not found")
+
+    open_idx = m.end() - 1
+    depth = 0
+    for idx in range(open_idx, len(content)):
+        if content[idx] == "{":
+            depth += 1
+        elif content[idx] == "}":
+            depth -= 1
+            if depth == 0:
+                return open_idx, idx
+    raise DriftError(f"{signature} body is not balanced")
+
+
+def lcd_bus_dma(c: str, context: dict) -> str:
+    """Make rp2 SPI color transfers DMA-driven and non-blocking."""
+    spi_common_h = context["root"] / "micropy_updates" / "common" / "mp_spi_common.h"
+
+    # The DMA engine needs the SPI host index exposed by the shared bus struct.
+    if not spi_common_h.exists() or not re.search(r"\bhost\s*;", spi_common_h.read_text(encoding="utf-8")):
+        raise DriftError("mp_spi_common.h does not expose the SPI bus host field")
+
+    bus_ref = re.search(r"(self->[A-Za-z0-9_.>\-]*?spi_bus)->", c)
+    if not bus_ref:
+        raise DriftError("spi_bus reference not found in spi_bus.c")
+    host_expr = f"{bus_ref.group(1)}->host"
+
+    # Route the color payload through DMA and fall back to the original
+    # blocking transfer when no channel is available.
+    open_idx, close_idx = _function_body(c, "mp_lcd_err_t s_spi_tx_color")
+    body = c[open_idx:close_idx]
+    send = re.search(r"^([ \t]*)([^\n;]*\bcolor_size\b[^\n;]*\);)[ \t]*$", body, re.MULTILINE)
+    if not send:
+        raise DriftError("s_spi_tx_color color transfer statement not found")
+
+    indent = send.group(1)
+    dma_send = (
+        f"{indent}if (lcd_bus_rp2_dma_start(self, {host_expr}, color, color_size)) {{\n"
+        f"{indent}    return LCD_OK;\n"
+        f"{indent}}}\n"
+        f"{indent}{send.group(2)}"
     )
-    c = c.replace(old_firstbit, new_firstbit)
-
-    # Optional debug print injection for patch troubleshooting.
-    if enable_debug:
-        debug_marker = (
-            "mp_lcd_err_t s_spi_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
-            "    {"
-        )
-        debug_body = (
-            "mp_lcd_err_t s_spi_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
-            "    {\n"
-            "        mp_printf(&mp_plat_print, \"  [DBG] s_spi_init ENTER\\n\");"
-        )
-        if "DBG] s_spi_init" not in c and debug_marker in c:
-            c = c.replace(debug_marker, debug_body)
-
-        make_new_line = "spi = MP_OBJ_TO_PTR(MP_OBJ_TYPE_GET_SLOT(&machine_spi_type, make_new)"
-        if "DBG] before make_new" not in c and make_new_line in c:
-            idx = c.find(make_new_line)
-            c = c[:idx] + 'mp_printf(&mp_plat_print, "  [DBG] before make_new\\n");\n        ' + c[idx:]
-            idx2 = c.find(";", c.find(make_new_line)) + 1
-            c = c[:idx2] + '\n        mp_printf(&mp_plat_print, "  [DBG] after make_new\\n");' + c[idx2:]
-
-    if c != old_c:
-        write_text(spi_c, c)
-        changed = True
-
-    # Optional debug for panel IO init path.
-    if enable_debug:
-        tc = read_text(lcd_types_c)
-        old_init = (
-            "mp_lcd_err_t lcd_panel_io_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
-            "{\n"
-            "    mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)obj;\n\n"
-            "    return self->panel_io_handle.init"
-        )
-        new_init = (
-            "mp_lcd_err_t lcd_panel_io_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)\n"
-            "{\n"
-            "    mp_lcd_bus_obj_t *self = (mp_lcd_bus_obj_t *)obj;\n"
-            "    mp_printf(&mp_plat_print, \"  [DBG] lcd_panel_io_init: init_fn=%p\\n\", self->panel_io_handle.init);\n\n"
-            "    return self->panel_io_handle.init"
-        )
-        if "[DBG] lcd_panel_io_init" not in tc and old_init in tc:
-            write_text(lcd_types_c, tc.replace(old_init, new_init))
-            changed = True
-
-    return changed
-
-
-def main() -> int:
-    """CLI entrypoint: validate paths, apply patches, and print summary."""
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--root", default=".", help="lvgl_micropython root")
-    parser.add_argument("--enable-debug", action="store_true")
-    args = parser.parse_args()
-
-    root = os.path.abspath(args.root)
-    cmake_path = os.path.join(root, "ext_mod", "lvgl", "micropython.cmake")
-    gen_path = os.path.join(root, "gen", "lvgl_api_gen_mpy.py")
-    lcd_base = os.path.join(root, "ext_mod", "lcd_bus")
-
-    # Fail fast when required files are missing.
-    for required in (cmake_path, gen_path, lcd_base):
-        if not os.path.exists(required):
-            print(f"ERROR: missing required path: {required}")
-            return 1
-
-    changed_any = False
-    try:
-        changed_any |= patch_micropython_cmake(cmake_path)
-        changed_any |= patch_lvgl_api_gen(gen_path)
-        changed_any |= patch_lcd_bus(lcd_base, args.enable_debug)
-    except RuntimeError as exc:
-        print(f"ERROR: {exc}")
-        return 1
-
-    if changed_any:
-        print("OK: tree patches applied")
-    else:
-        print("OK: tree already patched")
-
-    return 0
+    body = body[: send.start()] + dma_send + body[send.end() :]
+    c = c[:open_idx] + body + c[close_idx:]
+
+    # Every bus transaction must wait for an in-flight color transfer first.
+    for signature in (
+        "mp_lcd_err_t s_spi_tx_color",
+        "mp_lcd_err_t s_spi_tx_param",
+        "mp_lcd_err_t s_spi_rx_param",
+        "mp_lcd_err_t s_spi_del",
+    ):
+        open_idx, _ = _function_body(c, signature)
+        first = re.compile(r"\n([ \t]*)\S").search(c, open_idx)
+        indent = first.group(1) if first else "    "
+        c = c[: open_idx + 1] + f"\n{indent}lcd_bus_rp2_dma_wait();" + c[open_idx + 1 :]
+
+    anchor = re.search(r"^[ \t]*mp_lcd_err_t s_spi_\w+\([^;{]*\)\s*\{", c, re.MULTILINE)
+    if not anchor:
+        raise DriftError("spi_bus.c function definitions not found")
+    # The begin line carries the versioned done marker (see patch_engine).
+    block = LCD_DMA_BLOCK.lstrip("\n").replace(LCD_DMA_MARKER, context["done"], 1)
+    c = c[: anchor.start()] + block + c[anchor.start() :]
+
+    return c
+
+
+# Names are relative to the lvgl_micropython root.
+_TYPE_FIXES = (
+    {"replace": "mp_mp_machine_hw_spi_device_obj_t", "with": "mp_machine_hw_spi_device_obj_t", "optional": True},
+    {"regex": r"(?<!mp_)machine_hw_spi_device_obj_t", "with": "mp_machine_hw_spi_device_obj_t", "optional": True},
+    {"insert_after_line": "#include", "text": MODMACHINE_INCLUDE + "\n", "done": MODMACHINE_INCLUDE},
+)
+
+MANIFEST = (
+    {
+        "files": ("ext_mod/lvgl/micropython.cmake",),
+        "edits": (
+            {"insert_before": "set(LVGL_DIR ", "text": GEN_SCRIPT_BLOCK, "done": "_GEN_SCRIPT_VAL"},
+            {"replace": "$ENV{GEN_SCRIPT}_api_gen_mpy.py", "with": "${_GEN_SCRIPT_VAL}_api_gen_mpy.py", "optional": True},
+            {"replace": "--board=$ENV{LV_PORT}", "with": "--board=${_LV_PORT_VAL}", "optional": True},
+            {
+                "regex": (
+                    r"separate_arguments\s*\(\s*LV_CFLAGS_ENV\s+UNIX_COMMAND\s+\$ENV\{LV_CFLAGS\}\s*\)"
+                    r".*?"
+                    r"separate_arguments\s*\(\s*SECOND_BUILD_ENV\s+UNIX_COMMAND\s+\$ENV\{SECOND_BUILD\}\s*\)"
+                ),
+                "with": CFLAGS_BLOCK,
+                "flags": "S",
+                "count": 1,
+                "done": "_SECOND_BUILD_VAL",
+            },
+            {"insert_after_line": "set(LVGL_DIR ", "text": SPI_HOOK_BLOCK, "done": "patch_spi_api.py"},
+        ),
+    },
+    {
+        # LVGL API generator call signature expected by the current codebase.
+        "files": ("gen/lvgl_api_gen_mpy.py",),
+        "edits": (
+            {
+                "replace": "stub_gen.run(args.metadata)",
+                "with": "stub_gen.run(args.metadata, args.metadata)",
+                "done": "stub_gen.run(args.metadata, args.metadata)",
+            },
+        ),
+    },
+    {
+        "files": ("ext_mod/lcd_bus/common_include/spi_bus.h",),
+        "edits": (
+            *_TYPE_FIXES,
+            {"replace": OLD_LAYOUT, "with": NEW_LAYOUT, "optional": True},
+        ),
+    },
+    {
+        # Keep i80 header layout aligned when present.
+        "files": ("ext_mod/lcd_bus/common_include/i80_bus.h",),
+        "optional_file": True,
+        "edits": (
+            {"replace": OLD_LAYOUT, "with": NEW_LAYOUT, "optional": True},
+        ),
+    },
+    {
+        "files": ("ext_mod/lcd_bus/common_src/spi_bus.c",),
+        "edits": (
+            *_TYPE_FIXES,
+            {"replace": "->spi_bus->mosi", "with": "->spi_bus->data1", "optional": True},
+            {"replace": "->spi_bus->miso", "with": "->spi_bus->data0", "optional": True},
+            {"insert_before": SPI_INIT_MARKER, "text": SPI_EXTRA_INIT, "done": "self->buf1 = NULL;"},
+            {"replace": OLD_FIRSTBIT, "with": NEW_FIRSTBIT, "optional": True},
+            {"replace": DEBUG_INIT_MARKER, "with": DEBUG_INIT_BODY, "done": "DBG] s_spi_init",
+             "optional": True, "when": "debug"},
+            {"transform": debug_make_new, "when": "debug"},
+            {"transform": lcd_bus_dma, "done": LCD_DMA_MARKER, "when": "spi_dma"},
+        ),
+    },
+    {
+        # Debug for the panel IO init path.
+        "files": ("ext_mod/lcd_bus/lcd_types.c",),
+        "when": "debug",
+        "edits": (
+            {"replace": OLD_PANEL_IO_INIT, "with": NEW_PANEL_IO_INIT, "done": "[DBG] lcd_panel_io_init",
+             "optional": True},
+        ),
+    },
+)
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(run(MANIFEST, "rp2040_tree", build_parser(__doc__.splitlines()[0]).parse_args()))
@@ -3,66 +3,69 @@
 # Created: 2026-02-20
 # License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
 # See: ./LICENSE.md
-"""Patch rp2 machine_spi.c to new mp_spi_common.h API."""
+"""Patch rp2 machine_spi.c to new mp_spi_common.h API.
+
+Patch manifest for common/patch_engine.py. Called with one machine_spi.c
+path (repo script or CMake hook); the engine is looked up next to this file
+(gen/) or in the template tree.
+"""
 
-import os
-import re
 import sys
+from pathlib import Path
+
+_HERE = Path(__file__).resolve().parent
+sys.path[:0] = [str(_HERE), str(_HERE.parent / "common")]
+from patch_engine import build_parser, run  # noqa: E402
+
+# Symbol-level replacements from old API to mp_spi_common.h API.
+_RENAMES = (
+    ("machine_hw_spi_obj_t", "mp_machine_hw_spi_device_obj_t"),
+    (".mosi =", ".data1 ="),
+    (".miso =", ".data0 ="),
+    (".active_devices =", ".device_count ="),
+    ("spi_bus->mosi", "spi_bus->data1"),
+    ("spi_bus->miso", "spi_bus->data0"),
+    ("spi_bus->active_devices", "spi_bus->device_count"),
+    ("self->baudrate", "self->freq"),
+    ("self->mosi", "self->data1"),
+    ("self->miso", "self->data0"),
+)
+
+MANIFEST = (
+    {
+        "files": ("machine_spi.c",),
+        "edits": (
+            # Drop obsolete struct definition before renaming its uses.
+            {
+                "regex": r"typedef\s+struct\s+_machine_hw_spi_obj_t\s*\{.*?\}\s*machine_hw_spi_obj_t\s*;",
+                "with": "",
+                "flags": "S",
+                "optional": True,
+            },
+            *({"replace": old, "with": new, "optional": True} for old, new in _RENAMES),
+        ),
+        # Old API left over after patching means upstream changed shape.
+        "residual": (r"\bmachine_hw_spi_obj_t\b", r"\.mosi\b", r"\.miso\b", r"\.active_devices\b", r"self->baudrate"),
+    },
+)
 
 
 def main() -> int:
     """Patch one machine_spi.c file and keep operation idempotent."""
-    if len(sys.argv) < 2:
-        print("ERROR: missing path")
-        return 1
+    parser = build_parser("Patch rp2 machine_spi.c to the mp_spi_common.h API.")
+    parser.add_argument("path", type=Path, help="machine_spi.c to patch")
+    args = parser.parse_args()
 
     # File path is supplied by caller (repo script or CMake hook).
-    spi_path = sys.argv[1]
-    if not os.path.exists(spi_path):
-        print("SKIP: " + spi_path)
+    if not args.path.exists():
+        print(f"SKIP: {args.path}")
         return 0
 
-    with open(spi_path, "r", encoding="utf-8") as fh:
-        content = fh.read()
-
-    if (
-        "mp_machine_hw_spi_device_obj_t" in content
-        and "machine_hw_spi_obj_t" not in content
-        and ".data1 =" in content
-    ):
-        # Nothing to do if the new API symbols are already in place.
-        print("already patched")
-        return 0
-
-    # Drop obsolete struct definition and translate old field names.
-    pat = re.compile(
-        r"typedef\s+struct\s+_machine_hw_spi_obj_t\s*\{.*?\}\s*machine_hw_spi_obj_t\s*;",
-        re.DOTALL,
-    )
-    content = pat.sub("", content)
-
-    # Symbol-level replacements from old API to mp_spi_common.h API.
-    pairs = [
-        ("machine_hw_spi_obj_t", "mp_machine_hw_spi_device_obj_t"),
-        (".mosi =", ".data1 ="),
-        (".miso =", ".data0 ="),
-        (".active_devices =", ".device_count ="),
-        ("spi_bus->mosi", "spi_bus->data1"),
-        ("spi_bus->miso", "spi_bus->data0"),
-        ("spi_bus->active_devices", "spi_bus->device_count"),
-        ("self->baudrate", "self->freq"),
-        ("self->mosi", "self->data1"),
-        ("self->miso", "self->data0"),
-    ]
-
-    for old, new in pairs:
-        content = content.replace(old, new)
-
-    with open(spi_path, "w", encoding="utf-8") as fh:
-        fh.write(content)
-
-    print("patched OK")
-    return 0
+    path = args.path.resolve()
+    # Stamps live in the lvgl_micropython root when this runs from gen/.
+    if args.root == Path(".") and _HERE.name == "gen":
+        args.root = _HERE.parent
+    return run(MANIFEST, "spi_api", args, paths={"machine_spi.c": path})
 
 
 if __name__ == "__main__":
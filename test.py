@@ -2,12 +2,23 @@
 # Created: 2026-02-18
 # License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
 # See: ./LICENSE.md
+import sys
 import time
 import lvgl as lv
 
+# Set to True to record flush/task/touch timings with lvgl_profiler.
+# Dump them from the REPL with: import lvgl_profiler; lvgl_profiler.dump()
+PROFILE = False
+# Set to True to run flush submission and touch sampling on the second core
+# (board modules that support it, currently RP2040).
+CORE1 = False
+# Duration of one arc sweep (0 -> 100 or back) in ms.
+ARC_SWEEP_MS = 5000
+
+# (module name, board name, matching sys.platform)
 BOARD_CANDIDATES = (
-    ("waveshare_esp32s3_lcd128", "ESP32-S3"),
-    ("waveshare_rp2040_lcd128", "RP2040"),
+    ("waveshare_esp32s3_lcd128", "ESP32-S3", "esp32"),
+    ("waveshare_rp2040_lcd128", "RP2040", "rp2"),
 )
 
 
@@ -33,9 +44,12 @@ def _load_board_module():
     """Load the first available board module from the candidate list.
 
     This keeps the app compatible with multiple supported boards without
-    manually changing the module name.
+    manually changing the module name. Candidates matching `sys.platform`
+    are tried first so the usual case needs a single import.
     """
-    for module_name, board_name in BOARD_CANDIDATES:
+    platform = getattr(sys, "platform", "")
+    candidates = sorted(BOARD_CANDIDATES, key=lambda c: c[2] != platform)
+    for module_name, board_name, _ in candidates:
         try:
             module = __import__(module_name)
             print(f"[OK] Board module: {module_name} ({board_name})")
@@ -45,19 +59,44 @@ def _load_board_module():
                 continue
             raise
 
-    names = ", ".join(name for name, _ in BOARD_CANDIDATES)
+    names = ", ".join(c[0] for c in BOARD_CANDIDATES)
     raise RuntimeError(
         f"No board module found. Expected: {names}. "
         "Rebuild/flash the correct firmware."
     )
 
 
+def _load_optional_module(module_name):
+    """Import an optional frozen helper module, returning `None` if absent.
+
+    Firmware built without shared runtime modules keeps working with the
+    built-in fallbacks below.
+    """
+    try:
+        return __import__(module_name)
+    except ImportError as e:
+        if _is_missing_module_error(e, module_name):
+            return None
+        raise
+
+
 def _init_board(board):
     """Initialize display and touch using the API exposed by board module.
 
-    This provides a uniform flow for boards exposing either
-    `init_display`/`init_touch` or a single `init` method.
+    This provides a uniform flow for boards exposing either a single `init`
+    method (preferred, it can overlap display and touch bring-up) or
+    `init_display`/`init_touch`.
     """
+    if hasattr(board, "init"):
+        try:
+            if CORE1:
+                display, indev = board.init(touch=True, core1=True)
+            else:
+                display, indev = board.init(touch=True)
+        except TypeError:
+            display, indev = board.init()
+        return display, indev
+
     if hasattr(board, "init_display"):
         display = board.init_display()
         try:
@@ -68,13 +107,6 @@ def _init_board(board):
             indev = None
         return display, indev
 
-    if hasattr(board, "init"):
-        try:
-            display, indev = board.init(touch=True)
-        except TypeError:
-            display, indev = board.init()
-        return display, indev
-
     raise RuntimeError("The board module does not expose init_display/init.")
 
 
@@ -99,18 +131,50 @@ def _pick_font(*sizes):
             return fnt, size
     return None, None
 
-def create_ui(indev):
-    """Build the UI and connect touch-related event handlers.
+def _main_screen(on_pressed):
+    """Widget specs of the demo screen for lvgl_app.build()."""
+    return (
+        ("arc", {
+            "id": "arc",
+            "size": (230, 230),
+            "align": (lv.ALIGN.CENTER, 0, 0),
+            "range": (0, 100),
+            "value": 0,
+        }),
+        ("button", {
+            "id": "button",
+            "align": (lv.ALIGN.CENTER, 0, 0),
+            "flags": (lv.obj.FLAG.CLICKABLE,),
+            "events": ((on_pressed, lv.EVENT.PRESSED),),
+        }, (
+            ("label", {"id": "label", "text": "PRESS ME!"}),
+        )),
+    )
 
-    It creates screen widgets and interactive elements while adapting to
-    whether an input device is available.
-    """
-    def onButtonPressed(e):
-        if label.get_text() == "AAAH":
-            label.set_text("PRESS ME!")
-        else:
-            label.set_text("AAAH")
+
+def _create_widgets_fallback(scr, on_pressed):
+    """Build the demo screen without lvgl_app; return the widgets by id."""
+    arc1 = lv.arc(scr)
+    arc1.set_size(230, 230)
+    arc1.align(lv.ALIGN.CENTER, 0, 0)
+    arc1.set_range(0, 100)
+    arc1.set_value(0)
+
+    button = lv.button(scr)
+    button.align(lv.ALIGN.CENTER, 0, 0)
+    button.add_flag(lv.obj.FLAG.CLICKABLE)
+
+    label = lv.label(button)
+    label.set_text("PRESS ME!")
+
+    button.add_event_cb(on_pressed, lv.EVENT.PRESSED, None)
+    return {"arc": arc1, "button": button, "label": label}
+
+
+def _animate_arc_fallback(arc1):
+    """Step the arc back and forth from a Python timer (one value per 50 ms)."""
     forward = True
+
     def update(t):
         nonlocal forward
         if forward:
@@ -122,6 +186,28 @@ def create_ui(indev):
             forward = False
         elif arc1.get_value() == 0:
             forward = True
+
+    timer = lv.timer_create(update, 50, None)
+    timer.set_repeat_count(-1)
+
+
+def create_ui(indev):
+    """Build the UI and connect touch-related event handlers.
+
+    It creates screen widgets and interactive elements while adapting to
+    whether an input device is available. With the frozen lvgl_app
+    scaffold the screen is declared as a widget spec and the arc sweep is
+    an LVGL animation; without it a Python timer moves the arc.
+    """
+    widgets = {}
+
+    def onButtonPressed(e):
+        label = widgets["label"]
+        if label.get_text() == "AAAH":
+            label.set_text("PRESS ME!")
+        else:
+            label.set_text("AAAH")
+
     scr = lv.screen_active()
     scr.add_flag(lv.obj.FLAG.CLICKABLE)
     scr.set_style_bg_color(lv.color_hex(0x000000), lv.PART.MAIN)
@@ -136,24 +222,26 @@ def create_ui(indev):
         f"status={size_status or 'default'} "
         f"counter={size_counter or 'default'}"
     )
-    
-    arc1 = lv.arc(scr)
-    arc1.set_size(230, 230)
-    arc1.align(lv.ALIGN.CENTER, 0, 0)
-    arc1.set_range(0,100)
-    arc1.set_value(0)
 
-    button = lv.button(scr)
-    button.align(lv.ALIGN.CENTER, 0, 0)
-    button.add_flag(lv.obj.FLAG.CLICKABLE)
-    
-    label = lv.label(button)
-    label.set_text("PRESS ME!")
-    
-    button.add_event_cb(onButtonPressed, lv.EVENT.PRESSED, None)
+    app = _load_optional_module("lvgl_app")
+    if app is None:
+        print("[WARN] lvgl_app not frozen, animating the arc from a Python timer.")
+        widgets.update(_create_widgets_fallback(scr, onButtonPressed))
+        _animate_arc_fallback(widgets["arc"])
+        return
+
+    def build_main(screen):
+        ids = {}
+        for spec in _main_screen(onButtonPressed):
+            app.build(screen, spec, ids)
+        return ids
+
+    screens = app.Screens()
+    screens.add("main", build_main, screen=scr)
+    widgets.update(screens.ids("main"))
+    # 0 -> 100 -> 0 like the timer fallback (100 steps of 50 ms each way).
+    app.ping_pong(widgets["arc"], lv.arc.set_value, 0, 100, ARC_SWEEP_MS)
 
-    timer = lv.timer_create(update,50,None)
-    timer.set_repeat_count(-1)
 
 def main():
     """Application entrypoint.
@@ -161,6 +249,11 @@ def main():
     It loads the board module, initializes hardware/UI, and keeps the main
     LVGL loop running.
     """
+    profiler = _load_optional_module("lvgl_profiler") if PROFILE else None
+    if profiler is not None:
+        profiler.enable()
+        print("[OK] Profiling enabled (lvgl_profiler.dump() to print).")
+
     board = _load_board_module()
     display, indev = _init_board(board)
 
@@ -168,10 +261,35 @@ def main():
     if hasattr(lv, "refr_now"):
         lv.refr_now(display._disp_drv)
     print("[OK] UI ready.")
-
+    if hasattr(board, "boot_mark"):
+        board.boot_mark("first_frame")
+        print(f"[OK] Boot to first frame: {board.boot_report()} ms")
+
+    try:
+        _run_loop(profiler)
+    finally:
+        # Stop board worker threads (core 1) before the soft reset.
+        if hasattr(board, "shutdown"):
+            board.shutdown()
+
+
+def _run_loop(profiler):
+    """Drive LVGL forever with the best loop available in the firmware."""
+    runloop = _load_optional_module("lvgl_runloop")
+    if runloop is not None:
+        print("[OK] Run loop: lvgl_runloop (deadline driven)")
+        if profiler is not None:
+            runloop.wrap_timer_handler(lambda fn: profiler.wrap(profiler.TASK, fn, 0))
+        runloop.run()
+        return
+
+    print("[WARN] lvgl_runloop not frozen, using fixed 5 ms loop.")
+    task_handler = lv.task_handler
+    if profiler is not None:
+        task_handler = profiler.wrap(profiler.TASK, task_handler, 0)
     while True:
         lv.tick_inc(5)
-        lv.task_handler()
+        task_handler()
         time.sleep_ms(5)
 
 
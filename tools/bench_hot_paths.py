@@ -0,0 +1,218 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Per-call timing of the RP2040 board module hot paths, bytecode vs native.
+
+Run it on the board from the repository root (needs mpremote):
+
+    python3 tools/bench_hot_paths.py [--port PORT] [--module board_module.py] [--iterations N]
+
+The `@_hot_path` functions are extracted from the board module source on the
+host and sent to the board together with this file (`mpremote run`). There
+each one is compiled twice, as plain bytecode and with `@micropython.native`
+exactly as the firmware build does, and timed against small stubs of the
+hardware objects. `--script FILE` only writes the script sent to the board.
+The MicroPython unix port can run this file directly
+(`micropython tools/bench_hot_paths.py [board_module.py] [iterations]`).
+A port without the native emitter is reported as an error.
+"""
+
+import sys
+import time
+
+DEFAULT_MODULE = "script_heredoc_templates/rp2040/board/board_module.py"
+DEFAULT_ITERATIONS = 20000
+
+# Hot paths that can run against the stubs below, with the hot paths they
+# call (compiled with the same emitter).
+BENCHMARKS = (
+    ("_touch_into", ()),
+    ("_read_touch", ("_touch_into",)),
+    ("_core1_read_cb", ()),
+)
+
+if hasattr(time, "ticks_us"):
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+else:
+    def _ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(end, start):
+        return end - start
+
+
+class _Obj:
+    """Attribute bag used for LVGL structs and enum namespaces."""
+
+
+class _TouchDev:
+    """CST816S stand-in returning a fixed one-finger report."""
+
+    def __init__(self):
+        self._buf = bytearray(b"\x01\x00\x78\x00\xa0")
+
+    def read(self, nbytes, write=0):
+        return self._buf
+
+
+def _extract(source, name):
+    """Return the source of the top-level `@_hot_path` function `name`."""
+    lines = source.split("\n")
+    header = "def %s(" % name
+    for idx, line in enumerate(lines):
+        if line.startswith(header) and idx > 0 and lines[idx - 1] == "@_hot_path":
+            body = [line]
+            for nxt in lines[idx + 1:]:
+                if nxt and not nxt[0].isspace():
+                    break
+                body.append(nxt)
+            return "\n".join(body) + "\n"
+    raise SystemExit("hot path %s not found in board module" % name)
+
+
+def _namespace():
+    """Module globals the benchmarked functions refer to."""
+    lv = _Obj()
+    lv.INDEV_STATE = _Obj()
+    lv.INDEV_STATE.PRESSED = 1
+    lv.INDEV_STATE.RELEASED = 0
+
+    box = _Obj()
+    box.seq = 2
+    box.pressed = True
+    box.x = 120
+    box.y = 160
+    box.last_pressed = False
+    box.last_x = 0
+    box.last_y = 0
+
+    return {
+        "lv": lv,
+        "DISPLAY_WIDTH": 240,
+        "DISPLAY_HEIGHT": 240,
+        "_TOUCH_REG_REPORT": 0x02,
+        "_core1_touch": (None, None, box),
+        # Core 1 running, no stop requested.
+        "_core1_state": bytearray(b"\x00\x01\x00"),
+        "CORE1_READ_RETRIES": 4,
+    }
+
+
+def _compile(sources, names, emitter):
+    """Compile `names` into one namespace, optionally under a MicroPython emitter."""
+    ns = _namespace()
+    if emitter != "bytecode":
+        import micropython
+
+        ns["micropython"] = micropython
+    for name in names:
+        source = sources[name]
+        if emitter != "bytecode":
+            source = "@micropython.%s\n%s" % (emitter, source)
+        exec(source, ns)
+    return ns[names[-1]]
+
+
+def _native_available():
+    try:
+        _compile({"_probe": "def _probe():\n    return 1\n"}, ("_probe",), "native")
+    except Exception:
+        return False
+    return True
+
+
+def _time_call(name, fn, iterations):
+    """Return the mean duration of one `fn` call in nanoseconds."""
+    dev = _TouchDev()
+    data = _Obj()
+    data.point = _Obj()
+    data.state = 0
+    if name == "_read_touch":
+        # IRQ mode with a finger down: every call reads the controller.
+        pending = bytearray(b"\x01")
+        state = bytearray(b"\x01")
+        start = _ticks_us()
+        for _ in range(iterations):
+            fn(dev, pending, state, data)
+    else:
+        arg = None if name == "_core1_read_cb" else dev
+        start = _ticks_us()
+        for _ in range(iterations):
+            fn(arg, data)
+    return _ticks_diff(_ticks_us(), start) * 1000 // iterations
+
+
+def run(sources, iterations):
+    """Print per-call time of each hot path as bytecode and native code."""
+    if not _native_available():
+        raise SystemExit("native emitter unavailable on %s: nothing to compare" % sys.platform)
+
+    print("%-16s %12s %12s %8s" % ("hot path", "bytecode ns", "native ns", "speedup"))
+    for name, deps in BENCHMARKS:
+        names = deps + (name,)
+        bytecode = _time_call(name, _compile(sources, names, "bytecode"), iterations)
+        native = _time_call(name, _compile(sources, names, "native"), iterations)
+        print("%-16s %12d %12d %7.2fx" % (name, bytecode, native, bytecode / max(native, 1)))
+
+
+def _sources(path):
+    with open(path) as fh:
+        source = fh.read()
+    names = set()
+    for name, deps in BENCHMARKS:
+        names.add(name)
+        names.update(deps)
+    return {name: _extract(source, name) for name in names}
+
+
+def _host_main():
+    """Send the extracted hot paths and this benchmark to the board."""
+    import argparse
+    import os
+    import shutil
+    import subprocess
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Time board module hot paths on the board.")
+    parser.add_argument("--port", help="mpremote connect target (default: first board found)")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="board module source")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--script", help="write the board script here instead of running it")
+    args = parser.parse_args()
+
+    with open(__file__, encoding="utf-8") as fh:
+        bench = fh.read()
+    script = "_SOURCES = %r\n_ITERATIONS = %d\n%s" % (_sources(args.module), args.iterations, bench)
+    if args.script:
+        with open(args.script, "w", encoding="utf-8") as fh:
+            fh.write(script)
+        print("Board script written: %s" % args.script)
+        return 0
+
+    if shutil.which("mpremote") is None:
+        raise SystemExit("mpremote not found (pip install mpremote), or use --script")
+    with tempfile.TemporaryDirectory(prefix="bench_hot_paths_") as tmp:
+        path = os.path.join(tmp, "bench_hot_paths_board.py")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(script)
+        cmd = ["mpremote"]
+        if args.port:
+            cmd += ["connect", args.port]
+        return subprocess.call(cmd + ["run", path])
+
+
+def main():
+    """CLI entrypoint: on the board, on the unix port or from the host."""
+    if "_SOURCES" in globals():
+        run(_SOURCES, _ITERATIONS)
+    elif sys.implementation.name == "micropython":
+        path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODULE
+        iterations = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ITERATIONS
+        run(_sources(path), iterations)
+    else:
+        raise SystemExit(_host_main())
+
+
+main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Build a matrix of targets x variants concurrently with a shared git object store.
+
+The matrix is a JSON file:
+
+    {
+      "targets": ["rp2040", "esp32"],
+      "env": {"LVGL_FONT_DEFAULT_SIZE": "14"},
+      "variants": {
+        "small": {"LVGL_MONTSERRAT_FONTS": "14"},
+        "full": {"LVGL_MONTSERRAT_FONTS": "12 14 16 28"}
+      }
+    }
+
+Every target/variant pair runs `compile_<target>.sh all` in its own job
+directory under `--out`. A reference checkout of lvgl_micropython (with the
+submodules of all targets) is cloned or refreshed once up front and passed
+to the jobs as GIT_REFERENCE_DIR, so job clones only add their working
+trees. Job output is prefixed with the job name on stdout and written to
+`<job dir>/build.log`; a summary table is printed and saved as
+`summary.json`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_REPO_URL = "https://github.com/lvgl-micropython/lvgl_micropython"
+
+# Per target: submodules the workflow initializes and the artifacts it leaves.
+TARGETS = {
+    "rp2040": {
+        "submodules": ("ext_mod", "lib/lvgl", "lib/micropython"),
+        "firmware": "firmware_rp2040.uf2",
+        "report": "firmware_rp2040.size.json",
+    },
+    "esp32": {
+        "submodules": ("ext_mod", "lib/lvgl", "lib/micropython", "lib/esp-idf"),
+        "firmware": "firmware_esp32.bin",
+        "report": "firmware_esp32.size.json",
+    },
+}
+
+# Set for every job: jobs must never prompt and must not install packages concurrently.
+JOB_ENV = {"RECLONE": "0", "INSTALL_DEPS": "0"}
+
+_print_lock = threading.Lock()
+
+
+def load_matrix(path: Path) -> list[tuple[str, str, dict[str, str]]]:
+    """Expand a matrix file into `(job name, target, env)` tuples."""
+    try:
+        matrix = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"Cannot read build matrix {path}: {exc}") from exc
+
+    targets = matrix.get("targets") or []
+    unknown = [target for target in targets if target not in TARGETS]
+    if not targets or unknown:
+        raise SystemExit(f"Matrix targets must be a non-empty subset of {sorted(TARGETS)} (got {targets})")
+
+    common = {key: str(value) for key, value in matrix.get("env", {}).items()}
+    variants = matrix.get("variants") or {"default": {}}
+    jobs = []
+    for target in targets:
+        for variant, overrides in variants.items():
+            env = dict(common)
+            env.update({key: str(value) for key, value in overrides.items()})
+            jobs.append((f"{target}-{variant}", target, env))
+    return jobs
+
+
+def _git(*args: str, cwd: Path | None = None) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True)
+
+
+def prepare_reference(reference: Path, repo_url: str, submodules: set[str]) -> None:
+    """Clone or refresh the shared reference checkout and its submodules."""
+    if (reference / ".git").is_dir():
+        print(f"Refreshing reference checkout {reference}")
+        _git("fetch", "--quiet", "origin", cwd=reference)
+        _git("reset", "--quiet", "--hard", "FETCH_HEAD", cwd=reference)
+    else:
+        print(f"Cloning reference checkout {reference}")
+        reference.parent.mkdir(parents=True, exist_ok=True)
+        _git("clone", "--quiet", repo_url, str(reference))
+    for submodule in sorted(submodules):
+        _git("submodule", "update", "--init", "--recursive", "--quiet", submodule, cwd=reference)
+
+
+def _emit(name: str, line: str) -> None:
+    with _print_lock:
+        sys.stdout.write(f"[{name}] {line}")
+        sys.stdout.flush()
+
+
+def _size_info(job_dir: Path, target: str) -> tuple[int | None, int | None]:
+    """Return `(firmware file bytes, flash bytes from the size report)`."""
+    firmware = job_dir / TARGETS[target]["firmware"]
+    report = job_dir / TARGETS[target]["report"]
+    size = firmware.stat().st_size if firmware.is_file() else None
+    flash = None
+    if report.is_file():
+        try:
+            flash = json.loads(report.read_text(encoding="utf-8"))["totals"]["flash"]
+        except (OSError, ValueError, KeyError):
+            pass
+    return size, flash
+
+
+def run_job(name: str, target: str, env: dict[str, str], out: Path, base_env: dict[str, str]) -> dict:
+    """Run one compile script, streaming prefixed output into the job log."""
+    job_dir = out / name
+    job_dir.mkdir(parents=True, exist_ok=True)
+    script = REPO_ROOT / f"compile_{target}.sh"
+    log_path = job_dir / "build.log"
+
+    job_env = dict(os.environ)
+    job_env.update(base_env)
+    job_env.update(env)
+
+    start = time.monotonic()
+    _emit(name, f"started in {job_dir}\n")
+    with log_path.open("w", encoding="utf-8") as log:
+        proc = subprocess.Popen(
+            ["bash", str(script), "all"],
+            cwd=job_dir,
+            env=job_env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        for line in proc.stdout:
+            log.write(line)
+            _emit(name, line)
+        returncode = proc.wait()
+
+    duration = time.monotonic() - start
+    # Artifacts of a failed job may be left over from an earlier run.
+    size, flash = _size_info(job_dir, target) if returncode == 0 else (None, None)
+    status = "ok" if returncode == 0 else f"failed ({returncode})"
+    _emit(name, f"{status} after {duration:.0f} s\n")
+    return {
+        "job": name,
+        "target": target,
+        "env": env,
+        "status": status,
+        "returncode": returncode,
+        "seconds": round(duration, 1),
+        "firmware_bytes": size,
+        "flash_bytes": flash,
+        "log": str(log_path),
+    }
+
+
+def print_summary(results: list[dict], wall: float) -> None:
+    """Print one row per job plus serial vs wall-clock time."""
+    print()
+    print(f"{'job':<28} {'status':<12} {'time s':>8} {'firmware':>10} {'flash':>10}")
+    for result in results:
+        firmware = result["firmware_bytes"]
+        flash = result["flash_bytes"]
+        print(
+            f"{result['job']:<28} {result['status']:<12} {result['seconds']:>8.0f} "
+            f"{firmware if firmware is not None else '-':>10} {flash if flash is not None else '-':>10}"
+        )
+    serial = sum(result["seconds"] for result in results)
+    print(f"Wall clock {wall:.0f} s for {serial:.0f} s of builds")
+
+
+def main() -> int:
+    """CLI entrypoint: prepare the reference checkout and run all jobs."""
+    parser = argparse.ArgumentParser(description="Parallel multi-target/multi-variant firmware builds.")
+    parser.add_argument("matrix", type=Path, help="matrix JSON (targets, env, variants)")
+    parser.add_argument("--out", type=Path, default=Path("build_matrix"), help="job directories root")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="concurrent builds (default: 2)")
+    parser.add_argument("--reference", type=Path, help="reference checkout (default: <out>/reference/lvgl_micropython)")
+    parser.add_argument("--repo-url", default=DEFAULT_REPO_URL)
+    parser.add_argument("--no-refresh", action="store_true", help="use the reference checkout as is")
+    parser.add_argument("--only", nargs="*", default=[], help="run only these job names")
+    args = parser.parse_args()
+
+    jobs = load_matrix(args.matrix)
+    if args.only:
+        jobs = [job for job in jobs if job[0] in args.only]
+        if not jobs:
+            raise SystemExit(f"No matrix job matches {args.only}")
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1")
+
+    out = args.out.resolve()
+    reference = (args.reference or out / "reference" / "lvgl_micropython").resolve()
+    if not args.no_refresh:
+        submodules = {sub for _, target, _ in jobs for sub in TARGETS[target]["submodules"]}
+        try:
+            prepare_reference(reference, args.repo_url, submodules)
+        except subprocess.CalledProcessError as exc:
+            raise SystemExit(f"Preparing reference checkout failed: {exc}") from exc
+
+    base_env = dict(JOB_ENV, GIT_REFERENCE_DIR=str(reference))
+    print(f"Running {len(jobs)} job(s), {args.jobs} at a time")
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(run_job, name, target, env, out, base_env) for name, target, env in jobs]
+        results = [future.result() for future in futures]
+    wall = time.monotonic() - start
+
+    print_summary(results, wall)
+    summary = out / "summary.json"
+    summary.write_text(json.dumps({"wall_seconds": round(wall, 1), "jobs": results}, indent=2) + "\n", encoding="utf-8")
+    print(f"Summary: {summary}")
+    return 0 if all(result["returncode"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,438 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Run the board modules and the app under CPython against simulated hardware.
+
+Usage, from the repository root:
+
+    python3 tools/host_sim.py [--board rp2040|esp32] [--scenario NAME] [--update-baseline]
+
+The real code is executed: the RP2040 board module rendered from its template,
+the ESP32 board module produced by its generator, the frozen runtime modules
+(lvgl_runloop, lvgl_profiler, lcd_spi_calibration) and the app (`test.py` by
+default, through its own `main()`). `lvgl`, `machine`, `lcd_bus`, `gc9a01`,
+`cst816s` and `i2c` come from tools/host_sim_fakes, which model the LVGL
+refresh/input timers, the SPI bus with DMA flushes and the I2C touch
+controller on a virtual clock (see the fake modules for the model).
+
+A scenario is a timeline started when the app enters its run loop: a
+duration plus touches (`at_ms`, `x`, `y`, `hold_ms`) injected through the
+touch controller and its interrupt line. Metrics of that window are compared
+with tools/host_sim_baselines.json: SPI bytes per flush and frame, flushes
+per frame, I2C transactions per second, sleep share, loop wakeups, Python
+callbacks run by LVGL per second, binding calls per frame and Python lines
+executed per frame by the board/app/runtime code (the interpreter time each
+frame costs on the device), allocations still held by the runtime code and presses
+seen by the app. A metric beyond its budget exits with status 1;
+`--update-baseline` records the current values. Independently of any
+baseline, the app must see exactly one press per injected touch: a
+mismatch fails the run and is never recorded as a baseline.
+Extra scenarios can be loaded from a JSON object with `--scenario-file`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKES_DIR = ROOT / "tools" / "host_sim_fakes"
+FROZEN_DIR = ROOT / "script_heredoc_templates" / "common" / "frozen"
+DEFAULT_BASELINE = ROOT / "tools" / "host_sim_baselines.json"
+
+BOARDS = {
+    "rp2040": {"module": "waveshare_rp2040_lcd128"},
+    "esp32": {
+        "module": "waveshare_esp32s3_lcd128",
+        # Same values as apply_board_profile_defaults (waveshare_esp32s3_lcd128).
+        "env": {
+            "PIN_LCD_BL": "2", "PIN_TP_INT": "5", "PIN_TP_SDA": "6", "PIN_TP_SCL": "7",
+            "PIN_LCD_DC": "8", "PIN_LCD_CS": "9", "PIN_LCD_CLK": "10", "PIN_LCD_MOSI": "11",
+            "PIN_LCD_MISO": "12", "PIN_TP_RST": "13", "PIN_LCD_RST": "14",
+            "DISPLAY_WIDTH": "240", "DISPLAY_HEIGHT": "240",
+            "SPI_HOST": "1", "SPI_FREQ": "40000000", "I2C_HOST": "0", "I2C_FREQ": "100000",
+            "TOUCH_USE_IRQ": "1",
+        },
+    },
+}
+
+_BUTTON_PRESS = {"x": 120, "y": 120, "hold_ms": 200}
+SCENARIOS = {
+    "arc": {
+        "description": "10 s of the arc animation, no touch",
+        "duration_ms": 10000,
+        "touches": [],
+    },
+    "arc_touch": {
+        "description": "10 s of the arc animation with four button presses",
+        "duration_ms": 10000,
+        "touches": [dict(_BUTTON_PRESS, at_ms=at) for at in (1000, 3500, 6000, 8500)],
+    },
+}
+
+# metric -> (direction, relative tolerance, absolute tolerance). Direction 1:
+# higher is a regression, -1: lower is a regression, 0: must match exactly.
+BUDGETS = {
+    "boot_ms": (1, 0.05, 5),
+    "fps": (-1, 0.05, 0),
+    "flushes_per_frame": (1, 0.05, 0),
+    "spi_bytes_per_frame": (1, 0.05, 0),
+    "spi_busy_pct": (1, 0.05, 0.5),
+    "flush_wait_ms": (1, 0.10, 5),
+    "i2c_transactions_per_s": (1, 0.05, 0.5),
+    "i2c_busy_ms": (1, 0.10, 2),
+    "sleep_pct": (-1, 0.02, 0.5),
+    "loop_wakeups_per_s": (1, 0.10, 1),
+    "lv_callbacks_per_s": (1, 0.05, 1),
+    "binding_calls_per_frame": (1, 0.05, 0.5),
+    "py_lines_per_frame": (1, 0.05, 1),
+    "alloc_blocks": (1, 0, 4),
+    "presses": (0, 0, 0),
+}
+
+_FAKE_MODULES = ("_sim", "lvgl", "machine", "lcd_bus", "gc9a01", "cst816s", "i2c")
+_RUNTIME_MODULES = ("lvgl_runloop", "lvgl_profiler", "lcd_spi_calibration", "lvgl_app")
+_APP_MODULE = "host_sim_app"
+_TIME_FUNCS = ("ticks_ms", "ticks_us", "ticks_cpu", "ticks_add", "ticks_diff", "sleep_ms", "sleep_us")
+_TICKS_MASK = (1 << 30) - 1
+_TICKS_HALF = 1 << 29
+
+
+def render_board_module(board: str, out_dir: Path) -> Path:
+    """Produce the board module the firmware would freeze, as bytecode."""
+    spec = BOARDS[board]
+    out_py = out_dir / f"{spec['module']}.py"
+    if board == "rp2040":
+        board_dir = ROOT / "script_heredoc_templates" / "rp2040" / "board"
+        cmd = [sys.executable, str(ROOT / "script_heredoc_templates" / "rp2040" / "generate_board_module.py"),
+               str(board_dir / "board_module.py"), str(board_dir / "pins.csv"), str(out_py), "bytecode"]
+        env = os.environ
+    else:
+        cmd = [sys.executable, str(ROOT / "script_heredoc_templates" / "esp32" / "generate_frozen_board_module.py")]
+        env = dict(os.environ, **spec["env"], BOARD_MODULE_NAME=spec["module"], HOT_PATH_EMITTER="bytecode",
+                   FROZEN_BOARD_PY=str(out_py), FROZEN_BOARD_MANIFEST=str(out_dir / "manifest.py"),
+                   FROZEN_RUNTIME_MODULES="")
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Generating the {board} board module failed:\n{result.stdout}{result.stderr}")
+    return out_py
+
+
+def _install_time(clock) -> None:
+    """Give CPython's time module the MicroPython tick/sleep API on the virtual clock."""
+    def ticks_ms():
+        return (clock.now_us // 1000) & _TICKS_MASK
+
+    def ticks_us():
+        return clock.now_us & _TICKS_MASK
+
+    def ticks_add(ticks, delta):
+        return (ticks + delta) & _TICKS_MASK
+
+    def ticks_diff(end, start):
+        return ((end - start + _TICKS_HALF) & _TICKS_MASK) - _TICKS_HALF
+
+    def sleep_ms(ms):
+        clock.sleep(max(int(ms), 0) * 1000)
+
+    def sleep_us(us):
+        clock.sleep(max(int(us), 0))
+
+    time.ticks_ms = ticks_ms
+    time.ticks_us = ticks_us
+    time.ticks_cpu = ticks_us
+    time.ticks_add = ticks_add
+    time.ticks_diff = ticks_diff
+    time.sleep_ms = sleep_ms
+    time.sleep_us = sleep_us
+
+
+def _uninstall_time() -> None:
+    for name in _TIME_FUNCS:
+        if hasattr(time, name):
+            delattr(time, name)
+
+
+def _purge_modules() -> None:
+    for name in _FAKE_MODULES + _RUNTIME_MODULES + (_APP_MODULE,) + tuple(s["module"] for s in BOARDS.values()):
+        sys.modules.pop(name, None)
+
+
+def simulate(board: str, scenario: dict, app: Path, refr_period_ms: int, verbose: bool,
+             count_calls: bool = False) -> dict:
+    """Boot the app on `board`, play `scenario` and return its metrics.
+
+    The window is observed either through tracemalloc (allocations) or a
+    trace hook (binding calls, callbacks and executed lines): the hook
+    itself allocates interpreter frames, so one run cannot measure both.
+    """
+    with tempfile.TemporaryDirectory(prefix="host_sim_") as tmp:
+        tmp_dir = Path(tmp)
+        board_py = render_board_module(board, tmp_dir)
+        _purge_modules()
+        saved_path = list(sys.path)
+        sys.path[:0] = [str(FAKES_DIR), str(FROZEN_DIR), str(tmp_dir), str(app.parent)]
+        try:
+            import _sim
+            sim = _sim.reset(refr_period_ms=refr_period_ms)
+            _install_time(sim.clock)
+
+            import lcd_spi_calibration
+            # Never pick up a calibration stored on the host.
+            lcd_spi_calibration.CAL_FILE = str(tmp_dir / "lcd_spi_freq.txt")
+
+            spec = importlib.util.spec_from_file_location(_APP_MODULE, app)
+            app_module = importlib.util.module_from_spec(spec)
+            sys.modules[_APP_MODULE] = app_module
+            spec.loader.exec_module(app_module)
+
+            traced = [str(board_py), str(app)] + [str(path) for path in FROZEN_DIR.glob("*.py")]
+            fakes = {str(path) for path in FAKES_DIR.glob("*.py")}
+            window = {"lv_callbacks": 0, "binding_calls": 0, "py_lines": 0} if count_calls else {}
+            run_loop = app_module._run_loop
+
+            def _timeline_run_loop(profiler):
+                # The app is up: start the scripted window from here.
+                board_module = sys.modules[BOARDS[board]["module"]]
+                sim.touch.int_pin = board_module.PIN_TP_INT
+                window["boot_us"] = sim.clock.now_us
+                window["boot_counters"] = sim.counters
+                sim.counters = _sim.Counters()
+                sim.clock.stop_at_us = sim.clock.now_us + scenario["duration_ms"] * 1000
+                for touch in scenario.get("touches", ()):
+                    sim.clock.schedule(sim.clock.now_us + touch["at_ms"] * 1000,
+                                       lambda t=touch: sim.touch.press(t["x"], t["y"], t["hold_ms"]))
+                if count_calls:
+                    sys.settrace(_count_calls(set(traced), fakes, window))
+                else:
+                    tracemalloc.start()
+                return run_loop(profiler)
+
+            app_module._run_loop = _timeline_run_loop
+            output = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(output):
+                    app_module.main()
+            except _sim.SimulationEnd:
+                pass
+            finally:
+                sys.settrace(None)
+                if tracemalloc.is_tracing():
+                    # Only count what is still reachable (not garbage cycles).
+                    gc.collect()
+                    snapshot = tracemalloc.take_snapshot()
+                    tracemalloc.stop()
+                    filters = [tracemalloc.Filter(True, path) for path in traced]
+                    window["alloc_blocks"] = sum(
+                        stat.count for stat in snapshot.filter_traces(filters).statistics("filename"))
+            if verbose:
+                sys.stdout.write(output.getvalue())
+            if "boot_us" not in window:
+                raise SystemExit(f"{board}: the app returned before entering its run loop")
+
+            runloop = sys.modules.get("lvgl_runloop")
+            wakeups = runloop.stats()[0] if runloop is not None else 0
+            return _metrics(sim, window, wakeups)
+        finally:
+            _uninstall_time()
+            sys.path[:] = saved_path
+            _purge_modules()
+
+
+def _count_calls(code_files: set, fake_files: set, window: dict):
+    """Trace hook counting calls across the binding boundary and executed lines.
+
+    Calls from the board/app/runtime code into the fakes stand for binding
+    calls into C; calls from the fakes into that code are Python callbacks
+    run by LVGL or an interrupt. Lines executed in that code are what the
+    interpreter runs on the device (the fakes stand for C and are not
+    counted).
+    """
+    def _line(_frame, event, _arg):
+        if event == "line":
+            window["py_lines"] += 1
+        return _line
+
+    def _call(frame, event, _arg):
+        if event != "call":
+            return None
+        callee = frame.f_code.co_filename
+        if frame.f_back is not None:
+            caller = frame.f_back.f_code.co_filename
+            if callee in code_files and caller in fake_files:
+                window["lv_callbacks"] += 1
+            elif callee in fake_files and caller in code_files:
+                window["binding_calls"] += 1
+        return _line if callee in code_files else None
+
+    return _call
+
+
+def _metrics(sim, window: dict, wakeups: int) -> dict:
+    counters = sim.counters
+    window_us = sim.clock.now_us - window["boot_us"]
+    seconds = window_us / 1e6
+    spi_bytes = counters.spi_cmd_bytes + counters.spi_pixel_bytes
+    frames = max(counters.frames, 1)
+    metrics = {
+        "boot_ms": round(window["boot_us"] / 1000, 1),
+        "boot_spi_bytes": window["boot_counters"].spi_cmd_bytes + window["boot_counters"].spi_pixel_bytes,
+        "window_ms": round(window_us / 1000, 1),
+        "frames": counters.frames,
+        "fps": round(counters.frames / seconds, 2),
+        "flushes": counters.flushes,
+        "flushes_per_frame": round(counters.flushes / frames, 3),
+        "spi_bytes_per_flush": round(spi_bytes / max(counters.flushes, 1), 1),
+        "spi_bytes_per_frame": round(spi_bytes / frames, 1),
+        "spi_busy_pct": round(100 * counters.spi_busy_us / window_us, 2),
+        "flush_wait_ms": round(counters.flush_wait_us / 1000, 1),
+        "i2c_transactions_per_s": round(counters.i2c_transactions / seconds, 2),
+        "i2c_busy_ms": round(counters.i2c_busy_us / 1000, 1),
+        "touch_irqs": counters.touch_irqs,
+        "sleep_pct": round(100 * counters.sleep_us / window_us, 2),
+        "loop_wakeups_per_s": round(wakeups / seconds, 2),
+        "presses": counters.presses,
+    }
+    if "lv_callbacks" in window:
+        metrics["lv_callbacks_per_s"] = round(window["lv_callbacks"] / seconds, 2)
+        metrics["binding_calls_per_frame"] = round(window["binding_calls"] / frames, 2)
+        metrics["py_lines_per_frame"] = round(window["py_lines"] / frames, 1)
+    if "alloc_blocks" in window:
+        metrics["alloc_blocks"] = window["alloc_blocks"]
+    return metrics
+
+
+def measure(board: str, scenario: dict, app: Path, refr_period_ms: int, verbose: bool) -> dict:
+    """Metrics of both observation runs (the simulation is deterministic)."""
+    metrics = simulate(board, scenario, app, refr_period_ms, verbose)
+    calls = simulate(board, scenario, app, refr_period_ms, False, count_calls=True)
+    metrics["lv_callbacks_per_s"] = calls["lv_callbacks_per_s"]
+    metrics["binding_calls_per_frame"] = calls["binding_calls_per_frame"]
+    metrics["py_lines_per_frame"] = calls["py_lines_per_frame"]
+    return metrics
+
+
+def check_invariants(scenario: dict, metrics: dict) -> list[str]:
+    """Baseline-independent checks; return the failures."""
+    touches = len(scenario.get("touches", ()))
+    if metrics["presses"] != touches:
+        return [f"presses {metrics['presses']} != injected touches {touches}"]
+    return []
+
+
+def check_budget(metric: str, value: float, base: float) -> bool:
+    """True when `value` stays within the budget of `metric` around `base`."""
+    direction, rel, abs_tol = BUDGETS[metric]
+    if direction == 0:
+        return value == base
+    if direction > 0:
+        return value <= base * (1 + rel) + abs_tol
+    return value >= base * (1 - rel) - abs_tol
+
+
+def print_report(key: str, metrics: dict, baseline: dict | None) -> list[str]:
+    """Print metrics next to the baseline; return the metrics over budget."""
+    print()
+    print(f"{key}")
+    print(f"  {'metric':<24} {'value':>12} {'baseline':>12} {'delta':>10}  status")
+    failed = []
+    for metric, value in metrics.items():
+        base = baseline.get(metric) if baseline else None
+        if base is None:
+            base_text, delta_text, status = "-", "-", ""
+        else:
+            base_text = f"{base:g}"
+            delta_text = f"{value - base:+g}"
+            status = "report" if metric not in BUDGETS else "ok"
+            if metric in BUDGETS and not check_budget(metric, value, base):
+                status = "OVER BUDGET"
+                failed.append(metric)
+        print(f"  {metric:<24} {value:>12g} {base_text:>12} {delta_text:>10}  {status}")
+    return failed
+
+
+def _load_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Host simulation with bus traffic budgets.")
+    parser.add_argument("--board", action="append", choices=sorted(BOARDS), help="board (default: all)")
+    parser.add_argument("--scenario", action="append", help="scenario name (default: all)")
+    parser.add_argument("--scenario-file", type=Path, help="JSON object of extra scenarios")
+    parser.add_argument("--app", type=Path, default=ROOT / "test.py", help="app run through its main()")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="record the current metrics")
+    parser.add_argument("--json", type=Path, help="also write the metrics here")
+    parser.add_argument("--refr-period", type=int, default=33, help="LV_DEF_REFR_PERIOD of the fake LVGL (ms)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the app output")
+    args = parser.parse_args()
+
+    scenarios = dict(SCENARIOS)
+    if args.scenario_file:
+        scenarios.update(json.loads(args.scenario_file.read_text(encoding="utf-8")))
+    names = args.scenario or sorted(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)} (available: {', '.join(sorted(scenarios))})")
+
+    baselines = _load_json(args.baseline)
+    results = {}
+    failed = []
+    missing = []
+    broken = []
+    for board in args.board or sorted(BOARDS):
+        for name in names:
+            key = f"{board}/{name}"
+            results[key] = measure(board, scenarios[name], args.app.resolve(), args.refr_period, args.verbose)
+            broken += [f"{key}: {problem}" for problem in check_invariants(scenarios[name], results[key])]
+            if args.update_baseline:
+                print_report(key, results[key], baselines.get(key))
+                continue
+            if key not in baselines:
+                missing.append(key)
+            failed += [f"{key}: {metric}" for metric in print_report(key, results[key], baselines.get(key))]
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if broken:
+        print()
+        for item in broken:
+            print(f"Broken: {item}")
+        if args.update_baseline:
+            print("Baseline not updated: fix the broken runs first")
+        return 1
+    if args.update_baseline:
+        baselines.update(results)
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    print()
+    for key in missing:
+        print(f"No baseline for {key} (run with --update-baseline)")
+    for item in failed:
+        print(f"Over budget: {item}")
+    if failed or missing:
+        return 1
+    print(f"All metrics within budget ({len(results)} run(s))")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
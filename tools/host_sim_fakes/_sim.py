@@ -0,0 +1,252 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Shared state of the host simulation: virtual clock, bus models and counters.
+
+Time only moves when the code under test sleeps, waits for a DMA transfer or
+blocks on a bus, so a run is deterministic and takes far less than its
+simulated duration. Scheduled events (DMA completions, touch controller
+interrupts) fire while the clock advances past them.
+
+Bus timing model: a transfer costs its bits at the bus clock plus a fixed
+per-transaction setup overhead (chip select/DC handling, driver call).
+"""
+
+import heapq
+
+# Per-transaction setup cost on the SPI and I2C buses.
+SPI_TXN_OVERHEAD_US = 10
+I2C_TXN_OVERHEAD_US = 20
+# CST816S: interrupt pulse on touch, every report period while held and on release.
+TOUCH_REPORT_MS = 10
+TOUCH_CHIP_ID = 0xB5
+
+
+class SimulationEnd(Exception):
+    """Raised from a sleep once the scripted timeline is over."""
+
+
+class Counters:
+    """Everything the fakes count; reset when the timeline starts."""
+
+    def __init__(self):
+        self.spi_cmd_bytes = 0
+        self.spi_pixel_bytes = 0
+        self.spi_busy_us = 0
+        self.flushes = 0
+        self.frames = 0
+        self.flush_wait_us = 0
+        self.bus_wait_us = 0
+        self.i2c_transactions = 0
+        self.i2c_bytes = 0
+        self.i2c_busy_us = 0
+        self.sleep_us = 0
+        self.sleep_calls = 0
+        self.touch_irqs = 0
+        self.presses = 0
+
+
+class Clock:
+    """Microsecond virtual clock with an event queue."""
+
+    def __init__(self):
+        self.now_us = 0
+        self.stop_at_us = None
+        self.stopped = False
+        self._events = []
+        self._seq = 0
+
+    def schedule(self, at_us, fn):
+        self._seq += 1
+        heapq.heappush(self._events, (at_us, self._seq, fn))
+
+    def advance_to(self, target_us):
+        """Move to `target_us`, firing due events in order on the way."""
+        while self._events and self._events[0][0] <= target_us:
+            at_us, _, fn = heapq.heappop(self._events)
+            self.now_us = max(self.now_us, at_us)
+            fn()
+        self.now_us = max(self.now_us, target_us)
+
+    def run_next_event(self):
+        """Jump to the next scheduled event; False when none is pending."""
+        if not self._events:
+            return False
+        self.advance_to(self._events[0][0])
+        return True
+
+    def sleep(self, duration_us):
+        SIM.counters.sleep_us += duration_us
+        SIM.counters.sleep_calls += 1
+        self.advance_to(self.now_us + duration_us)
+        if self.stop_at_us is not None and not self.stopped and self.now_us >= self.stop_at_us:
+            # Raised once: cleanup code may still sleep after the timeline.
+            self.stopped = True
+            raise SimulationEnd()
+
+    def busy(self, duration_us):
+        """CPU blocked on a synchronous transfer."""
+        self.advance_to(self.now_us + duration_us)
+
+    def wait_until(self, condition):
+        """Run events until `condition()` holds; returns the time waited (us)."""
+        start = self.now_us
+        while not condition():
+            if not self.run_next_event():
+                raise RuntimeError("simulation deadlock: waiting with no event scheduled")
+        return self.now_us - start
+
+
+class SpiBusModel:
+    """One SPI bus: synchronous command writes and asynchronous DMA transfers."""
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.busy_until_us = 0
+
+    def _duration_us(self, nbytes):
+        return SPI_TXN_OVERHEAD_US + (nbytes * 8 * 1_000_000 + self.freq - 1) // self.freq
+
+    def _wait_idle(self):
+        # The pending DMA completion is scheduled at busy_until_us.
+        clock = SIM.clock
+        if self.busy_until_us > clock.now_us:
+            SIM.counters.bus_wait_us += clock.wait_until(lambda: clock.now_us >= self.busy_until_us)
+
+    def write(self, nbytes):
+        """Blocking command/parameter write."""
+        self._wait_idle()
+        duration = self._duration_us(nbytes)
+        SIM.counters.spi_cmd_bytes += nbytes
+        SIM.counters.spi_busy_us += duration
+        SIM.clock.busy(duration)
+
+    def write_dma(self, nbytes, on_done):
+        """Queue a pixel transfer; `on_done` runs when the bus finishes it."""
+        self._wait_idle()
+        duration = self._duration_us(nbytes)
+        SIM.counters.spi_pixel_bytes += nbytes
+        SIM.counters.spi_busy_us += duration
+        self.busy_until_us = SIM.clock.now_us + duration
+        SIM.clock.schedule(self.busy_until_us, on_done)
+
+
+class TouchPanel:
+    """CST816S register file driven by the scripted touches."""
+
+    ADDR = 0x15
+
+    def __init__(self):
+        self.int_pin = None
+        self.regs = bytearray(256)
+        self.regs[0xA7] = TOUCH_CHIP_ID
+        self._pointer = 0
+        self._down = False
+
+    def press(self, x, y, hold_ms):
+        """Schedule a touch at the current time, released after `hold_ms`."""
+        clock = SIM.clock
+        start = clock.now_us
+        end = start + hold_ms * 1000
+
+        def _down():
+            self._down = True
+            self.regs[0x01] = 0
+            self.regs[0x02] = 1
+            self.regs[0x03] = (x >> 8) & 0x0F
+            self.regs[0x04] = x & 0xFF
+            self.regs[0x05] = (y >> 8) & 0x0F
+            self.regs[0x06] = y & 0xFF
+            self._pulse()
+
+        def _report():
+            if self._down:
+                self._pulse()
+
+        def _up():
+            self._down = False
+            self.regs[0x02] = 0
+            self._pulse()
+
+        clock.schedule(start, _down)
+        for at in range(start + TOUCH_REPORT_MS * 1000, end, TOUCH_REPORT_MS * 1000):
+            clock.schedule(at, _report)
+        clock.schedule(end, _up)
+
+    def _pulse(self):
+        SIM.counters.touch_irqs += 1
+        irq = SIM.pin_irqs.get(self.int_pin)
+        if irq is not None:
+            pin, handler = irq
+            handler(pin)
+
+    def write(self, data):
+        if len(data):
+            self._pointer = data[0]
+            for offset, value in enumerate(data[1:], 1):
+                self.regs[(self._pointer + offset) & 0xFF] = value
+
+    def read_into(self, buf):
+        for idx in range(len(buf)):
+            buf[idx] = self.regs[(self._pointer + idx) & 0xFF]
+
+
+class I2cBusModel:
+    """Blocking I2C bus; a transaction ends with a STOP condition."""
+
+    def __init__(self, freq):
+        self.freq = freq
+
+    def _device(self, addr):
+        if addr != SIM.touch.ADDR:
+            raise OSError(19)  # ENODEV, as the ports report a missing ACK
+        return SIM.touch
+
+    def _transfer(self, nbytes, stop):
+        # Address byte + data bytes, 9 clocks each (ACK included).
+        duration = (I2C_TXN_OVERHEAD_US if stop else 0) + ((nbytes + 1) * 9 * 1_000_000) // self.freq
+        SIM.counters.i2c_bytes += nbytes
+        SIM.counters.i2c_busy_us += duration
+        if stop:
+            SIM.counters.i2c_transactions += 1
+        SIM.clock.busy(duration)
+
+    def write(self, addr, data, stop=True):
+        self._device(addr).write(data)
+        self._transfer(len(data), stop)
+
+    def read_into(self, addr, buf, stop=True):
+        self._device(addr).read_into(buf)
+        self._transfer(len(buf), stop)
+
+
+class Simulation:
+    """Process-wide simulation state used by every fake module."""
+
+    def __init__(self, refr_period_ms=33):
+        self.clock = Clock()
+        self.counters = Counters()
+        self.touch = TouchPanel()
+        # Pin id -> (pin, handler) of the armed falling-edge interrupts.
+        self.pin_irqs = {}
+        self.spi_buses = []
+        self.refr_period_ms = refr_period_ms
+
+    def spi_bus(self, freq):
+        bus = SpiBusModel(freq)
+        self.spi_buses.append(bus)
+        return bus
+
+    def i2c_bus(self, freq):
+        return I2cBusModel(freq)
+
+
+SIM = Simulation()
+
+
+def reset(**config):
+    """Start a fresh simulation (called by the runner before loading code)."""
+    global SIM
+    SIM = Simulation(**config)
+    return SIM
@@ -0,0 +1,65 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host stand-in for lvgl_micropython's CST816S touch driver.
+
+Like the pointer framework it builds on, the driver registers its own LVGL
+pointer input device whose read callback goes through `_get_coords()`.
+"""
+
+import time
+
+import lvgl as lv
+from machine import Pin
+
+I2C_ADDR = 0x15
+BITS = 8
+
+_GESTURE_ID = 0x01
+_CHIP_ID = 0xA7
+_CHIP_IDS = (0xB4, 0xB5, 0xB6)
+
+
+class CST816S:
+    def __init__(self, device, reset_pin=None, touch_cal=None, startup_rotation=0, debug=False):
+        self._device = device
+        self._tx_buf = bytearray(1)
+        self._tx_mv = memoryview(self._tx_buf)
+        self._rx_buf = bytearray(6)
+        self._rx_mv = memoryview(self._rx_buf)
+
+        if reset_pin is not None:
+            rst = Pin(reset_pin, Pin.OUT)
+            rst.value(0)
+            time.sleep_ms(10)
+            rst.value(1)
+            time.sleep_ms(50)
+
+        self._read_reg(_CHIP_ID, 1)
+        if self._rx_buf[0] not in _CHIP_IDS:
+            raise RuntimeError("CST816S not found (chip id 0x%02X)" % self._rx_buf[0])
+
+        self._indev_drv = lv.indev_create()
+        self._indev_drv.set_type(lv.INDEV_TYPE.POINTER)
+        self._indev_drv.set_read_cb(self._read)
+
+    def _read_reg(self, reg, num_bytes):
+        self._tx_buf[0] = reg
+        self._device.write_readinto(self._tx_mv[:1], self._rx_mv[:num_bytes])
+
+    def _get_coords(self):
+        self._read_reg(_GESTURE_ID, 6)
+        buf = self._rx_buf
+        if not buf[1] & 0x0F:
+            return None
+        x = ((buf[2] & 0x0F) << 8) | buf[3]
+        y = ((buf[4] & 0x0F) << 8) | buf[5]
+        return lv.INDEV_STATE.PRESSED, x, y
+
+    def _read(self, indev, data):
+        coords = self._get_coords()
+        if coords is None:
+            data.state = lv.INDEV_STATE.RELEASED
+            return
+        data.state, data.point.x, data.point.y = coords
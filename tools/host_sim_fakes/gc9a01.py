@@ -0,0 +1,90 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host stand-in for lvgl_micropython's GC9A01 display driver."""
+
+import time
+
+import lvgl as lv
+from machine import Pin
+
+STATE_HIGH = 1
+STATE_LOW = 0
+STATE_PWM = -1
+BYTE_ORDER_RGB = 0x00
+BYTE_ORDER_BGR = 0x08
+
+_CASET = 0x2A
+_RASET = 0x2B
+_RAMWR = 0x2C
+# Parameter counts of the vendor init sequence (inter-register setup, gamma,
+# pixel format, sleep out, display on).
+_INIT_PARAMS = (0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 1, 1, 1, 4, 1, 1, 1, 1,
+                6, 6, 6, 6, 2, 12, 11, 12, 9, 7, 2, 7, 1, 0)
+_SLEEP_OUT_MS = 120
+_DISPLAY_ON_MS = 20
+
+
+class GC9A01:
+    def __init__(self, data_bus, display_width, display_height, frame_buffer1=None, frame_buffer2=None,
+                 reset_pin=None, reset_state=STATE_HIGH, power_pin=None, power_on_state=STATE_HIGH,
+                 backlight_pin=None, backlight_on_state=STATE_HIGH, offset_x=0, offset_y=0,
+                 color_byte_order=BYTE_ORDER_RGB, color_space=lv.COLOR_FORMAT.RGB888,
+                 rgb565_byte_swap=False, _cmd_bits=8, _param_bits=8, _init_bus=True):
+        if frame_buffer1 is None:
+            # Driver default: two buffers of 1/10 of the screen.
+            size = display_width * display_height * 2 // 10
+            frame_buffer1 = bytearray(size)
+            frame_buffer2 = bytearray(size)
+        self._data_bus = data_bus
+        self._backlight_pin = Pin(backlight_pin, Pin.OUT) if backlight_pin is not None else None
+        self._backlight_on = backlight_on_state
+        if _init_bus:
+            data_bus.init(display_width, display_height, 16, len(frame_buffer1), rgb565_byte_swap)
+
+        self._disp_drv = lv.display_create(display_width, display_height)
+        self._disp_drv.set_color_format(color_space)
+        self._disp_drv.set_buffers(frame_buffer1, frame_buffer2, len(frame_buffer1), lv.DISPLAY_RENDER_MODE.PARTIAL)
+        self._disp_drv.set_flush_cb(self._flush_cb)
+        data_bus.register_callback(self._flush_ready_cb)
+        self._param_buf = bytearray(4)
+        self._param_mv = memoryview(self._param_buf)
+
+    def _flush_ready_cb(self, *_):
+        self._disp_drv.flush_ready()
+
+    def _set_memory_location(self, x1, y1, x2, y2):
+        buf = self._param_buf
+        buf[0] = x1 >> 8
+        buf[1] = x1 & 0xFF
+        buf[2] = x2 >> 8
+        buf[3] = x2 & 0xFF
+        self._data_bus.tx_param(_CASET, self._param_mv[:4])
+        buf[0] = y1 >> 8
+        buf[1] = y1 & 0xFF
+        buf[2] = y2 >> 8
+        buf[3] = y2 & 0xFF
+        self._data_bus.tx_param(_RASET, self._param_mv[:4])
+
+    def _flush_cb(self, disp, area, color_p):
+        x1, y1, x2, y2 = area.x1, area.y1, area.x2, area.y2
+        self._set_memory_location(x1, y1, x2, y2)
+        self._data_bus.tx_color(_RAMWR, color_p, x1, y1, x2 + 1, y2 + 1, 0, disp.flush_is_last())
+
+    def init(self):
+        for nparams in _INIT_PARAMS:
+            self._data_bus.tx_param(0, bytearray(nparams) if nparams else None)
+        time.sleep_ms(_SLEEP_OUT_MS)
+        self._data_bus.tx_param(0x29)
+        time.sleep_ms(_DISPLAY_ON_MS)
+
+    def set_power(self, value):
+        pass
+
+    def set_backlight(self, value):
+        if self._backlight_pin is not None:
+            self._backlight_pin.value(self._backlight_on if value else not self._backlight_on)
+
+    def set_rotation(self, value):
+        pass
@@ -0,0 +1,49 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host stand-in for lvgl_micropython's ESP32 `i2c` module (Bus + register Device)."""
+
+import _sim
+
+
+class I2C:
+    class Bus:
+        def __init__(self, host, scl, sda, freq=400_000, use_locks=False, pullup=False):
+            self.host = host
+            self._model = _sim.SIM.i2c_bus(freq)
+
+        def deinit(self):
+            pass
+
+    class Device:
+        def __init__(self, bus, dev_id, reg_bits=8):
+            self._bus = bus._model
+            self._addr = dev_id
+            self._reg_bytes = reg_bits // 8
+
+        def _reg(self, memaddr):
+            return memaddr.to_bytes(self._reg_bytes, "big")
+
+        def write_readinto(self, write_buf, read_buf):
+            self._bus.write(self._addr, write_buf, False)
+            self._bus.read_into(self._addr, read_buf)
+
+        def read_mem(self, memaddr, buf=None, num_bytes=None):
+            if buf is None:
+                buf = bytearray(num_bytes)
+            self._bus.write(self._addr, self._reg(memaddr), False)
+            self._bus.read_into(self._addr, buf)
+            return buf
+
+        def write_mem(self, memaddr, buf):
+            self._bus.write(self._addr, self._reg(memaddr) + bytes(buf))
+
+        def read(self, buf=None, num_bytes=None):
+            if buf is None:
+                buf = bytearray(num_bytes)
+            self._bus.read_into(self._addr, buf)
+            return buf
+
+        def write(self, buf):
+            self._bus.write(self._addr, buf)
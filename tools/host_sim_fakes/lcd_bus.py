@@ -0,0 +1,47 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host stand-in for lvgl_micropython's `lcd_bus.SPIBus`.
+
+Commands and their parameters are blocking writes; pixel data is streamed
+by DMA and the registered callback runs when the transfer completes.
+"""
+
+import _sim
+
+
+class SPIBus:
+    def __init__(self, *, spi_bus, dc, freq, cs=-1, spi_mode=0, lsb_first=False,
+                 dc_low_on_data=False, cs_high_active=False, **_):
+        self.spi_bus = spi_bus
+        self.freq = freq
+        self._model = _sim.SIM.spi_bus(freq)
+        self._callback = None
+
+    def init(self, width, height, bpp, buffer_size, rgb565_byte_swap, cmd_bits=8, param_bits=8):
+        pass
+
+    def register_callback(self, callback):
+        self._callback = callback
+
+    def _done(self):
+        if self._callback is not None:
+            self._callback()
+
+    def tx_param(self, cmd, data=None):
+        self._model.write(1 + (len(data) if data is not None else 0))
+
+    def rx_param(self, cmd, data):
+        self._model.write(1 + len(data))
+
+    def tx_color(self, cmd, data, x_start, y_start, x_end, y_end, rotation, last_update):
+        nbytes = (x_end - x_start) * (y_end - y_start) * 2
+        self._model.write(1)
+        self._model.write_dma(nbytes, self._done)
+
+    def get_lane_count(self):
+        return 1
+
+    def deinit(self):
+        pass
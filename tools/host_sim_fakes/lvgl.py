@@ -0,0 +1,1033 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host stand-in for the LVGL 9 MicroPython binding.
+
+Only what the board modules and the app use, modelled closely enough that
+bus traffic follows the application's behaviour:
+
+- timers run from `timer_handler()` against the tick fed by `tick_inc()`,
+  newest first, like lv_timer_handler;
+- widgets invalidate the areas LVGL would (arc: the swept segment and both
+  knob positions; content-sized parents on text changes; pressed state);
+- the display refresh timer joins invalid areas, renders them into the
+  partial buffers row band by row band and waits for `flush_ready()` before
+  each flush, pausing itself when nothing is invalid;
+- input devices are read on their own timer and deliver PRESSED, PRESSING,
+  RELEASED and CLICKED to the topmost clickable widget;
+- animations step on the animation timer created by `init()`. Functions of
+  this module count as C functions: `anim_t.set_exec_cb()` and
+  `set_path_cb()` take only those (a binding function is stored as its C
+  pointer) and raise TypeError for Python callables, which go through
+  `set_custom_exec_cb()` and run Python on every step.
+
+Rendering itself costs no simulated time.
+"""
+
+import math
+
+import _sim
+
+NO_TIMER_READY = 0xFFFFFFFF
+# Invalid areas kept per display before falling back to a full refresh.
+_INV_BUF_SIZE = 32
+# Default theme metrics at LV_DPI_DEF 130 on a small screen.
+_ARC_WIDTH = 12
+_KNOB_PAD = 5
+_BUTTON_PAD_HOR = 10
+_BUTTON_PAD_VER = 10
+_BUTTON_SHADOW = 3
+
+
+class _Enum:
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+COLOR_FORMAT = _Enum(RGB565=0x12, RGB888=0x0F, ARGB8888=0x10)
+DISPLAY_RENDER_MODE = _Enum(PARTIAL=0, DIRECT=1, FULL=2)
+DISPLAY_ROTATION = _Enum(_0=0, _90=1, _180=2, _270=3)
+INDEV_TYPE = _Enum(NONE=0, POINTER=1, KEYPAD=2, BUTTON=3, ENCODER=4)
+INDEV_STATE = _Enum(RELEASED=0, PRESSED=1)
+ALIGN = _Enum(DEFAULT=0, TOP_LEFT=1, TOP_MID=2, TOP_RIGHT=3, BOTTOM_LEFT=4, BOTTOM_MID=5,
+              BOTTOM_RIGHT=6, LEFT_MID=7, RIGHT_MID=8, CENTER=9)
+PART = _Enum(MAIN=0x000000, SCROLLBAR=0x010000, INDICATOR=0x020000, KNOB=0x030000)
+STATE = _Enum(DEFAULT=0x0000, CHECKED=0x0001, FOCUSED=0x0002, PRESSED=0x0020, DISABLED=0x0080)
+EVENT = _Enum(ALL=0, PRESSED=1, PRESSING=2, PRESS_LOST=3, SHORT_CLICKED=4, CLICKED=7, RELEASED=8,
+              VALUE_CHANGED=35)
+
+
+class font_t:
+    def __init__(self, size):
+        self.size = size
+        self.line_height = size + size // 7 + 1
+
+    def text_width(self, text):
+        return int(math.ceil(len(text) * self.size * 0.6))
+
+
+font_montserrat_14 = font_t(14)
+font_montserrat_16 = font_t(16)
+font_default = font_montserrat_14
+
+
+def color_hex(value):
+    return value
+
+
+class area_t:
+    def __init__(self):
+        self.x1 = 0
+        self.y1 = 0
+        self.x2 = 0
+        self.y2 = 0
+
+
+class point_t:
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+
+
+# --- Areas as (x1, y1, x2, y2) tuples, inclusive ---
+
+def _area_size(a):
+    return (a[2] - a[0] + 1) * (a[3] - a[1] + 1)
+
+
+def _area_union(a, b):
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _area_intersect(a, b):
+    res = max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+    return res if res[0] <= res[2] and res[1] <= res[3] else None
+
+
+def _area_is_on(a, b):
+    # Overlapping or touching (lv_area_is_on).
+    return not (a[0] > b[2] + 1 or b[0] > a[2] + 1 or a[1] > b[3] + 1 or b[1] > a[3] + 1)
+
+
+def _area_is_in(inner, outer):
+    return inner[0] >= outer[0] and inner[1] >= outer[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+def _expand(a, px):
+    return a[0] - px, a[1] - px, a[2] + px, a[3] + px
+
+
+# --- Tick and timers ---
+
+_tick = 0
+_timers = []
+_displays = []
+_default_display = None
+_indevs = []
+_initialized = False
+_anims = []
+_anim_timer = None
+ANIM_REPEAT_INFINITE = 0xFFFF
+
+
+def init():
+    global _initialized, _anim_timer
+    _initialized = True
+    _anim_timer = timer_create(_anim_timer_cb, _sim.SIM.refr_period_ms)
+    _anim_timer.pause()
+
+
+def is_initialized():
+    return _initialized
+
+
+def deinit():
+    global _initialized
+    _initialized = False
+
+
+def tick_inc(ms):
+    global _tick
+    _tick += ms
+
+
+def tick_get():
+    return _tick
+
+
+def tick_elaps(prev):
+    return _tick - prev
+
+
+class timer_t:
+    def __init__(self, cb, period, user_data):
+        self._cb = cb
+        self.period = period
+        self.user_data = user_data
+        self.last_run = _tick
+        self.repeat_count = -1
+        self.paused = False
+
+    def set_period(self, period):
+        self.period = period
+
+    def set_repeat_count(self, count):
+        self.repeat_count = count
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def ready(self):
+        self.last_run = _tick - self.period - 1
+
+    def reset(self):
+        self.last_run = _tick
+
+    def delete(self):
+        if self in _timers:
+            _timers.remove(self)
+
+    def get_user_data(self):
+        return self.user_data
+
+    def _run_if_due(self):
+        if self.paused or _tick - self.last_run < self.period:
+            return False
+        self.last_run = _tick
+        if self.repeat_count > 0:
+            self.repeat_count -= 1
+        self._cb(self)
+        if self.repeat_count == 0:
+            self.delete()
+        return True
+
+
+def timer_create(cb, period, user_data=None):
+    timer = timer_t(cb, period, user_data)
+    # lv_timer_create inserts at the head of the timer list.
+    _timers.insert(0, timer)
+    return timer
+
+
+def timer_handler():
+    """Run due timers; return ms until the next one (NO_TIMER_READY if none)."""
+    for timer in list(_timers):
+        if timer in _timers:
+            timer._run_if_due()
+
+    next_ms = NO_TIMER_READY
+    for timer in _timers:
+        if not timer.paused:
+            remaining = timer.period - (_tick - timer.last_run)
+            next_ms = min(next_ms, max(remaining, 0))
+    return next_ms
+
+
+task_handler = timer_handler
+
+
+# --- Animations ---
+
+def _is_c_function(fn):
+    return getattr(fn, "__module__", None) == __name__
+
+
+class anim_t:
+    def init(self):
+        self.var = None
+        self.start_value = 0
+        self.end_value = 100
+        self.current_value = None
+        self.duration = 500
+        self.act_time = 0
+        self.playback_duration = 0
+        self.playback_delay = 0
+        self.repeat_count = 1
+        self.repeat_delay = 0
+        self.path_cb = anim_t.path_linear
+        self.exec_cb = None
+        self.custom_exec_cb = None
+        self.completed_cb = None
+        self._playback_now = False
+
+    __init__ = init
+
+    def set_var(self, var):
+        self.var = var
+
+    def set_values(self, start, end):
+        self.start_value = start
+        self.end_value = end
+
+    def set_duration(self, duration):
+        self.duration = duration
+
+    set_time = set_duration
+
+    def set_delay(self, delay):
+        self.act_time = -delay
+
+    def set_playback_duration(self, duration):
+        self.playback_duration = duration
+
+    set_playback_time = set_reverse_duration = set_playback_duration
+
+    def set_playback_delay(self, delay):
+        self.playback_delay = delay
+
+    def set_repeat_count(self, count):
+        self.repeat_count = count
+
+    def set_repeat_delay(self, delay):
+        self.repeat_delay = delay
+
+    def set_path_cb(self, path_cb):
+        if not _is_c_function(path_cb):
+            raise TypeError("path_cb must be an lv.anim_t.path_* function")
+        self.path_cb = path_cb
+
+    def set_exec_cb(self, exec_cb):
+        if not _is_c_function(exec_cb):
+            raise TypeError("exec_cb has no user_data: pass a binding function or use set_custom_exec_cb")
+        self.exec_cb = exec_cb
+
+    def set_custom_exec_cb(self, exec_cb):
+        self.custom_exec_cb = exec_cb
+
+    def set_completed_cb(self, completed_cb):
+        self.completed_cb = completed_cb
+
+    def start(self):
+        # lv_anim_start copies the descriptor and replaces animations of the same var/exec_cb.
+        running = anim_t()
+        running.__dict__.update(self.__dict__)
+        global _anim_last_run
+        if _anim_timer.paused:
+            _anim_last_run = _tick
+        for other in list(_anims):
+            if other.var is running.var and other.exec_cb is running.exec_cb and \
+                    other.custom_exec_cb is running.custom_exec_cb:
+                _anims.remove(other)
+        _anims.append(running)
+        if running.act_time >= 0:
+            running._step(0)
+        _anim_timer.resume()
+        return running
+
+    def path_linear(self):
+        step = self.act_time * 1024 // max(self.duration, 1)
+        return self.start_value + ((self.end_value - self.start_value) * step >> 10)
+
+    def path_ease_in(self):
+        t = self.act_time / max(self.duration, 1)
+        return self.start_value + int((self.end_value - self.start_value) * t * t)
+
+    def path_ease_out(self):
+        t = self.act_time / max(self.duration, 1)
+        return self.start_value + int((self.end_value - self.start_value) * (1 - (1 - t) * (1 - t)))
+
+    def path_ease_in_out(self):
+        t = self.act_time / max(self.duration, 1)
+        return self.start_value + int((self.end_value - self.start_value) * t * t * (3 - 2 * t))
+
+    def _exec(self, value):
+        if self.exec_cb is not None:
+            self.exec_cb(self.var, value)
+        elif self.custom_exec_cb is not None:
+            self.custom_exec_cb(self, value)
+
+    def _step(self, elapsed):
+        """Advance by `elapsed` ms; False once the animation is finished."""
+        self.act_time += elapsed
+        if self.act_time < 0:
+            return True
+        if self.act_time > self.duration:
+            self.act_time = self.duration
+        value = self.path_cb(self)
+        if value != self.current_value:
+            self.current_value = value
+            self._exec(value)
+        if self.act_time < self.duration:
+            return True
+        return self._ready()
+
+    def _ready(self):
+        if self.playback_duration and not self._playback_now:
+            self._playback_now = True
+            self.start_value, self.end_value = self.end_value, self.start_value
+            self._forward_duration, self.duration = self.duration, self.playback_duration
+            self.act_time = -self.playback_delay
+            return True
+        if self._playback_now:
+            self._playback_now = False
+            self.start_value, self.end_value = self.end_value, self.start_value
+            self.duration = self._forward_duration
+        if self.repeat_count == ANIM_REPEAT_INFINITE or self.repeat_count > 1:
+            if self.repeat_count != ANIM_REPEAT_INFINITE:
+                self.repeat_count -= 1
+            self.act_time = -self.repeat_delay
+            return True
+        if self.completed_cb is not None:
+            self.completed_cb(self)
+        return False
+
+
+_anim_last_run = 0
+
+
+def _anim_timer_cb(timer):
+    global _anim_last_run
+    elapsed = _tick - _anim_last_run
+    _anim_last_run = _tick
+    for anim in list(_anims):
+        if anim in _anims and not anim._step(elapsed):
+            _anims.remove(anim)
+    if not _anims:
+        timer.pause()
+
+
+def anim_delete(var, exec_cb=None):
+    for anim in list(_anims):
+        if anim.var is var and (exec_cb is None or anim.exec_cb is exec_cb):
+            _anims.remove(anim)
+
+
+def anim_count_running():
+    return len(_anims)
+
+
+class _Timeline:
+    def __init__(self):
+        self.entries = []
+
+
+def anim_timeline_create():
+    return _Timeline()
+
+
+def anim_timeline_add(timeline, start_time, anim):
+    timeline.entries.append((start_time, anim))
+
+
+def anim_timeline_start(timeline):
+    playtime = 0
+    for start_time, anim in timeline.entries:
+        running = anim_t()
+        running.__dict__.update(anim.__dict__)
+        running.act_time -= start_time
+        running.start()
+        playtime = max(playtime, start_time + anim.duration + anim.playback_duration)
+    return playtime
+
+
+def anim_timeline_delete(timeline):
+    for _, anim in timeline.entries:
+        anim_delete(anim.var, anim.exec_cb)
+
+
+# --- Events and widgets ---
+
+class event_t:
+    def __init__(self, code, target, user_data):
+        self.code = code
+        self.target = target
+        self.user_data = user_data
+
+    def get_code(self):
+        return self.code
+
+    def get_target(self):
+        return self.target
+
+    def get_target_obj(self):
+        return self.target
+
+    def get_current_target(self):
+        return self.target
+
+    def get_user_data(self):
+        return self.user_data
+
+
+class obj:
+    FLAG = _Enum(HIDDEN=0x0001, CLICKABLE=0x0002, CLICK_FOCUSABLE=0x0004, SCROLLABLE=0x0010)
+    _DEFAULT_FLAGS = FLAG.CLICKABLE | FLAG.CLICK_FOCUSABLE | FLAG.SCROLLABLE
+    # Default size; None = size to content.
+    _DEFAULT_SIZE = (100, 100)
+    _PAD = (0, 0)
+    _EXT_DRAW = 0
+    # Whether the default theme styles the pressed state differently.
+    _PRESSED_STYLE = False
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.children = []
+        self.flags = self._DEFAULT_FLAGS
+        self.state = STATE.DEFAULT
+        self.width, self.height = self._DEFAULT_SIZE
+        self.x = 0
+        self.y = 0
+        self._align = None
+        self._events = []
+        self._styles = {}
+        if parent is not None:
+            parent.children.append(self)
+            self.invalidate()
+
+    # Geometry
+
+    def _content_size(self):
+        return 0, 0
+
+    def get_width(self):
+        return self.width if self.width is not None else self._content_size()[0]
+
+    def get_height(self):
+        return self.height if self.height is not None else self._content_size()[1]
+
+    def get_coords(self, area=None):
+        x1, y1, x2, y2 = self._coords()
+        if area is not None:
+            area.x1, area.y1, area.x2, area.y2 = x1, y1, x2, y2
+        return area
+
+    def _coords(self):
+        width = self.get_width()
+        height = self.get_height()
+        if self.parent is None:
+            return 0, 0, width - 1, height - 1
+        px1, py1, px2, py2 = self.parent._coords()
+        pad_x, pad_y = self.parent._PAD
+        if self._align is not None and self._align[0] == ALIGN.CENTER:
+            _, dx, dy = self._align
+            x1 = px1 + (px2 - px1 + 1 - width) // 2 + dx
+            y1 = py1 + (py2 - py1 + 1 - height) // 2 + dy
+        else:
+            x1 = px1 + pad_x + self.x
+            y1 = py1 + pad_y + self.y
+        return x1, y1, x1 + width - 1, y1 + height - 1
+
+    def _layout_root(self):
+        # Objects whose area follows from this one's size.
+        node = self
+        while node.parent is not None and node.parent.parent is not None and \
+                (node.parent.width is None or node.parent.height is None):
+            node = node.parent
+        return node
+
+    def _change_geometry(self, apply):
+        root = self._layout_root()
+        root.invalidate()
+        apply()
+        root.invalidate()
+
+    def set_size(self, width, height):
+        def _apply():
+            self.width = width
+            self.height = height
+        self._change_geometry(_apply)
+
+    def set_width(self, width):
+        self.set_size(width, self.height)
+
+    def set_height(self, height):
+        self.set_size(self.width, height)
+
+    def set_pos(self, x, y):
+        def _apply():
+            self.x = x
+            self.y = y
+            self._align = None
+        self._change_geometry(_apply)
+
+    def align(self, align, x_ofs=0, y_ofs=0):
+        def _apply():
+            self._align = (align, x_ofs, y_ofs)
+        self._change_geometry(_apply)
+
+    def center(self):
+        self.align(ALIGN.CENTER, 0, 0)
+
+    def set_x(self, x):
+        self.set_pos(x, self.y)
+
+    def set_y(self, y):
+        self.set_pos(self.x, y)
+
+    def _set_opa(self, opa):
+        self._styles[("set_style_opa", PART.MAIN)] = opa
+        self.invalidate()
+
+    def fade_in(self, duration, delay):
+        self._fade(0, 255, duration, delay)
+
+    def fade_out(self, duration, delay):
+        self._fade(255, 0, duration, delay)
+
+    def _fade(self, start, end, duration, delay):
+        anim = anim_t()
+        anim.set_var(self)
+        anim.set_values(start, end)
+        anim.set_duration(duration)
+        anim.set_delay(delay)
+        anim.set_exec_cb(obj._set_opa)
+        anim.start()
+
+    # Flags, state and styles
+
+    def add_flag(self, flag):
+        self.flags |= flag
+
+    def remove_flag(self, flag):
+        self.flags &= ~flag
+
+    clear_flag = remove_flag
+
+    def has_flag(self, flag):
+        return bool(self.flags & flag)
+
+    def add_state(self, state):
+        if not self.state & state:
+            self.state |= state
+            if self._PRESSED_STYLE and state & STATE.PRESSED:
+                self.invalidate()
+
+    def remove_state(self, state):
+        if self.state & state:
+            self.state &= ~state
+            if self._PRESSED_STYLE and state & STATE.PRESSED:
+                self.invalidate()
+
+    def has_state(self, state):
+        return bool(self.state & state)
+
+    def __getattr__(self, name):
+        if name.startswith("set_style_"):
+            def _set_style(value, selector=0):
+                if self._styles.get((name, selector)) != value:
+                    self._styles[(name, selector)] = value
+                    self.invalidate()
+            return _set_style
+        raise AttributeError(name)
+
+    # Events
+
+    def add_event_cb(self, cb, filter=EVENT.ALL, user_data=None):
+        self._events.append((cb, filter, user_data))
+
+    def send_event(self, code, param=None):
+        for cb, filter, user_data in list(self._events):
+            if filter in (EVENT.ALL, code):
+                cb(event_t(code, self, user_data))
+        if code == EVENT.PRESSED:
+            _sim.SIM.counters.presses += 1
+
+    # Drawing
+
+    def invalidate(self):
+        disp = _display_of(self)
+        if disp is not None and not self.flags & obj.FLAG.HIDDEN:
+            disp._invalidate(_expand(self._coords(), self._EXT_DRAW))
+
+    def _hit_test(self, x, y):
+        x1, y1, x2, y2 = self._coords()
+        return x1 <= x <= x2 and y1 <= y <= y2
+
+    def delete(self):
+        self.invalidate()
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+
+def _display_of(widget):
+    while widget.parent is not None:
+        widget = widget.parent
+    for disp in _displays:
+        if disp._screen is widget:
+            return disp
+    return None
+
+
+class label(obj):
+    _DEFAULT_FLAGS = 0
+    _DEFAULT_SIZE = (None, None)
+
+    def __init__(self, parent=None):
+        self._text = "Text"
+        super().__init__(parent)
+
+    def _content_size(self):
+        font = font_default
+        return font.text_width(self._text), font.line_height
+
+    def set_text(self, text):
+        if text == self._text:
+            return
+
+        def _apply():
+            self._text = text
+        self._change_geometry(_apply)
+
+    def get_text(self):
+        return self._text
+
+
+class button(obj):
+    _DEFAULT_FLAGS = obj.FLAG.CLICKABLE | obj.FLAG.CLICK_FOCUSABLE
+    _DEFAULT_SIZE = (None, None)
+    _PAD = (_BUTTON_PAD_HOR, _BUTTON_PAD_VER)
+    _EXT_DRAW = _BUTTON_SHADOW
+    _PRESSED_STYLE = True
+
+    def _content_size(self):
+        width = height = 0
+        for child in self.children:
+            width = max(width, child.x + child.get_width())
+            height = max(height, child.y + child.get_height())
+        return width + 2 * _BUTTON_PAD_HOR, height + 2 * _BUTTON_PAD_VER
+
+
+class arc(obj):
+    _DEFAULT_FLAGS = obj.FLAG.CLICKABLE | obj.FLAG.CLICK_FOCUSABLE
+    _DEFAULT_SIZE = (150, 150)
+    _EXT_DRAW = _KNOB_PAD
+    _PRESSED_STYLE = True
+
+    def __init__(self, parent=None):
+        self._min = 0
+        self._max = 100
+        self._value = 0
+        self._bg_start = 135
+        self._bg_end = 45
+        super().__init__(parent)
+
+    def set_range(self, min_value, max_value):
+        self._min = min_value
+        self._max = max_value
+        self.set_value(min(max(self._value, min_value), max_value))
+
+    def get_min_value(self):
+        return self._min
+
+    def get_max_value(self):
+        return self._max
+
+    def _angle(self, value):
+        sweep = (self._bg_end - self._bg_start) % 360
+        return self._bg_start + sweep * (value - self._min) // max(self._max - self._min, 1)
+
+    def _geometry(self):
+        x1, y1, x2, y2 = self._coords()
+        radius = min(x2 - x1 + 1, y2 - y1 + 1) // 2
+        return (x1 + x2) // 2, (y1 + y2) // 2, radius
+
+    def _arc_area(self, start, end):
+        # Bounding box of the ring segment (lv_draw_arc_get_area, rounded ends).
+        cx, cy, radius = self._geometry()
+        inner = radius - _ARC_WIDTH
+        xs = []
+        ys = []
+        for angle in list(range(start, end + 1)) + [end]:
+            rad = math.radians(angle)
+            for r in (radius, inner):
+                xs.append(cx + r * math.cos(rad))
+                ys.append(cy + r * math.sin(rad))
+        half = _ARC_WIDTH // 2
+        return (int(math.floor(min(xs))) - half, int(math.floor(min(ys))) - half,
+                int(math.ceil(max(xs))) + half, int(math.ceil(max(ys))) + half)
+
+    def _knob_area(self, angle):
+        cx, cy, radius = self._geometry()
+        r = radius - _ARC_WIDTH // 2
+        rad = math.radians(angle)
+        kx = int(round(cx + r * math.cos(rad)))
+        ky = int(round(cy + r * math.sin(rad)))
+        size = _ARC_WIDTH // 2 + _KNOB_PAD
+        return kx - size, ky - size, kx + size, ky + size
+
+    def set_value(self, value):
+        value = min(max(value, self._min), self._max)
+        if value == self._value:
+            return
+        old = self._angle(self._value)
+        new = self._angle(value)
+        self._value = value
+        disp = _display_of(self)
+        if disp is not None:
+            disp._invalidate(self._arc_area(min(old, new), max(old, new)))
+            disp._invalidate(self._knob_area(old))
+            disp._invalidate(self._knob_area(new))
+
+    def get_value(self):
+        return self._value
+
+    def set_bg_angles(self, start, end):
+        self._bg_start = start
+        self._bg_end = end
+        self.invalidate()
+
+    def _hit_test(self, x, y):
+        # Only the ring (plus the knob) is clickable (LV_EVENT_HIT_TEST).
+        cx, cy, radius = self._geometry()
+        dist = math.hypot(x - cx, y - cy)
+        return radius - _ARC_WIDTH - _KNOB_PAD <= dist <= radius + _KNOB_PAD
+
+
+# --- Display ---
+
+class display_t:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._buffers = []
+        self._buf_size = width * height * 2
+        self._flush_cb = None
+        self._flushing = False
+        self._flushing_last = False
+        self._inv_areas = []
+        self._inv_full = False
+        self._screen = obj()
+        self._screen.width = width
+        self._screen.height = height
+        self._screen.flags = 0
+        self._refr_timer = timer_create(self._refr_timer_cb, _sim.SIM.refr_period_ms)
+        self._invalidate((0, 0, width - 1, height - 1))
+
+    def set_color_format(self, color_format):
+        self._color_format = color_format
+
+    def set_buffers(self, buf1, buf2, size, render_mode=DISPLAY_RENDER_MODE.PARTIAL):
+        self._buffers = [buf for buf in (buf1, buf2) if buf is not None]
+        self._buf_size = size
+
+    def set_flush_cb(self, cb):
+        self._flush_cb = cb
+
+    def set_default(self):
+        global _default_display
+        _default_display = self
+
+    def get_horizontal_resolution(self):
+        return self.width
+
+    def get_vertical_resolution(self):
+        return self.height
+
+    def get_screen_active(self):
+        return self._screen
+
+    def flush_ready(self):
+        self._flushing = False
+
+    def flush_is_last(self):
+        return self._flushing_last
+
+    def _invalidate(self, area):
+        area = _area_intersect(area, (0, 0, self.width - 1, self.height - 1))
+        if area is None:
+            return
+        if not self._inv_full:
+            if any(_area_is_in(area, prev) for prev in self._inv_areas):
+                return
+            if len(self._inv_areas) >= _INV_BUF_SIZE:
+                self._inv_full = True
+                self._inv_areas = [(0, 0, self.width - 1, self.height - 1)]
+            else:
+                self._inv_areas.append(area)
+        self._refr_timer.resume()
+
+    def _join_areas(self):
+        # lv_refr_join_area: merge pairs whose union is smaller than both.
+        areas = list(self._inv_areas)
+        joined = [False] * len(areas)
+        for i in range(len(areas)):
+            if joined[i]:
+                continue
+            for j in range(len(areas)):
+                if i == j or joined[j] or not _area_is_on(areas[i], areas[j]):
+                    continue
+                union = _area_union(areas[i], areas[j])
+                if _area_size(union) < _area_size(areas[i]) + _area_size(areas[j]):
+                    areas[i] = union
+                    joined[j] = True
+        return [area for area, gone in zip(areas, joined) if not gone]
+
+    def _wait_for_flushing(self):
+        if self._flushing:
+            _sim.SIM.counters.flush_wait_us += _sim.SIM.clock.wait_until(lambda: not self._flushing)
+
+    def _refr_timer_cb(self, _timer):
+        if not self._inv_areas:
+            self._refr_timer.pause()
+            return
+        self.refresh()
+
+    def refresh(self):
+        areas = self._join_areas()
+        self._inv_areas = []
+        self._inv_full = False
+        if not areas or self._flush_cb is None:
+            return
+
+        parts = []
+        for x1, y1, x2, y2 in areas:
+            width = x2 - x1 + 1
+            rows = max(1, self._buf_size // (width * 2))
+            for row in range(y1, y2 + 1, rows):
+                parts.append((x1, row, x2, min(row + rows - 1, y2)))
+
+        counters = _sim.SIM.counters
+        counters.frames += 1
+        for idx, (x1, y1, x2, y2) in enumerate(parts):
+            self._wait_for_flushing()
+            area = area_t()
+            area.x1, area.y1, area.x2, area.y2 = x1, y1, x2, y2
+            buf = self._buffers[idx % len(self._buffers)] if self._buffers else None
+            self._flushing = True
+            self._flushing_last = idx == len(parts) - 1
+            counters.flushes += 1
+            self._flush_cb(self, area, buf)
+
+
+def display_create(width, height):
+    global _default_display
+    disp = display_t(width, height)
+    _displays.append(disp)
+    if _default_display is None:
+        _default_display = disp
+    return disp
+
+
+def display_get_default():
+    return _default_display
+
+
+def screen_active():
+    return _default_display._screen
+
+
+SCR_LOAD_ANIM = _Enum(NONE=0, OVER_LEFT=1, OVER_RIGHT=2, OVER_TOP=3, OVER_BOTTOM=4, MOVE_LEFT=5,
+                      MOVE_RIGHT=6, MOVE_TOP=7, MOVE_BOTTOM=8, FADE_IN=9, FADE_OUT=10)
+
+
+def screen_load(scr):
+    disp = _default_display
+    scr.width = disp.width
+    scr.height = disp.height
+    scr.flags = 0
+    disp._screen = scr
+    disp._invalidate((0, 0, disp.width - 1, disp.height - 1))
+
+
+def screen_load_anim(scr, anim_type, duration, delay, auto_del):
+    # The transition is not modelled: the new screen is drawn in full.
+    screen_load(scr)
+
+
+def refr_now(disp=None):
+    targets = [disp] if disp is not None else list(_displays)
+    for target in targets:
+        target.refresh()
+
+
+# --- Input devices ---
+
+class indev_data_t:
+    def __init__(self):
+        self.point = point_t()
+        self.state = INDEV_STATE.RELEASED
+        self.continue_reading = False
+
+
+class indev_t:
+    def __init__(self):
+        self._type = INDEV_TYPE.NONE
+        self._read_cb = None
+        self._disp = None
+        self._data = indev_data_t()
+        self._pressed = False
+        self._target = None
+        self._timer = timer_create(self._read_timer_cb, _sim.SIM.refr_period_ms)
+
+    def set_type(self, indev_type):
+        self._type = indev_type
+
+    def set_read_cb(self, cb):
+        self._read_cb = cb
+
+    def set_display(self, disp):
+        self._disp = disp
+
+    def get_display(self):
+        return self._disp or _default_display
+
+    def enable(self, en):
+        self._timer.paused = not en
+
+    def delete(self):
+        self._timer.delete()
+        _indevs.remove(self)
+
+    def _read_timer_cb(self, _timer):
+        if self._read_cb is None:
+            return
+        data = self._data
+        while True:
+            data.continue_reading = False
+            self._read_cb(self, data)
+            if self._type == INDEV_TYPE.POINTER:
+                self._process_pointer(data)
+            if not data.continue_reading:
+                break
+
+    def _find_target(self, x, y):
+        disp = self.get_display()
+        if disp is None:
+            return None
+
+        def _search(node):
+            for child in reversed(node.children):
+                if child.flags & obj.FLAG.HIDDEN:
+                    continue
+                found = _search(child)
+                if found is not None:
+                    return found
+                if child.flags & obj.FLAG.CLICKABLE and child._hit_test(x, y):
+                    return child
+            return None
+
+        return _search(disp._screen) or disp._screen
+
+    def _process_pointer(self, data):
+        pressed = data.state == INDEV_STATE.PRESSED
+        if pressed and not self._pressed:
+            self._target = self._find_target(data.point.x, data.point.y)
+            self._target.add_state(STATE.PRESSED)
+            self._target.send_event(EVENT.PRESSED)
+        elif pressed and self._target is not None:
+            self._target.send_event(EVENT.PRESSING)
+        elif not pressed and self._pressed and self._target is not None:
+            target = self._target
+            self._target = None
+            target.remove_state(STATE.PRESSED)
+            target.send_event(EVENT.RELEASED)
+            target.send_event(EVENT.CLICKED)
+        self._pressed = pressed
+
+
+def indev_create():
+    indev = indev_t()
+    _indevs.append(indev)
+    return indev
+
+
+def indev_get_next(indev=None):
+    if indev is None:
+        return _indevs[0] if _indevs else None
+    idx = _indevs.index(indev) + 1
+    return _indevs[idx] if idx < len(_indevs) else None
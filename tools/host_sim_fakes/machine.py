@@ -0,0 +1,123 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host stand-in for MicroPython's `machine`: Pin, SPI and I2C on the simulated buses."""
+
+import _sim
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 4
+    IRQ_RISING = 8
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self._value = 1 if pull == self.PULL_UP else 0
+        if value is not None:
+            self._value = value
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = 1 if value else 0
+        return None
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    def irq(self, handler=None, trigger=IRQ_FALLING):
+        # Interrupts belong to the GPIO, not to this Pin object.
+        if handler is None:
+            _sim.SIM.pin_irqs.pop(self.id, None)
+        else:
+            _sim.SIM.pin_irqs[self.id] = (self, handler)
+
+
+class SPI:
+    """Blocking SPI master (also the ESP32 `SPI.Bus`/`SPI.Device` pair)."""
+
+    def __init__(self, id=0, baudrate=1_000_000, polarity=0, phase=0, sck=None, mosi=None, miso=None, **_):
+        self.baudrate = baudrate
+        self._bus = _sim.SIM.spi_bus(baudrate)
+
+    def init(self, baudrate=None, **_):
+        if baudrate is not None:
+            self.baudrate = self._bus.freq = baudrate
+
+    def deinit(self):
+        pass
+
+    def write(self, buf):
+        self._bus.write(len(buf))
+
+    def readinto(self, buf, write=0x00):
+        self._bus.write(len(buf))
+
+    def write_readinto(self, wr_buf, rd_buf):
+        self._bus.write(len(wr_buf))
+
+    class Bus:
+        def __init__(self, host, sck, mosi, miso=-1, **_):
+            self.host = host
+
+        def deinit(self):
+            pass
+
+    class Device:
+        def __init__(self, spi_bus, freq, cs=-1, polarity=0, phase=0, **_):
+            self.spi_bus = spi_bus
+            self._bus = _sim.SIM.spi_bus(freq)
+
+        def write(self, buf):
+            self._bus.write(len(buf))
+
+        def readinto(self, buf, write=0x00):
+            self._bus.write(len(buf))
+
+        def write_readinto(self, wr_buf, rd_buf):
+            self._bus.write(len(wr_buf))
+
+        def deinit(self):
+            pass
+
+
+class I2C:
+    """Blocking I2C controller with the touch controller at its address."""
+
+    def __init__(self, id=0, scl=None, sda=None, freq=400_000, **_):
+        self._bus = _sim.SIM.i2c_bus(freq)
+
+    def scan(self):
+        return [_sim.SIM.touch.ADDR]
+
+    def writeto(self, addr, buf, stop=True):
+        self._bus.write(addr, buf, stop)
+        return len(buf)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        self._bus.read_into(addr, buf, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        buf = bytearray(nbytes)
+        self._bus.read_into(addr, buf, stop)
+        return bytes(buf)
+
+    def writeto_mem(self, addr, memaddr, buf):
+        self._bus.write(addr, bytes([memaddr]) + bytes(buf))
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        self._bus.write(addr, bytes([memaddr]), False)
+        self._bus.read_into(addr, buf)
+
+
+def freq():
+    return 125_000_000
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Summarize an lvgl_profiler.dump() capture with percentiles and histograms."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+PERCENTILES = (50, 90, 99)
+
+
+def parse_dump(text: str) -> dict[str, tuple[int, list[int]]]:
+    """Return channel -> (total sample count, kept samples) from dump text."""
+    channels: dict[str, tuple[int, list[int]]] = {}
+    in_dump = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("# lvgl_profiler"):
+            in_dump = True
+            channels.clear()
+            continue
+        if not in_dump or not line:
+            continue
+        if line.startswith("# end"):
+            in_dump = False
+            continue
+
+        fields = line.split()
+        try:
+            values = [int(field) for field in fields[1:]]
+        except ValueError as exc:
+            raise SystemExit(f"Malformed profiler line: {line!r}") from exc
+        if not values:
+            raise SystemExit(f"Malformed profiler line: {line!r}")
+        channels[fields[0]] = (values[0], values[1:])
+
+    if not channels:
+        raise SystemExit("No lvgl_profiler dump found in input")
+    return channels
+
+
+def percentile(sorted_values: list[int], pct: int) -> int:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def histogram(values: list[int], bins: int, width: int) -> list[str]:
+    """Render a fixed-width text histogram of microsecond samples."""
+    low, high = min(values), max(values)
+    bins = min(bins, high - low + 1)
+    step = max(1, -(-(high - low + 1) // bins))
+    counts = [0] * bins
+    for value in values:
+        counts[min(bins - 1, (value - low) // step)] += 1
+
+    peak = max(counts)
+    lines = []
+    for idx, count in enumerate(counts):
+        start = low + idx * step
+        bar = "#" * (count * width // peak) if peak else ""
+        lines.append(f"    {start:>8} us | {bar} {count}")
+    return lines
+
+
+def main() -> int:
+    """CLI entrypoint: read a capture file (or stdin) and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("capture", nargs="?", help="serial capture file (default: stdin)")
+    parser.add_argument("--bins", type=int, default=10, help="histogram bins per channel")
+    parser.add_argument("--width", type=int, default=40, help="histogram bar width")
+    args = parser.parse_args()
+
+    if args.capture:
+        with open(args.capture, "r", encoding="utf-8", errors="replace") as fh:
+            text = fh.read()
+    else:
+        text = sys.stdin.read()
+
+    for name, (total, samples) in parse_dump(text).items():
+        print(f"== {name}: {total} samples ({len(samples)} kept)")
+        if not samples:
+            continue
+
+        ordered = sorted(samples)
+        mean = sum(ordered) / len(ordered)
+        pcts = " ".join(f"p{pct}={percentile(ordered, pct)}" for pct in PERCENTILES)
+        print(f"    min={ordered[0]} {pcts} max={ordered[-1]} mean={mean:.1f} (us)")
+        if name == "frame" and mean > 0:
+            print(f"    fps={1_000_000 / mean:.1f}")
+        for line in histogram(ordered, args.bins, args.width):
+            print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the configuration hashed by the artifact cache and step stamps.
+
+Run it from the repository root:
+
+    python3 tools/test_artifact_cache.py     (or: python3 -m pytest tools)
+
+The ESP32 workflow's print_config and script_functions/common/artifact_cache.sh
+are sourced in bash and their configuration is hashed by
+script_heredoc_templates/common/artifact_cache.py against a throwaway git
+checkout, as `restore_cached_firmware` does. The prepare_build_context
+stamp (script_functions/common/step_stamps.sh) hashes the same configuration.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import host_sim  # noqa: E402
+
+ROOT = host_sim.ROOT
+FUNCTIONS_DIR = ROOT / "script_functions"
+CACHE_TOOL = ROOT / "script_heredoc_templates" / "common" / "artifact_cache.py"
+
+_KEY_SCRIPT = """
+source "$FUNCTIONS_DIR/common/logging_io.sh"
+source "$FUNCTIONS_DIR/esp32/workflow.sh"
+source "$FUNCTIONS_DIR/common/artifact_cache.sh"
+source "$FUNCTIONS_DIR/common/step_stamps.sh"
+source "$FUNCTIONS_DIR/esp32/prebuild_setup.sh"
+case "$1" in
+    config) artifact_cache_config ;;
+    key) artifact_cache_config | "$PYTHON_BIN" "$CACHE_TOOL" key --repo "$REPO" ;;
+    stamp) _step_stamp_hash prepare_build_context_stamp_inputs ;;
+esac
+"""
+
+
+@unittest.skipIf(shutil.which("bash") is None or shutil.which("git") is None, "needs bash and git")
+class ArtifactCacheKeyTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_artifact_cache_")
+        self.repo = Path(self._tmp.name) / "lvgl_micropython"
+        self.repo.mkdir()
+        git = ["git", "-C", str(self.repo), "-c", "user.name=test", "-c", "user.email=test@example.invalid"]
+        subprocess.run(git + ["init", "-q"], check=True)
+        subprocess.run(git + ["commit", "-q", "--allow-empty", "-m", "upstream"], check=True)
+        # Same board values as the waveshare_esp32s3_lcd128 profile.
+        self.env = dict(os.environ, **host_sim.BOARDS["esp32"]["env"],
+                        FUNCTIONS_DIR=str(FUNCTIONS_DIR), CACHE_TOOL=str(CACHE_TOOL),
+                        PYTHON_BIN=sys.executable, REPO=str(self.repo), SCRIPT_DIR=str(ROOT),
+                        HEREDOC_TEMPLATES_DIR=str(ROOT / "script_heredoc_templates"),
+                        MODE="build", TARGET_PORT="esp32", BOARD_PROFILE="custom")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, what, **env):
+        result = subprocess.run(["bash", "-c", _KEY_SCRIPT, "artifact_cache", what],
+                                env=dict(self.env, **env), capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_config_has_the_board_values(self):
+        config = self._run("config").splitlines()
+        for name in host_sim.BOARDS["esp32"]["env"]:
+            self.assertIn(f"{name}={self.env[name]}", config)
+        self.assertEqual(len(config), len(set(line.split("=", 1)[0] for line in config)))
+        self.assertNotIn("MODE=build", config)
+
+    def test_pin_changes_the_key(self):
+        key = self._run("key").strip()
+        self.assertRegex(key, r"^[0-9a-f]{32}$")
+        self.assertEqual(self._run("key").strip(), key)
+        self.assertNotEqual(self._run("key", PIN_LCD_CS="21").strip(), key)
+        self.assertNotEqual(self._run("key", SPI_FREQ="80000000").strip(), key)
+
+    def test_pin_changes_the_build_context_stamp(self):
+        stamp = self._run("stamp").strip()
+        self.assertRegex(stamp, r"^[0-9a-f]{64}$")
+        self.assertEqual(self._run("stamp").strip(), stamp)
+        self.assertNotEqual(self._run("stamp", PIN_TP_INT="4").strip(), stamp)
+        self.assertNotEqual(self._run("stamp", DISPLAY_HEIGHT="280").strip(), stamp)
+
+    def test_ignored_settings_keep_the_key(self):
+        key = self._run("key").strip()
+        self.assertEqual(self._run("key", MODE="all", STEP_TIMING="1").strip(), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the lv_conf.h profiles (script_heredoc_templates/common/configure_lv_conf.py).
+
+Run it from the repository root:
+
+    python3 tools/test_configure_lv_conf.py     (or: python3 -m pytest tools)
+
+`configure()` must restore the recorded original of every macro a profile
+no longer sets when the profile is switched or dropped. The CLI is run
+against a small lv_conf.h to check the state file and the optional macros.
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "script_heredoc_templates" / "common" / "configure_lv_conf.py"
+sys.path.insert(0, str(SCRIPT.parent))
+
+import configure_lv_conf as conf  # noqa: E402
+
+LV_CONF = """\
+#define LV_USE_OS   LV_OS_NONE
+#define LV_MEM_SIZE (64 * 1024U)          /*[bytes]*/
+#define LV_DEF_REFR_PERIOD  33      /*[ms]*/
+#define LV_DRAW_BUF_ALIGN                       4
+#define LV_DRAW_SW_COMPLEX 1
+#define LV_USE_ASSERT_NULL          1
+#define LV_USE_ASSERT_MALLOC        1
+#define LV_USE_ASSERT_STYLE         0
+#define LV_USE_ASSERT_MEM_INTEGRITY 0
+#define LV_USE_ASSERT_OBJ           0
+#define LV_USE_LOG 1
+#define LV_DRAW_LAYER_SIMPLE_BUF_SIZE    (24 * 1024)
+#define LV_CACHE_DEF_SIZE       0
+#define LV_IMAGE_HEADER_CACHE_DEF_CNT 0
+#define LV_GRADIENT_MAX_STOPS    2
+#define LV_USE_PERF_MONITOR 0
+#define LV_USE_SYSMON   0
+#define LV_DRAW_SW_SHADOW_CACHE_SIZE 0
+#define LV_DRAW_SW_CIRCLE_CACHE_SIZE 4
+"""
+
+
+def _apply(text, originals, profile, port="rp2", overrides=None):
+    wanted = {**conf.profile_defines(profile, port), **(overrides or {})}
+    for name in conf.validate(text, wanted, set(overrides or ())):
+        del wanted[name]
+    return conf.configure(text, originals, wanted)
+
+
+class ConfigureTest(unittest.TestCase):
+    def test_profile_then_none_restores_everything(self):
+        originals = {}
+        text, changes = _apply(LV_CONF, originals, "max-fps")
+        self.assertTrue(changes)
+        self.assertEqual(conf.read_define(text, "LV_USE_LOG"), "0")
+        # Port entries override the shared ones.
+        self.assertEqual(conf.read_define(text, "LV_CACHE_DEF_SIZE"), "(16 * 1024)")
+        self.assertIn("#define LV_MEM_SIZE (64 * 1024U)          /*[bytes]*/", text)
+        self.assertEqual(originals["LV_USE_LOG"], "1")
+
+        text, _ = _apply(text, originals, "")
+        self.assertEqual(text, LV_CONF)
+        self.assertEqual(originals, {})
+
+    def test_switching_profiles_restores_what_the_new_one_does_not_set(self):
+        originals = {}
+        text, _ = _apply(LV_CONF, originals, "max-fps", "esp32")
+        self.assertEqual(conf.read_define(text, "LV_CACHE_DEF_SIZE"), "(64 * 1024)")
+        self.assertEqual(conf.read_define(text, "LV_IMAGE_HEADER_CACHE_DEF_CNT"), "8")
+
+        # low-latency sets no image header cache: back to the original 0.
+        text, _ = _apply(text, originals, "low-latency", "esp32")
+        self.assertEqual(conf.read_define(text, "LV_IMAGE_HEADER_CACHE_DEF_CNT"), "0")
+        self.assertEqual(conf.read_define(text, "LV_CACHE_DEF_SIZE"), "0")
+        self.assertEqual(conf.read_define(text, "LV_MEM_SIZE"), "(48 * 1024U)")
+        self.assertNotIn("LV_IMAGE_HEADER_CACHE_DEF_CNT", originals)
+        # Originals are those of the pristine file, not of the previous profile.
+        self.assertEqual(originals["LV_MEM_SIZE"], "(64 * 1024U)")
+
+        text, _ = _apply(text, originals, "")
+        self.assertEqual(text, LV_CONF)
+
+    def test_override_wins_and_is_restored(self):
+        originals = {}
+        text, _ = _apply(LV_CONF, originals, "low-memory", overrides={"LV_MEM_SIZE": "(40 * 1024U)"})
+        self.assertEqual(conf.read_define(text, "LV_MEM_SIZE"), "(40 * 1024U)")
+        text, _ = _apply(text, originals, "low-memory")
+        self.assertEqual(conf.read_define(text, "LV_MEM_SIZE"), "(32 * 1024U)")
+        text, _ = _apply(text, originals, "")
+        self.assertEqual(text, LV_CONF)
+
+    def test_missing_macros(self):
+        text = LV_CONF.replace("#define LV_USE_SYSMON   0\n", "")
+        skipped = conf.validate(text, conf.profile_defines("max-fps", "rp2"), set())
+        # The fixture is an LVGL 9 lv_conf.h: no LV_INDEV_DEF_READ_PERIOD either.
+        self.assertEqual(skipped, ["LV_INDEV_DEF_READ_PERIOD", "LV_USE_SYSMON"])
+        with self.assertRaises(SystemExit):
+            conf.validate(text, {"LV_USE_SYSMON": "1"}, {"LV_USE_SYSMON"})
+        with self.assertRaises(SystemExit):
+            conf.validate(LV_CONF.replace("#define LV_USE_LOG 1\n", ""), conf.profile_defines("max-fps", ""), set())
+
+    def test_parse_overrides(self):
+        self.assertEqual(conf.parse_overrides(["LV_MEM_SIZE=(40 * 1024U); LV_USE_LOG=1", "LV_USE_OS=LV_OS_NONE"]),
+                         {"LV_MEM_SIZE": "(40 * 1024U)", "LV_USE_LOG": "1", "LV_USE_OS": "LV_OS_NONE"})
+        for bad in ("LV_USE_LOG", "lv_use_log=1", "LV_USE_LOG=", "LV_FONT_MONTSERRAT_14=1"):
+            with self.subTest(bad=bad), self.assertRaises(SystemExit):
+                conf.parse_overrides([bad])
+        with self.assertRaises(SystemExit):
+            conf.profile_defines("fastest", "rp2")
+
+
+class CliTest(unittest.TestCase):
+    def test_state_file_across_runs(self):
+        with tempfile.TemporaryDirectory(prefix="test_lv_conf_") as tmp:
+            path = Path(tmp) / "lv_conf.h"
+            path.write_text(LV_CONF, encoding="utf-8")
+            state = path.with_name(path.name + conf.STATE_SUFFIX)
+
+            def cli(*args):
+                return subprocess.run([sys.executable, str(SCRIPT), str(path), "--port", "rp2", *args],
+                                      capture_output=True, text=True, check=True).stdout
+
+            self.assertIn("would set LV_USE_LOG: 1 -> 0", cli("--profile", "max-fps", "--check"))
+            self.assertEqual(path.read_text(encoding="utf-8"), LV_CONF)
+            self.assertFalse(state.exists())
+
+            cli("--profile", "max-fps")
+            self.assertEqual(json.loads(state.read_text(encoding="utf-8"))["LV_USE_LOG"], "1")
+            self.assertIn("0 changed", cli("--profile", "max-fps"))
+            cli("--profile", "")
+            self.assertEqual(path.read_text(encoding="utf-8"), LV_CONF)
+            self.assertEqual(json.loads(state.read_text(encoding="utf-8")), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
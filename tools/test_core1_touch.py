@@ -0,0 +1,124 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the RP2040 core 1 touch mailbox read on core 0.
+
+Run it from the repository root:
+
+    python3 tools/test_core1_touch.py     (or: python3 -m pytest tools)
+
+`_core1_read_cb` of the rendered board module reads a `_TouchMailbox`
+whose sequence counter is scripted by the test, so a sample that core 1
+keeps busy or tears on every attempt must still return within
+CORE1_READ_RETRIES attempts.
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import host_sim  # noqa: E402
+
+
+class _Obj:
+    """Attribute bag standing in for lv.indev_data_t and its point."""
+
+
+class Core1TouchReadTest(unittest.TestCase):
+    def setUp(self):
+        host_sim._purge_modules()
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_core1_touch_")
+        board_py = host_sim.render_board_module("rp2040", Path(self._tmp.name))
+        self._saved_path = list(sys.path)
+        sys.path[:0] = [str(host_sim.FAKES_DIR), str(host_sim.FROZEN_DIR), self._tmp.name]
+        import _sim
+
+        _sim.reset()
+        import lvgl
+
+        self.lv = lvgl
+        self.board = __import__(board_py.stem)
+        self.box = self.board._TouchMailbox()
+        self.board._core1_touch = (None, None, self.box)
+        # Worker running, no stop requested, no flush claimed.
+        self.board._core1_state[:] = b"\x00\x01\x00"
+        self.data = _Obj()
+        self.data.point = _Obj()
+        self.data.state = lvgl.INDEV_STATE.RELEASED
+
+    def tearDown(self):
+        sys.path[:] = self._saved_path
+        host_sim._purge_modules()
+        self._tmp.cleanup()
+
+    def _publish(self, pressed, x=0, y=0):
+        box = self.box
+        box.seq += 1
+        box.pressed = pressed
+        box.x = x
+        box.y = y
+        box.seq += 1
+
+    def _script_seq(self, values):
+        """Make `box.seq` return `values` in turn (the last one repeats)."""
+        reads = []
+
+        class _Box(type(self.box)):
+            @property
+            def seq(self):
+                reads.append(None)
+                return values[min(len(reads), len(values)) - 1]
+
+            @seq.setter
+            def seq(self, value):
+                pass
+
+        self.box.__class__ = _Box
+        return reads
+
+    def test_consistent_sample(self):
+        self._publish(True, 120, 80)
+        self.board._core1_read_cb(None, self.data)
+        self.assertEqual(self.data.state, self.lv.INDEV_STATE.PRESSED)
+        self.assertEqual((self.data.point.x, self.data.point.y), (120, 80))
+
+        self._publish(False)
+        self.board._core1_read_cb(None, self.data)
+        self.assertEqual(self.data.state, self.lv.INDEV_STATE.RELEASED)
+
+    def test_busy_sample_reuses_the_last_one(self):
+        self._publish(True, 10, 20)
+        self.board._core1_read_cb(None, self.data)
+        self.box.x = 200  # core 1 mid-update from here on
+        reads = self._script_seq([5])
+
+        self.data.point.x = self.data.point.y = None
+        self.board._core1_read_cb(None, self.data)
+        self.assertEqual(len(reads), self.board.CORE1_READ_RETRIES)
+        self.assertEqual(self.data.state, self.lv.INDEV_STATE.PRESSED)
+        self.assertEqual((self.data.point.x, self.data.point.y), (10, 20))
+
+    def test_torn_sample_reuses_the_last_one(self):
+        self.box.pressed = True
+        reads = self._script_seq(list(range(0, 64, 2)))
+
+        self.board._core1_read_cb(None, self.data)
+        self.assertEqual(len(reads), 2 * self.board.CORE1_READ_RETRIES)
+        # Nothing consistent was seen yet: released.
+        self.assertEqual(self.data.state, self.lv.INDEV_STATE.RELEASED)
+
+    def test_stopped_worker_reads_released(self):
+        self._publish(True, 120, 80)
+        for state in (b"\x00\x00\x00", b"\x01\x01\x00"):
+            self.board._core1_state[:] = state
+            self.data.state = self.lv.INDEV_STATE.PRESSED
+            self.board._core1_read_cb(None, self.data)
+            self.assertEqual(self.data.state, self.lv.INDEV_STATE.RELEASED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of script_heredoc_templates/common/estimate_firmware_size.py.
+
+Run it from the repository root:
+
+    python3 tools/test_estimate_firmware_size.py     (or: python3 -m pytest tools)
+
+The helpers are tested directly; the CLI runs against a temporary font
+directory (the synthetic font of test_subset_lvgl_fonts.py plus a source
+only countable by its hex literals), a frozen module and a size report.
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from test_subset_lvgl_fonts import ROOT, _font_source  # noqa: E402
+
+SCRIPT = ROOT / "script_heredoc_templates" / "common" / "estimate_firmware_size.py"
+sys.path.insert(0, str(SCRIPT.parent))
+
+import estimate_firmware_size as estimate  # noqa: E402
+from subset_lvgl_fonts import FontData  # noqa: E402
+
+REPORT = {
+    "totals": {"flash": 1_000_000},
+    "objects": {
+        "liblvgl.a(lv_font_montserrat_14.c.obj)": {"flash": 30_000},
+        "liblvgl.a(lv_font_montserrat_28.c.obj)": {"flash": 70_000},
+        "liblvgl.a(lv_obj.c.obj)": {"flash": 50_000},
+    },
+    "categories": {"frozen modules": {"flash": 20_000}},
+}
+
+
+class HelpersTest(unittest.TestCase):
+    def test_history_baseline(self):
+        self.assertEqual(estimate.history_baseline(REPORT), (1_000_000, 100_000, 20_000))
+        self.assertEqual(estimate.history_baseline({"totals": {"flash": 5}}), (5, 0, 0))
+
+    def test_suggest_drops_largest_optional_fonts(self):
+        fonts = {"montserrat_14": 10, "montserrat_28": 50, "unscii_16": 30, "montserrat_12": 5}
+        self.assertEqual(estimate.suggest(fonts, "montserrat_14", 40), ["montserrat_28"])
+        self.assertEqual(estimate.suggest(fonts, "montserrat_28", 40), ["unscii_16", "montserrat_14"])
+        # The default font is never dropped: not enough to recover.
+        self.assertEqual(estimate.suggest(fonts, "montserrat_28", 50), [])
+
+    def test_font_bytes(self):
+        with tempfile.TemporaryDirectory(prefix="test_estimate_") as tmp:
+            parsed = Path(tmp) / "lv_font_montserrat_14.c"
+            parsed.write_text(_font_source(), encoding="utf-8")
+            self.assertEqual(estimate.font_bytes(parsed), FontData(_font_source(), parsed.name).data_bytes())
+            raw = Path(tmp) / "lv_font_unscii_8.c"
+            raw.write_text("static const uint8_t data[] = {0x01, 0x02, 0xff};\n", encoding="utf-8")
+            self.assertEqual(estimate.font_bytes(raw), 3)
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_estimate_")
+        self.tmp = Path(self._tmp.name)
+        self.font_dir = self.tmp / "font"
+        self.font_dir.mkdir()
+        (self.font_dir / "lv_font_montserrat_14.c").write_text(_font_source(), encoding="utf-8")
+        (self.font_dir / "lv_font_montserrat_28.c").write_text(
+            "static const uint8_t data[] = {" + ", ".join(["0x00"] * 40_000) + "};\n", encoding="utf-8")
+        self.frozen = self.tmp / "lvgl_app.py"
+        self.frozen.write_text("x = 1\n" * 1000, encoding="utf-8")
+        self.report = self.tmp / "firmware.size.json"
+        self.report.write_text(json.dumps(REPORT), encoding="utf-8")
+        self.font14 = FontData(_font_source(), "14").data_bytes()
+        # Everything but the fonts and frozen modules of the last build.
+        self.rest = 1_000_000 - 100_000 - 20_000
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _cli(self, *args):
+        return subprocess.run([sys.executable, str(SCRIPT), str(self.font_dir), "14 28", "14",
+                               "--frozen", str(self.frozen), *args], capture_output=True, text=True)
+
+    def test_without_history(self):
+        result = self._cli()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn(f"Fonts + frozen modules: {self.font14 + 40_000 + 3000} bytes", result.stdout)
+        self.assertIn("whole-image prediction skipped", result.stdout)
+
+    def test_prediction_within_budget(self):
+        predicted = self.rest + self.font14 + 40_000 + 3000
+        result = self._cli("--history", str(self.report), "--budget", str(predicted))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn(f"Predicted:  {predicted} bytes", result.stdout)
+        self.assertIn("Estimated margin: 0 KB", result.stdout)
+
+    def test_over_budget_suggests_a_selection(self):
+        budget = self.rest + self.font14 + 3000
+        result = self._cli("--history", str(self.report), "--budget", str(budget))
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('LVGL_MONTSERRAT_FONTS="14"', result.stdout)
+        self.assertIn("exceeds the flash budget", result.stderr)
+
+    def test_missing_font(self):
+        result = self._cli("--toggle", "LV_FONT_UNSCII_16=1")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Missing font source", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
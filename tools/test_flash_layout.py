@@ -0,0 +1,125 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the flash layout planner (script_heredoc_templates/common/flash_layout.py).
+
+Run it from the repository root:
+
+    python3 tools/test_flash_layout.py     (or: python3 -m pytest tools)
+
+`plan()` is checked for both ports and modes, the ESP32 partition table
+round trip (render, parse, record) and the CLI `plan`/`get`/`header` steps the
+build scripts run.
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "script_heredoc_templates" / "common" / "flash_layout.py"
+sys.path.insert(0, str(SCRIPT.parent))
+
+import flash_layout  # noqa: E402
+
+KB = 1024
+MB = 1024 * KB
+
+
+class PlanTest(unittest.TestCase):
+    def test_rp2_fixed(self):
+        layout = flash_layout.plan("rp2", 2 * MB, 0, 64 * KB, 1024 * KB, 0, "fixed")
+        self.assertEqual(layout["firmware_max_bytes"], 1024 * KB)
+        self.assertEqual(layout["firmware_budget_bytes"], 1024 * KB)
+        self.assertEqual((layout["fs_offset"], layout["fs_bytes"]), (1024 * KB, 1024 * KB))
+
+    def test_rp2_auto_rounds_up_to_64k(self):
+        layout = flash_layout.plan("rp2", 2 * MB, 700 * KB + 1, 64 * KB, 1024 * KB, 256 * KB, "auto")
+        self.assertEqual(layout["firmware_max_bytes"], 768 * KB)
+        self.assertEqual(layout["fs_bytes"], 2 * MB - 768 * KB)
+        # The pre-build estimate may use everything but the minimum filesystem.
+        self.assertEqual(layout["firmware_budget_bytes"], 2 * MB - 256 * KB)
+
+    def test_rp2_auto_without_measurement_uses_fixed_split(self):
+        layout = flash_layout.plan("rp2", 2 * MB, 0, 64 * KB, 512 * KB, 256 * KB, "auto")
+        self.assertEqual(layout["firmware_max_bytes"], 1536 * KB)
+
+    def test_too_large_firmware_fails(self):
+        with self.assertRaises(SystemExit):
+            flash_layout.plan("rp2", 2 * MB, 1900 * KB, 64 * KB, 0, 256 * KB, "auto")
+        with self.assertRaises(SystemExit):
+            flash_layout.plan("rp2", 2 * MB, 0, 64 * KB, 0, 0, "fixed")
+
+    def test_esp32_auto_partitions(self):
+        layout = flash_layout.plan("esp32", 8 * MB, 1500 * KB, 64 * KB, 0, 1 * MB, "auto")
+        app = flash_layout.align_up(1564 * KB)
+        self.assertEqual(layout["firmware_max_bytes"], app)
+        parts = {part["name"]: part for part in layout["partitions"]}
+        self.assertEqual((parts["factory"]["offset"], parts["factory"]["size"]), (flash_layout.ESP32_APP_OFFSET, app))
+        self.assertEqual(parts["vfs"]["offset"], flash_layout.ESP32_APP_OFFSET + app)
+        self.assertEqual(parts["vfs"]["offset"] + parts["vfs"]["size"], 8 * MB)
+        self.assertEqual(parts["vfs"]["offset"] % flash_layout.ALIGN, 0)
+        with self.assertRaises(SystemExit):
+            flash_layout.plan("esp32", 8 * MB, 0, 64 * KB, 0, 1 * MB, "auto")
+
+    def test_esp32_partition_round_trip(self):
+        layout = flash_layout.plan("esp32", 8 * MB, 1500 * KB, 64 * KB, 0, 1 * MB, "auto")
+        with tempfile.TemporaryDirectory(prefix="test_flash_layout_") as tmp:
+            csv_path = Path(tmp) / "partitions.csv"
+            csv_path.write_text(flash_layout.partitions_csv(layout), encoding="utf-8")
+            parsed = flash_layout.read_partitions(csv_path)
+        self.assertEqual(parsed, layout["partitions"])
+        recorded = flash_layout.layout_from_partitions(parsed, 8 * MB)
+        for key in ("firmware_max_bytes", "fs_offset", "fs_bytes"):
+            self.assertEqual(recorded[key], layout[key])
+
+    def test_read_partitions_skips_symbolic_rows(self):
+        with tempfile.TemporaryDirectory(prefix="test_flash_layout_") as tmp:
+            csv_path = Path(tmp) / "partitions.csv"
+            csv_path.write_text("# Name, Type, SubType, Offset, Size\n"
+                                "nvs, data, nvs, , 0x6000,\n"
+                                "factory, app, factory, 0x10000, 2M,\n"
+                                "vfs, data, FAT, 0x210000, 0x5F0000,\n", encoding="utf-8")
+            parts = flash_layout.read_partitions(csv_path)
+        self.assertEqual([part["name"] for part in parts], ["nvs", "vfs"])
+        self.assertEqual(parts[1]["subtype"], "fat")
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_flash_layout_")
+        self.layout = Path(self._tmp.name) / "flash_layout_rp2.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _cli(self, *args, stdin=None):
+        return subprocess.run([sys.executable, str(SCRIPT), *args], input=stdin, capture_output=True, text=True)
+
+    def _plan(self, *args):
+        return self._cli("plan", "--layout", str(self.layout), "--port", "rp2", "--flash-kb", "2048",
+                         "--fs-kb", "1024", "--min-fs-kb", "256", "--exit-changed", *args)
+
+    def test_plan_reports_changes_and_reuses_the_measurement(self):
+        self.assertEqual(self._plan().returncode, 3)
+        self.assertEqual(self._plan().returncode, 0)
+        result = self._plan("--mode", "auto", "--measured", str(700 * KB))
+        self.assertEqual(result.returncode, 3, result.stderr)
+        self.assertIn("Flash layout changed: firmware 768 KB", result.stdout)
+        # Settled: the next auto plan reads the measurement from the file.
+        self.assertEqual(self._plan("--mode", "auto").returncode, 0)
+        fields = self._cli("get", "--layout", str(self.layout), "fs_bytes", "missing").stdout.split()
+        self.assertEqual(fields, [str(1280 * KB), "0"])
+
+    def test_header_sets_storage_size(self):
+        self._plan()
+        header = "#define MICROPY_HW_BOARD_NAME \"x\"\n#define MICROPY_HW_FLASH_STORAGE_BYTES (1408 * 1024)\n"
+        result = self._cli("header", "--layout", str(self.layout), stdin=header)
+        self.assertEqual(result.stdout, header.replace("(1408 * 1024)", "(1024 * 1024)"))
+
+
+if __name__ == "__main__":
+    unittest.main()
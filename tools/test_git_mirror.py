@@ -0,0 +1,131 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the git mirror and offline clone path against local bare repos.
+
+Run it from the repository root:
+
+    python3 tools/test_git_mirror.py     (or: python3 -m pytest tools)
+
+A superproject with one submodule is published as bare repositories under
+a temporary directory. script_functions/common/lvgl_repo.sh is sourced in
+bash and runs `ensure_repo_common` and `init_submodules_common` as the
+workflows do: online through GIT_MIRROR_DIR, then with OFFLINE=1 after the
+upstream repositories are gone.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FUNCTIONS_DIR = ROOT / "script_functions"
+
+_CLONE_SCRIPT = """
+source "$FUNCTIONS_DIR/common/logging_io.sh"
+source "$FUNCTIONS_DIR/common/lvgl_repo.sh"
+ensure_repo_common
+init_submodules_common lib/sub
+"""
+
+
+def _git(*args, cwd=None):
+    result = subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.invalid",
+                             "-c", "protocol.file.allow=always", *args],
+                            cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise AssertionError(f"git {' '.join(args)} failed: {result.stderr}")
+    return result.stdout.strip()
+
+
+@unittest.skipIf(shutil.which("bash") is None or shutil.which("git") is None, "needs bash and git")
+class GitMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_git_mirror_")
+        self.tmp = Path(self._tmp.name)
+        self.upstream = self.tmp / "upstream"
+        work = self.tmp / "work"
+
+        sub = work / "sub"
+        sub.mkdir(parents=True)
+        _git("init", "-q", cwd=sub)
+        for n in (1, 2):
+            (sub / "sub.txt").write_text(f"sub {n}\n")
+            _git("add", "sub.txt", cwd=sub)
+            _git("commit", "-q", "-m", f"sub {n}", cwd=sub)
+        _git("clone", "-q", "--bare", str(sub), str(self.upstream / "sub.git"))
+
+        top = work / "top"
+        top.mkdir()
+        _git("init", "-q", cwd=top)
+        (top / "README").write_text("top\n")
+        _git("add", "README", cwd=top)
+        _git("commit", "-q", "-m", "top 1", cwd=top)
+        self.sub_url = (self.upstream / "sub.git").as_uri()
+        _git("submodule", "add", "-q", self.sub_url, "lib/sub", cwd=top)
+        _git("commit", "-q", "-m", "top 2: add lib/sub", cwd=top)
+        _git("clone", "-q", "--bare", str(top), str(self.upstream / "top.git"))
+        self.repo_url = (self.upstream / "top.git").as_uri()
+        self.mirrors = self.tmp / "mirrors"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _clone(self, name, **env):
+        run_env = dict(os.environ, FUNCTIONS_DIR=str(FUNCTIONS_DIR), PYTHON_BIN=sys.executable,
+                       HEREDOC_TEMPLATES_DIR=str(ROOT / "script_heredoc_templates"),
+                       REPO_URL=self.repo_url, LVGL_DIR=str(self.tmp / name), RECLONE="0",
+                       GIT_MIRROR_DIR=str(self.mirrors), OFFLINE="0", GIT_FETCH_MODE="full",
+                       GIT_TERMINAL_PROMPT="0")
+        run_env.update(env)
+        result = subprocess.run(["bash", "-c", _CLONE_SCRIPT], env=run_env, capture_output=True, text=True)
+        return result.returncode, result.stdout + result.stderr, self.tmp / name
+
+    def test_online_clone_fills_the_mirrors(self):
+        status, out, checkout = self._clone("online")
+        self.assertEqual(status, 0, out)
+        self.assertEqual((checkout / "lib" / "sub" / "sub.txt").read_text(), "sub 2\n")
+        self.assertEqual(_git("rev-parse", "--is-shallow-repository", cwd=checkout), "false")
+        mirrored = sorted(path.name for path in self.mirrors.rglob("*.git") if (path / "HEAD").is_file())
+        self.assertEqual(mirrored, ["sub.git", "top.git"])
+
+    def test_offline_clone_from_the_mirrors(self):
+        status, out, _ = self._clone("online")
+        self.assertEqual(status, 0, out)
+        shutil.rmtree(self.upstream)
+
+        status, out, checkout = self._clone("offline", OFFLINE="1")
+        self.assertEqual(status, 0, out)
+        self.assertEqual((checkout / "lib" / "sub" / "sub.txt").read_text(), "sub 2\n")
+        # The checkout keeps the upstream URLs: the mirrors are only an insteadOf.
+        self.assertEqual(_git("remote", "get-url", "origin", cwd=checkout), self.repo_url)
+
+    def test_offline_without_mirrors_fails(self):
+        status, out, checkout = self._clone("offline", OFFLINE="1")
+        self.assertNotEqual(status, 0)
+        self.assertIn("no mirror of", out)
+        self.assertFalse(checkout.exists())
+
+        status, out, _ = self._clone("offline", OFFLINE="1", GIT_MIRROR_DIR="")
+        self.assertNotEqual(status, 0)
+        self.assertIn("OFFLINE=1 requires GIT_MIRROR_DIR", out)
+
+    def test_shallow_is_opt_in(self):
+        status, out, checkout = self._clone("shallow", GIT_FETCH_MODE="shallow")
+        self.assertEqual(status, 0, out)
+        self.assertEqual(_git("rev-parse", "--is-shallow-repository", cwd=checkout), "true")
+        self.assertEqual(_git("rev-list", "--count", "HEAD", cwd=checkout), "1")
+        self.assertEqual((checkout / "lib" / "sub" / "sub.txt").read_text(), "sub 2\n")
+
+        status, out, checkout = self._clone("default", GIT_FETCH_MODE="")
+        self.assertEqual(status, 0, out)
+        self.assertEqual(_git("rev-list", "--count", "HEAD", cwd=checkout), "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
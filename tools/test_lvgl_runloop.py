@@ -0,0 +1,120 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the frozen lvgl_runloop module on the host_sim virtual clock.
+
+Run it from the repository root:
+
+    python3 tools/test_lvgl_runloop.py     (or: python3 -m pytest tools)
+
+`lvgl` is the fake from tools/host_sim_fakes and `time` gets the MicroPython
+tick/sleep API on the simulation clock, so every sleep of the loop is exact
+and instantaneous.
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import host_sim  # noqa: E402
+
+
+class RunloopTest(unittest.TestCase):
+    def setUp(self):
+        host_sim._purge_modules()
+        self._saved_path = list(sys.path)
+        sys.path[:0] = [str(host_sim.FAKES_DIR), str(host_sim.FROZEN_DIR)]
+        import _sim
+
+        self.sim = _sim.reset()
+        host_sim._install_time(self.sim.clock)
+        import lvgl
+        import lvgl_runloop
+
+        self.lv = lvgl
+        self.runloop = lvgl_runloop
+        self.sleeps = []
+        sleep_ms = time.sleep_ms
+
+        def _recording_sleep_ms(ms):
+            self.sleeps.append(ms)
+            sleep_ms(ms)
+
+        time.sleep_ms = _recording_sleep_ms
+
+    def tearDown(self):
+        host_sim._uninstall_time()
+        sys.path[:] = self._saved_path
+        host_sim._purge_modules()
+
+    def _now_ms(self):
+        return self.sim.clock.now_us // 1000
+
+    def test_tick_follows_elapsed_time(self):
+        runs = []
+        self.lv.timer_create(lambda _t: runs.append(self._now_ms()), 33)
+        seen = []
+
+        def _record(handler):
+            def _handler():
+                seen.append((self._now_ms(), self.lv.tick_get()))
+                return handler()
+            return _handler
+
+        self.runloop.wrap_timer_handler(_record)
+        self.runloop.run(iterations=40)
+
+        first_ms, first_tick = seen[0]
+        for now_ms, tick in seen:
+            self.assertEqual(tick - first_tick, now_ms - first_ms)
+        # Deadline driven: one pass per timer period, each on time.
+        self.assertEqual(len(runs), 39)
+        self.assertEqual([b - a for a, b in zip(runs, runs[1:])], [33] * 38)
+        self.assertEqual(self.runloop.stats(), (40, 40 * 33))
+
+    def test_idle_sleep_is_capped(self):
+        # No LVGL timer: the handler reports NO_TIMER_READY.
+        self.runloop.run(iterations=3)
+
+        self.assertEqual(self.runloop.stats(), (3, 3 * self.runloop.MAX_SLEEP_MS))
+        self.assertLessEqual(max(self.sleeps), self.runloop.WAKE_POLL_MS)
+        self.assertEqual(self.runloop.run_once(max_sleep_ms=50), 50)
+
+    def test_deadline_beyond_cap_is_capped(self):
+        self.lv.timer_create(lambda _t: None, 2000)
+        self.runloop.run_once()  # starts tick accounting
+        self.assertEqual(self.runloop.run_once(), self.runloop.MAX_SLEEP_MS)
+
+    def test_wake_cuts_the_sleep(self):
+        # Mid-slice: the wake is seen at the end of the current poll slice.
+        wake_at_ms = 103
+        self.sim.clock.schedule(wake_at_ms * 1000, self.runloop.wake)
+        self.runloop.run(iterations=1)
+
+        wakeups, slept_ms = self.runloop.stats()
+        self.assertEqual(wakeups, 1)
+        self.assertGreaterEqual(slept_ms, wake_at_ms)
+        self.assertLessEqual(slept_ms, wake_at_ms + self.runloop.WAKE_POLL_MS)
+        self.assertLessEqual(self.runloop.WAKE_POLL_MS, 5)
+
+    def test_reset_stats_restarts_tick_accounting(self):
+        self.runloop.run(iterations=2)
+        self.runloop.reset_stats()
+        self.assertEqual(self.runloop.stats(), (0, 0))
+
+        tick = self.lv.tick_get()
+        time.sleep_ms(1000)  # outside the loop: not fed to LVGL
+        self.runloop.run_once()
+        self.assertEqual(self.lv.tick_get(), tick)
+        time.sleep_ms(7)
+        self.runloop.run_once()
+        self.assertEqual(self.lv.tick_get(), tick + 7)
+        self.assertEqual(self.runloop.stats(), (2, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of script_heredoc_templates/common/patch_engine.py on a fixture tree.
+
+Run it from the repository root:
+
+    python3 tools/test_patch_engine.py     (or: python3 -m pytest tools)
+
+A small manifest is applied through `run()`, as the manifest wrappers do,
+to a temporary tree: first application, re-application as a no-op,
+upstream drift (nothing written) and a transform whose code changed
+(versioned done marker).
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "script_heredoc_templates" / "common"))
+
+import patch_engine  # noqa: E402
+
+SOURCE = "#include <a.h>\nint main(void)\n{\n    return 0;\n}\n"
+BANNER = "// banner v1\n"
+
+
+def add_banner(content, context):
+    """Transform: prepend BANNER followed by the versioned done marker."""
+    return BANNER + "// " + context["done"] + "\n" + content
+
+
+def add_banner_v2(content, context):
+    """Same transform after a code change: a new fingerprint."""
+    return BANNER.replace("v1", "v2") + "// " + context["done"] + "\n" + content
+
+
+def _manifest(transform=add_banner):
+    return (
+        {
+            "files": ("src/main.c",),
+            "edits": (
+                {"insert_after_line": "#include <a.h>", "text": "#include <b.h>\n", "done": "#include <b.h>"},
+                {"replace": "return 0;", "with": "return run();", "done": "return run();"},
+                {"transform": transform, "done": "BANNER_DONE"},
+            ),
+        },
+    )
+
+
+class PatchEngineTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_patch_engine_")
+        self.root = Path(self._tmp.name)
+        self.target = self.root / "src" / "main.c"
+        self.target.parent.mkdir()
+        self.target.write_text(SOURCE, encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, manifest, *argv):
+        args = patch_engine.build_parser("test").parse_args(["--root", str(self.root), *argv])
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = patch_engine.run(manifest, "fixture", args)
+        return status, out.getvalue()
+
+    def test_apply_then_reapply_is_a_noop(self):
+        status, out = self._run(_manifest())
+        self.assertEqual(status, 0, out)
+        self.assertIn("applied 3 edit(s)", out)
+        patched = self.target.read_text(encoding="utf-8")
+        self.assertIn("#include <b.h>\n", patched)
+        self.assertIn("return run();", patched)
+        self.assertRegex(patched, r"// BANNER_DONE@[0-9a-f]{12}\n")
+
+        for argv in ((), ("--no-stamp",)):
+            status, out = self._run(_manifest(), *argv)
+            self.assertEqual(status, 0, out)
+            self.assertIn("OK: already patched", out)
+            self.assertEqual(self.target.read_text(encoding="utf-8"), patched)
+
+    def test_drift_fails_without_writing(self):
+        drifted = SOURCE.replace("return 0;", "return status;")
+        self.target.write_text(drifted, encoding="utf-8")
+        status, out = self._run(_manifest())
+        self.assertEqual(status, 1)
+        self.assertIn("anchor not found", out)
+        self.assertEqual(self.target.read_text(encoding="utf-8"), drifted)
+        self.assertFalse((self.root / patch_engine.STAMP_DIR).exists())
+
+    def test_changed_transform_repatches_from_the_original(self):
+        self._run(_manifest())
+        status, out = self._run(_manifest(add_banner_v2))
+        self.assertEqual(status, 0, out)
+        self.assertIn("patching again from the pre-patch copy", out)
+        patched = self.target.read_text(encoding="utf-8")
+        self.assertIn("// banner v2\n", patched)
+        self.assertNotIn("v1", patched)
+        self.assertEqual(patched.count("BANNER_DONE@"), 1)
+        self.assertEqual(patched.count("#include <b.h>"), 1)
+
+    def test_changed_transform_without_original_is_refused(self):
+        self._run(_manifest(), "--no-stamp")
+        applied = self.target.read_text(encoding="utf-8")
+        # No stamp copy and no git checkout to restore the file from.
+        status, out = self._run(_manifest(add_banner_v2), "--no-stamp")
+        self.assertEqual(status, 1)
+        self.assertIn("older version of the patch", out)
+        self.assertEqual(self.target.read_text(encoding="utf-8"), applied)
+
+    def test_run_validates_the_manifest(self):
+        manifest = ({"files": ("src/main.c",), "edits": ({"replace": "return 0;", "with": "return 1;"},)},)
+        with self.assertRaises(SystemExit) as raised:
+            self._run(manifest)
+        self.assertIn("need a `done` marker", str(raised.exception))
+        self.assertEqual(self.target.read_text(encoding="utf-8"), SOURCE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of the rp2040 tree patch manifest on a minimal fixture tree.
+
+Run it from the repository root:
+
+    python3 tools/test_patch_rp2040_tree.py     (or: python3 -m pytest tools)
+
+The fixture holds just the anchors script_heredoc_templates/rp2040/
+patch_rp2040_tree.py edits in an lvgl_micropython checkout. The manifest
+must apply once, be a no-op the second time (with and without stamps,
+with and without `--enable spi_dma`) and fail without writing anything
+when an anchor drifted upstream.
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "script_heredoc_templates" / "rp2040"))
+
+import patch_rp2040_tree  # noqa: E402
+from patch_engine import build_parser, run  # noqa: E402
+
+FIXTURE = {
+    "ext_mod/lvgl/micropython.cmake": (
+        "separate_arguments(LV_CFLAGS_ENV UNIX_COMMAND $ENV{LV_CFLAGS})\n"
+        "separate_arguments(SECOND_BUILD_ENV UNIX_COMMAND $ENV{SECOND_BUILD})\n"
+        "set(LVGL_DIR ${BINDING_DIR}/lib/lvgl)\n"
+        "add_custom_command(COMMAND $ENV{GEN_SCRIPT}_api_gen_mpy.py --board=$ENV{LV_PORT})\n"
+    ),
+    "gen/lvgl_api_gen_mpy.py": "stub_gen.run(args.metadata)\n",
+    "ext_mod/lcd_bus/common_include/spi_bus.h": (
+        "#include \"lcd_types.h\"\n"
+        "typedef struct {\n"
+        "            void *buf2;\n\n"
+        "            bool trans_done;\n"
+        "} mp_lcd_spi_bus_obj_t;\n"
+    ),
+    "micropy_updates/common/mp_spi_common.h": "typedef struct {\n    int host;\n} mp_machine_hw_spi_bus_obj_t;\n",
+    "ext_mod/lcd_bus/common_src/spi_bus.c": (
+        "#include \"spi_bus.h\"\n"
+        "\n"
+        "    mp_lcd_err_t s_spi_init(mp_obj_t obj)\n"
+        "    {\n"
+        "        self->panel_io_handle.del = s_spi_del;\n"
+        "        return LCD_OK;\n"
+        "    }\n"
+        "\n"
+        "    mp_lcd_err_t s_spi_tx_param(mp_obj_t obj, int cmd)\n"
+        "    {\n"
+        "        return LCD_OK;\n"
+        "    }\n"
+        "\n"
+        "    mp_lcd_err_t s_spi_rx_param(mp_obj_t obj, int cmd)\n"
+        "    {\n"
+        "        return LCD_OK;\n"
+        "    }\n"
+        "\n"
+        "    mp_lcd_err_t s_spi_tx_color(mp_obj_t obj, void *color, size_t color_size)\n"
+        "    {\n"
+        "        spi_write(self->bus_handle.spi_bus->x, color, color_size);\n"
+        "        return LCD_OK;\n"
+        "    }\n"
+        "\n"
+        "    mp_lcd_err_t s_spi_del(mp_obj_t obj)\n"
+        "    {\n"
+        "        return LCD_OK;\n"
+        "    }\n"
+    ),
+}
+
+
+class PatchRp2040TreeTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_patch_rp2040_tree_")
+        self.root = Path(self._tmp.name)
+        for rel, text in FIXTURE.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, *argv):
+        args = build_parser("test").parse_args(["--root", str(self.root), *argv])
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = run(patch_rp2040_tree.MANIFEST, "rp2040_tree", args)
+        return status, out.getvalue()
+
+    def _tree(self):
+        return {rel: (self.root / rel).read_text(encoding="utf-8") for rel in FIXTURE}
+
+    def _assert_idempotent(self, *argv):
+        status, out = self._run(*argv)
+        self.assertEqual(status, 0, out)
+        self.assertIn("OK: patches applied", out)
+        patched = self._tree()
+        for extra in ((), ("--no-stamp",)):
+            status, out = self._run(*argv, *extra)
+            self.assertEqual(status, 0, out)
+            self.assertIn("OK: already patched", out)
+            self.assertEqual(self._tree(), patched)
+        return patched
+
+    def test_apply_twice(self):
+        patched = self._assert_idempotent()
+        cmake = patched["ext_mod/lvgl/micropython.cmake"]
+        self.assertEqual(cmake.count("_GEN_SCRIPT_VAL \"python\""), 1)
+        self.assertEqual(cmake.count("patch_spi_api.py"), 1)
+        self.assertNotIn("$ENV{SECOND_BUILD})", cmake)
+        self.assertIn("stub_gen.run(args.metadata, args.metadata)", patched["gen/lvgl_api_gen_mpy.py"])
+        self.assertIn("uint32_t buffer_flags;", patched["ext_mod/lcd_bus/common_include/spi_bus.h"])
+        spi_bus = patched["ext_mod/lcd_bus/common_src/spi_bus.c"]
+        self.assertEqual(spi_bus.count(patch_rp2040_tree.MODMACHINE_INCLUDE), 1)
+        self.assertEqual(spi_bus.count("self->buf1 = NULL;"), 1)
+        self.assertNotIn(patch_rp2040_tree.LCD_DMA_MARKER, spi_bus)
+
+    def test_apply_twice_with_spi_dma(self):
+        spi_bus = self._assert_idempotent("--enable", "spi_dma")["ext_mod/lcd_bus/common_src/spi_bus.c"]
+        self.assertRegex(spi_bus, r"// --- LCD_BUS_RP2_DMA@[0-9a-f]{12}: non-blocking color transfers \(begin\)")
+        self.assertEqual(spi_bus.count("lcd_bus_rp2_dma_wait();"), 4)
+        self.assertIn("lcd_bus_rp2_dma_start(self, self->bus_handle.spi_bus->host, color, color_size)", spi_bus)
+
+    def test_dma_after_plain_patch(self):
+        self._assert_idempotent()
+        spi_bus = self._assert_idempotent("--enable", "spi_dma")["ext_mod/lcd_bus/common_src/spi_bus.c"]
+        self.assertEqual(spi_bus.count("self->buf1 = NULL;"), 1)
+        self.assertEqual(spi_bus.count("LCD_BUS_RP2_DMA@"), 1)
+
+    def test_upstream_drift_fails(self):
+        drifted = "ext_mod/lcd_bus/common_src/spi_bus.c"
+        (self.root / drifted).write_text(FIXTURE[drifted].replace("panel_io_handle.del", "panel_io_handle.deinit"),
+                                         encoding="utf-8")
+        before = self._tree()
+        status, out = self._run()
+        self.assertEqual(status, 1)
+        self.assertIn("anchor not found", out)
+        # Drift in one file stops every file from being written.
+        self.assertEqual(self._tree(), before)
+
+    def test_missing_file_fails(self):
+        (self.root / "gen" / "lvgl_api_gen_mpy.py").unlink()
+        status, out = self._run()
+        self.assertEqual(status, 1)
+        self.assertIn("file not found", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
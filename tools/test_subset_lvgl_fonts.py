@@ -0,0 +1,169 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test of script_heredoc_templates/common/subset_lvgl_fonts.py.
+
+Run it from the repository root:
+
+    python3 tools/test_subset_lvgl_fonts.py     (or: python3 -m pytest tools)
+
+Code point range parsing and cmap planning are tested directly. Subsetting
+runs on a small synthetic font laid out like lv_font_conv output (a
+FORMAT0 ASCII range, a sparse symbol list and class kerning), through
+`subset_font()` and through the CLI with its `.orig` restore.
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "script_heredoc_templates" / "common" / "subset_lvgl_fonts.py"
+sys.path.insert(0, str(SCRIPT.parent))
+
+import subset_lvgl_fonts as subset  # noqa: E402
+
+ASCII = list(range(0x20, 0x7F))
+SYMBOLS = [0xF001, 0xF008]
+
+
+def _font_source():
+    """A tiny lv_font_conv style source: ASCII, two symbols, class kerning."""
+    codepoints = ASCII + SYMBOLS
+    bitmap = []
+    glyphs = ["    {.bitmap_index = 0, .adv_w = 0, .box_w = 0, .box_h = 0, .ofs_x = 0, .ofs_y = 0} /* id = 0 reserved */"]
+    for glyph_id, cp in enumerate(codepoints, start=1):
+        size = 0 if cp == 0x20 else 1 + cp % 3
+        glyphs.append(f"    {{.bitmap_index = {len(bitmap)}, .adv_w = {cp % 50 + 40}, .box_w = {size}, "
+                      f".box_h = {size}, .ofs_x = 0, .ofs_y = {cp % 4}}}")
+        bitmap.extend((cp + n) & 0xFF for n in range(size))
+    ids = len(codepoints) + 1
+    return (
+        "/*******************************************************************************\n"
+        " * Size: 14 px\n"
+        " ******************************************************************************/\n"
+        "\n"
+        "static LV_ATTRIBUTE_LARGE_CONST const uint8_t glyph_bitmap[] = {"
+        + subset.format_values(bitmap, "0x{:x}") + "};\n\n"
+        "static const lv_font_fmt_txt_glyph_dsc_t glyph_dsc[] = {\n" + ",\n".join(glyphs) + "\n};\n\n"
+        "static const uint16_t unicode_list_1[] = {"
+        + subset.format_values([cp - SYMBOLS[0] for cp in SYMBOLS], "0x{:x}") + "};\n\n"
+        "/*Collect the unicode lists and glyph_id offsets*/\n"
+        "static const lv_font_fmt_txt_cmap_t cmaps[] =\n{\n"
+        "    {\n"
+        f"        .range_start = 32, .range_length = {len(ASCII)}, .glyph_id_start = 1,\n"
+        "        .unicode_list = NULL, .glyph_id_ofs_list = NULL, .list_length = 0, "
+        ".type = LV_FONT_FMT_TXT_CMAP_FORMAT0_TINY\n"
+        "    },\n"
+        "    {\n"
+        f"        .range_start = {SYMBOLS[0]}, .range_length = {SYMBOLS[-1] - SYMBOLS[0] + 1}, "
+        f".glyph_id_start = {len(ASCII) + 1},\n"
+        f"        .unicode_list = unicode_list_1, .glyph_id_ofs_list = NULL, .list_length = {len(SYMBOLS)}, "
+        ".type = LV_FONT_FMT_TXT_CMAP_SPARSE_TINY\n"
+        "    }\n"
+        "};\n\n"
+        "static const uint8_t kern_left_class_mapping[] =\n{"
+        + subset.format_values([glyph_id % 3 for glyph_id in range(ids)]) + "};\n\n"
+        "static const uint8_t kern_right_class_mapping[] =\n{"
+        + subset.format_values([glyph_id % 4 for glyph_id in range(ids)]) + "};\n\n"
+        "static const int8_t kern_class_values[] =\n{"
+        + subset.format_values([-1, -2, -3, -4, -5, -6]) + "};\n\n"
+        "static const lv_font_fmt_txt_kern_classes_t kern_classes = {\n"
+        "    .class_pair_values   = kern_class_values,\n"
+        "    .left_class_mapping  = kern_left_class_mapping,\n"
+        "    .right_class_mapping = kern_right_class_mapping,\n"
+        "    .left_class_cnt      = 2,\n"
+        "    .right_class_cnt     = 3,\n"
+        "};\n\n"
+        "static lv_font_fmt_txt_dsc_t font_dsc = {\n"
+        "    .glyph_bitmap = glyph_bitmap,\n"
+        "    .glyph_dsc = glyph_dsc,\n"
+        "    .cmaps = cmaps,\n"
+        "    .kern_dsc = &kern_classes,\n"
+        "    .kern_scale = 16,\n"
+        "    .cmap_num = 2,\n"
+        "    .bpp = 4,\n"
+        "    .kern_classes = 1,\n"
+        "};\n"
+    )
+
+
+class ParseRangesTest(unittest.TestCase):
+    def test_forms(self):
+        self.assertEqual(subset.parse_ranges(""), set())
+        self.assertEqual(subset.parse_ranges("0x41"), {0x41})
+        self.assertEqual(subset.parse_ranges("65-67"), {65, 66, 67})
+        self.assertEqual(subset.parse_ranges("0x30-0x32, 0xB0 8226"), {0x30, 0x31, 0x32, 0xB0, 8226})
+        self.assertEqual(subset.parse_ranges(" 0x41,,0x41-0x41 "), {0x41})
+
+    def test_invalid(self):
+        for raw in ("0x7E-0x20", "A-Z", "0x20-", "12.5"):
+            with self.subTest(raw=raw), self.assertRaises(SystemExit):
+                subset.parse_ranges(raw)
+
+
+class PlanCmapsTest(unittest.TestCase):
+    def test_runs_and_sparse(self):
+        run = list(range(0x30, 0x30 + subset.MIN_FORMAT0_RUN))
+        short = [0x41, 0x42, 0x50]
+        cmaps = subset.plan_cmaps([0x20] + run + short + [0xF001])
+        self.assertEqual(cmaps, [("sparse", [0x20]), ("format0", run), ("sparse", short + [0xF001])])
+
+    def test_sparse_range_is_bounded(self):
+        cmaps = subset.plan_cmaps([0x20, 0x20 + 0x10000, 0x20 + 0x10001])
+        self.assertEqual(cmaps, [("sparse", [0x20]), ("sparse", [0x10020, 0x10021])])
+
+
+class SubsetFontTest(unittest.TestCase):
+    def test_subset_keeps_glyphs_and_kerning(self):
+        content = _font_source()
+        wanted = {ord(char) for char in "Hello, World!"} | {0xF008, 0x2603}
+        new, font, sub, missing = subset.subset_font(content, wanted, "montserrat_14")
+
+        self.assertEqual(missing, [0x2603])
+        self.assertEqual(sorted(sub.codepoints), sorted(wanted - {0x2603}))
+        self.assertLess(sub.data_bytes(), font.data_bytes())
+        self.assertIn("(subset_lvgl_fonts.py)", new)
+        # Kerning between kept glyphs is preserved (verify_subset checks all pairs).
+        pairs = [(left, right) for left in sub.codepoints for right in sub.codepoints
+                 if font.kern_value(font.codepoints[left], font.codepoints[right])]
+        self.assertTrue(pairs)
+        for left, right in pairs:
+            self.assertEqual(sub.kern_value(sub.codepoints[left], sub.codepoints[right]),
+                             font.kern_value(font.codepoints[left], font.codepoints[right]))
+
+    def test_nothing_in_font(self):
+        with self.assertRaises(SystemExit):
+            subset.subset_font(_font_source(), {0x2603}, "montserrat_14")
+
+    def test_cli_subsets_then_restores(self):
+        with tempfile.TemporaryDirectory(prefix="test_subset_fonts_") as tmp:
+            font_dir = Path(tmp)
+            path = font_dir / "lv_font_montserrat_14.c"
+            original = _font_source()
+            path.write_text(original, encoding="utf-8")
+
+            def cli(*args):
+                return subprocess.run([sys.executable, str(SCRIPT), str(font_dir), "14", *args],
+                                      capture_output=True, text=True, check=True).stdout
+
+            out = cli("--ranges", "0x30-0x39", "--keep-symbols")
+            self.assertIn("montserrat_14: 13/97 glyphs", out)
+            self.assertEqual(path.with_name(path.name + ".orig").read_text(encoding="utf-8"), original)
+            first = path.read_text(encoding="utf-8")
+            cli("--ranges", "0x30-0x39", "--keep-symbols")
+            self.assertEqual(path.read_text(encoding="utf-8"), first)
+
+            # A new character set starts from the pristine copy again.
+            self.assertIn("montserrat_14: 2/97 glyphs", cli("--charset", "A"))
+
+            self.assertIn("full Montserrat sources in place", cli())
+            self.assertEqual(path.read_text(encoding="utf-8"), original)
+            self.assertFalse(path.with_name(path.name + ".orig").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
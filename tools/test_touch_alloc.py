@@ -0,0 +1,111 @@
+# Author: antlampas
+# Created: 2026-10-17
+# License: Creative Commons Attribution-ShareAlike 4.0 International (CC BY-SA 4.0)
+# See: ./LICENSE.md
+"""Host test: the RP2040 touch read path does not allocate in steady state.
+
+Run it from the repository root:
+
+    python3 tools/test_touch_alloc.py     (or: python3 -m pytest tools)
+
+The board module is rendered from its template as host_sim does and its
+`_read_touch`/`_touch_into` are driven through `_CompatI2CDevice` against a
+bus stub that answers with a fixed one-finger report. After a warm-up read,
+tracemalloc must see no block still held by the board module, however many
+reads follow.
+"""
+
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import host_sim  # noqa: E402
+
+
+class _Bus:
+    """machine.I2C stand-in: register writes are ignored, reads get a report."""
+
+    REPORT = b"\x01\x00\x78\x00\xa0"
+
+    def writeto(self, addr, buf, stop=True):
+        return len(buf)
+
+    def readfrom_into(self, addr, buf):
+        buf[:] = self.REPORT[:len(buf)]
+
+
+class _Obj:
+    """Attribute bag standing in for lv.indev_data_t and its point."""
+
+
+class TouchAllocTest(unittest.TestCase):
+    def setUp(self):
+        host_sim._purge_modules()
+        self._tmp = tempfile.TemporaryDirectory(prefix="test_touch_alloc_")
+        board_py = host_sim.render_board_module("rp2040", Path(self._tmp.name))
+        self._saved_path = list(sys.path)
+        sys.path[:0] = [str(host_sim.FAKES_DIR), str(host_sim.FROZEN_DIR), self._tmp.name]
+        import _sim
+
+        _sim.reset()
+        import lvgl
+
+        self.lv = lvgl
+        self.board = __import__(board_py.stem)
+        self.board_file = str(board_py)
+        self.dev = self.board._CompatI2CDevice(_Bus(), self.board.TOUCH_I2C_ADDR)
+        self.data = _Obj()
+        self.data.point = _Obj()
+        self.data.state = lvgl.INDEV_STATE.RELEASED
+
+    def tearDown(self):
+        sys.path[:] = self._saved_path
+        host_sim._purge_modules()
+        self._tmp.cleanup()
+
+    def _held_blocks(self, read, iterations):
+        """Blocks allocated by the board module and still held after `iterations` reads."""
+        read()  # warm-up: caches the read view
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            for _ in range(iterations):
+                read()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        only_board = [tracemalloc.Filter(True, self.board_file)]
+        diff = after.filter_traces(only_board).compare_to(before.filter_traces(only_board), "lineno")
+        return sum(max(stat.count_diff, 0) for stat in diff)
+
+    def test_touch_into_does_not_allocate(self):
+        def read():
+            self.assertTrue(self.board._touch_into(self.dev, self.data))
+
+        self.assertEqual(self._held_blocks(read, 1000), 0)
+        self.assertEqual((self.data.point.x, self.data.point.y), (120, 160))
+
+    def test_read_touch_does_not_allocate(self):
+        # IRQ mode with a finger down: every read goes to the controller.
+        pending = bytearray(b"\x01")
+        state = bytearray(b"\x01")
+
+        def read():
+            self.board._read_touch(self.dev, pending, state, self.data)
+
+        self.assertEqual(self._held_blocks(read, 10), 0)
+        self.assertEqual(self._held_blocks(read, 1000), 0)
+        self.assertEqual(self.data.state, self.lv.INDEV_STATE.PRESSED)
+
+    def test_read_view_is_reused(self):
+        first = self.dev.read(5, 0x02)
+        self.assertIs(self.dev.read(5, 0x02), first)
+        self.assertEqual(bytes(first), _Bus.REPORT)
+
+
+if __name__ == "__main__":
+    unittest.main()